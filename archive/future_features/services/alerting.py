@@ -48,7 +48,8 @@ from email.mime.multipart import MIMEMultipart
 import aiohttp
 
 from ..realtime import connection_manager, RealtimeErrorMonitor
-from ..storage.database import LogEntry, LogSeverity
+from ..storage.async_database import AsyncDatabaseManager
+from ..storage.database import DatabaseManager, LogEntry, LogSeverity
 
 logger = logging.getLogger(__name__)
 
@@ -217,17 +218,24 @@ class AlertManager:
     This system does the same thing but for software errors instead of emergencies!
     """
     
-    def __init__(self, error_monitor: RealtimeErrorMonitor):
+    def __init__(self, error_monitor: RealtimeErrorMonitor,
+                 database_manager: Optional[DatabaseManager] = None):
         """
         🏗️ SETTING UP THE COMMAND CENTER
         
         When we create a new AlertManager, it's like setting up a complete
         emergency response center with all the communication equipment,
         monitoring systems, and protocol manuals needed to handle alerts.
+        
+        The optional database_manager lets error_count_threshold rules count
+        recent matching logs; without it only the current log is counted.
         """
         # 📡 CONNECTION TO ERROR MONITORING SYSTEM
         self.error_monitor = error_monitor
         
+        # 🗄️ LOG DATABASE - used to count recent errors for threshold rules
+        self.database_manager = database_manager
+        
         # 📋 ALERT RULES DATABASE - all our configured alert conditions
         self.rules: Dict[str, AlertRule] = {}
         
@@ -393,9 +401,19 @@ class AlertManager:
         This counts how many similar errors have occurred in the recent time window.
         Like counting how many times the fire alarm has gone off in the last hour.
         """
-        # TODO: In a real implementation, you'd query the database for recent matching logs
-        # For now, we'll return 1 (just the current log)
-        return 1
+        if self.database_manager is None:
+            return 1  # Without a database we only know about the current log
+        
+        window_start = datetime.now() - timedelta(minutes=rule.time_window_minutes)
+        recent_count = await AsyncDatabaseManager.wrap(self.database_manager).count_logs(
+            start_date=window_start,
+            severities=rule.severity_filter,
+            languages=rule.language_filter,
+            projects=rule.project_filter,
+            tags=rule.tag_filter,  # Exact matches via the log_tags index
+        )
+        # The current log may not have been stored yet
+        return max(recent_count, 1)
     
     def _is_in_cooldown(self, rule: AlertRule) -> bool:
         """
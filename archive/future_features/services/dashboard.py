@@ -46,6 +46,7 @@ import statistics
 import hashlib
 import base64
 
+from ..storage.async_database import AsyncDatabaseManager
 from ..storage.database import DatabaseManager, LogEntry, LogSeverity
 from ..realtime import connection_manager
 
@@ -538,10 +539,8 @@ class DashboardEngine:
     async def _calculate_total_errors(self) -> int:
         """Calculate total number of errors in database."""
         try:
-            # This would query the database for total error count
-            # For now, return a placeholder value
-            results = self.database_manager.search_logs()
-            return len(results)
+            # Read from the rollup totals on a reader thread, off the event loop
+            return await AsyncDatabaseManager.wrap(self.database_manager).count_logs()
         except Exception:
             return 0
     
@@ -33,15 +33,24 @@ WHAT THIS MODULE PROVIDES:
 🛡️ Data Privacy - Like keeping everything secure and local
 """
 
-from .database import DatabaseManager, LogEntry, LogStats
+from .async_database import AsyncDatabaseManager
+from .database import DatabaseManager, LogChange, LogEntry, LogPage, LogRow, LogStats, LogWriteBuffer, TextSearchHit
+from .partitions import PartitionedDatabaseManager
 from .retention import RetentionManager
 from .search import SearchManager
 
 __version__ = "1.0.0"
 __all__ = [
+    "AsyncDatabaseManager",
     "DatabaseManager", 
+    "LogChange",
     "LogEntry", 
+    "LogPage",
+    "LogRow",
     "LogStats",
+    "LogWriteBuffer",
+    "PartitionedDatabaseManager",
     "RetentionManager",
-    "SearchManager"
+    "SearchManager",
+    "TextSearchHit"
 ]
\ No newline at end of file
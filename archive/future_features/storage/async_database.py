@@ -0,0 +1,201 @@
+"""
+⏳ DEBUGGLE ASYNC DATABASE - Keeping the Event Loop Free! ⏳
+
+DatabaseManager talks to SQLite synchronously: while a query runs, the
+calling thread waits. Inside FastAPI that thread is the event loop, so one
+slow search freezes every other request and WebSocket broadcast. This
+module puts the database behind a service counter: coroutines hand their
+request over and get on with other work until the answer is ready.
+
+🏆 HIGH SCHOOL EXPLANATION:
+Like a school library with a front desk:
+- Students (coroutines) drop off requests and go back to class instead of
+  standing at the shelves
+- Several librarians fetch books at the same time (concurrent reads)
+- Only one librarian is allowed to re-shelve, so returns are processed in
+  the order they came in (queued writes)
+- A request that takes too long is called off, and the librarian stops
+  looking (timeouts and cancellation)
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar, Union
+
+from .database import DatabaseManager, cancellable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ⚙️ POOL SIZES - WAL lets several readers run beside the single writer
+DEFAULT_READ_WORKERS = 4
+
+_NO_TIMEOUT = object()  # Sentinel: use the facade's default_timeout
+
+
+class AsyncDatabaseManager:
+    """
+    🛎️ THE FRONT DESK - awaitable DatabaseManager calls on worker threads
+
+    Wraps a DatabaseManager (or PartitionedDatabaseManager) and runs every
+    call on one of two thread pools:
+    - a pool of read_workers threads for queries, so reads run side by side
+      (each thread has its own pooled connection)
+    - a single writer thread, so writes are queued and applied in the
+      order they were awaited instead of fighting over SQLite's write lock
+
+    Every call accepts ``timeout`` (seconds; defaults to default_timeout).
+    When a call times out or the awaiting task is cancelled, a call still
+    waiting in the queue is skipped and a running SQLite statement is
+    interrupted, rolling back its transaction. DatabaseManager methods log
+    that interruption like any other database error.
+
+    Use ``AsyncDatabaseManager.wrap(db)`` to share one front desk between
+    all the services that use the same database.
+    """
+
+    # 🗂️ SHARED FACADES - one per DatabaseManager, created on first wrap() and
+    # kept on the manager itself, so the pair is collected together
+    _shared_lock = threading.Lock()
+
+    def __init__(self, database_manager: DatabaseManager,
+                 read_workers: int = DEFAULT_READ_WORKERS,
+                 default_timeout: Optional[float] = None):
+        """
+        🏗️ OPENING THE FRONT DESK
+
+        Args:
+            database_manager: The synchronous manager every call runs on
+            read_workers: Threads serving reads concurrently
+            default_timeout: Seconds before a call is abandoned (None waits forever)
+        """
+        if read_workers < 1:
+            raise ValueError("read_workers must be at least 1")
+
+        self.sync = database_manager
+        self.default_timeout = default_timeout
+        self._readers = ThreadPoolExecutor(max_workers=read_workers,
+                                           thread_name_prefix="debuggle-db-reader")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debuggle-db-writer")
+        self._closed = False
+
+    @classmethod
+    def wrap(cls, database_manager: Union[DatabaseManager, "AsyncDatabaseManager"]) -> "AsyncDatabaseManager":
+        """
+        🔗 THE SHARED FRONT DESK for a database
+
+        Returns database_manager itself if it is already async, otherwise
+        the facade shared by every caller wrapping the same manager.
+        """
+        if isinstance(database_manager, AsyncDatabaseManager):
+            return database_manager
+        with cls._shared_lock:
+            facade = getattr(database_manager, "_async_facade", None)
+            if facade is None or facade._closed:
+                facade = cls(database_manager)
+                database_manager._async_facade = facade
+            return facade
+
+    # ------------------------------------------------------------------
+    # ⚡ RUNNING CALLS
+    # ------------------------------------------------------------------
+
+    async def read(self, function: Callable[..., T], *args: Any,
+                   timeout: Any = _NO_TIMEOUT, **kwargs: Any) -> T:
+        """📖 Run function(*args, **kwargs) on the read pool and await its result."""
+        return await self._submit(self._readers, function, args, kwargs, timeout)
+
+    async def write(self, function: Callable[..., T], *args: Any,
+                    timeout: Any = _NO_TIMEOUT, **kwargs: Any) -> T:
+        """✍️ Queue function(*args, **kwargs) on the writer thread and await its result."""
+        return await self._submit(self._writer, function, args, kwargs, timeout)
+
+    async def _submit(self, executor: ThreadPoolExecutor, function: Callable[..., T],
+                      args: tuple, kwargs: dict, timeout: Any) -> T:
+        if self._closed:
+            raise RuntimeError("AsyncDatabaseManager is closed")
+        if timeout is _NO_TIMEOUT:
+            timeout = self.default_timeout
+
+        cancel = threading.Event()
+
+        def run() -> Optional[T]:
+            nonlocal function, args, kwargs
+            try:
+                if cancel.is_set():
+                    return None  # Abandoned while still queued; nobody is waiting
+                with cancellable(cancel):
+                    return function(*args, **kwargs)
+            finally:
+                # The pool thread holds this closure until its next job, so
+                # let go of the call (and the manager behind it) right away
+                function = args = kwargs = None  # type: ignore[assignment]
+
+        future = asyncio.get_running_loop().run_in_executor(executor, run)
+        try:
+            # wait_for cancels the future on timeout, which drops a call that
+            # is still queued; one that is already running is told to stop
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            cancel.set()
+            name = getattr(function, "__name__", repr(function))
+            logger.warning(f"Database call {name} abandoned (timeout={timeout})")
+            raise
+
+    async def close(self):
+        """🔒 Finish queued calls, stop the worker threads and close the manager."""
+        if self._closed:
+            return
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._writer.shutdown, wait=True))
+        await loop.run_in_executor(None, functools.partial(self._readers.shutdown, wait=True))
+        self.sync.close()
+
+    # ------------------------------------------------------------------
+    # 📚 THE DATABASEMANAGER API, AWAITABLE
+    # ------------------------------------------------------------------
+
+    async def iter_logs(self, batch_size: int = 1000, timeout: Any = _NO_TIMEOUT,
+                        **filters: Any) -> AsyncIterator[Any]:
+        """🚶 Async version of iter_logs: one awaited page per batch (timeout applies per page)."""
+        cursor = None
+        while True:
+            page = await self.read(self.sync.search_logs_page, limit=batch_size, cursor=cursor,
+                                   timeout=timeout, **filters)
+            for log in page.logs:
+                yield log
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+
+def _delegate(name: str, writes: bool):
+    """Build the awaitable counterpart of DatabaseManager.<name>."""
+    async def method(self: AsyncDatabaseManager, *args: Any, timeout: Any = _NO_TIMEOUT, **kwargs: Any) -> Any:
+        run = self.write if writes else self.read
+        return await run(getattr(self.sync, name), *args, timeout=timeout, **kwargs)
+
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = (f"{'✍️ Queued on the writer' if writes else '📖 Run on the read pool'}: "
+                      f"awaitable DatabaseManager.{name}.")
+    return method
+
+
+_READ_METHODS = (
+    "get_log", "search_logs", "search_logs_page", "search_text", "count_logs",
+    "get_statistics", "get_storage_statistics",
+)
+_WRITE_METHODS = (
+    "store_log", "store_logs", "delete_log", "delete_logs_older_than", "delete_logs_matching",
+    "tag_logs_matching", "purge_orphaned_blobs",
+    "rebuild_rollups", "rebuild_search_index", "vacuum_database",
+)
+for _name in _READ_METHODS:
+    setattr(AsyncDatabaseManager, _name, _delegate(_name, writes=False))
+for _name in _WRITE_METHODS:
+    setattr(AsyncDatabaseManager, _name, _delegate(_name, writes=True))
@@ -33,8 +33,20 @@ renting space in a warehouse across town!
 import sqlite3
 import json
 import hashlib
+import base64
+import inspect
+import os
+import re
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Callable, Tuple, Iterable, Iterator, Sequence, Union
 from pathlib import Path
 import logging
 from dataclasses import dataclass, asdict
@@ -43,6 +55,372 @@ from enum import Enum
 logger = logging.getLogger(__name__)
 
 
+# ⚙️ CONNECTION TUNING - pragmas applied to every pooled connection
+# WAL lets readers keep reading while a writer appends, and NORMAL sync is
+# crash-safe under WAL (only a power cut can lose the last commits).
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,  # Read pages straight from the OS page cache
+    "cache_size": -64000,            # Negative means KiB, so ~64 MB per connection
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,            # Wait up to 5s for a lock instead of failing
+    "recursive_triggers": "ON",      # INSERT OR REPLACE fires delete triggers too
+}
+
+# 🧱 SQLITE VERSION - UPDATE/DELETE ... RETURNING (every write's generation
+# and set-based retention) and ALTER TABLE ... DROP COLUMN (the blob
+# migration) need 3.35+. Python links whatever SQLite the platform ships,
+# so this is checked when a DatabaseManager is created.
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+
+def require_sqlite_version(version: Tuple[int, ...]):
+    """🧱 Raise RuntimeError naming both versions when the linked SQLite is too old."""
+    if tuple(version) < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"Debuggle storage needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer, "
+            f"but Python is linked against SQLite {'.'.join(map(str, version))}. "
+            "Upgrade the system SQLite or use a Python build that bundles a newer one."
+        )
+
+
+# 📝 PREPARED STATEMENT CACHE - compiled SQL kept per connection
+DEFAULT_CACHED_STATEMENTS = 256
+
+# 📦 BULK WRITES - rows per executemany transaction in store_logs
+DEFAULT_BULK_BATCH_SIZE = 500
+
+# 🧹 SET-BASED RETENTION - rows per delete/tag transaction, so a big cleanup
+# holds the write lock briefly and other writers get a turn between chunks
+DEFAULT_RETENTION_CHUNK_SIZE = 1000
+
+# 🛑 QUERY CANCELLATION - SQLite calls a progress handler every N virtual
+# machine instructions; it aborts the statement ("interrupted") once the
+# running thread's cancel event is set (see cancellable()).
+CANCEL_CHECK_INSTRUCTIONS = 10_000
+_cancellation = threading.local()
+
+
+@contextmanager
+def cancellable(event: threading.Event):
+    """
+    🛑 MAKE THIS THREAD'S QUERIES STOPPABLE
+    
+    While the block runs, setting event aborts whatever SQLite statement
+    this thread is executing on any DatabaseManager connection: sqlite3
+    raises OperationalError("interrupted") and the transaction rolls back.
+    Used by AsyncDatabaseManager to honour timeouts and cancellation.
+    """
+    previous = getattr(_cancellation, "event", None)
+    _cancellation.event = event
+    try:
+        yield
+    finally:
+        _cancellation.event = previous
+
+
+def _query_cancelled() -> int:
+    """SQLite progress handler: non-zero aborts the running statement."""
+    event = getattr(_cancellation, "event", None)
+    return 1 if event is not None and event.is_set() else 0
+
+# 📈 ROLLUP TABLES - pre-aggregated counts kept current on every write
+# Each row counts logs per time bucket for one (dimension, value) pair, e.g.
+# ("2024-03-01 14", "severity", "error") -> 12. The "total" dimension has an
+# empty value and counts every log in the bucket. Inserts add a whole batch
+# with one grouped statement per table (_ADD_ROLLUP_COUNTS_SQL); deletes and
+# updates go through the per-row triggers below.
+_ROLLUP_TABLES = {
+    "log_rollup_hourly": "%Y-%m-%d %H",
+    "log_rollup_daily": "%Y-%m-%d",
+}
+ROLLUP_DIMENSIONS = ("total", "severity", "language", "tag", "project")
+
+
+def _rollup_dimension_rows(row: str) -> str:
+    """SELECT producing one (dimension, value) pair per rollup counter a log row touches."""
+    return f"""
+        SELECT 'total' AS dimension, '' AS value
+        UNION ALL SELECT 'severity', {row}.severity
+        UNION ALL SELECT 'language', {row}.language
+        UNION ALL SELECT 'project', {row}.project_name WHERE {row}.project_name IS NOT NULL
+        UNION ALL SELECT DISTINCT 'tag', CAST(tag.value AS TEXT)
+            FROM json_each(CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END) AS tag"""
+
+
+def _rollup_counts_sql(bucket_format: str, where: str = "true") -> str:
+    """SELECT of (bucket, dimension, value, count) for every rollup counter of the logs matching where."""
+    bucket = f"strftime('{bucket_format}', timestamp)"
+    return f"""
+        SELECT {bucket}, 'total', '', COUNT(*) FROM logs WHERE {where} GROUP BY 1
+        UNION ALL
+        SELECT {bucket}, 'severity', severity, COUNT(*) FROM logs WHERE {where} GROUP BY 1, 3
+        UNION ALL
+        SELECT {bucket}, 'language', language, COUNT(*) FROM logs WHERE {where} GROUP BY 1, 3
+        UNION ALL
+        SELECT {bucket}, 'project', project_name, COUNT(*) FROM logs
+            WHERE project_name IS NOT NULL AND {where} GROUP BY 1, 3
+        UNION ALL
+        SELECT {bucket}, 'tag', CAST(tag.value AS TEXT), COUNT(DISTINCT logs.rowid)
+            FROM logs, json_each(CASE WHEN json_valid(logs.tags) THEN logs.tags ELSE '[]' END) AS tag
+            WHERE {where} GROUP BY 1, 3"""
+
+
+# One grouped upsert per table for every row a write stamped with :generation
+_ADD_ROLLUP_COUNTS_SQL = [
+    f"""INSERT INTO {table} (bucket, dimension, value, count)
+        {_rollup_counts_sql(bucket_format, "logs.generation = :generation")}
+        ON CONFLICT (bucket, dimension, value) DO UPDATE SET count = count + excluded.count"""
+    for table, bucket_format in _ROLLUP_TABLES.items()
+]
+
+
+def _rollup_statements(row: str, delta: int) -> str:
+    """Trigger body statements adding delta to every rollup counter of NEW/OLD."""
+    statements = []
+    for table, bucket_format in _ROLLUP_TABLES.items():
+        bucket = f"strftime('{bucket_format}', {row}.timestamp)"
+        statements.append(f"""
+        INSERT INTO {table} (bucket, dimension, value, count)
+            SELECT {bucket}, dimension, value, {delta} FROM ({_rollup_dimension_rows(row)}) WHERE true
+            ON CONFLICT (bucket, dimension, value) DO UPDATE SET count = count + excluded.count;""")
+        if delta < 0:
+            statements.append(f"""
+        DELETE FROM {table} WHERE bucket = {bucket} AND count <= 0;""")
+    return "".join(statements)
+
+
+_ROLLUP_TRIGGERS = {
+    "logs_rollup_delete": f"AFTER DELETE ON logs BEGIN {_rollup_statements('OLD', -1)}\n        END",
+    "logs_rollup_update": (
+        "AFTER UPDATE OF timestamp, severity, language, tags, project_name ON logs BEGIN "
+        f"{_rollup_statements('OLD', -1)}{_rollup_statements('NEW', 1)}\n        END"
+    ),
+}
+
+# 🏷️ TAG TABLE - one row per (tag, log) so tag filters are exact index lookups
+# The JSON tags column stays the source of truth; triggers mirror it here.
+_INSERT_NEW_TAGS = (
+    "INSERT OR IGNORE INTO log_tags (tag, log_id) "
+    "SELECT DISTINCT CAST(value AS TEXT), NEW.log_id "
+    "FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END);"
+)
+_TAG_TRIGGERS = {
+    "logs_tags_insert": f"AFTER INSERT ON logs BEGIN {_INSERT_NEW_TAGS} END",
+    "logs_tags_delete": "AFTER DELETE ON logs BEGIN DELETE FROM log_tags WHERE log_id = OLD.log_id; END",
+    "logs_tags_update": (
+        "AFTER UPDATE OF log_id, tags ON logs BEGIN "
+        f"DELETE FROM log_tags WHERE log_id = OLD.log_id; {_INSERT_NEW_TAGS} END"
+    ),
+}
+
+
+def tag_filter_sql(tags: Sequence[str], column: str = "log_id") -> Tuple[str, List[str]]:
+    """
+    🏷️ "HAS ANY OF THESE TAGS" as SQL - exact, case-insensitive, index-backed
+    
+    Returns a condition like ``log_id IN (SELECT log_id FROM log_tags WHERE
+    tag IN (?, ?))`` plus its parameters, so "Error" no longer matches
+    "TypeError" the way the old LIKE filter did.
+    """
+    placeholders = ", ".join("?" for _ in tags)
+    return (
+        f"{column} IN (SELECT log_id FROM log_tags WHERE tag IN ({placeholders}))",
+        list(tags),
+    )
+
+
+# 🗜️ BODY STORE - each distinct original/processed text is stored once
+# log_blobs is keyed by the SHA-256 of the text; logs rows only hold blob ids.
+# A stack trace seen 10,000 times is one compressed blob with refcount 10,000.
+# Refcounts are kept by triggers on logs; blobs that drop to zero are removed
+# by purge_orphaned_blobs() (never inside a trigger, because the full-text
+# delete trigger still needs the old text at that point).
+BLOB_CODEC_RAW = "raw"
+BLOB_CODEC_ZLIB = "zlib"
+BLOB_COMPRESSION_LEVEL = 6
+BLOB_MIN_COMPRESS_BYTES = 64      # Shorter bodies are not worth a zlib header
+DEFAULT_BLOB_CACHE_SIZE = 1024    # Decoded bodies kept per manager, by digest
+_BLOB_COLUMNS = {"original_log": "original_blob_id", "processed_log": "processed_blob_id"}
+
+
+def _encode_body(raw: bytes) -> Tuple[str, bytes]:
+    """🗜️ (codec, data) for one UTF-8 body; compressed only when that makes it smaller."""
+    if len(raw) >= BLOB_MIN_COMPRESS_BYTES:
+        compressed = zlib.compress(raw, BLOB_COMPRESSION_LEVEL)
+        if len(compressed) < len(raw):
+            return BLOB_CODEC_ZLIB, compressed
+    return BLOB_CODEC_RAW, raw
+
+
+def _decode_body(codec: str, data: bytes) -> str:
+    """📖 Turn a stored blob back into text."""
+    if codec == BLOB_CODEC_ZLIB:
+        data = zlib.decompress(data)
+    elif codec != BLOB_CODEC_RAW:
+        raise ValueError(f"Unknown log body codec: {codec!r}")
+    return bytes(data).decode("utf-8")
+
+
+def _body_sql(blob_id: str) -> str:
+    """SQL expression for the decoded text of the blob whose id is blob_id."""
+    return f"(SELECT log_body(digest, codec, data) FROM log_blobs WHERE blob_id = {blob_id})"
+
+
+def _blob_refcount_statements(row: str, delta: int) -> str:
+    """Trigger body statements adding delta to the refcount of both blobs of NEW/OLD."""
+    # One UPDATE per column so a row whose two bodies are the same blob counts twice
+    return "".join(
+        f" UPDATE log_blobs SET refcount = refcount + ({delta}) WHERE blob_id = {row}.{column};"
+        for column in _BLOB_COLUMNS.values()
+    )
+
+
+_BLOB_TRIGGERS = {
+    "logs_blobs_insert": f"AFTER INSERT ON logs BEGIN{_blob_refcount_statements('NEW', 1)} END",
+    "logs_blobs_delete": f"AFTER DELETE ON logs BEGIN{_blob_refcount_statements('OLD', -1)} END",
+    "logs_blobs_update": (
+        f"AFTER UPDATE OF {', '.join(_BLOB_COLUMNS.values())} ON logs BEGIN"
+        f"{_blob_refcount_statements('OLD', -1)}{_blob_refcount_statements('NEW', 1)} END"
+    ),
+}
+
+# 🪟 READ VIEW - logs with their bodies joined back in, decoded on demand
+# log_body() is a Python function registered on every pooled connection, so
+# a body is only decompressed when a query actually outputs or tests it.
+# The joins are LEFT JOINs on the blob primary key, which SQLite drops
+# entirely from queries that never mention a body column. The full-text
+# triggers call log_body() too, so write to logs through DatabaseManager
+# connections rather than a bare sqlite3.connect().
+LOG_TEXT_VIEW = "logs_text"
+_LOG_TEXT_VIEW_SQL = f"""
+    CREATE VIEW IF NOT EXISTS {LOG_TEXT_VIEW} AS
+    SELECT logs.rowid AS log_rowid, logs.log_id, logs.timestamp,
+           log_body(original.digest, original.codec, original.data) AS original_log,
+           log_body(processed.digest, processed.codec, processed.data) AS processed_log,
+           logs.summary, logs.tags, logs.severity, logs.language, logs.metadata,
+           logs.project_name, logs.file_path, logs.source, logs.created_at, logs.search_terms
+    FROM logs
+    LEFT JOIN log_blobs AS original ON original.blob_id = logs.original_blob_id
+    LEFT JOIN log_blobs AS processed ON processed.blob_id = logs.processed_blob_id
+"""
+
+# 🗂️ SHARED SQL - identical strings let sqlite3 reuse its compiled statements
+_LOG_COLUMN_NAMES = (
+    "log_id", "timestamp", "original_log", "processed_log", "summary", "tags", "severity",
+    "language", "metadata", "project_name", "file_path", "source"
+)
+_LOG_COLUMNS = ", ".join(_LOG_COLUMN_NAMES)
+_QUALIFIED_LOG_COLUMNS = ", ".join(f"logs.{name}" for name in _LOG_COLUMN_NAMES)
+_STORED_LOG_COLUMNS = ", ".join(_BLOB_COLUMNS.get(name, name) for name in _LOG_COLUMN_NAMES)
+_INSERT_LOG_SQL = (
+    f"INSERT OR REPLACE INTO logs ({_STORED_LOG_COLUMNS}, search_terms, generation) "
+    f"VALUES ({', '.join('?' for _ in _LOG_COLUMN_NAMES)}, ?, ?)"
+)
+_NEXT_GENERATION_SQL = "UPDATE log_generation SET generation = generation + 1 RETURNING generation"
+# Reads go through the view, aliased so "logs.<column>" conditions still apply
+_FROM_LOGS_TEXT = f"FROM {LOG_TEXT_VIEW} AS logs"
+_SELECT_LOG_SQL = f"SELECT {_LOG_COLUMNS} {_FROM_LOGS_TEXT} WHERE log_id = ?"
+
+
+def decode_page_sql(page_sql: str, order_by: str, columns: Optional[Sequence[str]] = None) -> str:
+    """
+    🗜️ SORT FIRST, DECODE AFTER - full log rows for one page of rowids
+    
+    SQLite computes every selected column before it sorts, so sorting
+    straight from logs_text would decompress every matching body. Instead
+    page_sql selects just ``logs.log_rowid`` with its own ORDER BY and
+    LIMIT, and this wraps it so only those rows are decoded, returned in
+    order_by order. ``columns`` narrows the output to a projection; bodies
+    left out of it are not decoded at all.
+    """
+    selected = _QUALIFIED_LOG_COLUMNS if columns is None else ", ".join(f"logs.{name}" for name in columns)
+    return (
+        f"SELECT {selected} FROM ({page_sql}) AS page "
+        f"JOIN {LOG_TEXT_VIEW} AS logs ON logs.log_rowid = page.log_rowid {order_by}"
+    )
+
+
+# 🔎 FULL-TEXT INDEX - an FTS5 table that reads its text from the logs_text view
+# unicode61 splits on punctuation (snake_case -> snake, case; java.lang -> java,
+# lang) and porter folds word endings (connecting -> connect). CamelCase
+# identifiers stay whole, so their parts are stored separately in the hidden
+# logs.search_terms column: "NullPointerException" also indexes null/pointer/exception.
+FTS_TOKENIZER = "porter unicode61 remove_diacritics 2"
+_FTS_COLUMNS = ("original_log", "processed_log", "summary", "search_terms")
+_FTS_WEIGHTS = (1.0, 0.75, 1.5, 0.5)  # bm25 column weights (summary is the most curated text)
+_FTS_SNIPPET_COLUMNS = (0, 2, 1)      # Prefer snippets from the raw log, then summary
+_FTS_SNIPPET_TOKENS = 16
+HIGHLIGHT_START, HIGHLIGHT_END = "<mark>", "</mark>"
+
+
+def _fts_values(row: str) -> str:
+    return ", ".join(
+        _body_sql(f"{row}.{_BLOB_COLUMNS[column]}") if column in _BLOB_COLUMNS else f"{row}.{column}"
+        for column in _FTS_COLUMNS
+    )
+
+
+_FTS_SOURCE_COLUMNS = ", ".join(_BLOB_COLUMNS.get(column, column) for column in _FTS_COLUMNS)
+_FTS_TRIGGERS = {
+    "logs_fts_insert": (
+        f"AFTER INSERT ON logs BEGIN "
+        f"INSERT INTO logs_fts (rowid, {', '.join(_FTS_COLUMNS)}) VALUES (NEW.rowid, {_fts_values('NEW')}); "
+        f"END"
+    ),
+    "logs_fts_delete": (
+        f"AFTER DELETE ON logs BEGIN "
+        f"INSERT INTO logs_fts (logs_fts, rowid, {', '.join(_FTS_COLUMNS)}) VALUES ('delete', OLD.rowid, {_fts_values('OLD')}); "
+        f"END"
+    ),
+    "logs_fts_update": (
+        f"AFTER UPDATE OF {_FTS_SOURCE_COLUMNS} ON logs BEGIN "
+        f"INSERT INTO logs_fts (logs_fts, rowid, {', '.join(_FTS_COLUMNS)}) VALUES ('delete', OLD.rowid, {_fts_values('OLD')}); "
+        f"INSERT INTO logs_fts (rowid, {', '.join(_FTS_COLUMNS)}) VALUES (NEW.rowid, {_fts_values('NEW')}); "
+        f"END"
+    ),
+}
+
+_IDENTIFIER = re.compile(r"[A-Za-z][A-Za-z0-9]*")
+_IDENTIFIER_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_QUERY_WORD = re.compile(r"\w+")
+
+
+def identifier_terms(*texts: Optional[str]) -> str:
+    """
+    🧩 SPLITTING CAMELCASE NAMES - "NullPointerException" -> "null pointer exception"
+    
+    Returns the lower-cased parts of every mixed-case identifier in the
+    texts (each part once), for the search_terms column of the FTS index.
+    """
+    parts: Dict[str, None] = {}
+    for text in texts:
+        for word in _IDENTIFIER.findall(text or ""):
+            pieces = _IDENTIFIER_PART.findall(word)
+            if len(pieces) > 1:
+                for piece in pieces:
+                    parts[piece.lower()] = None
+    return " ".join(parts)
+
+
+def fts_match_query(text: str) -> Optional[str]:
+    """
+    🔤 TURNING USER TEXT INTO AN FTS5 QUERY
+    
+    Every whitespace-separated word becomes a quoted prefix phrase, and all
+    of them must match: ``snake_case NullPoint`` -> ``"snake case"* "NullPoint"*``.
+    Quoting means user input can never inject FTS operators. Returns None
+    when the text has nothing searchable in it.
+    """
+    phrases = []
+    for chunk in text.split():
+        words = _QUERY_WORD.findall(chunk)
+        if words:
+            phrases.append('"' + " ".join(words) + '"*')
+    return " ".join(phrases) or None
+
+
 class TierLevel(str, Enum):
     """🎯 DEBUGGLE TIER LEVELS - Feature Access Control"""
     FREE = "free"           # Basic error analysis, 7-day retention
@@ -184,6 +562,278 @@ class LogStats:
     last_updated: datetime               # When we calculated these statistics
 
 
+def _entry_to_row(log_entry: LogEntry, original_blob_id: int, processed_blob_id: int) -> Tuple:
+    """🔄 Convert a LogEntry (with its interned body ids) into parameters for _INSERT_LOG_SQL."""
+    return (
+        log_entry.log_id,
+        log_entry.timestamp,
+        original_blob_id,
+        processed_blob_id,
+        log_entry.summary,
+        json.dumps(log_entry.tags),  # Convert list to JSON string
+        log_entry.severity.value,
+        log_entry.language,
+        json.dumps(log_entry.metadata),  # Convert dict to JSON string
+        log_entry.project_name,
+        log_entry.file_path,
+        log_entry.source,
+        identifier_terms(log_entry.original_log, log_entry.processed_log, log_entry.summary)
+    )
+
+
+def _row_to_entry(row: Sequence[Any]) -> LogEntry:
+    """🔄 Rebuild a LogEntry from a row selected with _LOG_COLUMNS."""
+    return LogEntry(
+        log_id=row[0],
+        timestamp=datetime.fromisoformat(row[1]),
+        original_log=row[2],
+        processed_log=row[3],
+        summary=row[4],
+        tags=json.loads(row[5]) if row[5] else [],
+        severity=LogSeverity(row[6]),
+        language=row[7],
+        metadata=json.loads(row[8]) if row[8] else {},
+        project_name=row[9],
+        file_path=row[10],
+        source=row[11]
+    )
+
+
+# 🧪 LAZY FIELD PARSERS - run the first time a LogRow field is read
+_LOG_FIELD_PARSERS = {
+    "timestamp": datetime.fromisoformat,
+    "tags": lambda raw: json.loads(raw) if raw else [],
+    "severity": LogSeverity,
+    "metadata": lambda raw: json.loads(raw) if raw else {},
+}
+
+
+class LogRow:
+    """
+    🪶 A LIGHTWEIGHT RESULT ROW - only the columns you asked for
+    
+    Returned by search_logs, search_logs_page and iter_logs when they are
+    given ``columns``. Fields read like LogEntry attributes, but nothing is
+    converted up front: the timestamp, severity, tags and metadata are
+    parsed the first time they are read (then kept), and columns that were
+    not selected are never fetched at all - so a retention or counting scan
+    over thousands of rows never decompresses a log body or parses JSON it
+    does not look at.
+    
+    🏆 HIGH SCHOOL EXPLANATION:
+    Like asking the office for just the names and dates on a stack of
+    forms instead of photocopies of every page: quicker to hand over, and
+    you only read the boxes you need. Asking for a box that wasn't copied
+    (an unselected column) raises AttributeError.
+    """
+    
+    __slots__ = ("_index", "_values", "_parsed")
+    
+    def __init__(self, index: Dict[str, int], values: Sequence[Any]):
+        self._index = index     # column name -> position, shared by every row of a query
+        self._values = values   # the raw sqlite3 row
+        self._parsed: Optional[Dict[str, Any]] = None
+    
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """The columns this row holds."""
+        return tuple(self._index)
+    
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in self._index:
+            raise AttributeError(f"LogRow has no column {name!r} (selected: {', '.join(self._index)})")
+        raw = self._values[self._index[name]]
+        parser = _LOG_FIELD_PARSERS.get(name)
+        if parser is None:
+            return raw
+        if self._parsed is None:
+            self._parsed = {}
+        elif name in self._parsed:
+            return self._parsed[name]
+        value = self._parsed[name] = parser(raw)
+        return value
+    
+    def to_entry(self) -> LogEntry:
+        """🔄 The full LogEntry - every column must have been selected."""
+        return LogEntry(**{name: getattr(self, name) for name in _LOG_COLUMN_NAMES})
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={self._values[i]!r}" for name, i in self._index.items())
+        return f"LogRow({fields})"
+
+
+@lru_cache(maxsize=64)
+def _projection(columns: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+    """
+    📐 The columns to SELECT for a projection, and their positions
+    
+    log_id and timestamp always come first: cursors are built from them.
+    """
+    unknown = [name for name in columns if name not in _LOG_COLUMN_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown log columns: {', '.join(unknown)}")
+    selected = tuple(dict.fromkeys(("log_id", "timestamp") + columns))
+    return selected, {name: i for i, name in enumerate(selected)}
+
+
+def _rows_to_logs(rows: Sequence[Sequence[Any]],
+                  index: Optional[Dict[str, int]]) -> List[Union[LogEntry, LogRow]]:
+    """🔄 LogEntry objects for full rows, LogRow wrappers for projected ones."""
+    if index is None:
+        return [_row_to_entry(row) for row in rows]
+    return [LogRow(index, row) for row in rows]
+
+
+def _top_counts(counts: Dict[Any, int], limit: Optional[int] = 10) -> Dict[Any, int]:
+    """🏆 Return counts sorted from most to least common, optionally cut to the top N."""
+    ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+    return dict(ranked[:limit] if limit is not None else ranked)
+
+
+@dataclass
+class _StatisticsPart:
+    """🧾 Unranked statistics tallies from one database, ready to be added together."""
+    totals: Dict[str, Dict[str, int]]       # dimension -> value -> all-time count
+    errors_per_day: List[int]               # Last 7 days, oldest first
+    severity_trends: Dict[str, List[int]]   # severity -> last 7 days
+    logs_this_week: int
+    logs_this_month: int
+    hour_counts: Dict[int, int]
+    weekday_counts: Dict[int, int]
+    oldest: Optional[datetime]
+    newest: Optional[datetime]
+
+
+def _statistics_from_parts(parts: Sequence[_StatisticsPart], now: datetime) -> LogStats:
+    """📋 Add up the tallies of one or more databases and rank them into a LogStats."""
+    totals: Dict[str, Dict[str, int]] = {dimension: {} for dimension in ROLLUP_DIMENSIONS}
+    errors_per_day = [0] * 7
+    severity_trends = {severity.value: [0] * 7 for severity in LogSeverity}
+    hour_counts: Dict[int, int] = {}
+    weekday_counts: Dict[int, int] = {}
+    for part in parts:
+        for dimension, counts in part.totals.items():
+            for value, count in counts.items():
+                totals[dimension][value] = totals[dimension].get(value, 0) + count
+        for i, count in enumerate(part.errors_per_day):
+            errors_per_day[i] += count
+        for severity, trend in part.severity_trends.items():
+            for i, count in enumerate(trend):
+                severity_trends[severity][i] += count
+        for hour, count in part.hour_counts.items():
+            hour_counts[hour] = hour_counts.get(hour, 0) + count
+        for weekday, count in part.weekday_counts.items():
+            weekday_counts[weekday] = weekday_counts.get(weekday, 0) + count
+    
+    day_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+    oldest_dates = [part.oldest for part in parts if part.oldest]
+    newest_dates = [part.newest for part in parts if part.newest]
+    
+    # 📋 COMPILE THE FINAL REPORT
+    return LogStats(
+        total_logs=totals["total"].get("", 0),
+        logs_today=errors_per_day[-1],
+        logs_this_week=sum(part.logs_this_week for part in parts),
+        logs_this_month=sum(part.logs_this_month for part in parts),
+        top_error_types=_top_counts(totals["tag"]),
+        top_languages=_top_counts(totals["language"]),
+        top_severity_levels=_top_counts(totals["severity"]),
+        errors_per_day_last_week=errors_per_day,
+        severity_trends=severity_trends,
+        busiest_hours=_top_counts(hour_counts, limit=None),
+        busiest_days={
+            day_names[weekday]: count
+            for weekday, count in _top_counts(weekday_counts, limit=None).items()
+        },
+        oldest_log_date=min(oldest_dates) if oldest_dates else None,
+        newest_log_date=max(newest_dates) if newest_dates else None,
+        last_updated=now
+    )
+
+
+def _empty_statistics() -> LogStats:
+    """📭 The LogStats returned when statistics cannot be read."""
+    return LogStats(
+        total_logs=0,
+        logs_today=0,
+        logs_this_week=0,
+        logs_this_month=0,
+        top_error_types={},
+        top_languages={},
+        top_severity_levels={},
+        errors_per_day_last_week=[0] * 7,
+        severity_trends={},
+        busiest_hours={},
+        busiest_days={},
+        oldest_log_date=None,
+        newest_log_date=None,
+        last_updated=datetime.now()
+    )
+
+
+@dataclass
+class LogPage:
+    """
+    🔖 ONE PAGE OF RESULTS - plus the bookmark for the next page
+    
+    next_cursor is an opaque string to pass back to search_logs_page;
+    it is None on the last page.
+    """
+    logs: List[Union[LogEntry, LogRow]]  # LogRow when the search was given columns
+    next_cursor: Optional[str]
+
+
+def encode_cursor(timestamp: str, log_id: str) -> str:
+    """🔖 Pack a (stored timestamp, log_id) position into an opaque URL-safe token."""
+    raw = json.dumps([timestamp, log_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """🔖 Unpack a token from encode_cursor; raises ValueError if it is not one."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, log_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid search cursor: {cursor!r}") from e
+    if not isinstance(timestamp, str) or not isinstance(log_id, str):
+        raise ValueError(f"Invalid search cursor: {cursor!r}")
+    return timestamp, log_id
+
+
+@dataclass
+class LogChange:
+    """
+    📣 ONE COMMITTED WRITE - what change listeners are told
+    
+    generation counts the database's committed writes (1, 2, 3, ...), so a
+    listener that sees a number skipped knows it missed a change. stored
+    holds entries that were inserted or replaced; deleted_ids the ids of
+    logs that were removed.
+    
+    For a DatabaseManager the count is kept in the database file itself
+    (and every log row records the generation that wrote it), so it
+    carries on across restarts and writes through another manager on the
+    same file show up as a skipped number.
+    """
+    generation: int
+    stored: Sequence[LogEntry] = ()
+    deleted_ids: Sequence[str] = ()
+
+
+@dataclass
+class TextSearchHit:
+    """
+    🎯 ONE RANKED SEARCH RESULT
+    
+    The log itself, how well it matched (higher is better) and a short
+    excerpt with the matching words wrapped in <mark>...</mark>.
+    """
+    log: LogEntry
+    score: float
+    snippet: str
+
+
 class DatabaseManager:
     """
     🏛️ THE MASTER LIBRARIAN - Managing Our Digital Error Library!
@@ -208,7 +858,10 @@ class DatabaseManager:
     making sure data is stored safely and can be retrieved quickly!
     """
     
-    def __init__(self, database_path: str = "logs.db"):
+    def __init__(self, database_path: str = "logs.db",
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+                 blob_cache_size: int = DEFAULT_BLOB_CACHE_SIZE):
         """
         🏗️ SETTING UP OUR DIGITAL LIBRARY
         
@@ -221,11 +874,44 @@ class DatabaseManager:
         
         This makes sure everything is ready to start storing and
         organizing error logs efficiently!
+        
+        Args:
+            database_path: SQLite file to use
+            pragmas: Overrides merged on top of DEFAULT_PRAGMAS
+            cached_statements: Prepared statements kept per connection
+            blob_cache_size: Decoded log bodies kept in memory (0 disables)
+        
+        Raises RuntimeError when the linked SQLite is older than MIN_SQLITE_VERSION.
         """
+        require_sqlite_version(sqlite3.sqlite_version_info)
+        
         # 📍 LIBRARY LOCATION - where our database file will live
         # Like choosing the building address for our new library branch
         self.database_path = Path(database_path)
         
+        # 🔌 CONNECTION POOL - one long-lived connection per thread
+        # Like giving each librarian their own desk key instead of
+        # queueing at the front door every time they need a book
+        self.pragmas: Dict[str, Any] = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.cached_statements = cached_statements
+        self.journal_mode: Optional[str] = None
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self.fts_enabled = False  # Set once the FTS5 index is confirmed
+        
+        # 🗜️ DECODED BODY CACHE - keyed by content digest, so it can never go stale
+        self.blob_cache_size = blob_cache_size
+        self._blob_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._blob_cache_lock = threading.Lock()
+        
+        # 📣 CHANGE FEED - listeners hear about every committed write, in order
+        # (generation and database_id are read from the file once it is set up)
+        self.generation = 0
+        self.database_id = ""
+        self._change_listeners: List[Callable[[], Optional[Callable[[LogChange], None]]]] = []
+        self._change_lock = threading.RLock()
+        
         # 📚 SETUP THE LIBRARY - create database tables and structure
         # Like installing all the shelves, catalog systems, and organization tools
         self._initialize_database()
@@ -233,6 +919,156 @@ class DatabaseManager:
         # ✅ READY FOR BUSINESS - log that our library is open!
         logger.info(f"Database manager initialized with database at: {self.database_path}")
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        🔌 OPENING A TUNED CONNECTION
+        
+        Opens a new connection and applies our pragmas. journal_mode is
+        stored in the database file itself, so the first connection switches
+        the file to WAL and every later connection just confirms it.
+        """
+        busy_timeout_ms = self.pragmas.get("busy_timeout", DEFAULT_PRAGMAS["busy_timeout"])
+        conn = sqlite3.connect(
+            str(self.database_path),
+            timeout=busy_timeout_ms / 1000,
+            cached_statements=self.cached_statements,
+            # Each connection is only used by the thread that opened it;
+            # this just lets close() tidy up connections from any thread.
+            check_same_thread=False,
+        )
+        # The logs_text view and the full-text triggers decode bodies with this
+        conn.create_function("log_body", 3, self._read_body, deterministic=True)
+        conn.set_progress_handler(_query_cancelled, CANCEL_CHECK_INSTRUCTIONS)
+        for name, value in self.pragmas.items():
+            result = conn.execute(f"PRAGMA {name} = {value}").fetchone()
+            if name == "journal_mode" and result:
+                self.journal_mode = str(result[0]).lower()
+        
+        with self._pool_lock:
+            self._connections.append(conn)
+        return conn
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        🪑 THIS THREAD'S CONNECTION
+        
+        Returns the calling thread's pooled connection, opening it on first
+        use. A forked child never reuses its parent's connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = self._open_connection()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """
+        🔐 ONE UNIT OF WORK
+        
+        Yields this thread's pooled connection inside a transaction: the
+        work is committed when the block finishes and rolled back if it
+        raises. Use this instead of calling sqlite3.connect directly.
+        """
+        conn = self.get_connection()
+        with conn:
+            yield conn
+    
+    def close(self):
+        """
+        🔒 CLOSING TIME - release every pooled connection
+        
+        Threads that use the manager afterwards transparently open a
+        fresh connection.
+        """
+        with self._pool_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing pooled connection: {e}")
+    
+    def partitions(self, start_date: Optional[datetime] = None,
+                   end_date: Optional[datetime] = None,
+                   newest_first: bool = True) -> Iterator["DatabaseManager"]:
+        """
+        🗂️ THE DATABASES TO ASK - always just this one
+        
+        PartitionedDatabaseManager returns one manager per time period in
+        range; having the same method here lets SearchManager fan out over
+        either kind without caring which it was given.
+        """
+        return iter([self])
+    
+    def add_change_listener(self, listener: Callable[[LogChange], None]):
+        """
+        📣 SUBSCRIBE TO WRITES - listener(LogChange) after every commit
+        
+        Listeners run on the writing thread, one change at a time and in
+        commit order; an exception is logged and doesn't fail the write.
+        Bound methods are held weakly, so subscribing doesn't keep their
+        object alive. Writes made through another DatabaseManager (or
+        another process) on the same file are not reported, but the next
+        reported change skips their generations.
+        """
+        reference = weakref.WeakMethod(listener) if inspect.ismethod(listener) else (lambda: listener)
+        with self._change_lock:
+            self._change_listeners.append(reference)
+    
+    def remove_change_listener(self, listener: Callable[[LogChange], None]):
+        """📣 Unsubscribe a listener added with add_change_listener."""
+        with self._change_lock:
+            self._change_listeners = [
+                reference for reference in self._change_listeners if reference() != listener
+            ]
+    
+    def _publish(self, stored: Sequence[LogEntry] = (), deleted_ids: Sequence[str] = (),
+                 generation: Optional[int] = None):
+        """📣 Move to the write's generation (default: the next one) and tell every live listener."""
+        with self._change_lock:
+            self.generation = self.generation + 1 if generation is None else generation
+            change = LogChange(self.generation, stored, deleted_ids)
+            for reference in list(self._change_listeners):
+                listener = reference()
+                if listener is None:
+                    self._change_listeners.remove(reference)
+                    continue
+                try:
+                    listener(change)
+                except Exception as e:
+                    logger.error(f"Change listener {listener!r} failed on generation {change.generation}: {e}")
+    
+    def _read_body(self, digest: bytes, codec: str, data: bytes) -> Optional[str]:
+        """
+        📖 THE log_body() SQL FUNCTION - decode one stored body
+        
+        Only runs for rows a query actually outputs (or filters on text),
+        and repeated traces come straight from the digest-keyed cache.
+        """
+        if data is None:
+            return None
+        with self._blob_cache_lock:
+            text = self._blob_cache.get(digest)
+            if text is not None:
+                self._blob_cache.move_to_end(digest)
+                return text
+        text = _decode_body(codec, data)
+        self._remember_body(digest, text)
+        return text
+    
+    def _remember_body(self, digest: bytes, text: str):
+        """Put a decoded body in the LRU cache, evicting the oldest past blob_cache_size."""
+        if self.blob_cache_size <= 0:
+            return
+        with self._blob_cache_lock:
+            self._blob_cache[digest] = text
+            self._blob_cache.move_to_end(digest)
+            while len(self._blob_cache) > self.blob_cache_size:
+                self._blob_cache.popitem(last=False)
+    
     def _initialize_database(self):
         """
         🏗️ BUILDING THE LIBRARY INFRASTRUCTURE
@@ -245,15 +1081,15 @@ class DatabaseManager:
         
         We only need to do this once when the library first opens!
         """
-        with sqlite3.connect(self.database_path) as conn:
+        with self.connection() as conn:
             # 📋 CREATE THE MAIN CATALOG TABLE - where all log entries live
             # This is like designing the main filing system for our library
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS logs (
                     log_id TEXT PRIMARY KEY,
                     timestamp DATETIME NOT NULL,
-                    original_log TEXT NOT NULL,
-                    processed_log TEXT NOT NULL,
+                    original_blob_id INTEGER NOT NULL, -- log_blobs row holding the raw log
+                    processed_blob_id INTEGER NOT NULL, -- log_blobs row holding the cleaned log
                     summary TEXT,
                     tags TEXT, -- JSON array of strings
                     severity TEXT NOT NULL,
@@ -262,16 +1098,68 @@ class DatabaseManager:
                     project_name TEXT,
                     file_path TEXT,
                     source TEXT DEFAULT 'api',
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    search_terms TEXT, -- CamelCase parts for the full-text index
+                    generation INTEGER NOT NULL DEFAULT 0 -- log_generation of the write that stored it
+                )
+            ''')
+            
+            # 🔁 MIGRATION - databases created before the search_terms column
+            log_columns = {row[1] for row in conn.execute("PRAGMA table_info(logs)")}
+            if "search_terms" not in log_columns:
+                conn.execute("ALTER TABLE logs ADD COLUMN search_terms TEXT")
+                self._backfill_search_terms(conn)
+            if "generation" not in log_columns:
+                conn.execute("ALTER TABLE logs ADD COLUMN generation INTEGER NOT NULL DEFAULT 0")
+            
+            # 📣 WRITE COUNTER - the change feed's generation, kept with the data
+            # so indexes saved to disk can tell exactly which writes they are
+            # missing; database_id tells this file apart from any other
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS log_generation (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    database_id TEXT NOT NULL,
+                    generation INTEGER NOT NULL
+                )
+            ''')
+            conn.execute("INSERT OR IGNORE INTO log_generation VALUES (1, ?, 0)", (uuid.uuid4().hex,))
+            self.database_id, self.generation = conn.execute(
+                "SELECT database_id, generation FROM log_generation"
+            ).fetchone()
+            
+            # 🗜️ BODY STORE - one compressed copy of every distinct log text
+            # digest is UNIQUE, so "have we seen this trace?" is one index probe;
+            # the partial index finds unreferenced blobs without a table scan
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS log_blobs (
+                    blob_id INTEGER PRIMARY KEY,
+                    digest BLOB NOT NULL UNIQUE, -- SHA-256 of the UTF-8 text
+                    codec TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL, -- Uncompressed size in bytes
+                    refcount INTEGER NOT NULL DEFAULT 0
                 )
             ''')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_log_blobs_orphaned ON log_blobs(blob_id) WHERE refcount <= 0'
+            )
+            
+            # 🔁 MIGRATION - databases that still keep the text inline in logs
+            if "original_log" in log_columns:
+                self._migrate_bodies_to_blobs(conn)
+            for name, body in _BLOB_TRIGGERS.items():
+                conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+            conn.execute(_LOG_TEXT_VIEW_SQL)
             
             # 🗂️ CREATE PERFORMANCE INDEXES - make searching lightning fast
             # This is like creating a sophisticated cross-reference system
             # so librarians can find any book in seconds instead of hours
             
             # 📅 TIME-BASED INDEX - quickly find logs from specific dates
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON logs(timestamp)')
+            # (timestamp, log_id) is also the exact order cursor pagination walks;
+            # it replaces the older timestamp-only index
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_timestamp_log_id ON logs(timestamp, log_id)')
+            conn.execute('DROP INDEX IF EXISTS idx_timestamp')
             
             # 🏷️ TAG-BASED INDEX - quickly find logs with specific tags
             conn.execute('CREATE INDEX IF NOT EXISTS idx_severity ON logs(severity)')
@@ -285,11 +1173,267 @@ class DatabaseManager:
             # 🕒 CREATION TIME INDEX - for retention and cleanup operations
             conn.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON logs(created_at)')
             
+            # 📣 GENERATION INDEX - "what changed since generation N?"
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_generation ON logs(generation)')
+            
+            # 📈 ROLLUP TABLES - running tallies so statistics never scan the logs
+            # Like keeping a tally sheet next to each drawer instead of recounting
+            # every file whenever the principal asks for a report
+            for table in _ROLLUP_TABLES:
+                conn.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        bucket TEXT NOT NULL,
+                        dimension TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        count INTEGER NOT NULL,
+                        PRIMARY KEY (bucket, dimension, value)
+                    ) WITHOUT ROWID
+                ''')
+            for name, body in _ROLLUP_TRIGGERS.items():
+                conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+            # Inserts are counted per batch by _insert_entries now; older
+            # databases still carry the per-row insert trigger
+            conn.execute("DROP TRIGGER IF EXISTS logs_rollup_insert")
+            
+            # 🏷️ TAG LOOKUP TABLE - the index in the back of the book
+            # (tag, log_id) is the primary key, so "which logs have tag X?"
+            # is answered from the index alone; idx_log_tags_log_id serves deletes
+            tag_table_existed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'log_tags'"
+            ).fetchone() is not None
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS log_tags (
+                    tag TEXT NOT NULL COLLATE NOCASE,
+                    log_id TEXT NOT NULL,
+                    PRIMARY KEY (tag, log_id)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_log_tags_log_id ON log_tags(log_id)')
+            for name, body in _TAG_TRIGGERS.items():
+                conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+            
+            # 🔁 ONE-TIME MIGRATION - fill log_tags for databases that predate it
+            if not tag_table_existed:
+                self._rebuild_tag_table(conn)
+            
+            # 🔎 FULL-TEXT INDEX - the subject index at the back of the library
+            self.fts_enabled = self._initialize_fts(conn)
+            
+            # 🔁 ONE-TIME BACKFILL - databases created before rollups existed
+            rollups_empty = conn.execute("SELECT 1 FROM log_rollup_daily LIMIT 1").fetchone() is None
+            has_logs = conn.execute("SELECT 1 FROM logs LIMIT 1").fetchone() is not None
+            if rollups_empty and has_logs:
+                self._rebuild_rollups(conn)
+            
             # 💾 SAVE ALL CHANGES - make sure our library setup is permanent
             conn.commit()
             
         logger.info("Database schema initialized successfully")
     
+    def rebuild_rollups(self):
+        """
+        🔁 RECOUNT THE TALLY SHEETS
+        
+        Writes keep the rollups current, so this is only needed if rows were
+        changed behind DatabaseManager's back (or the rollups were damaged).
+        """
+        with self.connection() as conn:
+            self._rebuild_rollups(conn)
+    
+    def _rebuild_rollups(self, conn: sqlite3.Connection):
+        """Recompute every rollup table from the logs table in one pass each."""
+        for table, bucket_format in _ROLLUP_TABLES.items():
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"INSERT INTO {table} (bucket, dimension, value, count) {_rollup_counts_sql(bucket_format)}")
+        logger.info("Statistics rollups rebuilt from logs table")
+    
+    def _initialize_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        🔎 SETTING UP THE FULL-TEXT INDEX
+        
+        Creates the external-content FTS5 table (it stores only the index,
+        the text itself is read back through logs_text) plus the triggers that keep it in
+        sync. Returns False when this SQLite build has no FTS5, in which
+        case text search falls back to LIKE scans.
+        """
+        fts_existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs_fts'"
+        ).fetchone() is not None
+        try:
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+                    {', '.join(_FTS_COLUMNS)},
+                    content='{LOG_TEXT_VIEW}', content_rowid='log_rowid',
+                    tokenize='{FTS_TOKENIZER}'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, text search will scan with LIKE: {e}")
+            return False
+        
+        for name, body in _FTS_TRIGGERS.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        if not fts_existed:
+            # 🔁 ONE-TIME MIGRATION - index logs stored before the FTS table existed
+            conn.execute("INSERT INTO logs_fts (logs_fts) VALUES ('rebuild')")
+        return True
+    
+    def _migrate_bodies_to_blobs(self, conn: sqlite3.Connection):
+        """
+        🔁 ONE-TIME MIGRATION - move inline original/processed text into log_blobs
+        
+        Walks the table in rowid chunks, interns every body, points the row
+        at its blobs, sets the refcounts in one go and finally drops the old
+        text columns. The full-text index is dropped too and rebuilt over
+        the logs_text view by _initialize_fts.
+        """
+        for name in _FTS_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute("DROP TABLE IF EXISTS logs_fts")
+        
+        log_columns = {row[1] for row in conn.execute("PRAGMA table_info(logs)")}
+        for column in _BLOB_COLUMNS.values():
+            if column not in log_columns:
+                conn.execute(f"ALTER TABLE logs ADD COLUMN {column} INTEGER")
+        
+        refcounts: Dict[int, int] = {}
+        migrated = 0
+        last_rowid = None
+        while True:
+            rows = conn.execute(
+                "SELECT rowid, original_log, processed_log FROM logs "
+                "WHERE rowid > COALESCE(?, -9223372036854775808) ORDER BY rowid LIMIT ?",
+                (last_rowid, DEFAULT_BULK_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            blob_ids = self._intern_bodies(conn, [text for row in rows for text in row[1:]])
+            updates = []
+            for rowid, original, processed in rows:
+                original_id, processed_id = blob_ids[original], blob_ids[processed]
+                refcounts[original_id] = refcounts.get(original_id, 0) + 1
+                refcounts[processed_id] = refcounts.get(processed_id, 0) + 1
+                updates.append((original_id, processed_id, rowid))
+            conn.executemany(
+                f"UPDATE logs SET {' = ?, '.join(_BLOB_COLUMNS.values())} = ? WHERE rowid = ?", updates
+            )
+            migrated += len(rows)
+            last_rowid = rows[-1][0]
+        
+        conn.executemany(
+            "UPDATE log_blobs SET refcount = refcount + ? WHERE blob_id = ?",
+            [(count, blob_id) for blob_id, count in refcounts.items()]
+        )
+        for column in _BLOB_COLUMNS:
+            conn.execute(f"ALTER TABLE logs DROP COLUMN {column}")
+        logger.info(f"Moved the bodies of {migrated} logs into {len(refcounts)} shared blobs")
+    
+    def _intern_bodies(self, conn: sqlite3.Connection, texts: Iterable[str]) -> Dict[str, int]:
+        """
+        🗜️ FIND OR ADD A BLOB FOR EACH TEXT - returns {text: blob_id}
+        
+        Known texts cost one digest lookup and are never recompressed. New
+        blobs start at refcount 0; the logs insert trigger counts the
+        reference, all inside the caller's transaction.
+        """
+        blob_ids: Dict[str, int] = {}
+        for text in texts:
+            if text in blob_ids:
+                continue
+            raw = text.encode("utf-8")
+            digest = hashlib.sha256(raw).digest()
+            row = conn.execute("SELECT blob_id FROM log_blobs WHERE digest = ?", (digest,)).fetchone()
+            if row is None:
+                codec, data = _encode_body(raw)
+                row = (conn.execute(
+                    "INSERT INTO log_blobs (digest, codec, data, size) VALUES (?, ?, ?, ?)",
+                    (digest, codec, data, len(raw))
+                ).lastrowid,)
+                # The full-text trigger reads this body back straight away
+                self._remember_body(digest, text)
+            blob_ids[text] = row[0]
+        return blob_ids
+    
+    def purge_orphaned_blobs(self) -> int:
+        """
+        🧹 DROP BODIES NO LOG POINTS AT ANY MORE
+        
+        Deleting logs only lowers refcounts; this removes the blobs that
+        reached zero. delete_logs_older_than and vacuum_database call it,
+        so it is only needed after deleting logs some other way.
+        Returns the number of blobs removed.
+        """
+        try:
+            with self.connection() as conn:
+                return self._purge_orphaned_blobs(conn)
+        except Exception as e:
+            logger.error(f"Failed to purge orphaned log bodies: {e}")
+            return 0
+    
+    def _purge_orphaned_blobs(self, conn: sqlite3.Connection) -> int:
+        return conn.execute("DELETE FROM log_blobs WHERE refcount <= 0").rowcount
+    
+    def get_storage_statistics(self) -> Dict[str, int]:
+        """
+        📦 HOW MUCH ARE WE SAVING? - body store totals
+        
+        references is how many log bodies point into the store,
+        original_bytes what the distinct bodies would take uncompressed,
+        and stored_bytes what they actually take.
+        """
+        try:
+            with self.connection() as conn:
+                blobs, references, original_bytes, stored_bytes = conn.execute('''
+                    SELECT COUNT(*), COALESCE(SUM(refcount), 0),
+                           COALESCE(SUM(size), 0), COALESCE(SUM(length(data)), 0)
+                    FROM log_blobs
+                ''').fetchone()
+            return {
+                "blobs": blobs,
+                "references": references,
+                "original_bytes": original_bytes,
+                "stored_bytes": stored_bytes,
+            }
+        except Exception as e:
+            logger.error(f"Failed to read storage statistics: {e}")
+            return {"blobs": 0, "references": 0, "original_bytes": 0, "stored_bytes": 0}
+    
+    def _backfill_search_terms(self, conn: sqlite3.Connection):
+        """Fill logs.search_terms for rows written before the column existed."""
+        rows = conn.execute(
+            "SELECT rowid, original_log, processed_log, summary FROM logs WHERE search_terms IS NULL"
+        ).fetchall()
+        conn.executemany(
+            "UPDATE logs SET search_terms = ? WHERE rowid = ?",
+            [(identifier_terms(original, processed, summary), rowid)
+             for rowid, original, processed, summary in rows]
+        )
+        if rows:
+            logger.info(f"Backfilled search terms for {len(rows)} logs")
+    
+    def rebuild_search_index(self):
+        """
+        🔁 REBUILD THE FULL-TEXT INDEX from the logs table
+        
+        Only needed if logs were changed by a connection that bypassed the
+        triggers (for example INSERT OR REPLACE with recursive_triggers off).
+        """
+        if not self.fts_enabled:
+            return
+        with self.connection() as conn:
+            conn.execute("INSERT INTO logs_fts (logs_fts) VALUES ('rebuild')")
+    
+    def _rebuild_tag_table(self, conn: sqlite3.Connection):
+        """Repopulate log_tags from the JSON tags column of every log."""
+        conn.execute("DELETE FROM log_tags")
+        cursor = conn.execute('''
+            INSERT OR IGNORE INTO log_tags (tag, log_id)
+            SELECT DISTINCT CAST(tag.value AS TEXT), logs.log_id
+            FROM logs, json_each(CASE WHEN json_valid(logs.tags) THEN logs.tags ELSE '[]' END) AS tag
+        ''')
+        if cursor.rowcount:
+            logger.info(f"Migrated {cursor.rowcount} tag links into log_tags")
+    
     def store_log(self, log_entry: LogEntry) -> bool:
         """
         📚 FILING A NEW ERROR REPORT - Adding to Our Library Collection!
@@ -310,32 +1454,11 @@ class DatabaseManager:
         Returns True if successfully stored, False if something went wrong.
         """
         try:
-            with sqlite3.connect(self.database_path) as conn:
-                # 📝 PREPARE THE FILING DATA - convert our LogEntry to database format
-                # Like transcribing information from a handwritten form to a computer system
-                conn.execute('''
-                    INSERT OR REPLACE INTO logs (
-                        log_id, timestamp, original_log, processed_log, summary,
-                        tags, severity, language, metadata, project_name, 
-                        file_path, source
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    log_entry.log_id,
-                    log_entry.timestamp,
-                    log_entry.original_log,
-                    log_entry.processed_log,
-                    log_entry.summary,
-                    json.dumps(log_entry.tags),  # Convert list to JSON string
-                    log_entry.severity.value,
-                    log_entry.language,
-                    json.dumps(log_entry.metadata),  # Convert dict to JSON string
-                    log_entry.project_name,
-                    log_entry.file_path,
-                    log_entry.source
-                ))
-                
-                # 💾 COMMIT THE TRANSACTION - make the storage permanent
-                conn.commit()
+            with self._change_lock:
+                with self.connection() as conn:
+                    # 📝 FILE IT - the transaction commits when the block ends
+                    generation = self._insert_entries(conn, [log_entry])
+                self._publish(stored=[log_entry], generation=generation)
                 
             # ✅ SUCCESS! - log that we successfully filed this document
             logger.debug(f"Successfully stored log entry: {log_entry.log_id}")
@@ -346,6 +1469,91 @@ class DatabaseManager:
             logger.error(f"Failed to store log entry {log_entry.log_id}: {e}")
             return False
     
+    def store_logs(self, entries: Iterable[LogEntry],
+                   batch_size: int = DEFAULT_BULK_BATCH_SIZE) -> int:
+        """
+        📦 FILING A WHOLE STACK AT ONCE - Bulk Storage!
+        
+        store_log commits (and fsyncs) once per entry, which caps ingestion
+        at a few hundred logs per second. This files entries in batches:
+        each batch is a single executemany inside one transaction.
+        
+        🏆 HIGH SCHOOL EXPLANATION:
+        Like walking a full box of forms to the filing room instead of
+        making a separate trip for every single sheet of paper.
+        
+        If a batch fails it is rolled back as a whole and we stop there, so
+        the return value is exactly the number of entries that were stored.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        stored = 0
+        batch: List[LogEntry] = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                if not self._store_batch(batch):
+                    return stored
+                stored += len(batch)
+                batch = []
+        
+        if batch and self._store_batch(batch):
+            stored += len(batch)
+        return stored
+    
+    def _store_batch(self, batch: Sequence[LogEntry]) -> bool:
+        """💾 Store one batch in a single transaction; False if it was rolled back."""
+        try:
+            with self._change_lock:
+                with self.connection() as conn:
+                    generation = self._insert_entries(conn, batch)
+                self._publish(stored=batch, generation=generation)
+            logger.debug(f"Bulk stored {len(batch)} log entries")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to bulk store {len(batch)} log entries "
+                         f"(first id {batch[0].log_id}): {e}")
+            return False
+    
+    def _insert_entries(self, conn: sqlite3.Connection, entries: Sequence[LogEntry]) -> int:
+        """
+        📝 THE ONE WRITE PATH - every insert goes through here
+        
+        Runs inside the caller's transaction so single and bulk writes
+        share exactly the same SQL (and the same cached statement). Bodies
+        are interned first, so the rows only carry blob ids. Returns the
+        write's generation, which every inserted row is stamped with - the
+        rollups then count the whole write with one grouped upsert per table.
+        
+        An id repeated within the write is stored once, as its last entry,
+        which is what a run of INSERT OR REPLACEs would leave behind. (The
+        earlier copies would otherwise be "deleted" from rollups that never
+        counted them.)
+        """
+        last = {entry.log_id: position for position, entry in enumerate(entries)}
+        entries = [entry for position, entry in enumerate(entries) if last[entry.log_id] == position]
+        blob_ids = self._intern_bodies(
+            conn, [text for entry in entries for text in (entry.original_log, entry.processed_log)]
+        )
+        generation = self._next_generation(conn)
+        conn.executemany(_INSERT_LOG_SQL, [
+            (*_entry_to_row(entry, blob_ids[entry.original_log], blob_ids[entry.processed_log]), generation)
+            for entry in entries
+        ])
+        for statement in _ADD_ROLLUP_COUNTS_SQL:
+            conn.execute(statement, {"generation": generation})
+        return generation
+    
+    def _next_generation(self, conn: sqlite3.Connection) -> int:
+        """📣 Count one more write in log_generation (rolled back with the caller's transaction)."""
+        return conn.execute(_NEXT_GENERATION_SQL).fetchone()[0]
+    
+    def create_write_buffer(self, max_size: int = DEFAULT_BULK_BATCH_SIZE,
+                            max_delay_seconds: float = 1.0) -> "LogWriteBuffer":
+        """🚚 Build a write-behind buffer that feeds store_logs (see LogWriteBuffer)."""
+        return LogWriteBuffer(self, max_size=max_size, max_delay_seconds=max_delay_seconds)
+    
     def get_log(self, log_id: str) -> Optional[LogEntry]:
         """
         🔍 FINDING A SPECIFIC ERROR REPORT - Library Lookup Service!
@@ -365,15 +1573,9 @@ class DatabaseManager:
         Returns the complete LogEntry if found, or None if it doesn't exist.
         """
         try:
-            with sqlite3.connect(self.database_path) as conn:
+            with self.connection() as conn:
                 # 🎯 PRECISE SEARCH - look for exactly this log_id
-                cursor = conn.execute('''
-                    SELECT log_id, timestamp, original_log, processed_log, summary,
-                           tags, severity, language, metadata, project_name, 
-                           file_path, source
-                    FROM logs 
-                    WHERE log_id = ?
-                ''', (log_id,))
+                cursor = conn.execute(_SELECT_LOG_SQL, (log_id,))
                 
                 # 📋 GET THE RESULTS - did we find anything?
                 row = cursor.fetchone()
@@ -381,20 +1583,7 @@ class DatabaseManager:
                 if row:
                     # 🔄 CONVERT BACK TO LOGENTRY - reconstruct the original object
                     # Like taking the filed paperwork and putting it back in the original format
-                    return LogEntry(
-                        log_id=row[0],
-                        timestamp=datetime.fromisoformat(row[1]),
-                        original_log=row[2],
-                        processed_log=row[3],
-                        summary=row[4],
-                        tags=json.loads(row[5]) if row[5] else [],
-                        severity=LogSeverity(row[6]),
-                        language=row[7],
-                        metadata=json.loads(row[8]) if row[8] else {},
-                        project_name=row[9],
-                        file_path=row[10],
-                        source=row[11]
-                    )
+                    return _row_to_entry(row)
                 else:
                     # 📭 NOT FOUND - no log with this ID exists
                     return None
@@ -404,6 +1593,21 @@ class DatabaseManager:
             logger.error(f"Failed to retrieve log {log_id}: {e}")
             return None
     
+    def delete_log(self, log_id: str) -> bool:
+        """🗑️ Delete one log by id; True if it existed. Its bodies are released too."""
+        try:
+            with self._change_lock:
+                with self.connection() as conn:
+                    deleted = conn.execute("DELETE FROM logs WHERE log_id = ?", (log_id,)).rowcount
+                    self._purge_orphaned_blobs(conn)
+                    generation = self._next_generation(conn) if deleted else None
+                if deleted:
+                    self._publish(deleted_ids=[log_id], generation=generation)
+            return deleted > 0
+        except Exception as e:
+            logger.error(f"Failed to delete log {log_id}: {e}")
+            return False
+    
     def search_logs(
         self, 
         start_date: Optional[datetime] = None,
@@ -414,8 +1618,9 @@ class DatabaseManager:
         project_name: Optional[str] = None,
         text_search: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> List[LogEntry]:
+        offset: int = 0,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Union[LogEntry, LogRow]]:
         """
         🔍 ADVANCED LIBRARY SEARCH - Finding Multiple Related Documents!
         
@@ -435,86 +1640,468 @@ class DatabaseManager:
         - Return only the first 20 results (limit/offset)
         
         This is much more powerful than looking up one specific record!
+        
+        Pass ``columns`` (e.g. ``["severity", "tags"]``) when you only need a
+        few fields: the results are then LogRow objects holding just those
+        columns plus log_id and timestamp, parsed lazily on access.
         """
+        selected, index = _projection(tuple(columns)) if columns is not None else (None, None)
         try:
-            with sqlite3.connect(self.database_path) as conn:
+            with self.connection() as conn:
                 # 🏗️ BUILD THE SEARCH QUERY - construct our library search
                 # Like building a complex question for the library catalog system
+                conditions, params = self._search_conditions(
+                    start_date, end_date, severity, language, tags, project_name, text_search
+                )
                 
-                query = "SELECT log_id, timestamp, original_log, processed_log, summary, tags, severity, language, metadata, project_name, file_path, source FROM logs WHERE 1=1"
-                params = []
-                
-                # 📅 DATE RANGE FILTER - "show me only logs from this time period"
-                if start_date:
-                    query += " AND timestamp >= ?"
-                    params.append(start_date)
-                if end_date:
-                    query += " AND timestamp <= ?"
-                    params.append(end_date)
-                
-                # 🌡️ SEVERITY FILTER - "show me only critical errors"
-                if severity:
-                    query += " AND severity = ?"
-                    params.append(severity.value)
-                
-                # 💻 LANGUAGE FILTER - "show me only Python errors"
-                if language:
-                    query += " AND language = ?"
-                    params.append(language)
-                
-                # 📁 PROJECT FILTER - "show me only errors from this project"
-                if project_name:
-                    query += " AND project_name = ?"
-                    params.append(project_name)
-                
-                # 🔍 TEXT SEARCH - "show me logs containing this text"
-                if text_search:
-                    query += " AND (original_log LIKE ? OR processed_log LIKE ? OR summary LIKE ?)"
-                    search_term = f"%{text_search}%"
-                    params.extend([search_term, search_term, search_term])
-                
-                # 🏷️ TAG SEARCH - "show me logs with any of these tags"
-                if tags:
-                    tag_conditions = []
-                    for tag in tags:
-                        tag_conditions.append("tags LIKE ?")
-                        params.append(f"%{tag}%")
-                    query += f" AND ({' OR '.join(tag_conditions)})"
-                
-                # 📊 SORT AND LIMIT - organize results and don't return too many
-                query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
-                
-                # 🎯 EXECUTE THE SEARCH - run our complex query
-                cursor = conn.execute(query, params)
-                rows = cursor.fetchall()
-                
-                # 🔄 CONVERT RESULTS - turn database rows back into LogEntry objects
-                results = []
-                for row in rows:
-                    log_entry = LogEntry(
-                        log_id=row[0],
-                        timestamp=datetime.fromisoformat(row[1]),
-                        original_log=row[2],
-                        processed_log=row[3],
-                        summary=row[4],
-                        tags=json.loads(row[5]) if row[5] else [],
-                        severity=LogSeverity(row[6]),
-                        language=row[7],
-                        metadata=json.loads(row[8]) if row[8] else {},
-                        project_name=row[9],
-                        file_path=row[10],
-                        source=row[11]
-                    )
-                    results.append(log_entry)
-                
-                return results
+                # 🎯 EXECUTE THE SEARCH and turn rows back into LogEntry objects
+                rows = self._select_newest_first(conn, conditions, params, limit,
+                                                 offset=offset, columns=selected)
+                return _rows_to_logs(rows, index)
                 
         except Exception as e:
             # ❌ SEARCH ERROR - something went wrong during the complex search
             logger.error(f"Failed to search logs: {e}")
             return []
     
+    def search_logs_page(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        severity: Optional[LogSeverity] = None,
+        language: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        project_name: Optional[str] = None,
+        text_search: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> "LogPage":
+        """
+        🔖 BOOKMARKED PAGING - "Continue From Where I Left Off"
+        
+        Same filters as search_logs, but instead of "skip the first 5,000
+        results" (which makes the database walk past all 5,000 every time)
+        each page hands back a bookmark. Passing it as cursor jumps straight
+        to the next result through idx_timestamp_log_id, so page 500 is as
+        fast as page 1 - and logs arriving meanwhile never shift the pages.
+        
+        Results are newest first, ordered by (timestamp, log_id). Raises
+        ValueError for a cursor that was not produced by this method.
+        ``columns`` works as in search_logs.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        selected, index = _projection(tuple(columns)) if columns is not None else (None, None)
+        try:
+            with self.connection() as conn:
+                conditions, params = self._search_conditions(
+                    start_date, end_date, severity, language, tags, project_name, text_search
+                )
+                # One extra row tells us whether another page exists
+                rows = self._select_newest_first(conn, conditions, params, limit + 1,
+                                                 after=after, columns=selected)
+        except Exception as e:
+            logger.error(f"Failed to fetch log page: {e}")
+            return LogPage(logs=[], next_cursor=None)
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
+        return LogPage(logs=_rows_to_logs(rows, index), next_cursor=next_cursor)
+    
+    def iter_logs(self, batch_size: int = 1000, **filters: Any) -> Iterator[Union[LogEntry, LogRow]]:
+        """
+        🚶 WALKING THE WHOLE COLLECTION - newest first, one batch at a time
+        
+        Keyset-paginated generator for full-table jobs such as rebuilding
+        search indexes. Accepts the search_logs_page filters (and columns)
+        as keywords.
+        """
+        cursor = None
+        while True:
+            page = self.search_logs_page(limit=batch_size, cursor=cursor, **filters)
+            yield from page.logs
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+    
+    def iter_logs_changed_since(self, generation: int, batch_size: int = 1000,
+                                columns: Optional[Sequence[str]] = None) -> Iterator[Union[LogEntry, LogRow]]:
+        """
+        📣 CATCHING UP - every log stored or replaced after ``generation``
+        
+        Walks idx_generation in batches (keyset on rowid), so the cost
+        follows the number of changed logs rather than the size of the
+        table. Deletions leave no row behind and are not reported.
+        ``columns`` works as in search_logs.
+        """
+        selected, index = _projection(tuple(columns)) if columns is not None else (None, None)
+        order_by = "ORDER BY logs.log_rowid"
+        page_sql = (
+            "SELECT rowid AS log_rowid FROM logs WHERE generation > ? AND rowid > ? "
+            "ORDER BY rowid LIMIT ?"
+        )
+        after = 0
+        while True:
+            with self.connection() as conn:
+                rows = conn.execute(
+                    decode_page_sql(page_sql, order_by, (selected or _LOG_COLUMN_NAMES) + ("log_rowid",)),
+                    (generation, after, batch_size)
+                ).fetchall()
+            yield from _rows_to_logs([row[:-1] for row in rows], index)
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][-1]
+    
+    def _search_conditions(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        severity: Optional[LogSeverity],
+        language: Optional[str],
+        tags: Optional[List[str]],
+        project_name: Optional[str],
+        text_search: Optional[str]
+    ) -> Tuple[List[str], List[Any]]:
+        """🧰 All search_logs filters, including text search, as WHERE conditions."""
+        conditions, params = self._filter_conditions(
+            start_date, end_date, severity, language, tags, project_name
+        )
+        
+        # 🔍 TEXT SEARCH - "show me logs containing this text"
+        # Answered by the full-text index instead of scanning every log
+        if text_search:
+            condition, text_params = self._text_condition(text_search)
+            conditions.append(condition)
+            params.extend(text_params)
+        return conditions, params
+    
+    def _select_newest_first(
+        self,
+        conn: sqlite3.Connection,
+        conditions: List[str],
+        params: List[Any],
+        limit: int,
+        offset: int = 0,
+        after: Optional[Tuple[str, str]] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Tuple]:
+        """
+        📊 SORT AND LIMIT - newest first, log_id breaking timestamp ties
+        
+        ``after`` is a decoded cursor: only rows strictly after that
+        (timestamp, log_id) position in the ordering are returned.
+        ``columns`` selects a projection instead of every log column.
+        """
+        conditions = list(conditions)
+        params = list(params)
+        if after is not None:
+            conditions.append("(logs.timestamp, logs.log_id) < (?, ?)")
+            params.extend(after)
+        
+        order_by = "ORDER BY logs.timestamp DESC, logs.log_id DESC"
+        page_sql = (
+            f"SELECT logs.log_rowid {_FROM_LOGS_TEXT} WHERE {' AND '.join(conditions) or '1=1'} "
+            f"{order_by} LIMIT ? OFFSET ?"
+        )
+        return conn.execute(decode_page_sql(page_sql, order_by, columns), params + [limit, offset]).fetchall()
+    
+    def search_text(
+        self,
+        text: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        severity: Optional[LogSeverity] = None,
+        language: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        project_name: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List["TextSearchHit"]:
+        """
+        🎯 RANKED FULL-TEXT SEARCH - Best Matches First, With Highlights!
+        
+        Like asking the librarian "which books are MOST about this topic?"
+        instead of "which books mention it?". Results are ordered by BM25
+        relevance (rare words and short, focused logs score higher) and each
+        hit carries a snippet with the matching words wrapped in <mark> tags.
+        
+        Takes the same filters as search_logs. Without FTS5 the hits come
+        back newest-first with a score of 0.
+        """
+        match_query = fts_match_query(text) if self.fts_enabled else None
+        conditions, params = self._filter_conditions(
+            start_date, end_date, severity, language, tags, project_name
+        )
+        
+        try:
+            with self.connection() as conn:
+                if match_query is None:
+                    if self.fts_enabled:
+                        return []  # Nothing searchable in the text
+                    condition, text_params = self._text_condition(text)
+                    rows = self._select_newest_first(conn, conditions + [condition], params + text_params,
+                                                     limit, offset=offset)
+                    return [TextSearchHit(log=_row_to_entry(row), score=0.0, snippet="") for row in rows]
+                
+                weights = ", ".join(str(weight) for weight in _FTS_WEIGHTS)
+                snippets = ", ".join(
+                    f"snippet(logs_fts, {column}, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '...', {_FTS_SNIPPET_TOKENS})"
+                    for column in _FTS_SNIPPET_COLUMNS
+                )
+                where = " AND ".join(["logs_fts MATCH ?"] + conditions)
+                # Rank and cut to the page first, then decode bodies and build
+                # snippets for that page only. CROSS JOIN keeps logs_fts as the
+                # outer loop, so the MATCH runs once rather than once per page row.
+                query = f"""
+                    SELECT {_QUALIFIED_LOG_COLUMNS}, page.rank, {snippets}
+                    FROM logs_fts
+                    CROSS JOIN (
+                        SELECT logs.log_rowid, logs.timestamp, bm25(logs_fts, {weights}) AS rank
+                        FROM logs_fts JOIN {LOG_TEXT_VIEW} AS logs ON logs.log_rowid = logs_fts.rowid
+                        WHERE {where}
+                        ORDER BY rank, logs.timestamp DESC
+                        LIMIT ? OFFSET ?
+                    ) AS page ON page.log_rowid = logs_fts.rowid
+                    JOIN {LOG_TEXT_VIEW} AS logs ON logs.log_rowid = page.log_rowid
+                    WHERE logs_fts MATCH ?
+                    ORDER BY page.rank, page.timestamp DESC
+                """
+                hits = []
+                for row in conn.execute(query, [match_query] + params + [limit, offset, match_query]):
+                    column_count = len(_LOG_COLUMN_NAMES)
+                    candidates = row[column_count + 1:]
+                    snippet = next((c for c in candidates if c and HIGHLIGHT_START in c), candidates[0] or "")
+                    hits.append(TextSearchHit(
+                        log=_row_to_entry(row[:column_count]),
+                        score=-row[column_count],  # bm25 is negative; flip so higher is better
+                        snippet=snippet
+                    ))
+                return hits
+        except Exception as e:
+            logger.error(f"Failed to run text search for {text!r}: {e}")
+            return []
+    
+    def _filter_conditions(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        severity: Optional[LogSeverity],
+        language: Optional[str],
+        tags: Optional[List[str]],
+        project_name: Optional[str]
+    ) -> Tuple[List[str], List[Any]]:
+        """🧰 Build the WHERE conditions shared by search_logs and search_text."""
+        conditions: List[str] = []
+        params: List[Any] = []
+        
+        # 📅 DATE RANGE FILTER - "show me only logs from this time period"
+        if start_date:
+            conditions.append("logs.timestamp >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("logs.timestamp <= ?")
+            params.append(end_date)
+        
+        # 🌡️ SEVERITY / 💻 LANGUAGE / 📁 PROJECT FILTERS
+        if severity:
+            conditions.append("logs.severity = ?")
+            params.append(severity.value)
+        if language:
+            conditions.append("logs.language = ?")
+            params.append(language)
+        if project_name:
+            conditions.append("logs.project_name = ?")
+            params.append(project_name)
+        
+        # 🏷️ TAG SEARCH - exact tag matches through the log_tags index
+        if tags:
+            tag_condition, tag_params = tag_filter_sql(tags, column="logs.log_id")
+            conditions.append(tag_condition)
+            params.extend(tag_params)
+        
+        return conditions, params
+    
+    def _text_condition(self, text: str) -> Tuple[str, List[Any]]:
+        """🔍 A WHERE condition for "contains this text": FTS5 MATCH, or LIKE without FTS5."""
+        match_query = fts_match_query(text) if self.fts_enabled else None
+        if match_query is not None:
+            return "logs.log_rowid IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)", [match_query]
+        if self.fts_enabled:
+            return "0", []  # Only punctuation - nothing can match
+        
+        search_term = f"%{text}%"
+        return (
+            "(logs.original_log LIKE ? OR logs.processed_log LIKE ? OR logs.summary LIKE ?)",
+            [search_term] * 3,
+        )
+    
+    def count_logs(
+        self,
+        start_date: Optional[datetime] = None,
+        severities: Optional[Sequence[LogSeverity]] = None,
+        languages: Optional[Sequence[str]] = None,
+        projects: Optional[Sequence[str]] = None,
+        tags: Optional[Sequence[str]] = None
+    ) -> int:
+        """
+        🔢 HOW MANY MATCH? - Counting Without Fetching
+        
+        Like asking the librarian "how many books on this shelf have a red
+        sticker?" - they count from the index instead of carrying every book
+        to the desk. Each filter accepts several values (any may match);
+        tags use the exact log_tags index. With no filters at all the
+        answer comes straight from the rollup tally.
+        """
+        if not (start_date or severities or languages or projects or tags):
+            query = "SELECT COALESCE(SUM(count), 0) FROM log_rollup_daily WHERE dimension = 'total'"
+        else:
+            query = "SELECT COUNT(*) FROM logs WHERE 1=1"
+        params: List[Any] = []
+        
+        if start_date:
+            query += " AND timestamp >= ?"
+            params.append(start_date)
+        for column, values in (
+            ("severity", [severity.value for severity in severities or []]),
+            ("language", languages or []),
+            ("project_name", projects or []),
+        ):
+            if values:
+                query += f" AND {column} IN ({', '.join('?' for _ in values)})"
+                params.extend(values)
+        if tags:
+            tag_condition, tag_params = tag_filter_sql(tags)
+            query += f" AND {tag_condition}"
+            params.extend(tag_params)
+        
+        try:
+            with self.connection() as conn:
+                return conn.execute(query, params).fetchone()[0]
+        except Exception as e:
+            logger.error(f"Failed to count logs: {e}")
+            return 0
+    
+    def _retention_conditions(
+        self,
+        before: datetime,
+        severities: Optional[Sequence[LogSeverity]],
+        languages: Optional[Sequence[str]],
+        projects: Optional[Sequence[str]],
+        sources: Optional[Sequence[str]],
+        tags: Optional[Sequence[str]]
+    ) -> Tuple[List[str], List[Any]]:
+        """🧰 "Older than before, and any of each given list" as WHERE conditions on logs."""
+        conditions = ["timestamp < ?"]
+        params: List[Any] = [before]
+        for column, values in (
+            ("severity", [getattr(severity, "value", severity) for severity in severities or []]),
+            ("language", languages or []),
+            ("project_name", projects or []),
+            ("source", sources or []),
+        ):
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        if tags:
+            tag_condition, tag_params = tag_filter_sql(tags)
+            conditions.append(tag_condition)
+            params.extend(tag_params)
+        return conditions, params
+    
+    def delete_logs_matching(
+        self,
+        before: datetime,
+        severities: Optional[Sequence[LogSeverity]] = None,
+        languages: Optional[Sequence[str]] = None,
+        projects: Optional[Sequence[str]] = None,
+        sources: Optional[Sequence[str]] = None,
+        tags: Optional[Sequence[str]] = None,
+        limit: int = DEFAULT_RETENTION_CHUNK_SIZE
+    ) -> int:
+        """
+        🗑️ ONE CHUNK OF A RETENTION RULE - Deleting by Description
+        
+        Deletes up to ``limit`` logs older than ``before`` that match every
+        given filter (each a list of accepted values; tags match any),
+        oldest first, in one transaction. The rows are picked and deleted
+        by a single statement, so nothing is hydrated into LogEntry objects.
+        Returns how many were deleted; callers loop until it is below limit.
+        A failure is logged, rolled back and re-raised, so a loop can't
+        mistake it for the last, short chunk.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        conditions, params = self._retention_conditions(before, severities, languages, projects, sources, tags)
+        try:
+            with self._change_lock:
+                with self.connection() as conn:
+                    deleted_ids = [row[0] for row in conn.execute(
+                        f"DELETE FROM logs WHERE rowid IN (SELECT rowid FROM logs "
+                        f"WHERE {' AND '.join(conditions)} ORDER BY timestamp LIMIT ?) RETURNING log_id",
+                        params + [limit]
+                    )]
+                    self._purge_orphaned_blobs(conn)
+                    generation = self._next_generation(conn) if deleted_ids else None
+                if deleted_ids:
+                    self._publish(deleted_ids=deleted_ids, generation=generation)
+            return len(deleted_ids)
+        except Exception as e:
+            logger.error(f"Failed to delete a chunk of logs older than {before}: {e}")
+            raise
+    
+    def tag_logs_matching(
+        self,
+        tag: str,
+        before: datetime,
+        severities: Optional[Sequence[LogSeverity]] = None,
+        languages: Optional[Sequence[str]] = None,
+        projects: Optional[Sequence[str]] = None,
+        sources: Optional[Sequence[str]] = None,
+        tags: Optional[Sequence[str]] = None,
+        limit: int = DEFAULT_RETENTION_CHUNK_SIZE
+    ) -> int:
+        """
+        🏷️ ONE CHUNK OF "MARK THESE" - Adding a Tag by Description
+        
+        Same selection as delete_logs_matching, but appends ``tag`` to up
+        to ``limit`` matching logs that don't carry it yet, so calling it
+        again moves on to the next chunk. The tagged logs are re-read in
+        the same transaction for the change listeners. Returns how many
+        were tagged; failures are logged and re-raised like
+        delete_logs_matching's.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        conditions, params = self._retention_conditions(before, severities, languages, projects, sources, tags)
+        conditions.append("log_id NOT IN (SELECT log_id FROM log_tags WHERE tag = ?)")
+        params.append(tag)
+        try:
+            with self._change_lock:
+                with self.connection() as conn:
+                    generation = self._next_generation(conn)
+                    tagged_ids = [row[0] for row in conn.execute(
+                        f"UPDATE logs SET generation = ?, tags = json_insert("
+                        f"CASE WHEN json_valid(tags) THEN tags ELSE '[]' END, '$[#]', ?) "
+                        f"WHERE rowid IN (SELECT rowid FROM logs WHERE {' AND '.join(conditions)} "
+                        f"ORDER BY timestamp LIMIT ?) RETURNING log_id",
+                        [generation, tag] + params + [limit]
+                    )]
+                    if not tagged_ids:
+                        conn.rollback()  # Don't count a write that changed nothing
+                        return 0
+                    placeholders = ", ".join("?" for _ in tagged_ids)
+                    tagged = [_row_to_entry(row) for row in conn.execute(
+                        f"SELECT {_LOG_COLUMNS} {_FROM_LOGS_TEXT} WHERE log_id IN ({placeholders})",
+                        tagged_ids
+                    )]
+                self._publish(stored=tagged, generation=generation)
+            return len(tagged)
+        except Exception as e:
+            logger.error(f"Failed to tag a chunk of logs older than {before} with {tag!r}: {e}")
+            raise
+    
     def delete_logs_older_than(self, days: int) -> int:
         """
         🗑️ ARCHIVE CLEANUP - Removing Old Documents to Save Space!
@@ -538,26 +2125,35 @@ class DatabaseManager:
             # 📅 CALCULATE CUTOFF DATE - how far back should we keep logs?
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.database_path) as conn:
-                # 📊 COUNT BEFORE DELETION - how many logs will be removed?
-                cursor = conn.execute(
-                    "SELECT COUNT(*) FROM logs WHERE timestamp < ?", 
-                    (cutoff_date,)
-                )
-                count_to_delete = cursor.fetchone()[0]
-                
-                # 🗑️ PERFORM THE DELETION - remove old logs permanently
-                conn.execute(
-                    "DELETE FROM logs WHERE timestamp < ?", 
-                    (cutoff_date,)
-                )
-                
-                # 💾 COMMIT THE CHANGES - make the deletion permanent
-                conn.commit()
+            with self._change_lock:
+                with self.connection() as conn:
+                    # 📊 LIST BEFORE DELETION - which logs will be removed?
+                    # (their ids go to the change listeners, and their number is the result)
+                    cursor = conn.execute(
+                        "SELECT log_id FROM logs WHERE timestamp < ?", 
+                        (cutoff_date,)
+                    )
+                    deleted_ids = [row[0] for row in cursor]
+                    
+                    # 🗑️ PERFORM THE DELETION - remove old logs permanently
+                    conn.execute(
+                        "DELETE FROM logs WHERE timestamp < ?", 
+                        (cutoff_date,)
+                    )
+                    
+                    # 🗜️ DROP BODIES THAT NO REMAINING LOG SHARES
+                    self._purge_orphaned_blobs(conn)
+                    generation = self._next_generation(conn) if deleted_ids else None
+                    
+                    # 💾 COMMIT THE CHANGES - make the deletion permanent
+                    conn.commit()
                 
-                # 📝 LOG THE CLEANUP - record what we did
-                logger.info(f"Deleted {count_to_delete} log entries older than {days} days")
-                return count_to_delete
+                if deleted_ids:
+                    self._publish(deleted_ids=deleted_ids, generation=generation)
+            
+            # 📝 LOG THE CLEANUP - record what we did
+            logger.info(f"Deleted {len(deleted_ids)} log entries older than {days} days")
+            return len(deleted_ids)
                 
         except Exception as e:
             # ❌ CLEANUP ERROR - something went wrong during deletion
@@ -584,170 +2180,106 @@ class DatabaseManager:
         
         This helps identify patterns that wouldn't be obvious from
         looking at individual error reports!
+        
+        ⚡ PERFORMANCE NOTE:
+        Everything is read from the hourly/daily rollup tables (kept current
+        by triggers), so the cost depends on how many days and distinct
+        values exist - not on how many logs are stored.
         """
         try:
-            with sqlite3.connect(self.database_path) as conn:
-                # 📊 BASIC COUNTING STATISTICS
-                # Like counting all the books in different sections of the library
-                
-                # Total count of all logs
-                total_logs = conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
-                
-                # Logs from specific time periods
-                today = datetime.now().date()
-                logs_today = conn.execute(
-                    "SELECT COUNT(*) FROM logs WHERE DATE(timestamp) = ?", 
-                    (today,)
-                ).fetchone()[0]
-                
-                week_ago = datetime.now() - timedelta(days=7)
-                logs_this_week = conn.execute(
-                    "SELECT COUNT(*) FROM logs WHERE timestamp >= ?", 
-                    (week_ago,)
-                ).fetchone()[0]
-                
-                month_ago = datetime.now() - timedelta(days=30)
-                logs_this_month = conn.execute(
-                    "SELECT COUNT(*) FROM logs WHERE timestamp >= ?", 
-                    (month_ago,)
-                ).fetchone()[0]
-                
-                # 🏆 TOP CATEGORIES - What are the most common types?
-                # Like finding out which sections of the library are most popular
-                
-                # Most common error severities
-                severity_cursor = conn.execute('''
-                    SELECT severity, COUNT(*) as count 
-                    FROM logs 
-                    GROUP BY severity 
-                    ORDER BY count DESC 
-                    LIMIT 10
-                ''')
-                top_severity_levels = dict(severity_cursor.fetchall())
-                
-                # Most common programming languages
-                language_cursor = conn.execute('''
-                    SELECT language, COUNT(*) as count 
-                    FROM logs 
-                    GROUP BY language 
-                    ORDER BY count DESC 
-                    LIMIT 10
-                ''')
-                top_languages = dict(language_cursor.fetchall())
-                
-                # Most common error types (from tags)
-                # This is more complex because tags are stored as JSON arrays
-                tag_counts = {}
-                tag_cursor = conn.execute("SELECT tags FROM logs WHERE tags IS NOT NULL")
-                for (tags_json,) in tag_cursor.fetchall():
-                    if tags_json:
-                        tags = json.loads(tags_json)
-                        for tag in tags:
-                            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-                
-                # Get top 10 most common error types
-                top_error_types = dict(
-                    sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-                )
-                
-                # 📈 TREND ANALYSIS - Are things getting better or worse?
-                # Like tracking whether library usage is increasing over time
-                
-                errors_per_day = []
-                for i in range(7):  # Last 7 days
-                    day = datetime.now().date() - timedelta(days=i)
-                    count = conn.execute(
-                        "SELECT COUNT(*) FROM logs WHERE DATE(timestamp) = ?", 
-                        (day,)
-                    ).fetchone()[0]
-                    errors_per_day.append(count)
-                
-                errors_per_day.reverse()  # Put in chronological order
-                
-                # Severity trends (simplified version)
-                severity_trends = {}
-                for severity in LogSeverity:
-                    daily_counts = []
-                    for i in range(7):
-                        day = datetime.now().date() - timedelta(days=i)
-                        count = conn.execute(
-                            "SELECT COUNT(*) FROM logs WHERE DATE(timestamp) = ? AND severity = ?", 
-                            (day, severity.value)
-                        ).fetchone()[0]
-                        daily_counts.append(count)
-                    daily_counts.reverse()
-                    severity_trends[severity.value] = daily_counts
-                
-                # 🕒 TIMING PATTERNS - When do errors happen most?
-                # Like figuring out the busiest hours at the library
-                
-                # Busiest hours (0-23)
-                hour_cursor = conn.execute('''
-                    SELECT strftime('%H', timestamp) as hour, COUNT(*) as count
-                    FROM logs 
-                    GROUP BY hour 
-                    ORDER BY count DESC
-                ''')
-                busiest_hours = {int(hour): count for hour, count in hour_cursor.fetchall()}
-                
-                # Busiest days of week
-                day_cursor = conn.execute('''
-                    SELECT strftime('%w', timestamp) as day_of_week, COUNT(*) as count
-                    FROM logs 
-                    GROUP BY day_of_week 
-                    ORDER BY count DESC
-                ''')
-                # Convert day numbers to day names
-                day_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-                busiest_days = {day_names[int(day)]: count for day, count in day_cursor.fetchall()}
-                
-                # 📅 DATA FRESHNESS - How current is our information?
-                oldest_cursor = conn.execute("SELECT MIN(timestamp) FROM logs")
-                oldest_result = oldest_cursor.fetchone()[0]
-                oldest_log_date = datetime.fromisoformat(oldest_result) if oldest_result else None
-                
-                newest_cursor = conn.execute("SELECT MAX(timestamp) FROM logs")
-                newest_result = newest_cursor.fetchone()[0]
-                newest_log_date = datetime.fromisoformat(newest_result) if newest_result else None
-                
-                # 📋 COMPILE THE FINAL REPORT
-                return LogStats(
-                    total_logs=total_logs,
-                    logs_today=logs_today,
-                    logs_this_week=logs_this_week,
-                    logs_this_month=logs_this_month,
-                    top_error_types=top_error_types,
-                    top_languages=top_languages,
-                    top_severity_levels=top_severity_levels,
-                    errors_per_day_last_week=errors_per_day,
-                    severity_trends=severity_trends,
-                    busiest_hours=busiest_hours,
-                    busiest_days=busiest_days,
-                    oldest_log_date=oldest_log_date,
-                    newest_log_date=newest_log_date,
-                    last_updated=datetime.now()
-                )
-                
+            now = datetime.now()
+            with self.connection() as conn:
+                part = self._statistics_part(conn, now)
+            return _statistics_from_parts([part], now)
         except Exception as e:
             # ❌ ANALYTICS ERROR - something went wrong generating statistics
             logger.error(f"Failed to generate statistics: {e}")
             # Return empty statistics as fallback
-            return LogStats(
-                total_logs=0,
-                logs_today=0,
-                logs_this_week=0,
-                logs_this_month=0,
-                top_error_types={},
-                top_languages={},
-                top_severity_levels={},
-                errors_per_day_last_week=[0] * 7,
-                severity_trends={},
-                busiest_hours={},
-                busiest_days={},
-                oldest_log_date=None,
-                newest_log_date=None,
-                last_updated=datetime.now()
-            )
+            return _empty_statistics()
+    
+    def _statistics_part(self, conn: sqlite3.Connection, now: datetime) -> "_StatisticsPart":
+        """
+        🧾 RAW TALLIES FOR get_statistics - nothing ranked or cut off yet
+        
+        Kept separate from the final LogStats so tallies from several
+        databases (see PartitionedDatabaseManager) can be added up exactly
+        before the top-10 lists are chosen.
+        """
+        today = now.date()
+        
+        # 🏆 ALL-TIME TALLIES - totals and top categories in one pass
+        # Like adding up the tally sheets instead of recounting every file
+        totals: Dict[str, Dict[str, int]] = {dimension: {} for dimension in ROLLUP_DIMENSIONS}
+        for dimension, value, count in conn.execute('''
+            SELECT dimension, value, SUM(count)
+            FROM log_rollup_daily
+            GROUP BY dimension, value
+        '''):
+            totals[dimension][value] = count
+        
+        # 📈 TREND ANALYSIS - the last 7 days, per day and per severity
+        days = [today - timedelta(days=i) for i in range(6, -1, -1)]
+        day_index = {day.isoformat(): i for i, day in enumerate(days)}
+        errors_per_day = [0] * 7
+        severity_trends = {severity.value: [0] * 7 for severity in LogSeverity}
+        for bucket, dimension, value, count in conn.execute('''
+            SELECT bucket, dimension, value, count
+            FROM log_rollup_daily
+            WHERE bucket >= ? AND bucket <= ? AND dimension IN ('total', 'severity')
+        ''', (days[0].isoformat(), days[-1].isoformat())):
+            i = day_index[bucket]
+            if dimension == "total":
+                errors_per_day[i] = count
+            elif value in severity_trends:
+                severity_trends[value][i] = count
+        
+        # 🕒 TIMING PATTERNS - at most 24 x 7 (hour, weekday) cells
+        hour_counts: Dict[int, int] = {}
+        weekday_counts: Dict[int, int] = {}
+        for hour, weekday, count in conn.execute('''
+            SELECT CAST(substr(bucket, 12, 2) AS INTEGER) AS hour,
+                   CAST(strftime('%w', substr(bucket, 1, 10)) AS INTEGER) AS weekday,
+                   SUM(count)
+            FROM log_rollup_hourly
+            WHERE dimension = 'total'
+            GROUP BY hour, weekday
+        '''):
+            hour_counts[hour] = hour_counts.get(hour, 0) + count
+            weekday_counts[weekday] = weekday_counts.get(weekday, 0) + count
+        
+        # 📅 DATA FRESHNESS - both ends of the timestamp index
+        oldest, newest = conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM logs").fetchone()
+        
+        return _StatisticsPart(
+            totals=totals,
+            errors_per_day=errors_per_day,
+            severity_trends=severity_trends,
+            logs_this_week=self._count_since(conn, now - timedelta(days=7)),
+            logs_this_month=self._count_since(conn, now - timedelta(days=30)),
+            hour_counts=hour_counts,
+            weekday_counts=weekday_counts,
+            oldest=datetime.fromisoformat(oldest) if oldest else None,
+            newest=datetime.fromisoformat(newest) if newest else None,
+        )
+    
+    def _count_since(self, conn: sqlite3.Connection, since: datetime) -> int:
+        """
+        🧮 EXACT ROLLING COUNT - logs with timestamp >= since
+        
+        Whole hours come from the hourly rollup; only the partial hour at
+        the start of the window is counted from the logs table (a short
+        range scan on idx_timestamp_log_id).
+        """
+        first_full_hour = since.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        full_hours = conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM log_rollup_hourly WHERE dimension = 'total' AND bucket >= ?",
+            (first_full_hour.strftime("%Y-%m-%d %H"),)
+        ).fetchone()[0]
+        partial_hour = conn.execute(
+            "SELECT COUNT(*) FROM logs WHERE timestamp >= ? AND timestamp < ?",
+            (since, first_full_hour)
+        ).fetchone()[0]
+        return full_hours + partial_hour
     
     def create_log_id(self, log_content: str, timestamp: datetime) -> str:
         """
@@ -789,13 +2321,156 @@ class DatabaseManager:
         SQLite's VACUUM command does the same thing for our database!
         """
         try:
-            with sqlite3.connect(self.database_path) as conn:
+            with self.connection() as conn:
+                # 🗜️ DROP UNREFERENCED BODIES first so VACUUM reclaims their pages
+                self._purge_orphaned_blobs(conn)
+                conn.commit()
+                
                 # 🧹 OPTIMIZE THE DATABASE - reorganize for better performance
                 conn.execute("VACUUM")
                 conn.commit()
+                
+                # 📜 FOLD THE WRITE-AHEAD LOG BACK IN - and shrink the -wal file
+                if self.journal_mode == "wal":
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             
             logger.info("Database vacuum completed successfully")
             
         except Exception as e:
             # ❌ MAINTENANCE ERROR - something went wrong during optimization
-            logger.error(f"Failed to vacuum database: {e}")
\ No newline at end of file
+            logger.error(f"Failed to vacuum database: {e}")
+
+class LogWriteBuffer:
+    """
+    🚚 THE MAIL CART - Write-Behind Buffering for Ingestion Bursts
+    
+    Instead of running to the filing room with every single form, the
+    mail cart collects forms and delivers them in one trip when it is
+    full (max_size) or when the oldest form has waited long enough
+    (max_delay_seconds), whichever comes first.
+    
+    🏆 HIGH SCHOOL EXPLANATION:
+    Like a school mail cart:
+    - Teachers drop forms in the cart (add)
+    - A full cart is delivered immediately by whoever filled it
+    - A background helper delivers a half-full cart after a short wait
+    - At the end of the day the cart is emptied (close)
+    
+    Entries are only durable once flushed, so call flush() or close()
+    before shutting down. Failed flushes are logged and the entries are
+    dropped rather than retried forever.
+    """
+    
+    def __init__(self, database_manager: DatabaseManager,
+                 max_size: int = DEFAULT_BULK_BATCH_SIZE,
+                 max_delay_seconds: float = 1.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_delay_seconds <= 0:
+            raise ValueError("max_delay_seconds must be positive")
+        
+        self.db = database_manager
+        self.max_size = max_size
+        self.max_delay_seconds = max_delay_seconds
+        
+        # 📊 DELIVERY STATISTICS
+        self.entries_written = 0
+        self.entries_dropped = 0
+        self.flush_count = 0
+        
+        self._pending: List[LogEntry] = []
+        self._oldest_pending_at: Optional[float] = None
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()  # Keeps flushes in arrival order
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="debuggle-log-write-buffer", daemon=True
+        )
+        self._worker.start()
+    
+    @property
+    def pending(self) -> int:
+        """📬 Number of entries waiting to be written."""
+        with self._condition:
+            return len(self._pending)
+    
+    def add(self, log_entry: LogEntry):
+        """
+        📥 DROP A FORM IN THE CART
+        
+        Returns immediately unless this entry fills the cart, in which case
+        the caller flushes it (natural back-pressure during bursts).
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("LogWriteBuffer is closed")
+            self._pending.append(log_entry)
+            if self._oldest_pending_at is None:
+                self._oldest_pending_at = time.monotonic()
+                self._condition.notify()
+            full = len(self._pending) >= self.max_size
+        
+        if full:
+            self.flush()
+    
+    def add_many(self, entries: Iterable[LogEntry]):
+        """📥 Add several entries (flushing whenever the cart fills)."""
+        for entry in entries:
+            self.add(entry)
+    
+    def flush(self) -> int:
+        """
+        🚚 DELIVER EVERYTHING NOW
+        
+        Writes all pending entries via store_logs and returns how many were
+        stored.
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch, self._pending = self._pending, []
+                self._oldest_pending_at = None
+            if not batch:
+                return 0
+            
+            stored = self.db.store_logs(batch, batch_size=self.max_size)
+            self.entries_written += stored
+            self.entries_dropped += len(batch) - stored
+            self.flush_count += 1
+            if stored < len(batch):
+                logger.error(f"Write buffer dropped {len(batch) - stored} log entries")
+            return stored
+    
+    def close(self):
+        """🔒 Stop the background helper and flush whatever is left."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+        self.flush()
+    
+    def __enter__(self) -> "LogWriteBuffer":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _run(self):
+        """⏰ Background helper: flush once the oldest entry is max_delay_seconds old."""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._oldest_pending_at is None:
+                        self._condition.wait()
+                        continue
+                    remaining = self._oldest_pending_at + self.max_delay_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Background log flush failed: {e}")
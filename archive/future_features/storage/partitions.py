@@ -0,0 +1,510 @@
+"""
+🗓️ DEBUGGLE PARTITIONED STORAGE - One Drawer Per Day (or Week)! 🗓️
+
+Think of this module as a filing cabinet where every drawer holds exactly
+one day (or one week) of error reports. When you look for last Tuesday's
+errors you only open Tuesday's drawer, and when old reports expire you
+throw away the whole drawer instead of pulling files out one by one.
+
+🏆 HIGH SCHOOL EXPLANATION:
+Imagine the school office keeps one binder per school week:
+- New forms always go into this week's binder (writes pick a partition)
+- "Show me last week's forms" only opens one binder (queries fan out
+  to the partitions in range, newest first)
+- At the end of the year, old binders go straight into the recycling bin -
+  nobody has to flip through them page by page (retention drops files)
+
+WHY SEPARATE FILES:
+Each partition is an ordinary DatabaseManager database (with its own
+full-text index, tag table, rollups and body store), stored as
+logs-YYYY-MM-DD.db named after the first day it covers. Dropping a
+partition is closing it and deleting the file: no giant DELETE, no WAL
+growth, no VACUUM afterwards.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .database import (
+    DEFAULT_BLOB_CACHE_SIZE, DEFAULT_BULK_BATCH_SIZE, DEFAULT_CACHED_STATEMENTS, DEFAULT_RETENTION_CHUNK_SIZE,
+    DatabaseManager, LogChange, LogEntry, LogPage, LogRow, LogSeverity, LogStats, LogWriteBuffer, TextSearchHit,
+    _empty_statistics, _statistics_from_parts, decode_cursor, encode_cursor, require_sqlite_version
+)
+
+logger = logging.getLogger(__name__)
+
+# 📏 PARTITION SIZES - days covered by one partition file
+PARTITION_PERIODS = {"day": 1, "week": 7}
+_PARTITION_FILE = re.compile(r"^logs-(\d{4}-\d{2}-\d{2})\.db$")
+
+
+class PartitionedDatabaseManager:
+    """
+    🗄️ THE CABINET OF DRAWERS - DatabaseManager's API over time partitions
+
+    Offers the same methods as DatabaseManager (store, get, search, count,
+    statistics, retention, maintenance), routing each call to the
+    partitions it concerns:
+    - Writes go to the partition of the entry's timestamp
+    - Time-ordered reads walk partitions newest first and stop as soon as
+      the page is full, so recent pages never open old files
+    - delete_logs_older_than deletes whole partition files and only runs a
+      row DELETE inside the one partition that straddles the cutoff
+
+    🏆 HIGH SCHOOL EXPLANATION:
+    Like a head librarian who doesn't shelve anything personally, but knows
+    which branch library holds which months and sends each request there.
+
+    Two differences from a single database: a log_id is only unique within
+    its partition (storing the same id with a timestamp in another period
+    adds a second copy, and change listeners are told an id was deleted
+    when any one of its copies is), and search_text ranks hits from different
+    partitions by their own BM25 scores, which are close to but not exactly
+    what one combined index would give.
+    """
+
+    def __init__(self, directory: str = "logs", period: str = "day",
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+                 blob_cache_size: int = DEFAULT_BLOB_CACHE_SIZE):
+        """
+        🏗️ OPENING THE CABINET
+
+        Finds the partition files already in the directory; each one is
+        only opened the first time a query or write needs it.
+
+        Args:
+            directory: Folder holding the logs-YYYY-MM-DD.db partition files
+            period: "day" or "week" (weeks start on Monday)
+            pragmas, cached_statements, blob_cache_size: Passed to every
+                partition's DatabaseManager
+        """
+        if period not in PARTITION_PERIODS:
+            raise ValueError(f"period must be one of {sorted(PARTITION_PERIODS)}, not {period!r}")
+        require_sqlite_version(sqlite3.sqlite_version_info)  # Before any partition is opened
+
+        self.directory = Path(directory)
+        self.period = period
+        self._period_length = timedelta(days=PARTITION_PERIODS[period])
+        self._manager_options: Dict[str, Any] = {
+            "pragmas": pragmas,
+            "cached_statements": cached_statements,
+            "blob_cache_size": blob_cache_size,
+        }
+
+        # 🗂️ PARTITION DIRECTORY - first day -> manager (None until opened)
+        self._lock = threading.Lock()
+        self._partitions: Dict[date, Optional[DatabaseManager]] = {}
+
+        # 📣 CHANGE FEED - every partition's writes, renumbered as one sequence
+        self.generation = 0
+        self._change_listeners: List[Any] = []
+        self._change_lock = threading.RLock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.directory.glob("logs-*.db")):
+            match = _PARTITION_FILE.match(path.name)
+            if not match:
+                continue
+            start = date.fromisoformat(match.group(1))
+            if start != self._period_start(start):
+                logger.warning(f"Ignoring {path.name}: it does not start a {period} partition")
+                continue
+            self._partitions[start] = None
+
+        logger.info(f"Partitioned storage opened at {self.directory} "
+                    f"({len(self._partitions)} {period} partitions)")
+
+    # ------------------------------------------------------------------
+    # 🗂️ PARTITION BOOKKEEPING
+    # ------------------------------------------------------------------
+
+    def _period_start(self, day: date) -> date:
+        """First day of the partition that day falls in."""
+        if self.period == "week":
+            return day - timedelta(days=day.weekday())
+        return day
+
+    def _partition_path(self, start: date) -> Path:
+        return self.directory / f"logs-{start.isoformat()}.db"
+
+    def _manager(self, start: date) -> DatabaseManager:
+        """Open (creating if needed) the partition that begins on start."""
+        with self._lock:
+            manager = self._partitions.get(start)
+            if manager is None:
+                manager = DatabaseManager(str(self._partition_path(start)), **self._manager_options)
+                manager.add_change_listener(self._forward_change)
+                self._partitions[start] = manager
+            return manager
+
+    def _manager_for(self, timestamp: datetime) -> DatabaseManager:
+        return self._manager(self._period_start(timestamp.date()))
+
+    def _starts(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                newest_first: bool) -> List[date]:
+        """First days of the existing partitions overlapping [start_date, end_date]."""
+        first = self._period_start(start_date.date()) if start_date else None
+        last = end_date.date() if end_date else None
+        with self._lock:
+            starts = sorted(self._partitions, reverse=newest_first)
+        return [
+            start for start in starts
+            if (first is None or start >= first) and (last is None or start <= last)
+        ]
+
+    def partitions(self, start_date: Optional[datetime] = None,
+                   end_date: Optional[datetime] = None,
+                   newest_first: bool = True) -> Iterator[DatabaseManager]:
+        """
+        🗂️ THE DRAWERS TO OPEN - partitions that can hold logs in the range
+
+        Newest first by default, so callers reading in time order can stop
+        early: each partition is only opened when the iteration reaches it.
+        Only partitions that already exist are returned.
+        """
+        for start in self._starts(start_date, end_date, newest_first):
+            yield self._manager(start)
+
+    # ------------------------------------------------------------------
+    # 📣 CHANGE FEED - same contract as DatabaseManager's
+    # ------------------------------------------------------------------
+
+    add_change_listener = DatabaseManager.add_change_listener
+    remove_change_listener = DatabaseManager.remove_change_listener
+    _publish = DatabaseManager._publish
+
+    def _forward_change(self, change: LogChange):
+        """Republish a partition's change under this manager's generation."""
+        self._publish(stored=change.stored, deleted_ids=change.deleted_ids)
+
+    # ------------------------------------------------------------------
+    # 📝 WRITES
+    # ------------------------------------------------------------------
+
+    def store_log(self, log_entry: LogEntry) -> bool:
+        """📚 File one log in the partition for its timestamp."""
+        return self._manager_for(log_entry.timestamp).store_log(log_entry)
+
+    def store_logs(self, entries: Iterable[LogEntry],
+                   batch_size: int = DEFAULT_BULK_BATCH_SIZE) -> int:
+        """
+        📦 BULK FILING ACROSS DRAWERS
+
+        Each batch is split by partition and every part is stored with the
+        partition's own store_logs. Like DatabaseManager.store_logs it stops
+        at the first failure and returns how many entries were stored.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        stored = 0
+        batch: List[LogEntry] = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                written = self._store_batch(batch, batch_size)
+                stored += written
+                if written < len(batch):
+                    return stored
+                batch = []
+
+        if batch:
+            stored += self._store_batch(batch, batch_size)
+        return stored
+
+    def _store_batch(self, batch: Sequence[LogEntry], batch_size: int) -> int:
+        groups: Dict[date, List[LogEntry]] = {}
+        for entry in batch:
+            groups.setdefault(self._period_start(entry.timestamp.date()), []).append(entry)
+
+        stored = 0
+        for start, group in groups.items():
+            written = self._manager(start).store_logs(group, batch_size)
+            stored += written
+            if written < len(group):
+                break
+        return stored
+
+    def create_write_buffer(self, max_size: int = DEFAULT_BULK_BATCH_SIZE,
+                            max_delay_seconds: float = 1.0) -> LogWriteBuffer:
+        """🚚 Build a write-behind buffer that feeds store_logs (see LogWriteBuffer)."""
+        return LogWriteBuffer(self, max_size=max_size, max_delay_seconds=max_delay_seconds)
+
+    create_log_id = DatabaseManager.create_log_id
+
+    # ------------------------------------------------------------------
+    # 🔍 READS - fan out to the partitions in range
+    # ------------------------------------------------------------------
+
+    def get_log(self, log_id: str) -> Optional[LogEntry]:
+        """🔍 Look a log up by id, checking the newest partitions first."""
+        for manager in self.partitions():
+            log = manager.get_log(log_id)
+            if log is not None:
+                return log
+        return None
+
+    def delete_log(self, log_id: str) -> bool:
+        """🗑️ Delete a log by id from whichever partition holds it."""
+        deleted = False
+        for manager in self.partitions():
+            deleted = manager.delete_log(log_id) or deleted
+        return deleted
+
+    def search_logs(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        severity: Optional[LogSeverity] = None,
+        language: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        project_name: Optional[str] = None,
+        text_search: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Union[LogEntry, LogRow]]:
+        """
+        🔍 FILTERED SEARCH, NEWEST FIRST
+
+        Partitions cover separate stretches of time, so reading them newest
+        first and concatenating keeps the order; we stop once limit + offset
+        logs are in hand.
+        """
+        wanted = limit + offset
+        logs: List[Union[LogEntry, LogRow]] = []
+        for manager in self.partitions(start_date, end_date):
+            logs.extend(manager.search_logs(
+                start_date, end_date, severity, language, tags, project_name, text_search,
+                limit=wanted - len(logs), columns=columns
+            ))
+            if len(logs) >= wanted:
+                break
+        return logs[offset:offset + limit]
+
+    def search_logs_page(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        severity: Optional[LogSeverity] = None,
+        language: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        project_name: Optional[str] = None,
+        text_search: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> LogPage:
+        """
+        🔖 CURSOR PAGINATION ACROSS PARTITIONS
+
+        Cursors are the same opaque (timestamp, log_id) tokens as
+        DatabaseManager's, so partitions newer than the cursor are skipped
+        without being opened.
+        """
+        upper = end_date
+        if cursor:
+            after = datetime.fromisoformat(decode_cursor(cursor)[0])
+            upper = min(upper, after) if upper else after
+        filters = dict(start_date=start_date, end_date=end_date, severity=severity, language=language,
+                       tags=tags, project_name=project_name, text_search=text_search)
+
+        logs: List[Union[LogEntry, LogRow]] = []
+        next_cursor = None
+        for manager in self.partitions(start_date, upper):
+            if len(logs) >= limit:
+                # 🔭 PAGE IS FULL - is there anything at all in the older partitions?
+                if manager.search_logs_page(limit=1, cursor=cursor, columns=(), **filters).logs:
+                    last = logs[-1]
+                    next_cursor = encode_cursor(last.timestamp.isoformat(" "), last.log_id)
+                    break
+                continue
+            page = manager.search_logs_page(limit=limit - len(logs), cursor=cursor,
+                                            columns=columns, **filters)
+            logs.extend(page.logs)
+            if page.next_cursor:
+                next_cursor = page.next_cursor
+                break
+        return LogPage(logs=logs, next_cursor=next_cursor)
+
+    iter_logs = DatabaseManager.iter_logs
+
+    def search_text(
+        self,
+        text: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        severity: Optional[LogSeverity] = None,
+        language: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        project_name: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[TextSearchHit]:
+        """
+        🎯 RANKED SEARCH OVER EVERY PARTITION IN RANGE
+
+        Each partition returns its own best limit + offset hits; the
+        combined list is re-ranked by score (newest first on ties).
+        """
+        hits: List[TextSearchHit] = []
+        for manager in self.partitions(start_date, end_date):
+            hits.extend(manager.search_text(
+                text, start_date, end_date, severity, language, tags, project_name,
+                limit=limit + offset
+            ))
+        hits.sort(key=lambda hit: (hit.score, hit.log.timestamp), reverse=True)
+        return hits[offset:offset + limit]
+
+    def count_logs(
+        self,
+        start_date: Optional[datetime] = None,
+        severities: Optional[Sequence[LogSeverity]] = None,
+        languages: Optional[Sequence[str]] = None,
+        projects: Optional[Sequence[str]] = None,
+        tags: Optional[Sequence[str]] = None
+    ) -> int:
+        """🔢 Sum of the counts of every partition since start_date."""
+        return sum(
+            manager.count_logs(start_date, severities, languages, projects, tags)
+            for manager in self.partitions(start_date)
+        )
+
+    def get_statistics(self) -> LogStats:
+        """
+        📊 ONE REPORT FOR THE WHOLE CABINET
+
+        Adds up every partition's raw rollup tallies before ranking, so the
+        top-10 lists are exact rather than a merge of per-partition top-10s.
+        """
+        try:
+            now = datetime.now()
+            parts = []
+            for manager in self.partitions():
+                with manager.connection() as conn:
+                    parts.append(manager._statistics_part(conn, now))
+            return _statistics_from_parts(parts, now)
+        except Exception as e:
+            logger.error(f"Failed to generate partitioned statistics: {e}")
+            return _empty_statistics()
+
+    # ------------------------------------------------------------------
+    # 🗑️ RETENTION AND MAINTENANCE
+    # ------------------------------------------------------------------
+
+    def delete_logs_older_than(self, days: int) -> int:
+        """
+        🗑️ RECYCLING WHOLE BINDERS - O(1) per expired partition
+
+        Partitions that end before the cutoff are closed and their files
+        deleted; only the partition the cutoff falls inside runs a normal
+        row DELETE. Returns the number of logs removed.
+        """
+        cutoff = datetime.now() - timedelta(days=days)
+        deleted = 0
+        for start in self._starts(None, cutoff, newest_first=False):
+            if datetime.combine(start + self._period_length, time.min) <= cutoff:
+                deleted += self._drop_partition(start)
+            else:
+                deleted += self._manager(start).delete_logs_older_than(days)
+        return deleted
+
+    def delete_logs_matching(self, before: datetime, severities: Optional[Sequence[LogSeverity]] = None,
+                             languages: Optional[Sequence[str]] = None,
+                             projects: Optional[Sequence[str]] = None,
+                             sources: Optional[Sequence[str]] = None,
+                             tags: Optional[Sequence[str]] = None,
+                             limit: int = DEFAULT_RETENTION_CHUNK_SIZE) -> int:
+        """🗑️ One chunk of a retention rule, taken from the oldest partitions first."""
+        deleted = 0
+        for manager in self.partitions(None, before, newest_first=False):
+            if deleted >= limit:
+                break
+            deleted += manager.delete_logs_matching(before, severities, languages, projects,
+                                                    sources, tags, limit=limit - deleted)
+        return deleted
+
+    def tag_logs_matching(self, tag: str, before: datetime,
+                          severities: Optional[Sequence[LogSeverity]] = None,
+                          languages: Optional[Sequence[str]] = None,
+                          projects: Optional[Sequence[str]] = None,
+                          sources: Optional[Sequence[str]] = None,
+                          tags: Optional[Sequence[str]] = None,
+                          limit: int = DEFAULT_RETENTION_CHUNK_SIZE) -> int:
+        """🏷️ One chunk of tagging by description, oldest partitions first."""
+        tagged = 0
+        for manager in self.partitions(None, before, newest_first=False):
+            if tagged >= limit:
+                break
+            tagged += manager.tag_logs_matching(tag, before, severities, languages, projects,
+                                                sources, tags, limit=limit - tagged)
+        return tagged
+
+    def _drop_partition(self, start: date) -> int:
+        """Close one partition and delete its files; returns how many logs it held."""
+        with self._lock:
+            manager = self._partitions.pop(start, None)
+        path = self._partition_path(start)
+        try:
+            if manager is None:
+                manager = DatabaseManager(str(path), **self._manager_options)
+            if self._change_listeners:
+                # Listeners need the ids; a covering scan of the primary key
+                with manager.connection() as conn:
+                    deleted_ids = [row[0] for row in conn.execute("SELECT log_id FROM logs")]
+                count = len(deleted_ids)
+            else:
+                deleted_ids = []
+                count = manager.count_logs()  # Read from the rollup tally, not the rows
+            manager.close()
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{path}{suffix}").unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Failed to drop partition {path.name}: {e}")
+            return 0
+
+        if deleted_ids:
+            self._publish(deleted_ids=deleted_ids)
+        logger.info(f"Dropped partition {path.name} holding {count} logs")
+        return count
+
+    def vacuum_database(self):
+        """🧹 Vacuum every partition."""
+        for manager in self.partitions():
+            manager.vacuum_database()
+
+    def rebuild_rollups(self):
+        """🔁 Recount the rollup tallies of every partition."""
+        for manager in self.partitions():
+            manager.rebuild_rollups()
+
+    def rebuild_search_index(self):
+        """🔁 Rebuild the full-text index of every partition."""
+        for manager in self.partitions():
+            manager.rebuild_search_index()
+
+    def purge_orphaned_blobs(self) -> int:
+        """🧹 Drop unreferenced log bodies in every partition; returns how many."""
+        return sum(manager.purge_orphaned_blobs() for manager in self.partitions())
+
+    def get_storage_statistics(self) -> Dict[str, int]:
+        """📦 Body store totals summed over every partition."""
+        totals = {"blobs": 0, "references": 0, "original_bytes": 0, "stored_bytes": 0}
+        for manager in self.partitions():
+            for key, value in manager.get_storage_statistics().items():
+                totals[key] += value
+        return totals
+
+    def close(self):
+        """🔒 Close every open partition."""
+        with self._lock:
+            managers = [manager for manager in self._partitions.values() if manager is not None]
+            self._partitions = {start: None for start in self._partitions}
+        for manager in managers:
+            manager.close()
@@ -37,13 +37,17 @@ Unlike rigid cloud solutions, our local retention system lets you:
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Union
 from dataclasses import dataclass
 from enum import Enum
 import json
 
+from .async_database import AsyncDatabaseManager
 from .database import DatabaseManager, LogSeverity
 
+# 🏷️ The tag MARK_ARCHIVED rules add to logs they keep
+ARCHIVED_TAG = "archived"
+
 logger = logging.getLogger(__name__)
 
 
@@ -145,7 +149,7 @@ class RetentionManager:
     appropriate historical data for debugging and analysis!
     """
     
-    def __init__(self, database_manager: DatabaseManager):
+    def __init__(self, database_manager: Union[DatabaseManager, AsyncDatabaseManager]):
         """
         🏗️ SETTING UP THE ARCHIVE MANAGEMENT OFFICE
         
@@ -157,7 +161,10 @@ class RetentionManager:
         4. Set up automation schedules
         """
         # 🗄️ OUR CONNECTION TO THE FILING SYSTEM
-        self.db = database_manager
+        # Coroutines go through the async front desk so a cleanup run never
+        # blocks the event loop; self.db is the synchronous manager behind it
+        self.adb = AsyncDatabaseManager.wrap(database_manager)
+        self.db = self.adb.sync
         
         # 📋 LIST OF ALL RETENTION POLICIES
         # Like the master policy manual that defines how to handle different document types
@@ -177,6 +184,7 @@ class RetentionManager:
             "cleanup_hour": 2,                 # What time of day to run cleanup (2 AM)
             "max_execution_time": 3600,        # Maximum time to spend on cleanup (1 hour)
             "safety_checks": True,             # Extra validation before deleting data
+            "chunk_size": 1000,                # Logs deleted/marked per transaction
         }
         
         # 🏗️ LOAD DEFAULT RETENTION POLICIES
@@ -361,10 +369,20 @@ class RetentionManager:
                 # 📅 CALCULATE CUTOFF DATE FOR THIS RULE
                 cutoff_date = datetime.now() - timedelta(days=rule.days_to_keep)
                 
+                # 🧹 SET-BASED PATH - rules that never need to see a log's
+                # contents run as chunked SQL deletes/updates instead
+                if self._runs_in_sql(rule):
+                    processed = await self._execute_rule_in_chunks(rule, cutoff_date, start_time, errors)
+                    actions_taken[rule.action] += processed
+                    total_processed += processed
+                    rule.last_executed = datetime.now()
+                    rule.total_processed += processed
+                    continue
+                
                 # 🔍 FIND LOGS THAT MATCH THIS RULE AND ARE OLD ENOUGH
-                # We'll search for logs older than the cutoff date
-                # This is a simplified version - in practice, you'd want to batch this
-                matching_logs = self.db.search_logs(
+                # Exports and callbacks need whole logs, so these rules still
+                # fetch a batch of them and handle one log at a time
+                matching_logs = await self.adb.search_logs(
                     end_date=cutoff_date,  # Only logs older than cutoff
                     severity=rule.severity_filter[0] if rule.severity_filter and len(rule.severity_filter) == 1 else None,
                     language=rule.language_filter[0] if rule.language_filter and len(rule.language_filter) == 1 else None,
@@ -444,6 +462,78 @@ class RetentionManager:
         
         return report
     
+    def _runs_in_sql(self, rule: RetentionRule) -> bool:
+        """
+        🧮 CAN THIS RULE BE ONE SQL STATEMENT?
+        
+        Deletes and marks only need to know *which* logs match, and an
+        archive without an archive_path is just a delete. Exports and
+        callbacks need each log's contents, so they stay on the per-log path.
+        """
+        if rule.callback is not None:
+            return False
+        if rule.action == RetentionAction.ARCHIVE:
+            return not rule.archive_path
+        return rule.action in (RetentionAction.DELETE, RetentionAction.MARK_ARCHIVED)
+    
+    async def _execute_rule_in_chunks(self, rule: RetentionRule, cutoff_date: datetime,
+                                      start_time: datetime, errors: List[str]) -> int:
+        """
+        🧹 CLEANING A SHELF ONE ARMFUL AT A TIME
+        
+        The rule's filters become SQL conditions, and each call deletes (or
+        tags) at most config["chunk_size"] of the oldest matching logs in
+        its own transaction. We loop until a chunk comes back short, handing
+        the event loop back between chunks so API requests - and other
+        queued writes - keep flowing during a big cleanup.
+        
+        🏆 HIGH SCHOOL EXPLANATION:
+        Instead of pulling every old file out of the cabinet, reading each
+        one and walking it to the shredder, the archivist tells the shredding
+        crew "all warning reports from before March" - and the crew takes
+        one box at a time, so the office can still use the cabinet in between.
+        
+        Stops early (with an error in the report) when a chunk fails or
+        config["max_execution_time"] is used up; the rest is picked up by
+        the next run. Returns how many logs were processed.
+        """
+        chunk_size = self.config["chunk_size"]
+        filters = dict(
+            severities=rule.severity_filter,
+            languages=rule.language_filter,
+            projects=rule.project_filter,
+            sources=rule.source_filter,
+            tags=rule.tag_filter,
+            limit=chunk_size,
+        )
+        processed = 0
+        while True:
+            try:
+                if rule.action == RetentionAction.MARK_ARCHIVED:
+                    done = await self.adb.tag_logs_matching(ARCHIVED_TAG, cutoff_date, **filters)
+                else:
+                    done = await self.adb.delete_logs_matching(cutoff_date, **filters)
+            except Exception as chunk_error:
+                # The failed chunk was rolled back; earlier chunks stay done
+                errors.append(f"Rule {rule.name} failed after {processed} logs: {chunk_error}")
+                logger.error(f"Retention rule {rule.name} failed after {processed} logs: {chunk_error}")
+                break
+            processed += done
+            if done < chunk_size:
+                break
+            
+            if (datetime.now() - start_time).total_seconds() > self.config["max_execution_time"]:
+                errors.append(f"Rule {rule.name} stopped after {processed} logs: "
+                              f"max_execution_time reached, the rest is left for the next run")
+                logger.warning(f"Retention rule {rule.name} hit max_execution_time after {processed} logs")
+                break
+            
+            # 🤝 LET EVERYONE ELSE HAVE A TURN before the next chunk
+            await asyncio.sleep(0)
+        
+        logger.debug(f"Rule {rule.name} processed {processed} logs in chunks of {chunk_size}")
+        return processed
+    
     async def _delete_log(self, log_entry):
         """
         🗑️ PERMANENTLY REMOVING A LOG ENTRY
@@ -454,10 +544,7 @@ class RetentionManager:
         """
         # For now, we'll implement this as a database delete
         # In a real implementation, you might want additional safety checks
-        import sqlite3
-        with sqlite3.connect(self.db.database_path) as conn:
-            conn.execute("DELETE FROM logs WHERE log_id = ?", (log_entry.log_id,))
-            conn.commit()
+        await self.adb.delete_log(log_entry.log_id)
         
         logger.debug(f"Deleted log: {log_entry.log_id}")
     
@@ -501,8 +588,8 @@ class RetentionManager:
         """
         # TODO: Implement archived status in database schema
         # For now, we'll add an "archived" tag
-        if "archived" not in log_entry.tags:
-            log_entry.tags.append("archived")
+        if ARCHIVED_TAG not in log_entry.tags:
+            log_entry.tags.append(ARCHIVED_TAG)
             # Update the log in the database
             # (This would require updating the database record)
         
@@ -35,17 +35,29 @@ SEARCH CAPABILITIES PROVIDED:
 📈 Trending Search - Find patterns and frequently occurring errors
 """
 
-import sqlite3
 import re
 import json
+import heapq
+import itertools
 import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple, Set
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Sequence, Tuple, Set, Union
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
 import math
 
-from .database import DatabaseManager, LogEntry, LogSeverity
+from .async_database import AsyncDatabaseManager
+from .database import (
+    DatabaseManager, LogChange, LogEntry, LogSeverity, LOG_TEXT_VIEW, decode_page_sql, tag_filter_sql, encode_cursor, decode_cursor
+)
+from .segments import (
+    FORMAT_VERSION, FacetColumn, IndexSegment, SegmentDirectory, TermTrigrams, merge_segments, write_segment
+)
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +93,274 @@ class SortOrder(str, Enum):
     ALPHABETICAL = "alphabetical"       # 🔤 Alphabetical by content
 
 
+# 🚨 SEVERITY_HIGH ORDER - the rank SQL sorts by, reused when merging partitions
+_SEVERITY_SORT_RANK = {"critical": 1, "error": 2, "warning": 3, "info": 4, "debug": 5, "trace": 6}
+_UNKNOWN_SEVERITY_RANK = 7
+
+# 📐 INDEX COLUMNS - the only fields _SearchIndex.add reads
+_INDEX_COLUMNS = ("original_log", "processed_log", "summary", "project_name", "file_path", "tags",
+                  "severity", "language")
+
+# 🔤 TEXT FIELDS - what text/word searches look in, and the narrower phrase set
+_TEXT_FIELDS = ("original_log", "processed_log", "summary", "project_name", "file_path")
+_PHRASE_FIELDS = ("original_log", "processed_log", "summary")
+
+# 🚫 STOPWORDS - too common to index (so the index can't answer them)
+_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'the', 'is', 'was', 'are', 'were'
+})
+
+# 🧹 INDEX MAINTENANCE - generation of an index that must not be trusted,
+# and how many posting lists compaction sweeps per hold of the index lock
+_STALE = -1
+_COMPACTION_BATCH = 1000
+
+# 🔢 POSTING LISTS - ascending doc ids packed 4 bytes apiece in array("I")
+# (a set spends ~40 bytes per entry). _NO_DOCS stands in for missing terms
+# and is never appended to.
+_DOC_ID_TYPE = "I"
+_NO_DOCS = array(_DOC_ID_TYPE)
+
+# 📚 MERGE POLICY - adjacent saved segments combined per merge, and the share
+# of a segment's docs that must be dead before it is rewritten on its own
+_MERGE_FACTOR = 4
+_EXPUNGE_RATIO = 0.2
+
+# ⚖️ GALLOP OR FILTER - binary searching pays off once the longer list is
+# this many times the shorter; closer sizes are filtered at C speed instead
+_GALLOP_RATIO = 12
+
+# 🗺️ PLANNED PREDICATES - SearchQuery fields the in-memory indexes can resolve
+_INDEXABLE_PREDICATES = ("text", "exact_phrase", "all_words", "any_words", "exclude_words", "tags")
+
+# 🎯 RELEVANCE FIELDS - BM25F weighs a word's count in each field separately.
+# Every text posting carries a frequency packing its count in the summary
+# (high 16 bits) and in the rest of the text (low 16 bits); every doc keeps
+# its length in each field, in words (tags: how many it has)
+_LENGTH_FIELDS = ("body", "summary", "tags")
+_FREQUENCY_BITS = 16
+_FREQUENCY_MAX = (1 << _FREQUENCY_BITS) - 1
+
+
+# 🏎️ RANKING DEPTH - MOST_RELEVANT hands SQL the best offset + limit
+# candidates, this many times over when its filters turn out to reject
+# some of them
+_RANKING_WIDEN = 4
+
+# 🗂️ FACETS - per-doc values kept next to the postings (like doc values) so
+# filter suggestions and related tags are counted from the indexes, over
+# at most _FACET_SAMPLE of the newest matches
+_FACET_FIELDS = ("severity", "language", "project", "tags")
+_FACET_SAMPLE = 1000
+
+# 🔡 FUZZY SEARCH - a word no log contains is matched to indexed words
+# spelled like it: one edit away from 4 letters, two from 8; expanding
+# words may take this share of max_search_time_ms
+_FUZZY_MIN_LENGTH = 4
+_FUZZY_TWO_EDITS_LENGTH = 8
+_FUZZY_BUDGET_SHARE = 0.25
+
+
+def _pack_frequency(body: int, summary: int) -> int:
+    return min(summary, _FREQUENCY_MAX) << _FREQUENCY_BITS | min(body, _FREQUENCY_MAX)
+
+
+def _fuzzy_distance(word: str) -> int:
+    """How many typos a word may have and still match (0: too short to guess)."""
+    if len(word) < _FUZZY_MIN_LENGTH:
+        return 0
+    return 1 if len(word) < _FUZZY_TWO_EDITS_LENGTH else 2
+
+
+def _facet_values(log: LogEntry) -> Tuple[Tuple[str, ...], ...]:
+    """A log's values of each of _FACET_FIELDS (a missing one has none)."""
+    severity = getattr(log.severity, "value", log.severity)
+    return (
+        (severity,) if severity else (),
+        (log.language,) if log.language else (),
+        (log.project_name,) if log.project_name else (),
+        tuple(dict.fromkeys(log.tags)),
+    )
+
+
+def _like_sql(fields: Sequence[str]) -> str:
+    """🔍 "Does any of these fields contain ?" - one LIKE pattern per field."""
+    return "(" + " OR ".join(f"IFNULL({name}, '') LIKE ? ESCAPE '\\'" for name in fields) + ")"
+
+
+def _like_pattern(text: str) -> str:
+    """🔍 %text% with LIKE's own wildcards escaped, so user_id can't match userXid."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _extract_words(text: str) -> List[str]:
+    """
+    🔤 BREAKING TEXT INTO SEARCHABLE WORDS
+    
+    This takes a chunk of text and breaks it down into individual words
+    that can be searched. Like a librarian creating individual index
+    cards for every important word in a book's title and content.
+    """
+    if not text:
+        return []
+    
+    # Convert to lowercase for case-insensitive searching
+    text = text.lower()
+    
+    # Extract words (letters, numbers, underscores)
+    # This regex finds programming-friendly words like "IndexError" or "user_name"
+    words = re.findall(r'\b\w+\b', text)
+    
+    # Remove very short words (less than 2 characters) and very common words
+    words = [word for word in words if len(word) >= 2 and word not in _STOPWORDS]
+    
+    return words
+
+
+def _unguessed_parts(text: str, guessed: Set[str]) -> List[str]:
+    """
+    ✂️ What's left of text once the guessed words are cut out of it
+
+    "Connection timout refused" with "timout" guessed leaves "Connection"
+    and "refused" - the parts a LIKE check can still confirm as written.
+    """
+    parts = re.split(r"\b(?:" + "|".join(map(re.escape, guessed)) + r")\b", text, flags=re.IGNORECASE)
+    return [part.strip() for part in parts if re.search(r"\w", part)]
+
+
+def _extract_bigrams(words: List[str]) -> List[str]:
+    """
+    📝 CREATING TWO-WORD PHRASES FOR BETTER SEARCH
+    
+    This creates pairs of adjacent words, which helps with phrase
+    searching. Like indexing both "connection" and "timeout" separately,
+    but also indexing "connection timeout" as a phrase.
+    """
+    if len(words) < 2:
+        return []
+    
+    bigrams = []
+    for i in range(len(words) - 1):
+        bigram = f"{words[i]} {words[i+1]}"
+        bigrams.append(bigram)
+    
+    return bigrams
+
+
+def _intersect(lookups: Sequence[Tuple[str, array]]) -> array:
+    """🔀 Intersect posting lists smallest first, stopping as soon as nothing is left."""
+    ordered = sorted((ids for _, ids in lookups), key=len)
+    result = ordered[0]
+    for ids in ordered[1:]:
+        if not result:
+            break
+        result = _intersect_pair(result, ids)
+    return result
+
+
+def _intersect_pair(small: array, large: array) -> array:
+    """
+    🔀 Doc ids in both sorted lists
+    
+    Each id of the short list is binary searched in the long one, and the
+    search only moves forward, so the cost follows the short list: a rare
+    word costs the same against a common word as against another rare one.
+    Two lists of similar length are instead filtered through a set of the
+    shorter one, which keeps the longer one's order.
+    """
+    if len(large) < _GALLOP_RATIO * len(small):
+        return array(_DOC_ID_TYPE, filter(set(small).__contains__, large))
+    found = array(_DOC_ID_TYPE)
+    position, end = 0, len(large)
+    for doc in small:
+        position = bisect_left(large, doc, position)
+        if position == end:
+            break
+        if large[position] == doc:
+            found.append(doc)
+    return found
+
+
+def _union(lists: Sequence[array]) -> array:
+    """🔀 Doc ids in any of the sorted lists, sorted."""
+    non_empty = [ids for ids in lists if ids]
+    if len(non_empty) <= 1:
+        return non_empty[0] if non_empty else _NO_DOCS
+    return array(_DOC_ID_TYPE, sorted(set().union(*non_empty)))
+
+
+def _difference(ids: array, removed: array) -> array:
+    """
+    🔀 Doc ids in ids but not in removed (both sorted)
+    
+    Finds the positions to drop by walking the shorter list, then copies
+    the runs between them; ids itself comes back when nothing matched.
+    Lists of similar length are filtered through a set instead.
+    """
+    if max(len(ids), len(removed)) < _GALLOP_RATIO * min(len(ids), len(removed)):
+        kept = array(_DOC_ID_TYPE, itertools.filterfalse(set(removed).__contains__, ids))
+        return ids if len(kept) == len(ids) else kept
+    positions = _removed_positions(ids, removed)
+    return _without(ids, positions) if positions else ids
+
+
+def _removed_positions(ids: array, removed: array) -> List[int]:
+    """🔀 Positions in ids (sorted) of the doc ids in removed (sorted), walking the shorter list."""
+    positions: List[int] = []
+    if len(removed) <= len(ids):
+        position, end = 0, len(ids)
+        for doc in removed:
+            position = bisect_left(ids, doc, position)
+            if position == end:
+                break
+            if ids[position] == doc:
+                positions.append(position)
+    else:
+        position, end = 0, len(removed)
+        for index, doc in enumerate(ids):
+            position = bisect_left(removed, doc, position)
+            if position == end:
+                break
+            if removed[position] == doc:
+                positions.append(index)
+    return positions
+
+
+def _without(values: array, positions: List[int]) -> array:
+    """🔀 values minus the entries at positions (ascending), copied run by run."""
+    kept = array(values.typecode)
+    start = 0
+    for position in positions:
+        kept.extend(values[start:position])
+        start = position + 1
+    kept.extend(values[start:])
+    return kept
+
+
+def _matches(docs: Sequence[int], ids: array) -> Iterator[Tuple[int, int]]:
+    """
+    🔀 (doc, position in ids) for every doc of docs found in ids (both sorted)
+    
+    Gallops through ids when it is much longer than docs, like
+    _intersect_pair; otherwise walks ids once against a set of docs.
+    """
+    if len(ids) >= _GALLOP_RATIO * len(docs):
+        position, end = 0, len(ids)
+        for doc in docs:
+            position = bisect_left(ids, doc, position)
+            if position == end:
+                return
+            if ids[position] == doc:
+                yield doc, position
+    else:
+        wanted = set(docs)
+        for position, doc in enumerate(ids):
+            if doc in wanted:
+                yield doc, position
+
+
 @dataclass
 class SearchQuery:
     """
@@ -116,6 +396,7 @@ class SearchQuery:
     sort_by: SortOrder = SortOrder.NEWEST_FIRST   # How to order results
     limit: int = 100                              # Maximum results to return
     offset: int = 0                               # Results to skip (for pagination)
+    cursor: Optional[str] = None                  # next_cursor from the previous page (replaces offset)
     
     # 🎛️ ADVANCED OPTIONS
     case_sensitive: bool = False                  # Should text search care about capitalization?
@@ -150,6 +431,645 @@ class SearchResult:
     suggested_filters: Optional[Dict[str, List[str]]] = None   # Suggested ways to refine the search
     related_tags: Optional[List[str]] = None                   # Tags that appear in results
     trending_terms: Optional[List[str]] = None                 # Popular search terms in your results
+    
+    # 🔖 PAGINATION
+    next_cursor: Optional[str] = None                          # Pass as SearchQuery.cursor for the next page
+    
+    # 🗺️ HOW THE SEARCH RAN
+    query_plan: Optional["QueryPlan"] = None                   # What the indexes answered and what SQL checked
+
+
+@dataclass
+class QueryPlan:
+    """
+    🗺️ THE SEARCH PLAN - what the indexes answered and what SQL still checks
+    
+    Before touching the database, SearchManager looks each word and tag up
+    in its in-memory posting lists (word -> log ids) and intersects them,
+    smallest list first, so the database is asked for only the few ids that
+    can possibly match.
+    
+    🏆 HIGH SCHOOL EXPLANATION:
+    Like using the index at the back of a textbook: to find pages about
+    "photosynthesis" AND "chlorophyll", look both up, start from the shorter
+    page list and keep only the pages that are in both - then open just
+    those pages to double-check.
+    """
+    candidate_ids: Optional[Set[str]] = None       # None: no index lookup applied; else the only ids that can match
+    sql_predicates: Set[str] = field(default_factory=set)  # SearchQuery fields SQL must still check
+    steps: List[Tuple[str, int]] = field(default_factory=list)  # (lookup, ids found), in intersection order
+    index_used: bool = False                       # False when the indexes were stale and SQL did everything
+    generation: Optional[int] = None               # Database generation the indexes reflected
+    scores: Optional[Dict[str, float]] = None      # MOST_RELEVANT: BM25F scores of the top-ranked candidate ids
+    ranked_out: int = 0                            # MOST_RELEVANT: lower-ranked candidates left out of scores
+    facets: Optional[Dict[str, Counter]] = None    # Facet field → value counts over (a sample of) the candidates
+    fuzzy_expansions: Dict[str, List[str]] = field(default_factory=dict)  # Unmatched word → words spelled like it
+    fuzzy_checks: Dict[str, List[Tuple[List[str], Optional[Set[str]]]]] = field(default_factory=dict)
+    # ↑ Predicate with guessed words → per value, (its parts SQL still LIKE-checks, ids it is limited to)
+
+
+class _ResultCache:
+    """
+    🗄️ RECENT ANSWERS - search results kept until the next write
+    
+    Every result is filed under its normalized query together with the
+    database's write generation when it was computed. A write moves the
+    generation on, so a cached result is only ever served while nothing
+    has been written since - no timer guesses when it might be stale.
+    Least recently used results are dropped past max_entries.
+    
+    🏆 HIGH SCHOOL EXPLANATION:
+    Like a librarian who remembers the answer to a question asked five
+    minutes ago - and forgets it the moment a new book is shelved, because
+    the answer might have changed.
+    """
+    
+    def __init__(self):
+        self._results: "OrderedDict[Tuple, Tuple[int, SearchResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0    # Misses because a write came after the cached result
+        self.evictions = 0
+    
+    @staticmethod
+    def key(query: SearchQuery, config: Dict[str, Any]) -> Optional[Tuple]:
+        """
+        🔑 A query's cache key under config, or None if its results depend on the clock
+        
+        Lists are sets as far as searching goes (IN filters, all/any/none
+        of these words), so they are sorted and deduplicated.
+        """
+        if query.last_n_days or query.last_n_hours:
+            return None
+        key = [json.dumps(config, sort_keys=True)]
+        for option in fields(query):
+            value = getattr(query, option.name)
+            if isinstance(value, list):
+                value = tuple(sorted(set(value), key=str))
+            key.append(value)
+        return tuple(key)
+    
+    def get(self, key: Tuple, generation: int) -> Optional[SearchResult]:
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] == generation:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            if cached is not None:
+                del self._results[key]
+                self.invalidations += 1
+            self.misses += 1
+            return None
+    
+    def put(self, key: Tuple, generation: int, result: SearchResult, max_entries: int):
+        with self._lock:
+            self._results[key] = (generation, result)
+            self._results.move_to_end(key)
+            while len(self._results) > max_entries:
+                self._results.popitem(last=False)
+                self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._results),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+def _pick_merge(segments: Sequence[IndexSegment], dead: Set[int],
+                max_segments: int) -> Optional[Tuple[int, int]]:
+    """
+    📚 The [start, end) run of saved segments to merge next, or None
+    
+    Too many segments: the adjacent _MERGE_FACTOR with the fewest docs
+    between them, so small recent segments are merged often and big old
+    ones rarely. Otherwise the first segment at least _EXPUNGE_RATIO dead.
+    """
+    if len(segments) > max_segments:
+        width = min(_MERGE_FACTOR, len(segments))
+        sizes = [segment.doc_count for segment in segments]
+        start = min(range(len(segments) - width + 1), key=lambda i: sum(sizes[i:i + width]))
+        return start, start + width
+    if dead and segments:
+        starts = [segment.first_doc for segment in segments]
+        counts = [0] * len(segments)
+        for doc in dead:
+            position = bisect_right(starts, doc) - 1
+            if position >= 0:
+                counts[position] += 1
+        for position, segment in enumerate(segments):
+            if counts[position] and counts[position] >= _EXPUNGE_RATIO * segment.doc_count:
+                return position, position + 1
+    return None
+
+
+def _post(postings: Dict[str, array], term: str, doc: int):
+    """Append doc to term's posting list (doc is the newest id, so order holds)."""
+    ids = postings.get(term)
+    if ids is None:
+        postings[term] = array(_DOC_ID_TYPE, (doc,))
+    elif ids[-1] != doc:
+        ids.append(doc)
+
+
+class _MemorySegment:
+    """
+    📥 THE IN-TRAY - posting lists for the newest writes, still growing
+    
+    Every stored version of a log gets a fresh integer doc id. Doc ids
+    only ever grow, so indexing a log appends to the end of each of its
+    posting lists and they stay sorted for free. Retiring a doc (its log
+    was replaced or deleted) only forgets its log id: the old postings
+    stay behind until compaction sweeps them out, so updates never have to
+    hunt down every list the old version appeared in.
+    
+    Without an index directory this one segment holds everything; with
+    one, it is frozen and written to disk as an IndexSegment once it
+    grows big enough.
+    """
+    
+    def __init__(self, first_doc: int = 0):
+        self.text: Dict[str, array] = {}         # Word → sorted doc ids containing that word
+        self.tags: Dict[str, array] = {}         # Lowercased tag → sorted doc ids with that tag
+        self.bigrams: Dict[str, array] = {}      # Two-word phrase → sorted doc ids
+        self.frequencies: Dict[str, array] = {}  # Word → packed counts, parallel to its text postings
+        self.doc_ids: Dict[str, int] = {}        # Log id → its live doc id
+        self.log_ids: Dict[int, str] = {}        # Live doc id → log id (in doc id order)
+        self.lengths = [array(_DOC_ID_TYPE) for _ in _LENGTH_FIELDS]  # Per field, indexed by doc - first_doc
+        self.facets = [FacetColumn() for _ in _FACET_FIELDS]          # Per facet, indexed by doc - first_doc
+        self.first_doc = first_doc               # Every doc id here is at least this
+        self.swept: Set[int] = set()             # Retired doc ids still in the posting lists once frozen
+        self._fragment_words: Dict[str, List[str]] = {}  # Planner cache: fragment → words containing it
+        self._trigrams: Optional[TermTrigrams] = None    # Fuzzy search: built on first use, then kept up
+    
+    def add(self, doc: int, log: LogEntry):
+        """
+        📝 INDEXING ONE DOCUMENT - Adding to Our Card Catalog
+        
+        This takes one log entry and adds it to all our specialized indexes.
+        Like a librarian processing a new book by adding cards to multiple
+        card catalogs (title catalog, author catalog, subject catalog, etc.).
+        """
+        self.doc_ids[log.log_id] = doc
+        self.log_ids[doc] = log.log_id
+        
+        # 🔤 INDEX ALL TEXT CONTENT
+        # Extract the words of every searchable field; the summary's are
+        # counted separately so relevance ranking can weigh them higher
+        summary_words = _extract_words(log.summary)
+        words = [
+            *_extract_words(log.original_log),
+            *_extract_words(log.processed_log),
+            *summary_words,
+            *_extract_words(log.project_name),
+            *_extract_words(log.file_path),
+        ]
+        in_summary = Counter(summary_words)
+        for word, count in Counter(words).items():  # Repeated words are posted once, with their count
+            ids = self.text.get(word)
+            if ids is None:
+                ids = self.text[word] = array(_DOC_ID_TYPE)
+                self.frequencies[word] = array(_DOC_ID_TYPE)
+                self._forget_fragments_of(word)
+                if self._trigrams is not None:
+                    self._trigrams.add(word)
+            ids.append(doc)
+            summary_count = in_summary.get(word, 0)
+            self.frequencies[word].append(_pack_frequency(count - summary_count, summary_count))
+        
+        # 📏 FIELD LENGTHS for relevance ranking
+        body_length, summary_length, tag_count = self.lengths
+        body_length.append(len(words) - len(summary_words))
+        summary_length.append(len(summary_words))
+        tag_count.append(len(log.tags))
+        
+        # 🗂️ FACET VALUES for filter suggestions
+        for column, values in zip(self.facets, _facet_values(log)):
+            column.append(values)
+        
+        # 🏷️ INDEX TAGS
+        for tag in log.tags:
+            _post(self.tags, tag.lower(), doc)
+        
+        # 📝 INDEX WORD PAIRS (BIGRAMS) for phrase searching
+        # This helps with searches like "index error" or "connection timeout"
+        for bigram in _extract_bigrams(words):
+            _post(self.bigrams, bigram, doc)
+    
+    def remove(self, doc: int):
+        """🗑️ Forget a retired doc's log id (its postings wait for compaction)."""
+        del self.doc_ids[self.log_ids.pop(doc)]
+    
+    def fields(self) -> Dict[str, Dict[str, array]]:
+        return {"text": self.text, "tags": self.tags, "bigrams": self.bigrams}
+    
+    # The read interface shared with IndexSegment
+    @property
+    def doc_count(self) -> int:
+        return len(self.log_ids)
+    
+    def postings(self, field: str, term: str) -> array:
+        return self.fields()[field].get(term, _NO_DOCS)
+    
+    def postings_with_frequencies(self, field: str, term: str) -> Tuple[array, array]:
+        if field != "text":
+            return _NO_DOCS, _NO_DOCS
+        return self.text.get(term, _NO_DOCS), self.frequencies.get(term, _NO_DOCS)
+    
+    def lengths_of(self, doc: int) -> Optional[Tuple[int, ...]]:
+        position = doc - self.first_doc
+        if 0 <= position < len(self.lengths[0]):
+            return tuple(column[position] for column in self.lengths)
+        return None
+    
+    def facets_of(self, doc: int) -> Optional[Tuple[Tuple[str, ...], ...]]:
+        position = doc - self.first_doc
+        if 0 <= position < len(self.lengths[0]):
+            return tuple(column.values_at(position) for column in self.facets)
+        return None
+    
+    def facet_counts(self, docs: Iterable[int]) -> List[Counter]:
+        positions = [doc - self.first_doc for doc in docs]
+        return [column.count(positions) for column in self.facets]
+    
+    def log_id(self, doc: int) -> Optional[str]:
+        return self.log_ids.get(doc)
+    
+    def docs_of(self, log_id: str) -> List[int]:
+        doc = self.doc_ids.get(log_id)
+        return [] if doc is None else [doc]
+    
+    def items(self) -> Iterator[Tuple[int, str]]:
+        return iter(list(self.log_ids.items()))
+    
+    def term_count(self, field: str) -> int:
+        return len(self.fields()[field])
+    
+    def words_containing(self, field: str, fragment: str) -> List[str]:
+        """🔎 Indexed words containing fragment (cached until a new word could join them)."""
+        words = self._fragment_words.get(fragment)
+        if words is None:
+            words = [word for word in self.text if fragment in word]
+            if len(self._fragment_words) >= 1024:
+                self._fragment_words.clear()
+            self._fragment_words[fragment] = words
+        return words
+    
+    def similar_words(self, field: str, word: str, max_distance: int, deadline: float) -> List[Tuple[int, str]]:
+        """🔡 (distance, word) for indexed words within max_distance edits of word."""
+        if self._trigrams is None:
+            self._trigrams = TermTrigrams(self.text)
+        return self._trigrams.similar(word, max_distance, deadline)
+    
+    def _forget_fragments_of(self, word: str):
+        """A new word joins the vocabulary: drop cached fragment lookups it belongs in."""
+        if self._fragment_words:
+            for fragment in [fragment for fragment in self._fragment_words if fragment in word]:
+                del self._fragment_words[fragment]
+
+
+class _SearchIndex:
+    """
+    📇 THE CARD CATALOG - posting lists for the logs in the database
+    
+    A stack of segments covering ascending ranges of doc ids: immutable
+    ones (IndexSegments mapped from disk, or in-memory segments waiting to
+    be written) and, on top, the mutable in-memory segment new writes go
+    to. A term's posting list is its lists from each segment, one after
+    another. Segments are never edited, so when a log is replaced or
+    deleted its doc id goes on the dead list instead; merges and
+    compaction drop dead docs for good.
+    """
+    
+    def __init__(self, segments: Sequence[Any] = (), next_doc: int = 0, dead: Iterable[int] = ()):
+        self.segments: List[Any] = list(segments)  # Immutable segments, oldest first
+        self.memory = _MemorySegment(next_doc)     # Where new writes go
+        self.dead: Set[int] = set(dead)            # Retired doc ids still in some posting list
+        self.generation = _STALE                   # Database generation these postings reflect
+        self.segments_generation: Optional[int] = None  # Generation the saved segments are complete up to
+        self.dead_after_compaction = len(self.dead)
+        self._next_doc = next_doc
+        self._segment_starts = [segment.first_doc for segment in self.segments]
+        # Live docs' summed field lengths and how many have each field, for
+        # BM25F's average lengths (of the docs that have the field at all)
+        self.total_lengths = [sum(segment.total_lengths[name] for segment in self.segments)
+                              for name in _LENGTH_FIELDS]
+        self.docs_with_field = [sum(segment.docs_with_field[name] for segment in self.segments)
+                                for name in _LENGTH_FIELDS]
+        for doc in self.dead:
+            self._subtract_lengths(self._segment_of(doc), doc)
+    
+    # Shorthands for the in-memory segment
+    @property
+    def text(self) -> Dict[str, array]:
+        return self.memory.text
+    
+    @property
+    def tags(self) -> Dict[str, array]:
+        return self.memory.tags
+    
+    @property
+    def bigrams(self) -> Dict[str, array]:
+        return self.memory.bigrams
+    
+    def add(self, log: LogEntry):
+        """📝 Index one log under a fresh doc id, retiring the version indexed before."""
+        self.remove(log.log_id)
+        doc = self._next_doc
+        self._next_doc += 1
+        self.memory.add(doc, log)
+        for position, length in enumerate(self.memory.lengths_of(doc)):
+            self.total_lengths[position] += length
+            self.docs_with_field[position] += length > 0
+    
+    def remove(self, log_id: str):
+        """🗑️ Retire a log's live doc id (a no-op if it isn't indexed)."""
+        doc = self.memory.doc_ids.get(log_id)
+        if doc is not None:
+            self.memory.remove(doc)
+            self.dead.add(doc)
+            self._subtract_lengths(self.memory, doc)
+            return
+        for segment in reversed(self.segments):
+            for doc in segment.docs_of(log_id):
+                if doc not in self.dead:
+                    self.dead.add(doc)
+                    self._subtract_lengths(segment, doc)
+                    return
+    
+    def _subtract_lengths(self, segment: Any, doc: int):
+        for position, length in enumerate(segment.lengths_of(doc) or ()):
+            self.total_lengths[position] -= length
+            self.docs_with_field[position] -= length > 0
+    
+    def apply(self, change: LogChange):
+        """📣 Apply one committed write; applying it twice gives the same result."""
+        for log_id in change.deleted_ids:
+            self.remove(log_id)
+        for log in change.stored:
+            self.add(log)
+        self.generation = max(self.generation, change.generation)
+    
+    # ------------------------------------------------------------------
+    # 🔎 READING ACROSS SEGMENTS
+    # ------------------------------------------------------------------
+    
+    def postings(self, field: str, term: str) -> array:
+        """📋 A term's sorted doc ids from every segment (dead docs included)."""
+        parts = [ids for ids in (segment.postings(field, term) for segment in self.segments) if ids]
+        ids = self.memory.postings(field, term)
+        if ids:
+            parts.append(ids)
+        if len(parts) <= 1:
+            return parts[0] if parts else _NO_DOCS
+        joined = array(_DOC_ID_TYPE)
+        for ids in parts:
+            joined.extend(ids)
+        return joined
+    
+    def postings_with_frequencies(self, field: str, term: str) -> Tuple[array, array]:
+        """📋 A term's doc ids from every segment, with its packed frequency in each."""
+        parts = [pair for pair in (segment.postings_with_frequencies(field, term)
+                                   for segment in [*self.segments, self.memory]) if pair[0]]
+        if len(parts) <= 1:
+            return parts[0] if parts else (_NO_DOCS, _NO_DOCS)
+        ids, frequencies = array(_DOC_ID_TYPE), array(_DOC_ID_TYPE)
+        for segment_ids, segment_frequencies in parts:
+            ids.extend(segment_ids)
+            frequencies.extend(segment_frequencies)
+        return ids, frequencies
+    
+    def words_containing(self, fragment: str) -> List[str]:
+        """🔎 Indexed words containing fragment, from every segment."""
+        if not self.segments:
+            return self.memory.words_containing("text", fragment)
+        words = dict.fromkeys(self.memory.words_containing("text", fragment))
+        for segment in self.segments:
+            words.update(dict.fromkeys(segment.words_containing("text", fragment)))
+        return list(words)
+    
+    def similar_words(self, word: str, max_distance: int, limit: int, deadline: float) -> List[str]:
+        """🔡 Up to limit indexed words within max_distance edits of word, closest first."""
+        closest: Dict[str, int] = {}
+        for segment in [*self.segments, self.memory]:
+            for distance, similar in segment.similar_words("text", word, max_distance, deadline):
+                closest[similar] = min(distance, closest.get(similar, distance))
+        return sorted(closest, key=lambda similar: (closest[similar], similar))[:limit]
+    
+    def _segment_of(self, doc: int) -> Any:
+        if doc >= self.memory.first_doc:
+            return self.memory
+        return self.segments[bisect_right(self._segment_starts, doc) - 1]
+    
+    def live_log_ids(self, docs: Iterable[int]) -> Set[str]:
+        """🪪 The log ids of the live docs among docs (retired ones drop out)."""
+        return {log_id for _, log_id in self.live_docs(docs)}
+    
+    def live_docs(self, docs: Iterable[int]) -> Iterator[Tuple[int, str]]:
+        """🪪 (doc id, log id) for the live docs among docs, in order."""
+        memory, dead = self.memory, self.dead
+        for doc in docs:
+            if doc >= memory.first_doc:
+                log_id = memory.log_ids.get(doc)
+            elif doc in dead or not self.segments:
+                continue
+            else:
+                log_id = self._segment_of(doc).log_id(doc)
+            if log_id is not None:
+                yield doc, log_id
+    
+    def live(self, docs: Iterable[int]) -> List[int]:
+        """🪪 The live docs among docs, in order (no log id lookups)."""
+        memory, dead, first = self.memory.log_ids, self.dead, self.memory.first_doc
+        return [doc for doc in docs if ((doc in memory) if doc >= first else (doc not in dead))]
+    
+    def live_doc(self, log_id: str) -> Optional[int]:
+        """🪪 The live doc id of log_id, or None if it isn't indexed."""
+        doc = self.memory.doc_ids.get(log_id)
+        if doc is not None:
+            return doc
+        for segment in reversed(self.segments):
+            for doc in segment.docs_of(log_id):
+                if doc not in self.dead:
+                    return doc
+        return None
+    
+    def all_docs(self) -> array:
+        """📋 Every doc id in any segment, sorted (dead docs included)."""
+        docs = array(_DOC_ID_TYPE)
+        for segment in self.segments:
+            docs.extend(array(_DOC_ID_TYPE, segment.doc_ids) if isinstance(segment, IndexSegment)
+                        else array(_DOC_ID_TYPE, segment.log_ids))
+        docs.extend(array(_DOC_ID_TYPE, self.memory.log_ids))
+        return docs
+    
+    def live_items(self) -> Iterator[Tuple[int, str]]:
+        """🪪 Every live (doc id, log id), oldest first."""
+        for segment in self.segments:
+            for doc, log_id in segment.items():
+                if doc not in self.dead:
+                    yield doc, log_id
+        yield from self.memory.items()
+    
+    def live_count(self) -> int:
+        """🔢 How many logs the index holds."""
+        first = self.memory.first_doc
+        retired = sum(1 for doc in self.dead if doc < first)
+        return sum(segment.doc_count for segment in self.segments) - retired + len(self.memory.log_ids)
+    
+    def term_count(self, field: str) -> int:
+        """🔢 Distinct terms per segment, summed (a term in two segments counts twice)."""
+        return sum(segment.term_count(field) for segment in self.segments) + self.memory.term_count(field)
+    
+    # ------------------------------------------------------------------
+    # 🎯 RELEVANCE
+    # ------------------------------------------------------------------
+    
+    def score(self, docs: Sequence[int], terms: Sequence[str], weights: Dict[str, float],
+              k1: float, b: float) -> Dict[int, float]:
+        """
+        🎯 BM25F SCORES for live docs (ascending doc ids) against query terms
+        
+        A term's counts in each field are normalized by that field's length
+        relative to its average (among docs that have the field - most logs
+        have no summary), weighted and summed into one frequency,
+        which saturates through k1 and is scaled by the term's rarity
+        (idf). Only the stored counts and lengths are read, never the text.
+        A term's document frequency is the longer of its text and tag
+        posting lists, so it still counts retired docs until they are
+        swept - the same approximation segment merges make.
+        """
+        scores = dict.fromkeys(docs, 0.0)
+        if docs:
+            add_term = self._term_scorer(weights, k1, b)
+            for term in self._ranking_postings(terms):
+                add_term(scores, docs, term)
+        return scores
+    
+    def top_scores(self, docs: Sequence[int], terms: Sequence[str], depth: int,
+                   weights: Dict[str, float], k1: float, b: float) -> Dict[int, float]:
+        """
+        🏎️ THE depth BEST BM25F SCORES among live docs (ascending doc ids)
+        
+        Scores the same as score(), but term at a time, rarest term first,
+        dropping docs as it goes: a term adds less than its idf to any
+        score, so once a doc's score plus the idfs of the terms still to
+        come can't reach the depth-th best score so far, it can't make
+        the cut and its remaining terms are never looked at (max-score
+        pruning). Docs tied with the depth-th best all stay, so SQL's tie
+        breaks decide between them exactly as with every doc scored.
+        """
+        scores = dict.fromkeys(docs, 0.0)
+        if not docs:
+            return scores
+        add_term = self._term_scorer(weights, k1, b)
+        postings = sorted(self._ranking_postings(terms), key=lambda term: term[0], reverse=True)
+        idfs = [idf for idf, *_ in postings]
+        alive: Sequence[int] = docs
+        for position, term in enumerate(postings):
+            still_to_come = sum(idfs[position + 1:])
+            add_term(scores, alive, term)
+            if len(alive) > depth:
+                threshold = heapq.nlargest(depth, [scores[doc] for doc in alive])[-1]
+                alive = [doc for doc in alive if scores[doc] + still_to_come >= threshold]
+        if len(alive) > depth:
+            threshold = heapq.nlargest(depth, [scores[doc] for doc in alive])[-1]
+            alive = [doc for doc in alive if scores[doc] >= threshold]
+        return {doc: scores[doc] for doc in alive}
+    
+    def _ranking_postings(self, terms: Sequence[str]) -> List[Tuple[float, array, array, array]]:
+        """(idf, text doc ids, packed frequencies, tag doc ids) of each distinct indexed term."""
+        count = self.live_count()
+        postings = []
+        if count <= 0:
+            return postings
+        for term in dict.fromkeys(terms):
+            ids, frequencies = self.postings_with_frequencies("text", term)
+            tag_ids = self.postings("tags", term)
+            document_frequency = max(len(ids), len(tag_ids))
+            if document_frequency:
+                idf = math.log(1 + (count - document_frequency + 0.5) / (document_frequency + 0.5))
+                postings.append((idf, ids, frequencies, tag_ids))
+        return postings
+    
+    def _term_scorer(self, weights: Dict[str, float], k1: float, b: float):
+        """One term's BM25F contribution, added to scores of the docs (ascending) that have it."""
+        scales = [b / (total / docs_with if docs_with else 1.0)
+                  for total, docs_with in zip(self.total_lengths, self.docs_with_field)]
+        body_weight, summary_weight, tags_weight = (weights.get(name, 0.0) for name in _LENGTH_FIELDS)
+        memory, first = self.memory, self.memory.first_doc
+        cached: Dict[int, Tuple[float, ...]] = {}
+        
+        def norms(doc: int) -> Tuple[float, ...]:
+            """Each field's length normalization, 1 - b + b * length / average length."""
+            found = cached.get(doc)
+            if found is None:
+                if doc >= first:
+                    doc_lengths = [column[doc - first] for column in memory.lengths]
+                else:
+                    doc_lengths = self._segment_of(doc).lengths_of(doc) or (0,) * len(_LENGTH_FIELDS)
+                found = cached[doc] = tuple(1 - b + scale * length for scale, length in zip(scales, doc_lengths))
+            return found
+        
+        def add_term(scores: Dict[int, float], docs: Sequence[int], term: Tuple[float, array, array, array]):
+            idf, ids, frequencies, tag_ids = term
+            weighted: Dict[int, float] = {}
+            for doc, position in _matches(docs, ids):
+                body, summary = frequencies[position] & _FREQUENCY_MAX, frequencies[position] >> _FREQUENCY_BITS
+                body_norm, summary_norm, _ = norms(doc)
+                weighted[doc] = ((body_weight * body / body_norm if body else 0.0)
+                                 + (summary_weight * summary / summary_norm if summary else 0.0))
+            for doc, _ in _matches(docs, tag_ids):
+                weighted[doc] = weighted.get(doc, 0.0) + tags_weight / norms(doc)[2]
+            for doc, frequency in weighted.items():
+                scores[doc] += idf * frequency / (k1 + frequency)
+        
+        return add_term
+    
+    # ------------------------------------------------------------------
+    # 🗂️ FACETS
+    # ------------------------------------------------------------------
+    
+    def facet_counts(self, docs: Iterable[int]) -> Dict[str, Counter]:
+        """🗂️ How many of docs (live, ascending) have each value of each of _FACET_FIELDS."""
+        counts = {name: Counter() for name in _FACET_FIELDS}
+        for segment, segment_docs in itertools.groupby(docs, self._segment_of):
+            for counter, segment_counts in zip(counts.values(), segment.facet_counts(segment_docs)):
+                counter.update(segment_counts)
+        return counts
+    
+    # ------------------------------------------------------------------
+    # 🧊 SEGMENT STACK CHANGES (the caller holds the index lock)
+    # ------------------------------------------------------------------
+    
+    def freeze(self) -> Optional[_MemorySegment]:
+        """
+        🧊 Close the in-memory segment to new writes, ready to be written out
+        
+        Its retired docs leave the dead list (it no longer hands them out)
+        and are remembered in swept, so the written segment leaves them out.
+        """
+        frozen = self.memory
+        self.memory = _MemorySegment(self._next_doc)
+        frozen.swept = {doc for doc in self.dead if doc >= frozen.first_doc}
+        self.dead -= frozen.swept
+        self.dead_after_compaction = len(self.dead)
+        if not frozen.log_ids:
+            return None  # Nothing live: its postings only hold swept docs
+        self._replace_segments(len(self.segments), len(self.segments), [frozen])
+        return frozen
+    
+    def _replace_segments(self, start: int, end: int, replacements: Sequence[Any]):
+        self.segments[start:end] = replacements
+        self._segment_starts = [segment.first_doc for segment in self.segments]
 
 
 class SearchManager:
@@ -177,22 +1097,47 @@ class SearchManager:
     This SearchManager brings that level of expertise to finding error logs!
     """
     
-    def __init__(self, database_manager: DatabaseManager):
+    def __init__(self, database_manager: Union[DatabaseManager, AsyncDatabaseManager],
+                 index_dir: Optional[str] = None):
         """
         🏗️ SETTING UP THE SEARCH DEPARTMENT
         
         When we create a new SearchManager, it's like setting up a new
         search department in the library with all the tools, indexes,
         and systems needed to handle complex search requests efficiently.
+        
+        With index_dir, the indexes are also saved there as segments: a
+        restart maps them straight back in and only indexes the logs
+        written since, instead of reading the whole database again.
         """
         # 🗄️ CONNECTION TO THE MAIN DATABASE
-        self.db = database_manager
+        # search() runs its query through the async front desk (so it never
+        # blocks the event loop); self.db is the synchronous manager behind it
+        self.adb = AsyncDatabaseManager.wrap(database_manager)
+        self.db = self.adb.sync
         
         # 📚 SEARCH INDEXES FOR FAST LOOKUPS
-        # Like specialized card catalogs that make searching faster
-        self._text_index: Dict[str, Set[str]] = {}      # Word → Set of log IDs containing that word
-        self._tag_index: Dict[str, Set[str]] = {}       # Tag → Set of log IDs with that tag
-        self._bigram_index: Dict[str, Set[str]] = {}    # Two-word phrases → log IDs
+        # Like specialized card catalogs that make searching faster. The
+        # database's change feed keeps them up to date write by write; the
+        # lock gives every search one consistent generation to plan against
+        self._index = _SearchIndex()
+        self._index_lock = threading.RLock()
+        self._journal: Optional[List[LogChange]] = None    # Changes arriving while a rebuild runs
+        self._maintenance: Optional[threading.Thread] = None  # Background compaction/rebuild
+        self._maintenance_lock = threading.Lock()             # One compaction, flush or merge at a time
+        
+        # 💾 SAVED SEGMENTS - need the database's durable generation to know
+        # which writes a saved index is missing
+        self._segments: Optional[SegmentDirectory] = None
+        if index_dir is not None:
+            if getattr(self.db, "database_id", None):
+                self._segments = SegmentDirectory(index_dir)
+            else:
+                logger.warning("Saved search index segments need a single-file DatabaseManager; "
+                               "indexing in memory only")
+        
+        # 🗄️ RECENT RESULTS - served again until the next write
+        self._result_cache = _ResultCache()
         
         # 📊 SEARCH ANALYTICS
         self.search_history: List[Dict[str, Any]] = []  # Record of recent searches
@@ -204,12 +1149,21 @@ class SearchManager:
             "enable_fuzzy_search": True,        # Allow approximate matching
             "enable_auto_suggest": True,        # Provide search suggestions
             "max_search_time_ms": 5000,         # Maximum time to spend on one search
-            "index_rebuild_threshold": 1000,    # Rebuild indexes after this many new logs
+            "fuzzy_max_expansions": 10,         # Most spelled-alike words one misspelled word can match
+            "result_cache_size": 256,           # Recent results kept until the next write (0: no cache)
+            "index_compaction_threshold": 1000, # Sweep retired doc ids out after this many updates/deletes
+            "index_segment_size": 50000,        # Write the in-memory segment to index_dir at this many logs
+            "index_max_segments": 8,            # Merge saved segments beyond this many
+            "relevance_field_weights": {"summary": 2.0, "tags": 1.5, "body": 1.0},  # BM25F weight per field
+            "relevance_k1": 1.2,                # How quickly repeating a word stops adding to its score
+            "relevance_b": 0.75,                # How much longer fields are marked down (0 - 1)
             "highlight_context_chars": 200,     # Characters to show around search matches
         }
         
-        # 🚀 INITIALIZE SEARCH INDEXES
-        self._build_search_indexes()
+        # 🚀 INITIALIZE SEARCH INDEXES - subscribe first so no write slips between
+        self.db.add_change_listener(self._on_log_change)
+        if not self._load_search_indexes():
+            self._build_search_indexes()
         
         logger.info("Search manager initialized with full-text indexing")
     
@@ -223,123 +1177,335 @@ class SearchManager:
         one by keywords that appear in the content.
         
         These indexes let us find results in milliseconds instead of minutes!
+        
+        Only needed without saved segments (or to recover from a missed
+        change): the new catalog is built on the side while searches fall
+        back to SQL, writes that commit meanwhile are journaled and
+        replayed onto it, and then it replaces the old one.
         """
         logger.info("Building search indexes...")
         start_time = datetime.now()
         
-        # Clear existing indexes
-        self._text_index.clear()
-        self._tag_index.clear()
-        self._bigram_index.clear()
-        
-        # Get all logs from database (in batches to avoid memory issues)
-        batch_size = 1000
-        offset = 0
-        total_indexed = 0
-        
-        while True:
-            # Get a batch of logs
-            logs = self.db.search_logs(limit=batch_size, offset=offset)
-            if not logs:
-                break  # No more logs to process
-            
-            # Index each log in this batch
-            for log in logs:
-                self._index_log_content(log)
-                total_indexed += 1
-            
-            offset += batch_size
-        
-        # Calculate indexing performance
-        duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"Search indexes built: {total_indexed} logs indexed in {duration:.2f}s")
-        logger.info(f"Text index: {len(self._text_index)} terms")
-        logger.info(f"Tag index: {len(self._tag_index)} tags") 
-        logger.info(f"Bigram index: {len(self._bigram_index)} phrases")
+        # Walk every log in batches; iter_logs uses cursor pagination, so each
+        # batch is an index seek instead of re-skipping all earlier rows, and
+        # the projection skips metadata and the other fields we don't index
+        index = _SearchIndex()
+        if self._catch_up(index, self.db.iter_logs(batch_size=1000, columns=_INDEX_COLUMNS)):
+            logger.info(f"Search indexes built: {index.live_count()} logs indexed in "
+                        f"{(datetime.now() - start_time).total_seconds():.2f}s")
+            logger.info(f"Text index: {index.term_count('text')} terms")
+            logger.info(f"Tag index: {index.term_count('tags')} tags")
+            logger.info(f"Bigram index: {index.term_count('bigrams')} phrases")
     
-    def _index_log_content(self, log: LogEntry):
+    def _load_search_indexes(self) -> bool:
         """
-        📝 INDEXING ONE DOCUMENT - Adding to Our Card Catalog
+        💾 OPENING THE BOUND VOLUMES - start from the segments in index_dir
         
-        This takes one log entry and adds it to all our specialized indexes.
-        Like a librarian processing a new book by adding cards to multiple
-        card catalogs (title catalog, author catalog, subject catalog, etc.).
+        The manifest records the database generation its segments are
+        complete up to, so only logs stored after it are read and indexed;
+        deletes since are on its dead list, and if the log count still
+        disagrees the missing ones are found by id. Returns False (and the
+        caller rebuilds) when there is nothing usable on disk.
         """
-        log_id = log.log_id
-        
-        # 🔤 INDEX ALL TEXT CONTENT
-        # Combine all searchable text from the log
-        searchable_text = " ".join(filter(None, [
-            log.original_log,
-            log.processed_log,
-            log.summary,
-            log.project_name,
-            log.file_path
-        ]))
-        
-        # Extract individual words and add to text index
-        words = self._extract_words(searchable_text)
-        for word in words:
-            if word not in self._text_index:
-                self._text_index[word] = set()
-            self._text_index[word].add(log_id)
-        
-        # 🏷️ INDEX TAGS
-        for tag in log.tags:
-            tag_lower = tag.lower()
-            if tag_lower not in self._tag_index:
-                self._tag_index[tag_lower] = set()
-            self._tag_index[tag_lower].add(log_id)
+        if self._segments is None:
+            return False
+        manifest = self._segments.load()
+        if manifest is None:
+            return False
+        if manifest["database_id"] != self.db.database_id or manifest["generation"] > self.db.generation:
+            logger.info("Saved search index segments belong to another database; rebuilding")
+            return False
         
-        # 📝 INDEX WORD PAIRS (BIGRAMS) for phrase searching
-        # This helps with searches like "index error" or "connection timeout"
-        bigrams = self._extract_bigrams(words)
-        for bigram in bigrams:
-            if bigram not in self._bigram_index:
-                self._bigram_index[bigram] = set()
-            self._bigram_index[bigram].add(log_id)
+        start_time = datetime.now()
+        try:
+            index = _SearchIndex(self._segments.open(manifest), manifest["next_doc"], manifest["dead"])
+        except Exception as e:
+            logger.error(f"Failed to open saved search index segments: {e}")
+            return False
+        index.segments_generation = manifest["generation"]
+        changed = self.db.iter_logs_changed_since(manifest["generation"], columns=_INDEX_COLUMNS)
+        if not self._catch_up(index, changed, reconcile=True):
+            return False
+        logger.info(f"Search indexes loaded: {len(index.segments)} segments, {index.live_count()} logs, "
+                    f"{len(index.memory.log_ids)} indexed since they were saved, in "
+                    f"{(datetime.now() - start_time).total_seconds():.2f}s")
+        return True
     
-    def _extract_words(self, text: str) -> List[str]:
+    def _catch_up(self, index: _SearchIndex, logs: Iterable[LogEntry], reconcile: bool = False) -> bool:
         """
-        🔤 BREAKING TEXT INTO SEARCHABLE WORDS
+        🔁 FILL IN, CATCH UP AND SWAP IN
         
-        This takes a chunk of text and breaks it down into individual words
-        that can be searched. Like a librarian creating individual index
-        cards for every important word in a book's title and content.
+        Adds logs to index while searches fall back to SQL and writes are
+        journaled, then replays the journal (replaying a write the walk
+        already saw is harmless) and makes index the live one. With
+        reconcile, logs the index holds but the database no longer does
+        are retired. False if reading the database failed.
         """
-        if not text:
-            return []
+        with self._index_lock:
+            self._journal = []
+            self._index.generation = _STALE
+            generation = self.db.generation
         
-        # Convert to lowercase for case-insensitive searching
-        text = text.lower()
-        
-        # Extract words (letters, numbers, underscores)
-        # This regex finds programming-friendly words like "IndexError" or "user_name"
-        words = re.findall(r'\b\w+\b', text)
-        
-        # Remove very short words (less than 2 characters) and very common words
-        stopwords = {'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'the', 'is', 'was', 'are', 'were'}
-        words = [word for word in words if len(word) >= 2 and word not in stopwords]
+        index.generation = generation
+        try:
+            for log in logs:
+                index.add(log)
+            if reconcile and index.live_count() != self.db.count_logs():
+                stored = {row.log_id for row in self.db.iter_logs(batch_size=5000, columns=())}
+                for _, log_id in list(index.live_items()):
+                    if log_id not in stored:
+                        index.remove(log_id)
+        except Exception as e:
+            logger.error(f"Failed to build search indexes: {e}")
+            with self._index_lock:
+                self._journal = None
+            return False
+        
+        with self._index_lock:
+            for change in self._journal:
+                index.apply(change)
+            self._index, self._journal = index, None
+        if self._needs_maintenance(index):
+            self._start_maintenance()
+        return True
+    
+    def _on_log_change(self, change: LogChange):
+        """
+        📣 FILING THE NEW CARDS - apply one committed write to the indexes
         
-        return words
+        Runs on the writing thread right after the commit. A skipped
+        generation means a change was missed, so the indexes are marked
+        stale (searches use SQL) and rebuilt in the background.
+        """
+        with self._index_lock:
+            if self._journal is not None:
+                self._journal.append(change)  # A rebuild is running; it replays these
+                return
+            index = self._index
+            if index.generation != change.generation - 1:
+                index.generation = _STALE
+            else:
+                try:
+                    index.apply(change)
+                except Exception as e:
+                    logger.error(f"Failed to index change {change.generation}: {e}")
+                    index.generation = _STALE
+            needs_maintenance = self._needs_maintenance(index)
+        if needs_maintenance:
+            self._start_maintenance()
+    
+    def _needs_maintenance(self, index: _SearchIndex) -> bool:
+        """🧹 Stale, enough newly retired docs, or an in-memory segment due to be saved?"""
+        return (index.generation == _STALE
+                or len(index.dead) - index.dead_after_compaction >= self.config["index_compaction_threshold"]
+                or (self._segments is not None
+                    and len(index.memory.log_ids) >= self.config["index_segment_size"]))
+    
+    def _start_maintenance(self):
+        """🧹 Run compact_indexes on a background thread unless one is already running."""
+        with self._index_lock:
+            if self._maintenance is not None and self._maintenance.is_alive():
+                return
+            self._maintenance = threading.Thread(target=self.compact_indexes,
+                                                 name="debuggle-search-compaction", daemon=True)
+            self._maintenance.start()
+    
+    def compact_indexes(self):
+        """
+        🧹 SWEEPING OUT RETIRED CARDS - replaces periodic full rebuilds
+        
+        Removes the doc ids of deleted and replaced logs from the in-memory
+        posting lists and drops lists that end up empty. It works in
+        batches of posting lists, releasing the lock between batches so
+        searches and writes carry on. Retired doc ids are never reused, so
+        new writes can't be swept out by mistake. Stale indexes are rebuilt
+        instead. With an index directory it then saves a full in-memory
+        segment and merges saved segments (see flush_index and
+        merge_segments).
+        """
+        with self._maintenance_lock:
+            with self._index_lock:
+                index = self._index
+                if self._journal is not None:
+                    return  # A rebuild is already running
+                stale = index.generation == _STALE
+                first = index.memory.first_doc
+                dead = {doc for doc in index.dead if doc >= first}
+                index.dead -= dead
+                index.dead_after_compaction = len(index.dead)
+            
+            if stale:
+                self._build_search_indexes()
+                return
+            if dead:
+                self._sweep(index.memory, array(_DOC_ID_TYPE, sorted(dead)))
+                logger.debug(f"Compacted search indexes: {len(dead)} retired doc ids swept")
+            
+            if self._segments is not None:
+                if len(index.memory.log_ids) >= self.config["index_segment_size"]:
+                    self._flush(index)
+                if not self._merge(index) and index.segments:
+                    self._save_manifest(index)  # Record deletes since, so a restart needn't look for them
+    
+    def _sweep(self, memory: _MemorySegment, retired: array):
+        """🧹 Remove retired doc ids from a memory segment's posting lists, in batches."""
+        for postings in (memory.text, memory.tags, memory.bigrams):
+            frequencies = memory.frequencies if postings is memory.text else None
+            with self._index_lock:
+                terms = list(postings)
+            for start in range(0, len(terms), _COMPACTION_BATCH):
+                with self._index_lock:
+                    for term in terms[start:start + _COMPACTION_BATCH]:
+                        ids = postings.get(term)
+                        if ids is None:
+                            continue
+                        if frequencies is not None:
+                            # Frequencies stay parallel to their doc ids
+                            positions = _removed_positions(ids, retired)
+                            kept = _without(ids, positions) if positions else ids
+                            if kept and positions:
+                                frequencies[term] = _without(frequencies[term], positions)
+                            elif not kept:
+                                del frequencies[term]
+                        else:
+                            kept = _difference(ids, retired)
+                        if not kept:
+                            del postings[term]
+                        elif kept is not ids:
+                            postings[term] = kept
     
-    def _extract_bigrams(self, words: List[str]) -> List[str]:
+    # ------------------------------------------------------------------
+    # 💾 SAVED SEGMENTS
+    # ------------------------------------------------------------------
+    
+    def flush_index(self) -> bool:
         """
-        📝 CREATING TWO-WORD PHRASES FOR BETTER SEARCH
+        💾 SAVE THE IN-TRAY - write the in-memory segment to index_dir now
         
-        This creates pairs of adjacent words, which helps with phrase
-        searching. Like indexing both "connection" and "timeout" separately,
-        but also indexing "connection timeout" as a phrase.
+        Normally done in the background once index_segment_size logs have
+        piled up. False without an index directory, while the indexes are
+        stale or being rebuilt, or if writing failed.
         """
-        if len(words) < 2:
-            return []
+        if self._segments is None:
+            return False
+        with self._maintenance_lock:
+            return self._flush(self._index)
+    
+    def _flush(self, index: _SearchIndex) -> bool:
+        """
+        💾 Freeze the in-memory segment and write every frozen one to disk
         
-        bigrams = []
-        for i in range(len(words) - 1):
-            bigram = f"{words[i]} {words[i+1]}"
-            bigrams.append(bigram)
+        Frozen segments stay searchable from memory while they are written
+        and are then swapped for the mapped IndexSegment holding the same
+        doc ids. The manifest's generation moves up to the freeze, so a
+        restart indexes only what was written after it.
+        """
+        with self._index_lock:
+            if self._index is not index or self._journal is not None or index.generation == _STALE:
+                return False
+            index.freeze()
+            generation = index.generation
+            frozen = [segment for segment in index.segments if isinstance(segment, _MemorySegment)]
+        
+        for memory in frozen:
+            try:
+                fields, frequencies = memory.fields(), {"text": memory.frequencies}
+                if memory.swept:
+                    retired = array(_DOC_ID_TYPE, sorted(memory.swept))
+                    frequencies = {"text": {}}
+                    for term, ids in memory.text.items():
+                        positions = _removed_positions(ids, retired)
+                        frequencies["text"][term] = (_without(memory.frequencies[term], positions)
+                                                     if positions else memory.frequencies[term])
+                    fields = {name: {term: _difference(ids, retired) for term, ids in postings.items()}
+                              for name, postings in fields.items()}
+                docs = ((doc, log_id, memory.lengths_of(doc), memory.facets_of(doc))
+                        for doc, log_id in memory.log_ids.items())
+                segment = write_segment(self._segments.new_segment_path(), fields, docs,
+                                        frequencies, _LENGTH_FIELDS, _FACET_FIELDS)
+            except Exception as e:
+                logger.error(f"Failed to save search index segment: {e}")
+                return False
+            with self._index_lock:
+                if self._index is not index:
+                    return False
+                position = index.segments.index(memory)
+                index._replace_segments(position, position + 1, [segment])
+        
+        index.segments_generation = generation
+        self._save_manifest(index)
+        logger.info(f"Saved search index segment up to generation {generation}")
+        return True
+    
+    def merge_index_segments(self) -> int:
+        """
+        📚 MERGE SAVED SEGMENTS - fewer, denser volumes
         
-        return bigrams
+        Merges adjacent segments while there are more than
+        index_max_segments, and rewrites any segment whose docs are at
+        least _EXPUNGE_RATIO dead. Normally run in the background after
+        each flush. Returns the number of merges.
+        """
+        if self._segments is None:
+            return 0
+        with self._maintenance_lock:
+            return self._merge(self._index)
+    
+    def _merge(self, index: _SearchIndex) -> int:
+        """📚 Apply the merge policy until it is satisfied; the caller holds the maintenance lock."""
+        merges = 0
+        while True:
+            with self._index_lock:
+                if self._index is not index or not all(isinstance(s, IndexSegment) for s in index.segments):
+                    return merges
+                run = _pick_merge(index.segments, index.dead, self.config["index_max_segments"])
+                if run is None:
+                    return merges
+                start, end = run
+                segments = index.segments[start:end]
+                dead = {doc for doc in index.dead if segments[0].first_doc <= doc <= segments[-1].last_doc}
+            
+            try:
+                merged = merge_segments(self._segments.new_segment_path(), segments, dead)
+            except Exception as e:
+                logger.error(f"Failed to merge search index segments: {e}")
+                return merges
+            
+            with self._index_lock:
+                if self._index is not index or index.segments[start:end] != segments:
+                    return merges
+                index._replace_segments(start, end, [merged] if merged.doc_count else [])
+                index.dead -= dead
+                index.dead_after_compaction = len(index.dead)
+            self._save_manifest(index)
+            merges += 1
+            logger.info(f"Merged {len(segments)} search index segments ({len(dead)} dead docs dropped)")
+    
+    def _save_manifest(self, index: _SearchIndex):
+        """💾 Record index's saved segments, their dead docs and their generation."""
+        with self._index_lock:
+            if self._index is not index:
+                return
+            segments = [segment.name for segment in index.segments if isinstance(segment, IndexSegment)]
+            if len(segments) != len(index.segments):
+                return  # A frozen segment isn't written yet; its flush saves the manifest
+            manifest = {
+                "version": FORMAT_VERSION,
+                "database_id": self.db.database_id,
+                "generation": index.segments_generation,
+                "next_doc": index.memory.first_doc,
+                "segments": segments,
+                "dead": sorted(doc for doc in index.dead if doc < index.memory.first_doc),
+            }
+        try:
+            self._segments.save(manifest)
+        except Exception as e:
+            logger.error(f"Failed to save search index manifest: {e}")
+    
+    
+    # Word extraction is shared with relevance scoring and highlighting
+    _extract_words = staticmethod(_extract_words)
+    _extract_bigrams = staticmethod(_extract_bigrams)
     
     async def search(self, query: SearchQuery) -> SearchResult:
         """
@@ -361,14 +1527,30 @@ class SearchManager:
         start_time = datetime.now()
         logger.debug(f"Executing search query: {query}")
         
+        # 🗄️ ASKED BEFORE, AND NOTHING WRITTEN SINCE? Answer from the cache
+        cache_key = _ResultCache.key(query, self.config) if self.config["result_cache_size"] > 0 else None
+        generation = self.db.generation
+        if cache_key is not None:
+            cached = self._result_cache.get(cache_key, generation)
+            if cached is not None:
+                duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+                self._record_search(query, cached.total_matches, duration_ms)
+                return replace(cached, search_duration_ms=duration_ms, trending_terms=self._get_trending_terms())
+        
         try:
-            # 🎯 BUILD THE DATABASE QUERY based on search criteria
-            sql_query, params = self._build_sql_query(query)
+            # 🗺️ PLAN, BUILD AND EXECUTE THE SEARCH on a reader thread
+            # (abandoned after max_search_time_ms): the indexes narrow it down
+            # to candidate ids, SQL checks the rest on every database in range
+            plan, sql_query, rows = await self.adb.read(
+                self._plan_and_fetch, query,
+                timeout=self.config["max_search_time_ms"] / 1000
+            )
             
-            # ⚡ EXECUTE THE SEARCH using our optimized database query
-            with sqlite3.connect(self.db.database_path) as conn:
-                cursor = conn.execute(sql_query, params)
-                rows = cursor.fetchall()
+            # 🔖 KEYSET PAGINATION - one extra row was fetched to detect a next page
+            next_cursor = None
+            if self._supports_cursor(query) and len(rows) > query.limit:
+                rows = rows[:query.limit]
+                next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
             
             # 🔄 CONVERT DATABASE ROWS TO LOG ENTRIES
             logs = []
@@ -394,16 +1576,18 @@ class SearchManager:
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
             
             # 🎯 APPLY POST-PROCESSING (relevance scoring, highlighting, etc.)
-            if query.text or query.exact_phrase:
-                match_scores = self._calculate_relevance_scores(logs, query)
-                highlighted_snippets = self._generate_highlights(logs, query)
+            if query.text or query.exact_phrase or plan.scores is not None:
+                match_scores = self._calculate_relevance_scores(logs, query, plan)
+                highlighted_snippets = self._generate_highlights(logs, query, plan)
             else:
                 match_scores = None
                 highlighted_snippets = None
             
             # 💡 GENERATE SEARCH SUGGESTIONS
-            suggested_filters = self._generate_filter_suggestions(logs)
-            related_tags = self._extract_related_tags(logs)
+            # (counted from the indexes over the matches when they were
+            # used, else from this page of results)
+            suggested_filters = self._generate_filter_suggestions(logs, plan.facets)
+            related_tags = self._extract_related_tags(logs, plan.facets)
             
             # 📝 RECORD THIS SEARCH for analytics
             self._record_search(query, total_matches, duration_ms)
@@ -418,9 +1602,17 @@ class SearchManager:
                 highlighted_snippets=highlighted_snippets,
                 suggested_filters=suggested_filters,
                 related_tags=related_tags,
-                trending_terms=self._get_trending_terms()
+                trending_terms=self._get_trending_terms(),
+                next_cursor=next_cursor,
+                query_plan=plan
             )
             
+            # 🗄️ REMEMBER IT - unless a write landed meanwhile, or stale
+            # indexes left SQL to answer what they normally would (and rank)
+            planned_fully = plan.index_used or not plan.sql_predicates
+            if cache_key is not None and planned_fully and self.db.generation == generation:
+                self._result_cache.put(cache_key, generation, result, self.config["result_cache_size"])
+            
             logger.debug(f"Search completed: {total_matches} results in {duration_ms}ms")
             return result
             
@@ -442,7 +1634,245 @@ class SearchManager:
                 trending_terms=None
             )
     
-    def _build_sql_query(self, query: SearchQuery) -> Tuple[str, List[Any]]:
+    def _plan_and_fetch(self, query: SearchQuery) -> Tuple[QueryPlan, str, List[Tuple]]:
+        """
+        ⚡ Plan the query, build its SQL and run it (skipped when the indexes rule everything out)
+        
+        A ranked plan only hands SQL its best offset + limit candidates;
+        if SQL's own filters leave the page short while better-ranked ones
+        were left out, the query is planned again _RANKING_WIDEN times deeper.
+        """
+        depth = query.offset + query.limit
+        while True:
+            plan = self._plan_query(query, depth)
+            sql, params = self._build_sql_query(query, plan)
+            logger.debug(f"Query plan: {plan.steps}, SQL checks {sorted(plan.sql_predicates)}")
+            if plan.candidate_ids is not None and not plan.candidate_ids:
+                return plan, sql, []
+            rows = self._execute_on_partitions(query, sql, params, plan.scores)
+            if not plan.ranked_out or len(rows) >= query.limit:
+                return plan, sql, rows
+            depth *= _RANKING_WIDEN
+    
+    def _plan_query(self, query: SearchQuery, depth: Optional[int] = None) -> QueryPlan:
+        """
+        🗺️ THE QUERY PLANNER - answer what we can from the posting lists
+        
+        Every word and tag predicate becomes one or more posting lists
+        (sets of doc ids). They are intersected smallest first - the result
+        can only shrink, so starting small keeps every step cheap - and
+        exclude_words are subtracted at the end. A predicate is left to SQL
+        when the index only gives a superset of its matches (phrases, text
+        with punctuation, stopwords) or can't see it at all.
+        
+        Planning holds the index lock, so it sees exactly one generation of
+        the indexes. If that generation is behind the database's (a write
+        is being applied, or a rebuild is running) the whole query falls
+        back to SQL. depth caps how many candidates a MOST_RELEVANT plan
+        ranks (all of them by default).
+        """
+        present = {name for name in _INDEXABLE_PREDICATES if getattr(query, name)}
+        if not present:
+            return QueryPlan()
+        with self._index_lock:
+            if not self._index_is_current():
+                logger.debug("Search indexes are stale; answering the query with SQL only")
+                return QueryPlan(sql_predicates=present)
+            return self._plan_with_index(query, self._index, depth)
+    
+    def _plan_with_index(self, query: SearchQuery, index: _SearchIndex,
+                         depth: Optional[int] = None) -> QueryPlan:
+        """🗺️ The planner proper; the caller holds the index lock."""
+        plan = QueryPlan(sql_predicates=set(), index_used=True, generation=index.generation)
+        lookups: List[Tuple[str, array]] = []
+        deadline = time.monotonic() + self.config["max_search_time_ms"] / 1000 * _FUZZY_BUDGET_SHARE
+        
+        def resolve(text: str) -> Tuple[List[Tuple[str, array]], bool, Optional[List[str]]]:
+            """
+            A word predicate's posting lists and whether they are exact, with
+            spelled-alike words standing in for words that match nothing -
+            then the parts of text that weren't guessed at come third, for
+            SQL to LIKE-check (a LIKE on text itself would reject the guesses).
+            """
+            postings, exact = self._text_postings(index, text, exact_fields=True)
+            if self.config["enable_fuzzy_search"] and any(not ids for _, ids in postings):
+                fuzzy = self._fuzzy_postings(index, text, plan, deadline)
+                if fuzzy is not None and fuzzy[1]:  # Words that are all there just aren't in this order
+                    return fuzzy[0], True, _unguessed_parts(text, fuzzy[1])
+            return postings, exact, None
+        
+        def check(name: str, values: List[str],
+                  resolved: List[Tuple[List[Tuple[str, array]], bool, Optional[List[str]]]]):
+            """What SQL still checks of a predicate; per value when any of them was guessed at."""
+            if all(unguessed is None for _, _, unguessed in resolved):
+                if not all(postings and exact for postings, exact, _ in resolved):
+                    plan.sql_predicates.add(name)
+                return
+            checks = []
+            for value, (postings, exact, unguessed) in zip(values, resolved):
+                if unguessed is None:
+                    if name == "any_words" or not exact:
+                        checks.append(([value], None))
+                elif name == "any_words":
+                    # OR-ed with the other words, so it must bring its own candidates
+                    checks.append((unguessed, index.live_log_ids(index.live(_intersect(postings)))))
+                elif unguessed:
+                    checks.append((unguessed, None))
+            if checks:
+                plan.sql_predicates.add(name)
+                plan.fuzzy_checks[name] = checks
+        
+        if query.text:
+            resolved = resolve(query.text)
+            lookups.extend(resolved[0])
+            check("text", [query.text], [resolved])
+        if query.exact_phrase:
+            postings, exact = self._text_postings(index, query.exact_phrase, exact_fields=False)
+            lookups.extend(postings)
+            if not exact:
+                plan.sql_predicates.add("exact_phrase")
+        if query.all_words:
+            all_words = [resolve(word) for word in query.all_words]
+            for postings, _, _ in all_words:
+                lookups.extend(postings)
+            check("all_words", query.all_words, all_words)
+        
+        if query.any_words:
+            alternatives = [resolve(word) for word in query.any_words]
+            if all(postings for postings, _, _ in alternatives):
+                # Each alternative narrowed to its own intersection, then OR-ed
+                union = _union([_intersect(postings) for postings, _, _ in alternatives])
+                lookups.append((f"any_words {query.any_words}", union))
+            check("any_words", query.any_words, alternatives)
+        
+        if query.tags:
+            tag_ids = _union([index.postings("tags", tag.lower()) for tag in query.tags])
+            lookups.append((f"tags {query.tags}", tag_ids))
+            if not all(tag.isascii() for tag in query.tags):
+                plan.sql_predicates.add("tags")  # SQLite's NOCASE only folds ASCII
+        
+        excluded_lists: List[array] = []
+        for word in query.exclude_words or []:
+            postings, exact = self._text_postings(index, word, exact_fields=True)
+            if postings and exact:
+                excluded_lists.append(postings[0][1])
+            else:
+                plan.sql_predicates.add("exclude_words")  # A superset can't be subtracted
+        
+        excluded = _union(excluded_lists)
+        if not lookups and not excluded:
+            return plan
+        
+        # 🔀 INTERSECT SMALLEST FIRST
+        lookups.sort(key=lambda lookup: len(lookup[1]))
+        plan.steps = [(name, len(ids)) for name, ids in lookups]
+        candidates = _intersect(lookups) if lookups else index.all_docs()
+        if excluded:
+            candidates = _difference(candidates, excluded)
+            plan.steps.append(("exclude_words", len(excluded)))
+        # Retired doc ids (deleted or replaced logs) drop out here
+        live = index.live(candidates)
+        plan.facets = index.facet_counts(live[-_FACET_SAMPLE:])
+        terms = self._ranking_terms(query, plan) if query.sort_by == SortOrder.MOST_RELEVANT else []
+        if terms:
+            scores = index.top_scores(live, terms, depth or len(live), self.config["relevance_field_weights"],
+                                      self.config["relevance_k1"], self.config["relevance_b"])
+            plan.scores = {log_id: scores[doc] for doc, log_id in index.live_docs(sorted(scores))}
+            plan.ranked_out = len(live) - len(plan.scores)
+            plan.candidate_ids = set(plan.scores)
+        else:
+            plan.candidate_ids = index.live_log_ids(live)
+        return plan
+    
+    def _ranking_terms(self, query: SearchQuery, plan: Optional[QueryPlan] = None) -> List[str]:
+        """🎯 The indexed words of the query's text predicates (and fuzzy stand-ins) - what relevance is scored on."""
+        terms = self._extract_words(query.text) + self._extract_words(query.exact_phrase)
+        for word in (query.all_words or []) + (query.any_words or []):
+            terms.extend(self._extract_words(word))
+        if plan is not None:
+            for similar in plan.fuzzy_expansions.values():
+                terms.extend(similar)
+        return terms
+    
+    def _fuzzy_postings(self, index: _SearchIndex, text: str, plan: QueryPlan,
+                        deadline: float) -> Optional[Tuple[List[Tuple[str, array]], Set[str]]]:
+        """
+        🔡 TYPO-TOLERANT POSTING LISTS for a word predicate that matched nothing
+        
+        Each word of text matches the docs containing it, or else any
+        indexed word containing it ("connectionrefus"), or else up to
+        fuzzy_max_expansions indexed words within _fuzzy_distance edits of
+        it ("nullpointerexeption"), closest first, looked up until deadline.
+        Returns the posting lists with the words matched partially or
+        fuzzily, or None if some word is still unmatched - the query just
+        has no results.
+        """
+        postings: List[Tuple[str, array]] = []
+        guessed: Set[str] = set()
+        for word in self._extract_words(text):
+            ids = index.postings("text", word)
+            if ids:
+                postings.append((f"word '{word}'", ids))
+                continue
+            guessed.add(word)
+            ids = _union([index.postings("text", match) for match in index.words_containing(word)])
+            if ids:
+                postings.append((f"words containing '{word}'", ids))
+                continue
+            distance = _fuzzy_distance(word)
+            similar = index.similar_words(word, distance, self.config["fuzzy_max_expansions"],
+                                          deadline) if distance else []
+            if not similar:
+                return None
+            plan.fuzzy_expansions[word] = similar
+            postings.append((f"words spelled like '{word}'",
+                             _union([index.postings("text", match) for match in similar])))
+        return (postings, guessed) if postings else None
+    
+    def _text_postings(self, index: _SearchIndex, text: str,
+                       exact_fields: bool) -> Tuple[List[Tuple[str, array]], bool]:
+        """
+        🔤 POSTING LISTS FOR "FIELDS CONTAIN text" (a LIKE '%text%' search)
+        
+        - words in the middle of text must be whole words in a match, so
+          they are exact lookups, and so are the bigrams they form
+        - the first and last word may be cut off ("rror" in "IndexError"),
+          so they match every indexed word containing them
+        Words the index never stores (single letters, stopwords, and
+        fragments of stopwords) can't narrow anything down.
+        
+        Returns the posting lists plus whether their intersection is exactly
+        the set of matches: only for a single plain ASCII word searched in
+        all the indexed fields (exact_fields).
+        """
+        lowered = text.lower()
+        tokens = list(re.finditer(r"\w+", lowered))
+        postings: List[Tuple[str, array]] = []
+        whole_words: List[str] = []
+        for token in tokens:
+            word = token.group()
+            whole = token.start() > 0 and token.end() < len(lowered)
+            if whole:
+                if len(word) >= 2 and word not in _STOPWORDS:
+                    postings.append((f"word '{word}'", index.postings("text", word)))
+                    whole_words.append(word)
+            elif len(word) >= 2 and not any(word in stopword for stopword in _STOPWORDS):
+                containing = _union([index.postings("text", match)
+                                     for match in index.words_containing(word)])
+                postings.append((f"words containing '{word}'", containing))
+        
+        for bigram in _extract_bigrams(whole_words):
+            postings.append((f"phrase '{bigram}'", index.postings("bigrams", bigram)))
+        
+        exact = (exact_fields and len(tokens) == 1 and bool(postings)
+                 and tokens[0].group() == lowered and text.isascii())
+        return postings, exact
+    
+    def _index_is_current(self) -> bool:
+        """📏 Have the indexes applied every write the database has committed?"""
+        return self._index.generation == self.db.generation
+    
+    def _build_sql_query(self, query: SearchQuery, plan: Optional[QueryPlan] = None) -> Tuple[str, List[Any]]:
         """
         🏗️ BUILDING THE DATABASE SEARCH QUERY
         
@@ -450,15 +1880,30 @@ class SearchManager:
         database language (SQL) that can actually find the data.
         Like translating "find books about dogs" into the library's
         computer system language.
+        
+        With a plan, the candidate ids replace the predicates the indexes
+        answered; without one, SQL checks everything itself.
         """
-        # Start with base query
-        sql = """
-            SELECT log_id, timestamp, original_log, processed_log, summary,
-                   tags, severity, language, metadata, project_name, file_path, source
-            FROM logs
-            WHERE 1=1
-        """
+        if plan is None:
+            plan = QueryPlan(sql_predicates={name for name in _INDEXABLE_PREDICATES if getattr(query, name)})
+        # Start with base query - it picks the page of rowids; decode_page_sql
+        # then fetches full rows (and decompresses bodies) for that page only
         params = []
+        if plan.scores is not None:
+            # 🎯 RANKED CANDIDATES - joining the scores both filters and sorts by them
+            sql = f"""
+                SELECT logs.log_rowid, relevance.value AS relevance
+                FROM {LOG_TEXT_VIEW} AS logs
+                JOIN json_each(?) AS relevance ON relevance.key = logs.log_id
+                WHERE 1=1
+            """
+            params.append(json.dumps(plan.scores))
+        else:
+            sql = f"""
+                SELECT logs.log_rowid
+                FROM {LOG_TEXT_VIEW} AS logs
+                WHERE 1=1
+            """
         
         # 📅 TIME FILTERS
         if query.start_date:
@@ -500,66 +1945,151 @@ class SearchManager:
             sql += f" AND source IN ({source_placeholders})"
             params.extend(query.sources)
         
+        # 🗺️ INDEX CANDIDATES - only logs the posting lists allow
+        if plan.candidate_ids is not None and plan.scores is None:
+            sql += " AND logs.log_id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(list(plan.candidate_ids)))
+        
+        # 🔡 GUESSED WORDS - only what wasn't guessed at can be LIKE-checked
+        for name, checks in plan.fuzzy_checks.items():
+            conditions = []
+            for parts, log_ids in checks:
+                condition = [_like_sql(_TEXT_FIELDS)] * len(parts)
+                for part in parts:
+                    params.extend([_like_pattern(part)] * len(_TEXT_FIELDS))
+                if log_ids is not None:
+                    condition.append("logs.log_id IN (SELECT value FROM json_each(?))")
+                    params.append(json.dumps(sorted(log_ids)))
+                conditions.append("(" + (" AND ".join(condition) or "1=1") + ")")
+            sql += " AND (" + (" OR " if name == "any_words" else " AND ").join(conditions) + ")"
+        
         # 🔍 TEXT SEARCH
-        if query.text:
+        if "text" in plan.sql_predicates and "text" not in plan.fuzzy_checks:
             # Search in multiple text fields
-            text_search = f"%{query.text}%"
-            sql += """ AND (
-                original_log LIKE ? OR 
-                processed_log LIKE ? OR 
-                summary LIKE ? OR
-                project_name LIKE ? OR
-                file_path LIKE ?
-            )"""
-            params.extend([text_search] * 5)
+            sql += f" AND {_like_sql(_TEXT_FIELDS)}"
+            params.extend([_like_pattern(query.text)] * len(_TEXT_FIELDS))
         
         # 📝 EXACT PHRASE SEARCH
-        if query.exact_phrase:
-            phrase_search = f"%{query.exact_phrase}%"
-            sql += """ AND (
-                original_log LIKE ? OR 
-                processed_log LIKE ? OR 
-                summary LIKE ?
-            )"""
-            params.extend([phrase_search] * 3)
+        if "exact_phrase" in plan.sql_predicates:
+            sql += f" AND {_like_sql(_PHRASE_FIELDS)}"
+            params.extend([_like_pattern(query.exact_phrase)] * len(_PHRASE_FIELDS))
+        
+        # 🔤 WORD LISTS - every word, any word, none of these words
+        if "all_words" in plan.sql_predicates and "all_words" not in plan.fuzzy_checks:
+            for word in query.all_words:
+                sql += f" AND {_like_sql(_TEXT_FIELDS)}"
+                params.extend([_like_pattern(word)] * len(_TEXT_FIELDS))
+        if "any_words" in plan.sql_predicates and "any_words" not in plan.fuzzy_checks:
+            sql += " AND (" + " OR ".join(_like_sql(_TEXT_FIELDS) for _ in query.any_words) + ")"
+            for word in query.any_words:
+                params.extend([_like_pattern(word)] * len(_TEXT_FIELDS))
+        if "exclude_words" in plan.sql_predicates:
+            for word in query.exclude_words:
+                sql += f" AND NOT {_like_sql(_TEXT_FIELDS)}"
+                params.extend([_like_pattern(word)] * len(_TEXT_FIELDS))
         
         # 🏷️ TAG FILTERS
-        if query.tags:
-            tag_conditions = []
-            for tag in query.tags:
-                tag_conditions.append("tags LIKE ?")
-                params.append(f"%{tag}%")
-            sql += f" AND ({' OR '.join(tag_conditions)})"
-        
-        # 📊 SORTING
+        if "tags" in plan.sql_predicates:
+            tag_condition, tag_params = tag_filter_sql(query.tags)
+            sql += f" AND {tag_condition}"
+            params.extend(tag_params)
+        
+        # 🔖 CURSOR - continue after the last row of the previous page
+        if query.cursor:
+            if not self._supports_cursor(query):
+                raise ValueError(f"Cursor pagination is not supported for sort order {query.sort_by.value}")
+            comparison = "<" if query.sort_by == SortOrder.NEWEST_FIRST else ">"
+            sql += f" AND (timestamp, log_id) {comparison} (?, ?)"
+            params.extend(decode_cursor(query.cursor))
+        
+        # 📊 SORTING - log_id breaks timestamp ties so cursors are exact
         if query.sort_by == SortOrder.NEWEST_FIRST:
-            sql += " ORDER BY timestamp DESC"
+            order_by = " ORDER BY timestamp DESC, log_id DESC"
         elif query.sort_by == SortOrder.OLDEST_FIRST:
-            sql += " ORDER BY timestamp ASC"
+            order_by = " ORDER BY timestamp ASC, log_id ASC"
         elif query.sort_by == SortOrder.SEVERITY_HIGH:
             # Custom ordering for severity (critical first, then error, warning, etc.)
-            sql += """ ORDER BY 
-                CASE severity 
-                    WHEN 'critical' THEN 1
-                    WHEN 'error' THEN 2  
-                    WHEN 'warning' THEN 3
-                    WHEN 'info' THEN 4
-                    WHEN 'debug' THEN 5
-                    WHEN 'trace' THEN 6
-                    ELSE 7
-                END, timestamp DESC"""
+            ranks = " ".join(f"WHEN '{severity}' THEN {rank}" for severity, rank in _SEVERITY_SORT_RANK.items())
+            order_by = f" ORDER BY CASE severity {ranks} ELSE {_UNKNOWN_SEVERITY_RANK} END, timestamp DESC"
         elif query.sort_by == SortOrder.ALPHABETICAL:
-            sql += " ORDER BY original_log ASC"
+            order_by = " ORDER BY original_log ASC"
+        elif plan.scores is not None:
+            order_by = " ORDER BY relevance DESC, timestamp DESC, log_id DESC"
         else:
-            sql += " ORDER BY timestamp DESC"  # Default to newest first
+            order_by = " ORDER BY timestamp DESC, log_id DESC"  # Default to newest first
         
-        # 📏 LIMIT AND OFFSET
-        sql += " LIMIT ? OFFSET ?"
-        params.extend([query.limit, query.offset])
+        # 📏 LIMIT AND OFFSET - time-ordered searches fetch one extra row so
+        # search() can tell whether a next page (and cursor) exists
+        sql = decode_page_sql(sql + order_by + " LIMIT ? OFFSET ?", order_by)
+        if self._supports_cursor(query):
+            params.extend([query.limit + 1, 0 if query.cursor else query.offset])
+        else:
+            params.extend([query.limit, query.offset])
         
         return sql, params
     
-    def _calculate_relevance_scores(self, logs: List[LogEntry], query: SearchQuery) -> List[float]:
+    def _execute_on_partitions(self, query: SearchQuery, sql: str, params: List[Any],
+                               scores: Optional[Dict[str, float]] = None) -> List[Tuple]:
+        """
+        🗂️ RUNNING THE QUERY WHERE THE LOGS ARE
+        
+        A plain DatabaseManager is a single partition and runs the query as
+        built. A PartitionedDatabaseManager hands back every partition the
+        time range touches: each returns its first offset + limit rows, the
+        rows are merged in the query's order (by scores, if the plan ranked
+        them) and the offset is applied once. Time-ordered searches stop
+        opening partitions once enough rows are in.
+        """
+        start_date, end_date = self._time_range(query)
+        databases = self.db.partitions(
+            start_date, end_date, newest_first=query.sort_by != SortOrder.OLDEST_FIRST
+        )
+        first, second = next(databases, None), next(databases, None)
+        if first is None:
+            return []
+        if second is None:
+            with first.connection() as conn:
+                return conn.execute(sql, params).fetchall()
+        
+        # LIMIT and OFFSET are always the last two parameters
+        fetch, skip = params[-2], params[-1]
+        partition_params = params[:-2] + [fetch + skip, 0]
+        time_ordered = query.sort_by not in (SortOrder.SEVERITY_HIGH, SortOrder.ALPHABETICAL) and scores is None
+        rows: List[Tuple] = []
+        for database in itertools.chain((first, second), databases):
+            with database.connection() as conn:
+                rows.extend(conn.execute(sql, partition_params).fetchall())
+            if time_ordered and len(rows) >= fetch + skip:
+                break
+        
+        if query.sort_by == SortOrder.SEVERITY_HIGH:
+            rows.sort(key=lambda row: row[1], reverse=True)
+            rows.sort(key=lambda row: _SEVERITY_SORT_RANK.get(row[6], _UNKNOWN_SEVERITY_RANK))
+        elif query.sort_by == SortOrder.ALPHABETICAL:
+            rows.sort(key=lambda row: row[2])
+        elif scores is not None:
+            rows.sort(key=lambda row: (scores[row[0]], row[1], row[0]), reverse=True)
+        return rows[skip:skip + fetch]
+    
+    @staticmethod
+    def _time_range(query: SearchQuery) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """📅 The tightest (start, end) window the query's time filters allow."""
+        now = datetime.now()
+        starts = [query.start_date]
+        if query.last_n_days:
+            starts.append(now - timedelta(days=query.last_n_days))
+        if query.last_n_hours:
+            starts.append(now - timedelta(hours=query.last_n_hours))
+        starts = [start for start in starts if start]
+        return (max(starts) if starts else None), query.end_date
+    
+    @staticmethod
+    def _supports_cursor(query: SearchQuery) -> bool:
+        """🔖 Cursors follow (timestamp, log_id), so only time-ordered searches can use them."""
+        return query.sort_by in (SortOrder.NEWEST_FIRST, SortOrder.OLDEST_FIRST)
+    
+    def _calculate_relevance_scores(self, logs: List[LogEntry], query: SearchQuery,
+                                    plan: Optional[QueryPlan] = None) -> Optional[List[float]]:
         """
         🎯 SCORING SEARCH RESULTS - How Well Do They Match?
         
@@ -567,77 +2097,36 @@ class SearchManager:
         rank them by how well they match what you're looking for.
         Like a librarian saying "this book is exactly what you want,
         this one is pretty close, and this one is somewhat related."
-        """
-        scores = []
-        search_terms = []
-        
-        # Extract search terms from query
-        if query.text:
-            search_terms.extend(self._extract_words(query.text))
-        if query.exact_phrase:
-            search_terms.extend(self._extract_words(query.exact_phrase))
-        if query.all_words:
-            search_terms.extend(query.all_words)
-        if query.any_words:
-            search_terms.extend(query.any_words)
         
+        Scores are BM25F (see _SearchIndex.score), read from the indexes'
+        word counts and field lengths rather than the logs' text, and
+        scaled so the best match scored gets 1.0: the best candidate when
+        the plan ranked them all, else the best of these results. None
+        while the indexes are stale.
+        """
+        search_terms = self._ranking_terms(query, plan)
         if not search_terms:
             # No text search terms, return equal scores
             return [1.0] * len(logs)
         
-        for log in logs:
-            score = self._calculate_log_relevance(log, search_terms)
-            scores.append(score)
-        
-        return scores
+        if plan is not None and plan.scores is not None:
+            scores = [plan.scores.get(log.log_id, 0.0) for log in logs]
+            best = max(plan.scores.values(), default=0.0)
+        else:
+            with self._index_lock:
+                if not self._index_is_current():
+                    return None
+                index = self._index
+                docs = {log.log_id: index.live_doc(log.log_id) for log in logs}
+                found = sorted(doc for doc in docs.values() if doc is not None)
+                by_doc = index.score(found, search_terms, self.config["relevance_field_weights"],
+                                     self.config["relevance_k1"], self.config["relevance_b"])
+            scores = [by_doc.get(docs[log.log_id], 0.0) for log in logs]
+            best = max(scores, default=0.0)
+        return [score / best if best else 0.0 for score in scores]
     
-    def _calculate_log_relevance(self, log: LogEntry, search_terms: List[str]) -> float:
-        """
-        🎯 HOW WELL DOES THIS LOG MATCH THE SEARCH?
-        
-        This calculates a relevance score (0.0 to 1.0) for one log entry
-        based on how many search terms it contains and where they appear.
-        """
-        if not search_terms:
-            return 1.0
-        
-        # Combine all searchable text
-        searchable_text = " ".join(filter(None, [
-            log.original_log,
-            log.processed_log,
-            log.summary,
-            " ".join(log.tags)  # Tags are important for relevance
-        ])).lower()
-        
-        if not searchable_text:
-            return 0.0
-        
-        # Count how many search terms appear in the text
-        matches = 0
-        total_terms = len(search_terms)
-        
-        for term in search_terms:
-            term_lower = term.lower()
-            if term_lower in searchable_text:
-                matches += 1
-                
-                # Bonus points for exact matches in summary (summary is most important)
-                if log.summary and term_lower in log.summary.lower():
-                    matches += 0.5
-                
-                # Bonus points for matches in tags (tags are curated/important)
-                tag_text = " ".join(log.tags).lower()
-                if term_lower in tag_text:
-                    matches += 0.3
-        
-        # Calculate final score
-        if total_terms == 0:
-            return 1.0
-        
-        base_score = matches / total_terms
-        return min(1.0, base_score)  # Cap at 1.0
-    
-    def _generate_highlights(self, logs: List[LogEntry], query: SearchQuery) -> List[str]:
+    def _generate_highlights(self, logs: List[LogEntry], query: SearchQuery,
+                             plan: Optional[QueryPlan] = None) -> List[str]:
         """
         ✨ HIGHLIGHTING SEARCH MATCHES - Showing Where We Found Things
         
@@ -654,6 +2143,9 @@ class SearchManager:
             search_terms.extend(self._extract_words(query.text))
         if query.exact_phrase:
             search_terms.extend(self._extract_words(query.exact_phrase))
+        if plan is not None:
+            for similar in plan.fuzzy_expansions.values():
+                search_terms.extend(similar)  # Highlight what a misspelled word matched
         
         for log in logs:
             highlight = self._create_highlight_snippet(log, search_terms)
@@ -708,7 +2200,8 @@ class SearchManager:
         # For now, return the snippet as-is
         return snippet
     
-    def _generate_filter_suggestions(self, logs: List[LogEntry]) -> Dict[str, List[str]]:
+    def _generate_filter_suggestions(self, logs: List[LogEntry],
+                                     facets: Optional[Dict[str, Counter]] = None) -> Dict[str, List[str]]:
         """
         💡 SUGGESTING WAYS TO REFINE THE SEARCH
         
@@ -716,63 +2209,45 @@ class SearchManager:
         help narrow down the results. Like a librarian saying "I found
         50 books about programming - would you like to focus on Python
         books, or books from the last 5 years?"
+        
+        With facets (value counts the planner read from the indexes) the
+        suggestions reflect the matches, not just this page of them.
         """
-        if not logs:
-            return {}
+        if facets is None:
+            facets = {name: Counter() for name in _FACET_FIELDS}
+            for log in logs:
+                for name, values in zip(_FACET_FIELDS, _facet_values(log)):
+                    facets[name].update(values)
         
         suggestions = {}
         
-        # Suggest languages that appear in results
-        languages = {}
-        for log in logs:
-            lang = log.language
-            languages[lang] = languages.get(lang, 0) + 1
-        
-        if len(languages) > 1:  # Only suggest if there are multiple languages
-            # Sort by frequency and take top 5
-            top_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)[:5]
-            suggestions["languages"] = [lang for lang, count in top_languages]
-        
-        # Suggest severities that appear in results
-        severities = {}
-        for log in logs:
-            sev = log.severity.value
-            severities[sev] = severities.get(sev, 0) + 1
-        
-        if len(severities) > 1:
-            top_severities = sorted(severities.items(), key=lambda x: x[1], reverse=True)[:3]
-            suggestions["severities"] = [sev for sev, count in top_severities]
-        
-        # Suggest projects that appear in results
-        projects = {}
-        for log in logs:
-            if log.project_name:
-                proj = log.project_name
-                projects[proj] = projects.get(proj, 0) + 1
-        
-        if len(projects) > 1:
-            top_projects = sorted(projects.items(), key=lambda x: x[1], reverse=True)[:5]
-            suggestions["projects"] = [proj for proj, count in top_projects]
+        # Suggest languages, severities and projects that appear in results,
+        # only where there is more than one to choose between
+        for key, name, top in (("languages", "language", 5), ("severities", "severity", 3),
+                               ("projects", "project", 5)):
+            counts = facets[name]
+            if len(counts) > 1:
+                suggestions[key] = [value for value, _ in counts.most_common(top)]
         
         return suggestions
     
-    def _extract_related_tags(self, logs: List[LogEntry]) -> List[str]:
+    def _extract_related_tags(self, logs: List[LogEntry],
+                              facets: Optional[Dict[str, Counter]] = None) -> List[str]:
         """
         🏷️ FINDING RELATED ERROR CATEGORIES
         
         This looks at all the tags in the search results and identifies
         the most common ones. These can help users understand what types
-        of errors they're dealing with.
+        of errors they're dealing with. Counted from the planner's facets
+        when it has them.
         """
-        tag_counts = {}
-        
-        for log in logs:
-            for tag in log.tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        if facets is not None:
+            tag_counts = facets["tags"]
+        else:
+            tag_counts = Counter(tag for log in logs for tag in log.tags)
         
         # Return top 10 most common tags
-        sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        return [tag for tag, count in sorted_tags]
+        return [tag for tag, _ in tag_counts.most_common(10)]
     
     def _get_trending_terms(self) -> List[str]:
         """
@@ -843,9 +2318,11 @@ class SearchManager:
             "average_search_time_ms": round(avg_time, 2),
             "average_results_per_search": round(avg_results, 2),
             "popular_search_terms": self._get_trending_terms(),
+            "result_cache": self._result_cache.stats(),
             "index_stats": {
-                "text_terms": len(self._text_index),
-                "tags": len(self._tag_index),
-                "bigrams": len(self._bigram_index)
+                "text_terms": self._index.term_count("text"),
+                "tags": self._index.term_count("tags"),
+                "bigrams": self._index.term_count("bigrams"),
+                "segments": len(self._index.segments)
             }
         }
\ No newline at end of file
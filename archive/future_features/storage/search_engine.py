@@ -18,10 +18,13 @@ Think of this like having two search engines for your error logs:
 
 import os
 import json
+import queue
 import logging
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple, Set
+from typing import List, Dict, Optional, Any, Iterable, Tuple, Set
 from pathlib import Path
 from dataclasses import dataclass, asdict
 
@@ -38,6 +41,14 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 🗄️ SQLITE SCHEMA VERSION (PRAGMA user_version) - 1: every search_fts row
+# shares its rowid with its search_metadata row, and tags are in search_tags
+_SQLITE_SCHEMA_VERSION = 1
+
+# search_metadata columns, in the order _sqlite_rows lays them out
+_METADATA_COLUMNS = ("log_id", "timestamp", "severity", "language", "tags", "error_type",
+                     "file_path", "user_id", "project_id")
+
 @dataclass
 class SearchResult:
     """Single search result with metadata."""
@@ -51,6 +62,7 @@ class SearchResult:
     tags: Optional[List[str]] = None
     file_path: str = ""
     error_type: str = ""
+    snippet: str = ""           # Best matching fragment, matches wrapped in <mark></mark>
     
     def __post_init__(self):
         if self.tags is None:
@@ -86,6 +98,23 @@ class DebuggleSearchEngine:
         self.tier = tier
         self.index_dir.mkdir(exist_ok=True)
         
+        # ⚙️ BULK WRITES - add_logs writes this many logs per executemany, and
+        # FTS5 segments get merged (a bounded number of pages) and fully
+        # optimized after this many writes, so bulk imports don't leave
+        # hundreds of small segments behind for every query to visit
+        self.write_batch_size = 1000
+        self.merge_every_docs = 10000
+        self.merge_pages = 500
+        self.optimize_every_docs = 250000
+        self._docs_since_merge = 0
+        self._docs_since_optimize = 0
+        self._maintenance_lock = threading.Lock()
+        
+        # 📬 WRITE QUEUE - queue_logs hands logs to one background writer
+        self._write_queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        
         # Initialize the appropriate backend
         if WHOOSH_AVAILABLE:
             logger.info("🔍 Initializing Whoosh search engine (Pro features available)")
@@ -146,6 +175,9 @@ class DebuggleSearchEngine:
     def _create_sqlite_tables(self):
         """Create SQLite FTS tables."""
         with sqlite3.connect(self.db_path) as conn:
+            # WAL: searches keep reading while a bulk write is in progress
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             # Create FTS table for search
             conn.execute("""
                 CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
@@ -181,99 +213,319 @@ class DebuggleSearchEngine:
                 )
             """)
             
+            # Tags one per row, so tag filters are index lookups; doc is the
+            # log's search_metadata (and search_fts) rowid
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_tags (
+                    doc INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (doc, tag)
+                ) WITHOUT ROWID
+            """)
+            
+            # Filter indexes - newest first within a severity or language
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_tags_tag ON search_tags(tag, doc)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_metadata_timestamp ON search_metadata(timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_metadata_severity "
+                         "ON search_metadata(severity, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_search_metadata_language "
+                         "ON search_metadata(language, timestamp)")
+            
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SQLITE_SCHEMA_VERSION:
+                self._migrate_sqlite(conn)
+            
             conn.commit()
     
+    def _migrate_sqlite(self, conn: sqlite3.Connection):
+        """
+        Renumber an index written before search_fts rowids matched
+        search_metadata's (keeping the last copy of logs added twice), and
+        fill search_tags from the metadata's comma-separated tags.
+        """
+        rows = {row[1]: row[1:] for row in conn.execute("SELECT rowid, * FROM search_fts ORDER BY rowid")}
+        if rows:
+            logger.info(f"🔄 Migrating search index of {len(rows)} logs to schema {_SQLITE_SCHEMA_VERSION}")
+            docs = dict(conn.execute("SELECT log_id, rowid FROM search_metadata"))
+            conn.execute("DELETE FROM search_fts")
+            conn.executemany(
+                "INSERT INTO search_fts (rowid, log_id, title, content, full_text, language, severity, timestamp, "
+                "tags, error_type, file_path, user_id, project_id, custom_fields) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(docs[log_id], *row) for log_id, row in rows.items() if log_id in docs]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO search_tags (doc, tag) VALUES (?, ?)",
+                [(doc, tag) for doc, tags in conn.execute("SELECT rowid, tags FROM search_metadata")
+                 for tag in (tags or "").split(",") if tag]
+            )
+        conn.execute(f"PRAGMA user_version = {_SQLITE_SCHEMA_VERSION}")
+    
     def add_log(self, log_data: Dict[str, Any]) -> bool:
         """Add a log entry to the search index."""
+        return self.add_logs([log_data]) == 1
+    
+    def add_logs(self, logs: Iterable[Dict[str, Any]]) -> int:
+        """
+        📦 Add many log entries in one transaction - the way to bulk import
+        
+        Logs are written write_batch_size at a time with executemany, to
+        the FTS table and the metadata table alike, and committed once at
+        the end: either every log is indexed or (on error) none is.
+        Returns how many were added.
+        """
         try:
             if self.backend == "whoosh":
-                return self._add_log_whoosh(log_data)
+                return self._add_logs_whoosh(logs)
             else:
-                return self._add_log_sqlite(log_data)
+                return self._add_logs_sqlite(logs)
         except Exception as e:
-            logger.error(f"Error adding log to search index: {e}")
-            return False
+            logger.error(f"Error adding logs to search index: {e}")
+            return 0
+    
+    def _whoosh_document(self, log_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Prepare one log as a Whoosh document."""
+        doc = {
+            'log_id': log_data.get('id', ''),
+            'title': log_data.get('title', ''),
+            'content': log_data.get('content', ''),
+            'full_text': f"{log_data.get('title', '')} {log_data.get('content', '')}",
+            'language': log_data.get('language', 'unknown'),
+            'severity': log_data.get('severity', 'info'),
+            'timestamp': log_data.get('timestamp', datetime.now()),
+            'date_str': log_data.get('timestamp', datetime.now()).strftime('%Y-%m-%d'),
+            'tags': ','.join(log_data.get('tags', [])),
+            'error_type': log_data.get('error_type', ''),
+            'file_path': log_data.get('file_path', ''),
+        }
+        
+        # Add Pro tier fields
+        if self.tier != "free":
+            doc.update({
+                'user_id': log_data.get('user_id', ''),
+                'project_id': log_data.get('project_id', '')
+            })
+        
+        if self.tier == "enterprise":
+            doc['custom_fields'] = json.dumps(log_data.get('custom_fields', {}))
+        
+        return doc
     
-    def _add_log_whoosh(self, log_data: Dict[str, Any]) -> bool:
-        """Add log using Whoosh backend."""
+    def _add_logs_whoosh(self, logs: Iterable[Dict[str, Any]]) -> int:
+        """Add logs using Whoosh backend (one writer, one commit)."""
         writer = self.index.writer()
         try:
-            # Prepare document
-            doc = {
-                'log_id': log_data.get('id', ''),
-                'title': log_data.get('title', ''),
-                'content': log_data.get('content', ''),
-                'full_text': f"{log_data.get('title', '')} {log_data.get('content', '')}",
-                'language': log_data.get('language', 'unknown'),
-                'severity': log_data.get('severity', 'info'),
-                'timestamp': log_data.get('timestamp', datetime.now()),
-                'date_str': log_data.get('timestamp', datetime.now()).strftime('%Y-%m-%d'),
-                'tags': ','.join(log_data.get('tags', [])),
-                'error_type': log_data.get('error_type', ''),
-                'file_path': log_data.get('file_path', ''),
-            }
-            
-            # Add Pro tier fields
-            if self.tier != "free":
-                doc.update({
-                    'user_id': log_data.get('user_id', ''),
-                    'project_id': log_data.get('project_id', '')
-                })
-            
-            if self.tier == "enterprise":
-                doc['custom_fields'] = json.dumps(log_data.get('custom_fields', {}))
-            
-            writer.add_document(**doc)
+            added = 0
+            for log_data in logs:
+                writer.update_document(**self._whoosh_document(log_data))
+                added += 1
             writer.commit()
-            return True
+            return added
         except Exception as e:
             writer.cancel()
             raise e
     
-    def _add_log_sqlite(self, log_data: Dict[str, Any]) -> bool:
-        """Add log using SQLite FTS backend."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Insert into FTS table
-            conn.execute("""
-                INSERT OR REPLACE INTO search_fts (
-                    log_id, title, content, full_text, language, severity,
-                    timestamp, tags, error_type, file_path, user_id, project_id, custom_fields
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                log_data.get('id', ''),
-                log_data.get('title', ''),
-                log_data.get('content', ''),
-                f"{log_data.get('title', '')} {log_data.get('content', '')}",
-                log_data.get('language', 'unknown'),
-                log_data.get('severity', 'info'),
-                log_data.get('timestamp', datetime.now()).isoformat(),
-                ','.join(log_data.get('tags', [])),
-                log_data.get('error_type', ''),
-                log_data.get('file_path', ''),
-                log_data.get('user_id', '') if self.tier != "free" else '',
-                log_data.get('project_id', '') if self.tier != "free" else '',
-                json.dumps(log_data.get('custom_fields', {})) if self.tier == "enterprise" else ''
-            ))
-            
-            # Insert metadata
-            conn.execute("""
-                INSERT OR REPLACE INTO search_metadata (
-                    log_id, timestamp, severity, language, tags, error_type, file_path, user_id, project_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                log_data.get('id', ''),
-                log_data.get('timestamp', datetime.now()).isoformat(),
-                log_data.get('severity', 'info'),
-                log_data.get('language', 'unknown'),
-                ','.join(log_data.get('tags', [])),
-                log_data.get('error_type', ''),
-                log_data.get('file_path', ''),
-                log_data.get('user_id', '') if self.tier != "free" else '',
-                log_data.get('project_id', '') if self.tier != "free" else ''
-            ))
-            
-            conn.commit()
+    def _sqlite_rows(self, log_data: Dict[str, Any]) -> Tuple[Tuple, Tuple, List[str]]:
+        """One log's (search_fts row without rowid, search_metadata row, tags)."""
+        timestamp = log_data.get('timestamp', datetime.now()).isoformat()
+        tags = ','.join(log_data.get('tags', []))
+        user_id = log_data.get('user_id', '') if self.tier != "free" else ''
+        project_id = log_data.get('project_id', '') if self.tier != "free" else ''
+        fts_row = (
+            log_data.get('id', ''),
+            log_data.get('title', ''),
+            log_data.get('content', ''),
+            f"{log_data.get('title', '')} {log_data.get('content', '')}",
+            log_data.get('language', 'unknown'),
+            log_data.get('severity', 'info'),
+            timestamp,
+            tags,
+            log_data.get('error_type', ''),
+            log_data.get('file_path', ''),
+            user_id,
+            project_id,
+            json.dumps(log_data.get('custom_fields', {})) if self.tier == "enterprise" else ''
+        )
+        metadata_row = (
+            log_data.get('id', ''),
+            timestamp,
+            log_data.get('severity', 'info'),
+            log_data.get('language', 'unknown'),
+            tags,
+            log_data.get('error_type', ''),
+            log_data.get('file_path', ''),
+            user_id,
+            project_id
+        )
+        return fts_row, metadata_row, [tag for tag in log_data.get('tags', []) if tag]
+    
+    def _add_logs_sqlite(self, logs: Iterable[Dict[str, Any]]) -> int:
+        """Add logs using SQLite FTS backend (one connection, one transaction)."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # The WAL makes a commit durable in order; skipping the fsync per
+            # commit only risks the last writes on power loss, never corruption
+            conn.execute("PRAGMA synchronous=NORMAL")
+            added = 0
+            batch: List[Dict[str, Any]] = []
+            with conn:
+                for log_data in logs:
+                    batch.append(log_data)
+                    if len(batch) >= self.write_batch_size:
+                        added += self._write_sqlite_batch(conn, batch)
+                        batch = []
+                if batch:
+                    added += self._write_sqlite_batch(conn, batch)
+        finally:
+            conn.close()
+        self._maintain_sqlite(added)
+        return added
+    
+    def _write_sqlite_batch(self, conn: sqlite3.Connection, batch: List[Dict[str, Any]]) -> int:
+        """Write one batch to every table (inside the caller's transaction)."""
+        # The last copy of a log wins, as if they had been added one by one
+        rows = {fts_row[0]: (fts_row, metadata_row, tags)
+                for fts_row, metadata_row, tags in map(self._sqlite_rows, batch)}
+        
+        # 🗂️ METADATA FIRST - an upsert keeps a known log's rowid, which its
+        # FTS row and tags are filed under
+        updates = ", ".join(f"{column} = excluded.{column}" for column in _METADATA_COLUMNS[1:])
+        conn.executemany(f"""
+            INSERT INTO search_metadata ({', '.join(_METADATA_COLUMNS)})
+            VALUES ({', '.join('?' * len(_METADATA_COLUMNS))})
+            ON CONFLICT(log_id) DO UPDATE SET {updates}, created_at = CURRENT_TIMESTAMP
+        """, [metadata_row for _, metadata_row, _ in rows.values()])
+        log_ids = json.dumps(list(rows))
+        docs = dict(conn.execute(
+            "SELECT log_id, rowid FROM search_metadata WHERE log_id IN (SELECT value FROM json_each(?))", (log_ids,)
+        ))
+        
+        # 🔤 TEXT - REPLACE swaps out the old text of a log added again
+        conn.executemany("""
+            INSERT OR REPLACE INTO search_fts (
+                rowid, log_id, title, content, full_text, language, severity,
+                timestamp, tags, error_type, file_path, user_id, project_id, custom_fields
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(docs[log_id], *fts_row) for log_id, (fts_row, _, _) in rows.items()])
+        
+        # 🏷️ TAGS
+        conn.execute("DELETE FROM search_tags WHERE doc IN (SELECT value FROM json_each(?))",
+                     (json.dumps(list(docs.values())),))
+        conn.executemany("INSERT OR IGNORE INTO search_tags (doc, tag) VALUES (?, ?)",
+                         [(docs[log_id], tag) for log_id, (_, _, tags) in rows.items() for tag in tags])
+        return len(batch)
+    
+    # ------------------------------------------------------------------
+    # 🧹 FTS5 MAINTENANCE
+    # ------------------------------------------------------------------
+    
+    def _maintain_sqlite(self, added: int):
+        """Run the merge/optimize schedule after added more writes."""
+        with self._maintenance_lock:
+            self._docs_since_merge += added
+            self._docs_since_optimize += added
+            if self._docs_since_optimize >= self.optimize_every_docs:
+                self.optimize_index()
+            elif self._docs_since_merge >= self.merge_every_docs:
+                self._fts_command("merge", self.merge_pages)
+                self._docs_since_merge = 0
+    
+    def optimize_index(self) -> bool:
+        """
+        🧹 Merge the whole FTS index into one segment (after a bulk import)
+        
+        Queries then read one b-tree per term instead of one per segment.
+        It rewrites the index, so the schedule only runs it every
+        optimize_every_docs writes; between those, 'merge' does a bounded
+        amount of the same work.
+        """
+        if self.backend == "whoosh":
+            try:
+                self.index.optimize()
+                return True
+            except Exception as e:
+                logger.error(f"Error optimizing search index: {e}")
+                return False
+        optimized = self._fts_command("optimize")
+        if optimized:
+            self._docs_since_merge = self._docs_since_optimize = 0
+        return optimized
+    
+    def _fts_command(self, command: str, argument: Optional[int] = None) -> bool:
+        """Run an FTS5 special command ('merge', 'optimize'...) on search_fts."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if argument is None:
+                    conn.execute("INSERT INTO search_fts(search_fts) VALUES (?)", (command,))
+                else:
+                    conn.execute("INSERT INTO search_fts(search_fts, rank) VALUES (?, ?)", (command, argument))
+            return True
+        except Exception as e:
+            logger.error(f"FTS5 {command} failed: {e}")
+            return False
+    
+    # ------------------------------------------------------------------
+    # 📬 WRITE QUEUE
+    # ------------------------------------------------------------------
+    
+    def queue_logs(self, logs: Iterable[Dict[str, Any]]):
+        """
+        📬 Hand logs to the background writer and return at once
+        
+        The writer takes whatever has queued up (up to write_batch_size)
+        and adds it with add_logs, so a burst of single logs still becomes
+        a few transactions. flush_queue() waits for it to catch up.
+        """
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._write_queue = queue.Queue()
+                self._writer = threading.Thread(target=self._write_queued, args=(self._write_queue,),
+                                                name="search-engine-writer", daemon=True)
+                self._writer.start()
+            for log_data in logs:
+                self._write_queue.put(log_data)
+    
+    def queue_log(self, log_data: Dict[str, Any]):
+        """📬 Hand one log to the background writer."""
+        self.queue_logs([log_data])
+    
+    def _write_queued(self, pending: queue.Queue):
+        """The background writer: drain the queue batch by batch until close()."""
+        while True:
+            batch = [pending.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            logs = [log_data for log_data in batch if log_data is not None]
+            if logs and self.add_logs(logs) != len(logs):
+                logger.error(f"Background writer failed to index {len(logs)} queued logs")
+            for _ in batch:
+                pending.task_done()
+            if stop:
+                return
+    
+    def flush_queue(self, timeout: Optional[float] = None) -> bool:
+        """⏳ Wait until every queued log is written (False if timeout runs out first)."""
+        pending = self._write_queue
+        if pending is None:
             return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while pending.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def close(self, timeout: Optional[float] = None):
+        """🛑 Write what is queued and stop the background writer."""
+        with self._writer_lock:
+            writer, pending = self._writer, self._write_queue
+            self._writer = None
+        if writer is not None and writer.is_alive():
+            pending.put(None)
+            writer.join(timeout)
     
     def search(self, query: str, limit: int = 50, filters: Optional[Dict[str, Any]] = None) -> Tuple[List[SearchResult], Optional[SearchAnalytics]]:
         """
@@ -349,23 +601,33 @@ class DebuggleSearchEngine:
         return results
     
     def _search_sqlite(self, query: str, limit: int, filters: Dict[str, Any]) -> List[SearchResult]:
-        """Search using SQLite FTS backend."""
+        """
+        Search using SQLite FTS backend.
+        
+        Filters are applied in the same query, joined to search_metadata by
+        rowid, so LIMIT counts only logs that pass them. Scores are FTS5's
+        bm25() (negated, so higher is better) and snippets come from
+        snippet(), both computed by SQLite for the returned rows only.
+        """
         results = []
+        filter_sql, filter_params = self._sqlite_filters(filters)
         
         with sqlite3.connect(self.db_path) as conn:
             # Prepare FTS query
             fts_query = query.replace("'", "''")  # Escape quotes
             
-            sql = """
-                SELECT log_id, title, content, language, severity, timestamp, 
-                       tags, error_type, file_path, rank
-                FROM search_fts 
-                WHERE search_fts MATCH ?
-                ORDER BY rank
+            sql = f"""
+                SELECT search_fts.log_id, search_fts.title, search_fts.content, m.language, m.severity,
+                       m.timestamp, m.tags, m.error_type, m.file_path, bm25(search_fts) AS score,
+                       snippet(search_fts, -1, '<mark>', '</mark>', '…', 16)
+                FROM search_fts
+                JOIN search_metadata AS m ON m.rowid = search_fts.rowid
+                WHERE search_fts MATCH ?{filter_sql}
+                ORDER BY score
                 LIMIT ?
             """
             
-            cursor = conn.execute(sql, (fts_query, limit))
+            cursor = conn.execute(sql, (fts_query, *filter_params, limit))
             
             for row in cursor.fetchall():
                 try:
@@ -377,18 +639,54 @@ class DebuggleSearchEngine:
                     log_id=row[0],
                     title=row[1] or '',
                     content=row[2] or '',
-                    relevance_score=1.0,  # SQLite FTS doesn't provide detailed scoring
+                    relevance_score=-row[9],  # bm25() is negative: the lower, the better the match
                     timestamp=timestamp,
                     severity=row[4] or 'info',
                     language=row[3] or 'unknown',
                     tags=row[6].split(',') if row[6] else [],
                     file_path=row[8] or '',
-                    error_type=row[7] or ''
+                    error_type=row[7] or '',
+                    snippet=row[10] or ''
                 )
                 results.append(result)
         
         return results
     
+    @staticmethod
+    def _sqlite_filters(filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """
+        Filters as SQL conditions on search_metadata m (AND-ed to the match).
+        
+        severity, language and tags take one value or a list (any of them);
+        start_date/end_date, or date_range as a (start, end) pair, take
+        datetimes or ISO strings and either end may be None.
+        """
+        sql, params = "", []
+        for name in ("severity", "language"):
+            values = filters.get(name)
+            if values:
+                values = [values] if isinstance(values, str) else list(values)
+                sql += f" AND m.{name} IN ({', '.join('?' * len(values))})"
+                params.extend(values)
+        
+        tags = filters.get("tags")
+        if tags:
+            tags = [tags] if isinstance(tags, str) else list(tags)
+            sql += (" AND EXISTS (SELECT 1 FROM search_tags AS t "
+                    f"WHERE t.doc = m.rowid AND t.tag IN ({', '.join('?' * len(tags))}))")
+            params.extend(tags)
+        
+        start, end = filters.get("date_range") or (filters.get("start_date"), filters.get("end_date"))
+        for bound, comparison in ((start, ">="), (end, "<=")):
+            if bound:
+                sql += f" AND m.timestamp {comparison} ?"
+                params.append(bound.isoformat() if isinstance(bound, datetime) else bound)
+        
+        unknown = set(filters) - {"severity", "language", "tags", "date_range", "start_date", "end_date"}
+        if unknown:
+            logger.warning(f"Ignoring unsupported search filters: {sorted(unknown)}")
+        return sql, params
+    
     def _generate_suggestions(self, query: str) -> List[str]:
         """Generate search suggestions for Pro tier."""
         # Simple suggestion logic - can be enhanced
@@ -447,7 +745,8 @@ class DebuggleSearchEngine:
             'backend': self.backend,
             'tier': self.tier,
             'whoosh_available': WHOOSH_AVAILABLE,
-            'total_documents': 0
+            'total_documents': 0,
+            'queued_writes': self._write_queue.unfinished_tasks if self._write_queue is not None else 0
         }
         
         try:
@@ -0,0 +1,691 @@
+"""
+💾 DEBUGGLE INDEX SEGMENTS - The Card Catalog, Printed and Bound! 💾
+
+SearchManager keeps posting lists (word → doc ids) so it can plan searches
+without scanning the database, and building them means reading every
+stored log. This module writes finished posting lists to disk as immutable
+segments and reads them back through mmap: opening a segment only parses a
+small table of contents, and the operating system pages in just the terms
+that are actually looked up. A restarted process can search straight away,
+however many logs are stored.
+
+🏆 HIGH SCHOOL EXPLANATION:
+Like a library that prints its card catalog as bound volumes:
+- New cards go into a small box on the desk (the in-memory segment)
+- When the box is full it is printed as a new volume (a segment)
+- Printed volumes are never edited; withdrawn books are crossed off on a
+  separate list (dead doc ids in the manifest)
+- Now and then a few thin volumes are reprinted as one thick one (merges)
+- A new librarian opens the volumes on day one instead of rewriting them
+
+SEGMENT FILES - <name>.terms (the term dictionary) and <name>.postings:
+- .postings holds every posting list back to back as uint32 doc ids; in
+  fields with term frequencies each list is followed by as many uint32
+  frequencies, one per doc
+- .terms starts with MAGIC and the length of a JSON table of contents,
+  followed by the 8-byte aligned sections it points at. Every field (text,
+  tags, bigrams) has its terms sorted by UTF-8 bytes and newline
+  terminated, their offsets, and where each posting list starts. The doc
+  table lists the segment's doc ids in ascending order, their log ids, a
+  hash table for finding a log id's doc, each doc's field lengths (for
+  relevance ranking) with their totals and how many docs have each field,
+  and each doc's facet values (severity, tags...) as ordinals into a
+  per-segment list of values.
+All numbers are little-endian. manifest.json names the live segments.
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"DBGLSEG1"
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 3
+
+_HEADER = struct.Struct("<8sQ")     # magic, length of the JSON table of contents
+_ALIGNMENT = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+_SEGMENT_NAME = re.compile(r"^seg-(\d+)\.(terms|postings)$")
+_FRAGMENT_CACHE_SIZE = 1024
+
+
+def log_id_hash(log_id: str) -> int:
+    """🔑 Stable 64-bit hash of a log id (Python's hash() changes every run)."""
+    return int.from_bytes(hashlib.blake2b(log_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _packed(typecode: str, values: Iterable[int]) -> bytes:
+    """Little-endian bytes of an array of values."""
+    packed = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    if not _LITTLE_ENDIAN:
+        packed = array(typecode, packed)
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _fsync_write(path: Path, chunks: Iterable[bytes]):
+    """Write chunks to path and flush them to disk before returning."""
+    with open(path, "wb") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+class _SegmentWriter:
+    """
+    ✍️ PRINTING ONE VOLUME - streams sorted fields into the two segment files
+
+    Posting lists go straight to the .postings file as they arrive; the
+    term dictionary and doc table are collected and written at the end.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._postings_path = Path(f"{path}.postings.tmp")
+        self._postings = open(self._postings_path, "wb")
+        self._written = 0                                   # Doc ids written to .postings
+        self._sections: List[bytes] = []
+        self._toc: Dict[str, Any] = {"version": FORMAT_VERSION, "fields": {}}
+        self._offset = 0
+
+    def _section(self, data: bytes) -> List[int]:
+        """Queue one aligned section of .terms; returns its [offset, length]."""
+        position = self._offset
+        padding = -len(data) % _ALIGNMENT
+        self._sections.append(data + b"\0" * padding)
+        self._offset += len(data) + padding
+        return [position, len(data)]
+
+    def add_field(self, name: str, terms: Iterable[Tuple[bytes, Sequence[int], Sequence[int]]],
+                  frequencies: bool = False):
+        """
+        Add a field from (UTF-8 term, sorted doc ids, frequencies) in term
+        byte order; the frequencies (one per doc id) are only written if
+        the field has them.
+        """
+        keys = bytearray()
+        key_offsets = array("I", [0])
+        postings_offsets = array("Q", [self._written])
+        for key, ids, counts in terms:
+            if not ids:
+                continue
+            keys += key
+            keys += b"\n"
+            key_offsets.append(len(keys))
+            self._postings.write(_packed("I", ids))
+            self._written += len(ids)
+            if frequencies:
+                self._postings.write(_packed("I", counts))
+                self._written += len(counts)
+            postings_offsets.append(self._written)
+        self._toc["fields"][name] = {
+            "terms": len(key_offsets) - 1,
+            "frequencies": frequencies,
+            "keys": self._section(bytes(keys)),
+            "key_offsets": self._section(_packed("I", key_offsets)),
+            "postings_offsets": self._section(_packed("Q", postings_offsets)),
+        }
+
+    def set_docs(self, docs: Iterable[Tuple[int, str, Sequence[int], Sequence[Sequence[str]]]],
+                 length_fields: Sequence[str], facet_fields: Sequence[str] = ()):
+        """
+        Add the doc table from (doc id, log id, field lengths, facet values)
+        in ascending doc id order; facet values holds one sequence of
+        values per facet field.
+        """
+        doc_ids = array("I")
+        names = bytearray()
+        name_offsets = array("I", [0])
+        hashed: List[Tuple[int, int]] = []
+        lengths = [array("I") for _ in length_fields]
+        facets = [FacetColumn() for _ in facet_fields]
+        for position, (doc, log_id, doc_lengths, doc_facets) in enumerate(docs):
+            doc_ids.append(doc)
+            names += log_id.encode("utf-8")
+            name_offsets.append(len(names))
+            hashed.append((log_id_hash(log_id), position))
+            for column, length in zip(lengths, doc_lengths):
+                column.append(length)
+            for column, values in zip(facets, doc_facets):
+                column.append(values)
+        hashed.sort()
+        self._toc["docs"] = {
+            "count": len(doc_ids),
+            "doc_ids": self._section(_packed("I", doc_ids)),
+            "log_ids": self._section(bytes(names)),
+            "log_id_offsets": self._section(_packed("I", name_offsets)),
+            "hashes": self._section(_packed("Q", (value for value, _ in hashed))),
+            "hash_positions": self._section(_packed("I", (position for _, position in hashed))),
+            "lengths": {name: self._section(_packed("I", column)) for name, column in zip(length_fields, lengths)},
+            "total_lengths": {name: sum(column) for name, column in zip(length_fields, lengths)},
+            "docs_with_field": {name: len(column) - column.count(0) for name, column in zip(length_fields, lengths)},
+            "facets": {name: {"values": column.values,
+                              "offsets": self._section(_packed("I", column.offsets)),
+                              "ordinals": self._section(_packed("I", column.ordinals))}
+                       for name, column in zip(facet_fields, facets)},
+        }
+
+    def finish(self) -> "IndexSegment":
+        """Flush both files to disk, move them into place and open the segment."""
+        self._postings.flush()
+        os.fsync(self._postings.fileno())
+        self._postings.close()
+        toc = json.dumps(self._toc).encode("utf-8")
+        header = _HEADER.pack(MAGIC, len(toc)) + toc
+        header += b"\0" * (-len(header) % _ALIGNMENT)
+        terms_tmp = Path(f"{self.path}.terms.tmp")
+        _fsync_write(terms_tmp, [header, *self._sections])
+        os.replace(self._postings_path, f"{self.path}.postings")
+        os.replace(terms_tmp, f"{self.path}.terms")
+        return IndexSegment(self.path)
+
+    def abort(self):
+        """Throw away a half-written segment."""
+        self._postings.close()
+        for leftover in (self._postings_path, Path(f"{self.path}.terms.tmp")):
+            try:
+                leftover.unlink()
+            except OSError:
+                pass
+
+
+class FacetColumn:
+    """
+    🗂️ ONE FACET, DOC BY DOC - each doc's values as ordinals into values
+
+    Doc i's values are ordinals[offsets[i]:offsets[i + 1]], so a doc can
+    have any number of them (tags) or none (no project).
+    """
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.ordinal_of: Dict[str, int] = {}
+        self.offsets = array("I", [0])
+        self.ordinals = array("I")
+
+    def append(self, values: Iterable[str]):
+        for value in values:
+            ordinal = self.ordinal_of.get(value)
+            if ordinal is None:
+                ordinal = self.ordinal_of[value] = len(self.values)
+                self.values.append(value)
+            self.ordinals.append(ordinal)
+        self.offsets.append(len(self.ordinals))
+
+    def values_at(self, position: int) -> Tuple[str, ...]:
+        values = self.values
+        return tuple(values[ordinal] for ordinal in self.ordinals[self.offsets[position]:self.offsets[position + 1]])
+
+    def count(self, positions: Iterable[int]) -> Counter:
+        return count_facet_values(self.values, self.offsets, self.ordinals, positions)
+
+
+def count_facet_values(values: Sequence[str], offsets: Sequence[int], ordinals: Sequence[int],
+                       positions: Iterable[int]) -> Counter:
+    """How many of the docs at positions have each value (counted by ordinal, named once)."""
+    counts: Counter = Counter()
+    for position in positions:
+        counts.update(ordinals[offsets[position]:offsets[position + 1]])
+    return Counter({values[ordinal]: count for ordinal, count in counts.items()})
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edits (insert, delete, substitute, swap two neighbours) turning a into
+    b, or limit + 1 as soon as it is certain to be more than limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before: Optional[List[int]] = None
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, other in enumerate(b, 1):
+            value = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + (char != other))
+            if before is not None and j > 1 and char == b[j - 2] and a[i - 2] == other:
+                value = min(value, before[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        before, row = row, current
+    return min(row[-1], limit + 1)
+
+
+class TermTrigrams:
+    """
+    🔡 SPELLED-ALIKE LOOKUP - trigram → the terms containing it
+
+    One edit changes at most four of a word's trigrams ("$" marks its
+    ends; swapping two neighbours touches four), so a term within d edits
+    shares all but 4 * d of them - and so at least one of its 4 * d + 1
+    rarest. Only terms in those few lists
+    are candidates, only candidates sharing enough trigrams get a real
+    edit distance.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self.terms: List[str] = []
+        self.grams: Dict[str, array] = {}
+        for term in terms:
+            self.add(term)
+
+    def add(self, term: str):
+        number = len(self.terms)
+        self.terms.append(term)
+        for gram in _trigrams(term):
+            ids = self.grams.get(gram)
+            if ids is None:
+                self.grams[gram] = array("I", (number,))
+            else:
+                ids.append(number)
+
+    def similar(self, word: str, max_distance: int, deadline: float) -> List[Tuple[int, str]]:
+        """(distance, term) for terms at most max_distance edits from word, checked until deadline."""
+        grams = _trigrams(word)
+        needed = len(grams) - 4 * max_distance
+        rarest = sorted((self.grams.get(gram, ()) for gram in grams), key=len)[:4 * max_distance + 1]
+        terms = self.terms
+        shared: Dict[str, int] = {}
+        for number in set().union(*rarest):
+            term = terms[number]
+            if abs(len(term) - len(word)) <= max_distance:
+                count = len(grams & _trigrams(term))
+                if count >= needed:
+                    shared[term] = count
+        found = []
+        for checked, term in enumerate(sorted(shared, key=shared.__getitem__, reverse=True)):  # Likeliest first
+            if checked % 64 == 0 and time.monotonic() > deadline:
+                break
+            distance = edit_distance(word, term, max_distance)
+            if distance <= max_distance:
+                found.append((distance, term))
+        return found
+
+
+def _map(path: str) -> Any:
+    """Read-only mmap of a file (empty files map to empty bytes)."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class IndexSegment:
+    """
+    📕 ONE PRINTED VOLUME - an immutable segment read through mmap
+
+    Doc ids are the same global ids the in-memory index hands out, so a
+    segment covers one ascending range of them and posting lists from
+    successive segments simply follow one another. Nothing here knows which
+    docs have been deleted since; the index keeps that list.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.name = self.path.name
+        self._terms = _map(f"{path}.terms")
+        self._postings = _map(f"{path}.postings")
+        magic, toc_length = _HEADER.unpack_from(self._terms, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}.terms is not a search index segment")
+        toc = json.loads(bytes(self._terms[_HEADER.size:_HEADER.size + toc_length]))
+        if toc.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}.terms has unsupported version {toc.get('version')}")
+        self._base = _HEADER.size + toc_length + (-(_HEADER.size + toc_length) % _ALIGNMENT)
+
+        self._fields: Dict[str, Tuple[int, int, Sequence[int], Sequence[int]]] = {}
+        self._frequency_fields: Set[str] = set()
+        for field, layout in toc["fields"].items():
+            keys_start, keys_length = layout["keys"]
+            self._fields[field] = (
+                self._base + keys_start,
+                self._base + keys_start + keys_length,
+                self._numbers("I", layout["key_offsets"]),
+                self._numbers("Q", layout["postings_offsets"]),
+            )
+            if layout["frequencies"]:
+                self._frequency_fields.add(field)
+
+        docs = toc["docs"]
+        self.doc_count: int = docs["count"]
+        self.doc_ids = self._numbers("I", docs["doc_ids"])
+        self._names_start = self._base + docs["log_ids"][0]
+        self._name_offsets = self._numbers("I", docs["log_id_offsets"])
+        self._hashes = self._numbers("Q", docs["hashes"])
+        self._hash_positions = self._numbers("I", docs["hash_positions"])
+        self.length_fields: List[str] = list(docs["lengths"])
+        self._lengths = [self._numbers("I", section) for section in docs["lengths"].values()]
+        self.total_lengths: Dict[str, int] = docs["total_lengths"]
+        self.docs_with_field: Dict[str, int] = docs["docs_with_field"]
+        self.facet_fields: List[str] = list(docs["facets"])
+        self._facets = [(layout["values"], self._numbers("I", layout["offsets"]),
+                         self._numbers("I", layout["ordinals"])) for layout in docs["facets"].values()]
+        self.first_doc = self.doc_ids[0] if self.doc_count else 0
+        self.last_doc = self.doc_ids[-1] if self.doc_count else -1
+        self._fragment_cache: Dict[str, List[str]] = {}
+        self._trigrams: Dict[str, TermTrigrams] = {}  # Field → its terms' trigrams, built on first use
+
+    def _numbers(self, typecode: str, section: Sequence[int]) -> Sequence[int]:
+        """A zero-copy view of one numeric section (copied on big-endian machines)."""
+        start, length = section
+        raw = memoryview(self._terms)[self._base + start:self._base + start + length]
+        if _LITTLE_ENDIAN:
+            return raw.cast(typecode)
+        numbers = array(typecode, raw.tobytes())
+        numbers.byteswap()
+        return numbers
+
+    # ------------------------------------------------------------------
+    # 🔤 TERMS AND POSTINGS
+    # ------------------------------------------------------------------
+
+    def term_count(self, field: str) -> int:
+        return len(self._fields[field][2]) - 1 if field in self._fields else 0
+
+    def _key(self, field: str, position: int) -> bytes:
+        start, _, key_offsets, _ = self._fields[field]
+        return self._terms[start + key_offsets[position]:start + key_offsets[position + 1] - 1]
+
+    def _find(self, field: str, term: str) -> Optional[int]:
+        """Binary search the sorted term dictionary; the term's position or None."""
+        if field not in self._fields:
+            return None
+        key = term.encode("utf-8")
+        low, high = 0, self.term_count(field)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(field, middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count(field) and self._key(field, low) == key:
+            return low
+        return None
+
+    def _read(self, start: int, end: int) -> array:
+        numbers = array("I")
+        numbers.frombytes(self._postings[start * 4:end * 4])
+        if not _LITTLE_ENDIAN:
+            numbers.byteswap()
+        return numbers
+
+    def _span(self, field: str, position: int) -> Tuple[int, int, int]:
+        """Where a term's doc ids start, end, and where its frequencies end."""
+        postings_offsets = self._fields[field][3]
+        start, end = postings_offsets[position], postings_offsets[position + 1]
+        if field in self._frequency_fields:
+            return start, start + (end - start) // 2, end
+        return start, end, end
+
+    def _postings_at(self, field: str, position: int) -> array:
+        start, middle, _ = self._span(field, position)
+        return self._read(start, middle)
+
+    def _frequencies_at(self, field: str, position: int) -> array:
+        _, middle, end = self._span(field, position)
+        return self._read(middle, end)
+
+    def has_frequencies(self, field: str) -> bool:
+        return field in self._frequency_fields
+
+    def postings(self, field: str, term: str) -> array:
+        """📋 The term's sorted doc ids, copied out of the map (empty if absent)."""
+        position = self._find(field, term)
+        return self._postings_at(field, position) if position is not None else array("I")
+
+    def postings_with_frequencies(self, field: str, term: str) -> Tuple[array, array]:
+        """📋 The term's doc ids and, parallel to them, its frequency in each doc."""
+        position = self._find(field, term)
+        if position is None or field not in self._frequency_fields:
+            return array("I"), array("I")
+        start, middle, end = self._span(field, position)
+        return self._read(start, middle), self._read(middle, end)
+
+    def terms(self, field: str) -> Iterator[Tuple[bytes, int]]:
+        """Every (UTF-8 term, position) of a field in sorted order."""
+        for position in range(self.term_count(field)):
+            yield self._key(field, position), position
+
+    def words_containing(self, field: str, fragment: str) -> List[str]:
+        """
+        🔎 Terms containing fragment - a scan of the raw term bytes
+
+        Terms are newline terminated and fragments never contain a newline,
+        so a match can't straddle two terms. Cached: segments never change.
+        """
+        cache_key = f"{field}\n{fragment}"
+        words = self._fragment_cache.get(cache_key)
+        if words is not None:
+            return words
+        words = []
+        if field in self._fields:
+            start, end, key_offsets, _ = self._fields[field]
+            needle = fragment.encode("utf-8")
+            found = self._terms.find(needle, start, end)
+            while found != -1:
+                position = bisect_right(key_offsets, found - start) - 1
+                words.append(self._key(field, position).decode("utf-8"))
+                found = self._terms.find(needle, start + key_offsets[position + 1], end)
+        if len(self._fragment_cache) >= _FRAGMENT_CACHE_SIZE:
+            self._fragment_cache.clear()
+        self._fragment_cache[cache_key] = words
+        return words
+
+    def similar_words(self, field: str, word: str, max_distance: int, deadline: float) -> List[Tuple[int, str]]:
+        """🔡 (distance, term) for terms within max_distance edits of word (see TermTrigrams)."""
+        trigrams = self._trigrams.get(field)
+        if trigrams is None:
+            trigrams = self._trigrams[field] = TermTrigrams(term.decode("utf-8") for term, _ in self.terms(field))
+        return trigrams.similar(word, max_distance, deadline)
+
+    # ------------------------------------------------------------------
+    # 📇 DOCS
+    # ------------------------------------------------------------------
+
+    def _log_id_at(self, position: int) -> str:
+        start = self._names_start
+        return self._terms[start + self._name_offsets[position]:start + self._name_offsets[position + 1]].decode("utf-8")
+
+    def log_id(self, doc: int) -> Optional[str]:
+        """The log id stored under doc, or None if doc isn't in this segment."""
+        position = self._position(doc)
+        return None if position is None else self._log_id_at(position)
+
+    def docs_of(self, log_id: str) -> List[int]:
+        """Every doc id this segment stores for log_id (normally at most one)."""
+        key = log_id_hash(log_id)
+        position = bisect_left(self._hashes, key)
+        docs = []
+        while position < self.doc_count and self._hashes[position] == key:
+            doc_position = self._hash_positions[position]
+            if self._log_id_at(doc_position) == log_id:
+                docs.append(self.doc_ids[doc_position])
+            position += 1
+        return docs
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        """Every (doc id, log id) in doc id order."""
+        for position in range(self.doc_count):
+            yield self.doc_ids[position], self._log_id_at(position)
+
+    def _position(self, doc: int) -> Optional[int]:
+        position = bisect_left(self.doc_ids, doc)
+        if position < self.doc_count and self.doc_ids[position] == doc:
+            return position
+        return None
+
+    def _lengths_at(self, position: int) -> Tuple[int, ...]:
+        return tuple(column[position] for column in self._lengths)
+
+    def _facets_at(self, position: int) -> Tuple[Tuple[str, ...], ...]:
+        return tuple(tuple(values[ordinal] for ordinal in ordinals[offsets[position]:offsets[position + 1]])
+                     for values, offsets, ordinals in self._facets)
+
+    def facet_counts(self, docs: Iterable[int]) -> List[Counter]:
+        """How many of docs (those here) have each value of each facet, in facet_fields order."""
+        positions = [position for position in map(self._position, docs) if position is not None]
+        return [count_facet_values(values, offsets, ordinals, positions)
+                for values, offsets, ordinals in self._facets]
+
+    def lengths_of(self, doc: int) -> Optional[Tuple[int, ...]]:
+        """The doc's field lengths, in length_fields order (None if doc isn't here)."""
+        position = self._position(doc)
+        return None if position is None else self._lengths_at(position)
+
+    def facets_of(self, doc: int) -> Optional[Tuple[Tuple[str, ...], ...]]:
+        """The doc's values of each facet, in facet_fields order (None if doc isn't here)."""
+        position = self._position(doc)
+        return None if position is None else self._facets_at(position)
+
+
+def write_segment(path: Path, fields: Mapping[str, Mapping[str, Sequence[int]]],
+                  docs: Iterable[Tuple[int, str, Sequence[int]]],
+                  frequencies: Optional[Mapping[str, Mapping[str, Sequence[int]]]] = None,
+                  length_fields: Sequence[str] = (), facet_fields: Sequence[str] = ()) -> IndexSegment:
+    """
+    ✍️ PRINT A NEW VOLUME from in-memory posting lists
+
+    fields maps field name → {term: sorted doc ids}, and frequencies the
+    fields that have them → {term: frequency per doc id}. docs lists the
+    segment's (doc id, log id, lengths of length_fields, values of each
+    facet field) in ascending doc id order.
+    """
+    frequencies = frequencies or {}
+    writer = _SegmentWriter(path)
+    try:
+        for name, postings in fields.items():
+            counts = frequencies.get(name, {})
+            encoded = sorted((term.encode("utf-8"), ids, counts.get(term, ())) for term, ids in postings.items())
+            writer.add_field(name, encoded, frequencies=name in frequencies)
+        writer.set_docs(docs, length_fields, facet_fields)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def merge_segments(path: Path, segments: Sequence[IndexSegment], dead: Set[int]) -> IndexSegment:
+    """
+    📚 REPRINT SEVERAL VOLUMES AS ONE - dropping the dead docs
+
+    segments must be adjacent and in doc id order, so each term's merged
+    posting list is just its lists from each segment, one after another.
+    Terms are merged in sorted order, one term in memory at a time.
+    """
+    def tagged(index: int, field: str) -> Iterator[Tuple[bytes, int, int]]:
+        for key, position in segments[index].terms(field):
+            yield key, index, position
+
+    def merged(field: str, frequencies: bool) -> Iterator[Tuple[bytes, array, array]]:
+        streams = [tagged(index, field) for index in range(len(segments))]
+        for key, group in itertools.groupby(heapq.merge(*streams), key=lambda item: item[0]):
+            ids, counts = array("I"), array("I")
+            for _, index, position in group:
+                segment_ids = segments[index]._postings_at(field, position)
+                segment_counts = segments[index]._frequencies_at(field, position) if frequencies else ()
+                if dead:
+                    alive = [doc not in dead for doc in segment_ids]
+                    segment_ids = itertools.compress(segment_ids, alive)
+                    segment_counts = itertools.compress(segment_counts, alive)
+                ids.extend(segment_ids)
+                counts.extend(segment_counts)
+            yield key, ids, counts
+
+    def docs() -> Iterator[Tuple[int, str, Tuple[int, ...], Tuple[Tuple[str, ...], ...]]]:
+        for segment in segments:
+            for position, (doc, log_id) in enumerate(segment.items()):
+                if doc not in dead:
+                    yield doc, log_id, segment._lengths_at(position), segment._facets_at(position)
+
+    writer = _SegmentWriter(path)
+    try:
+        fields = dict.fromkeys(name for segment in segments for name in segment._fields)
+        for field in fields:
+            frequencies = all(segment.has_frequencies(field) for segment in segments)
+            writer.add_field(field, merged(field, frequencies), frequencies=frequencies)
+        writer.set_docs(docs(), segments[0].length_fields, segments[0].facet_fields)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+class SegmentDirectory:
+    """
+    🗄️ THE VOLUME SHELF - a directory of segments plus their manifest
+
+    manifest.json says which segments make up the index, which of their
+    docs are dead and which database generation they reflect. It is
+    replaced atomically, and segment files it no longer names are deleted
+    after each save, so a crash at any point leaves a loadable index.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        numbers = [int(match.group(1)) for match in map(_SEGMENT_NAME.match, os.listdir(self.path)) if match]
+        self._next_number = max(numbers, default=0) + 1
+
+    def new_segment_path(self) -> Path:
+        """A path no existing segment uses."""
+        with self._lock:
+            number, self._next_number = self._next_number, self._next_number + 1
+        return self.path / f"seg-{number:06d}"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The saved manifest, or None if there is none (or it can't be read)."""
+        manifest_path = self.path / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable search index manifest {manifest_path}: {e}")
+            return None
+        if manifest.get("version") != FORMAT_VERSION:
+            logger.info(f"Ignoring search index manifest with version {manifest.get('version')}")
+            return None
+        return manifest
+
+    def open(self, manifest: Mapping[str, Any]) -> List[IndexSegment]:
+        """Map every segment the manifest names, oldest first."""
+        return [IndexSegment(self.path / name) for name in manifest["segments"]]
+
+    def save(self, manifest: Mapping[str, Any]):
+        """Atomically replace the manifest, then delete segment files it doesn't name."""
+        manifest_path = self.path / MANIFEST_NAME
+        temporary = self.path / f"{MANIFEST_NAME}.tmp"
+        _fsync_write(temporary, [json.dumps(manifest).encode("utf-8")])
+        os.replace(temporary, manifest_path)
+
+        kept = set(manifest["segments"])
+        for file_name in os.listdir(self.path):
+            match = _SEGMENT_NAME.match(file_name)
+            if match and file_name.rsplit(".", 1)[0] not in kept:
+                try:
+                    (self.path / file_name).unlink()
+                except OSError as e:
+                    logger.debug(f"Could not delete old search index segment {file_name}: {e}")
@@ -0,0 +1,450 @@
+"""
+📦 PATTERN PACK LIBRARY - Loadable Error Profiles for More Languages 📦
+
+The built-in Python, JavaScript and Java matchers live as Python code in
+patterns.py. Every other language ships as a "pattern pack": a JSON (or YAML,
+when PyYAML is installed) file in the ``packs/`` directory next to this module.
+
+🏆 HIGH SCHOOL EXPLANATION:
+Think of a school library with a reference desk:
+- 📚 PACK FILES: The actual books (one per language) on the shelves
+- 🗂️ INDEX: The card catalogue - a prebuilt summary that says which book
+  covers what, so nobody has to read every book to find the right one
+- 🧑‍💼 LIBRARIAN (ErrorPatternMatcher): Only fetches the Go book off the
+  shelf when someone actually shows up with a Go question
+
+🔧 THE BUILD STEP:
+``python -m debuggle.core.pattern_packs build`` validates every pack
+(required fields, enum values, regexes that compile) and precomputes a
+*literal anchor* for every pattern and language indicator: a plain
+substring that must appear in the text for the regex to possibly match.
+The result is written to ``packs/pattern_index.json``. At runtime the
+matcher checks anchors with cheap ``in`` tests and compiles a pack's regexes
+only when its language is actually detected.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern
+
+from .patterns import BasePatternMatcher, ErrorCategory, ErrorPattern, ErrorSeverity
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PACK_DIR = Path(__file__).parent / "packs"
+INDEX_FILENAME = "pattern_index.json"
+INDEX_FORMAT_VERSION = 1
+
+# Shortest literal worth using as a prefilter - shorter ones match almost anything
+MIN_ANCHOR_LENGTH = 3
+
+# Characters of hex digits following \x, \u and \U - part of the escape, not literal text
+_ESCAPE_ARGUMENT_LENGTHS = {"x": 2, "u": 4, "U": 8}
+
+REQUIRED_PATTERN_FIELDS = (
+    "name", "pattern", "category", "severity", "explanation",
+    "what_happened", "quick_fixes", "prevention_tip", "learn_more_url",
+)
+
+
+class PatternPackError(ValueError):
+    """Raised when a pattern pack file is missing fields or has invalid values."""
+
+
+def extract_literal_anchor(regex: str) -> Optional[str]:
+    """
+    🔎 LITERAL ANCHOR FINDER - The plain text a regex can't match without
+
+    Walks the regex and returns the longest run of literal characters that
+    every match must contain, lowercased (patterns are case-insensitive).
+    Groups, character classes and optional characters are skipped, and a
+    top-level ``|`` means there is no single required literal, so None is
+    returned. Returning None is always safe: it just disables the prefilter.
+
+    Example: ``r"runtime error: index out of range \\[(\\d+)\\]"`` gives
+    ``"runtime error: index out of range ["``.
+    """
+    runs: List[str] = []
+    current: List[str] = []
+
+    def flush() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    def skip_class(i: int) -> int:
+        i += 1
+        if i < len(regex) and regex[i] == "^":
+            i += 1
+        if i < len(regex) and regex[i] == "]":
+            i += 1
+        while i < len(regex) and regex[i] != "]":
+            i += 2 if regex[i] == "\\" else 1
+        return i + 1
+
+    def skip_escape_argument(escaped: str, i: int) -> int:
+        if escaped in _ESCAPE_ARGUMENT_LENGTHS:
+            return i + _ESCAPE_ARGUMENT_LENGTHS[escaped]
+        if escaped == "N" and regex.startswith("{", i):
+            return regex.find("}", i) + 1 or len(regex)
+        if escaped == "0":
+            octal = re.match(r"[0-7]{1,2}", regex[i:])  # Octal \0NN
+            return i + len(octal.group()) if octal else i
+        if escaped.isdigit():
+            if escaped in "01234567" and re.match(r"[0-7]{2}", regex[i:]):
+                return i + 2  # Octal \NNN
+            return i + 1 if regex[i:i + 1].isdigit() else i  # Group reference \N or \NN
+        return i
+
+    def skip_group(i: int) -> int:
+        depth = 0
+        while i < len(regex):
+            char = regex[i]
+            if char == "\\":
+                i += 2
+                continue
+            if char == "[":
+                i = skip_class(i)
+                continue
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            i += 1
+        return i
+
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        if char == "\\":
+            escaped = regex[i + 1] if i + 1 < len(regex) else ""
+            i += 2
+            if escaped and not escaped.isalnum():
+                current.append(escaped)
+                continue
+            # \d, \w, \s, \b, backreferences ... are not literals, and
+            # neither are the arguments of \xNN, \uNNNN, \N{...} or octal \0NN
+            flush()
+            i = skip_escape_argument(escaped, i)
+            continue
+        if char == "|":
+            return None
+        if char == "[":
+            flush()
+            i = skip_class(i)
+            continue
+        if char == "(":
+            flush()
+            i = skip_group(i)
+            continue
+        if char in "*?":
+            # The previous character is optional, so it can't be required
+            if current:
+                current.pop()
+            flush()
+            i += 1
+            continue
+        if char == "{":
+            if current:
+                current.pop()
+            flush()
+            while i < len(regex) and regex[i] != "}":
+                i += 1
+            i += 1
+            continue
+        if char in ".^$+)":
+            flush()
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    flush()
+
+    best = max(runs, key=len, default="")
+    return best.lower() if len(best) >= MIN_ANCHOR_LENGTH else None
+
+
+def load_pack_file(path: Path) -> Dict[str, Any]:
+    """📖 Read one pack file (JSON always, YAML when PyYAML is installed)."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        if not YAML_AVAILABLE:
+            raise PatternPackError(f"{path.name}: PyYAML is required to load YAML pattern packs")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise PatternPackError(f"{path.name}: pack must be a mapping at the top level")
+    return data
+
+
+def validate_pack(data: Dict[str, Any], source: str = "<pack>") -> Dict[str, Any]:
+    """
+    ✅ PACK INSPECTOR - Check a pack and return its compiled-ready index entry
+
+    Collects every problem instead of stopping at the first, so a pack author
+    sees the whole list in one run. The returned entry carries the literal
+    anchors for each pattern and indicator.
+    """
+    problems: List[str] = []
+    language = data.get("language")
+    if not isinstance(language, str) or not language.strip():
+        problems.append("missing 'language'")
+        language = "?"
+    language = language.strip().lower()
+
+    indicators = data.get("indicators") or []
+    if not isinstance(indicators, list) or not indicators:
+        problems.append("'indicators' must be a non-empty list of regexes")
+        indicators = []
+
+    indicator_entries = []
+    for regex in indicators:
+        try:
+            re.compile(regex)
+        except (re.error, TypeError) as e:
+            problems.append(f"indicator {regex!r} does not compile: {e}")
+            continue
+        indicator_entries.append({"pattern": regex, "anchor": extract_literal_anchor(regex)})
+
+    patterns = data.get("patterns") or []
+    if not isinstance(patterns, list) or not patterns:
+        problems.append("'patterns' must be a non-empty list")
+        patterns = []
+
+    categories = {c.value for c in ErrorCategory}
+    severities = {s.value for s in ErrorSeverity}
+    seen_names = set()
+    pattern_entries = []
+    for position, spec in enumerate(patterns):
+        label = spec.get("name", f"#{position}") if isinstance(spec, dict) else f"#{position}"
+        if not isinstance(spec, dict):
+            problems.append(f"pattern {label} must be a mapping")
+            continue
+        missing = [field for field in REQUIRED_PATTERN_FIELDS if not spec.get(field)]
+        if missing:
+            problems.append(f"pattern {label} is missing {', '.join(missing)}")
+            continue
+        if spec["name"] in seen_names:
+            problems.append(f"pattern {label} is defined twice")
+        seen_names.add(spec["name"])
+        if spec["category"] not in categories:
+            problems.append(f"pattern {label} has unknown category {spec['category']!r}")
+        if spec["severity"] not in severities:
+            problems.append(f"pattern {label} has unknown severity {spec['severity']!r}")
+        if not isinstance(spec["quick_fixes"], list):
+            problems.append(f"pattern {label}: 'quick_fixes' must be a list")
+        try:
+            re.compile(spec["pattern"])
+        except re.error as e:
+            problems.append(f"pattern {label} does not compile: {e}")
+            continue
+
+        entry = {field: spec[field] for field in REQUIRED_PATTERN_FIELDS}
+        entry["languages"] = spec.get("languages") or [language]
+        entry["anchor"] = extract_literal_anchor(spec["pattern"])
+        pattern_entries.append(entry)
+
+    if problems:
+        raise PatternPackError(f"{source}: " + "; ".join(problems))
+
+    return {
+        "language": language,
+        "version": data.get("version", 1),
+        "description": data.get("description", ""),
+        "source": source,
+        "indicators": indicator_entries,
+        "patterns": pattern_entries,
+    }
+
+
+def _pack_files(pack_dir: Path) -> List[Path]:
+    suffixes = {".json", ".yaml", ".yml"} if YAML_AVAILABLE else {".json"}
+    return sorted(
+        path for path in pack_dir.iterdir()
+        if path.suffix in suffixes and path.name != INDEX_FILENAME
+    ) if pack_dir.is_dir() else []
+
+
+def _source_hashes(pack_dir: Path) -> Dict[str, str]:
+    """🔏 sha256 of every pack file's bytes, by file name (what the index's "sources" records)."""
+    return {path.name: hashlib.sha256(path.read_bytes()).hexdigest() for path in _pack_files(pack_dir)}
+
+
+def build_index_data(pack_dir: Path = DEFAULT_PACK_DIR) -> Dict[str, Any]:
+    """
+    🏗️ CATALOGUE BUILDER - Validate every pack and assemble the index
+
+    Raises PatternPackError if any pack is invalid or two packs claim the
+    same language.
+    """
+    packs: Dict[str, Any] = {}
+    sources: Dict[str, str] = {}
+    for path in _pack_files(pack_dir):
+        raw = path.read_bytes()
+        entry = validate_pack(load_pack_file(path), source=path.name)
+        if entry["language"] in packs:
+            raise PatternPackError(
+                f"{path.name}: language {entry['language']!r} already provided by "
+                f"{packs[entry['language']]['source']}"
+            )
+        packs[entry["language"]] = entry
+        sources[path.name] = hashlib.sha256(raw).hexdigest()
+    return {"format_version": INDEX_FORMAT_VERSION, "sources": sources, "packs": packs}
+
+
+def build_index(pack_dir: Path = DEFAULT_PACK_DIR, output: Optional[Path] = None) -> Path:
+    """💾 Build the index and write it next to the packs (or to ``output``)."""
+    data = build_index_data(pack_dir)
+    output = output or pack_dir / INDEX_FILENAME
+    output.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return output
+
+
+class PackPatternMatcher(BasePatternMatcher):
+    """
+    🌍 PACK-BACKED SPECIALIST - A language matcher built from an index entry
+
+    Behaves like the hand-written matchers, but its ErrorPatterns (and their
+    regexes) are only created the first time they're asked for.
+    """
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.language = entry["language"]
+        self._entry = entry
+        self._patterns: Optional[List[ErrorPattern]] = None
+        self._indicators: Optional[List[Pattern[str]]] = None
+
+    def get_language_indicators(self) -> List[Pattern[str]]:
+        if self._indicators is None:
+            self._indicators = [
+                re.compile(indicator["pattern"], re.IGNORECASE | re.MULTILINE)
+                for indicator in self._entry["indicators"]
+            ]
+        return self._indicators
+
+    def get_patterns(self) -> List[ErrorPattern]:
+        if self._patterns is None:
+            self._patterns = [
+                ErrorPattern(
+                    name=spec["name"],
+                    pattern=spec["pattern"],
+                    category=ErrorCategory(spec["category"]),
+                    severity=ErrorSeverity(spec["severity"]),
+                    languages=list(spec["languages"]),
+                    explanation=spec["explanation"],
+                    what_happened=spec["what_happened"],
+                    quick_fixes=list(spec["quick_fixes"]),
+                    prevention_tip=spec["prevention_tip"],
+                    learn_more_url=spec["learn_more_url"],
+                    literal_anchor=spec.get("anchor"),
+                )
+                for spec in self._entry["patterns"]
+            ]
+        return self._patterns
+
+
+class PatternPackIndex:
+    """
+    🗂️ CARD CATALOGUE - The loaded index of every available pattern pack
+
+    Answers "which packs could apply to this text?" using only substring
+    checks on precomputed anchors, and hands out one PackPatternMatcher per
+    language on demand.
+    """
+
+    def __init__(self, packs: Dict[str, Dict[str, Any]]):
+        self._packs = packs
+        self._matchers: Dict[str, PackPatternMatcher] = {}
+
+    @classmethod
+    def load(cls, pack_dir: Path = DEFAULT_PACK_DIR,
+             index_path: Optional[Path] = None) -> "PatternPackIndex":
+        """
+        📥 LOAD THE CATALOGUE - Prefer the prebuilt index, rebuild if stale
+
+        The prebuilt index is trusted when it lists exactly the pack files
+        present on disk, each with the sha256 of its current contents.
+        Otherwise (a pack was added, removed or edited without rerunning the
+        build step) the index is rebuilt in memory.
+        """
+        index_path = index_path or pack_dir / INDEX_FILENAME
+        if index_path.exists():
+            try:
+                data = json.loads(index_path.read_text(encoding="utf-8"))
+                if (data.get("format_version") == INDEX_FORMAT_VERSION
+                        and data.get("sources") == _source_hashes(pack_dir)):
+                    return cls(data["packs"])
+                logger.info("Pattern pack index is stale - rebuilding in memory")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not read pattern pack index {index_path}: {e}")
+        try:
+            return cls(build_index_data(pack_dir)["packs"])
+        except PatternPackError as e:
+            logger.error(f"Pattern packs disabled: {e}")
+            return cls({})
+
+    @property
+    def languages(self) -> List[str]:
+        return sorted(self._packs)
+
+    def candidate_languages(self, lowered_text: str) -> List[str]:
+        """Languages with at least one indicator whose anchor appears in the (lowercased) text."""
+        return [
+            language for language, entry in self._packs.items()
+            if any(indicator["anchor"] is None or indicator["anchor"] in lowered_text
+                   for indicator in entry["indicators"])
+        ]
+
+    def get_matcher(self, language: str) -> Optional[PackPatternMatcher]:
+        language = language.lower()
+        if language not in self._packs:
+            return None
+        if language not in self._matchers:
+            self._matchers[language] = PackPatternMatcher(self._packs[language])
+        return self._matchers[language]
+
+
+@lru_cache(maxsize=None)
+def get_default_pack_index() -> PatternPackIndex:
+    """📚 The shared index for the bundled packs (loaded once per process)."""
+    return PatternPackIndex.load()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """🔧 Command line entry point: ``build`` writes the index, ``validate`` only checks."""
+    parser = argparse.ArgumentParser(description="Validate and index Debuggle pattern packs")
+    parser.add_argument("command", choices=["build", "validate"])
+    parser.add_argument("--pack-dir", type=Path, default=DEFAULT_PACK_DIR)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "validate":
+            data = build_index_data(args.pack_dir)
+            print(f"✅ {len(data['packs'])} pattern packs are valid: {', '.join(sorted(data['packs']))}")
+        else:
+            output = build_index(args.pack_dir, args.output)
+            print(f"✅ Pattern pack index written to {output}")
+    except PatternPackError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,7 +32,10 @@ import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Pattern, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Pattern, Union
+
+if TYPE_CHECKING:  # pattern_packs imports this module
+    from .pattern_packs import PatternPackIndex
 
 
 class ErrorSeverity(Enum):
@@ -140,6 +143,10 @@ class ErrorPattern:
     # 📚 STUDY GUIDE - where to learn more about this type of error
     learn_more_url: str
     
+    # ⚓ QUICK PRE-CHECK - lowercase text that must appear for the regex to match
+    # (precomputed for pattern packs; None means "always run the regex")
+    literal_anchor: Optional[str] = None
+    
     def __post_init__(self):
         """Compile string patterns to regex objects."""
         if isinstance(self.pattern, str):
@@ -442,39 +449,96 @@ class JavaPatternMatcher(BasePatternMatcher):
 
 
 class ErrorPatternMatcher:
-    """Main pattern matcher that coordinates language-specific matchers."""
+    """
+    Main pattern matcher that coordinates language-specific matchers.
+
+    Python, JavaScript and Java are always loaded. Other languages come from
+    pattern packs (see pattern_packs.py) and are only loaded - and their
+    regexes compiled - once their language is detected in the text or
+    explicitly requested.
+    """
     
-    def __init__(self):
+    def __init__(self, pack_index: Optional["PatternPackIndex"] = None, use_packs: bool = True) -> None:
         """Initialize with all available pattern matchers."""
-        self.matchers = [
+        self.matchers: List[BasePatternMatcher] = [
             PythonPatternMatcher(),
             JavaScriptPatternMatcher(),
             JavaPatternMatcher(),
         ]
+        self._all_patterns: Optional[List[ErrorPattern]] = None
+        self._language_indicators: Optional[Dict[str, List[Pattern[str]]]] = None
+        
+        # 📦 PATTERN PACKS - extra languages, loaded on demand
+        if pack_index is None and use_packs:
+            from .pattern_packs import get_default_pack_index
+            pack_index = get_default_pack_index()
+        self.pack_index = pack_index
+        self.loaded_packs: List[str] = []
+    
+    @staticmethod
+    def _matcher_language(matcher: BasePatternMatcher) -> str:
+        """Language key for a matcher ('python' for PythonPatternMatcher, etc.)."""
+        return getattr(matcher, 'language', None) or \
+            matcher.__class__.__name__.replace('PatternMatcher', '').lower()
+    
+    def load_pack(self, language: str) -> bool:
+        """
+        📦 Load the pattern pack for ``language`` if one exists and isn't loaded yet.
+
+        Returns True when a new pack was added.
+        """
+        if self.pack_index is None:
+            return False
+        language = language.lower()
+        if language in self.loaded_packs:
+            return False
+        matcher = self.pack_index.get_matcher(language)
+        if matcher is None:
+            return False
+        self.matchers.append(matcher)
+        self.loaded_packs.append(language)
         self._all_patterns = None
         self._language_indicators = None
+        return True
+    
+    def _load_packs_for_text(self, text: str) -> None:
+        """Load packs whose language indicators actually appear in ``text``."""
+        if self.pack_index is None:
+            return
+        lowered = text.lower()
+        for language in self.pack_index.candidate_languages(lowered):
+            if language in self.loaded_packs:
+                continue
+            matcher = self.pack_index.get_matcher(language)
+            # Anchors only say "could match"; confirm with the indicator regexes
+            # before paying for the pack's error patterns
+            if matcher is not None and any(indicator.search(text)
+                                           for indicator in matcher.get_language_indicators()):
+                self.load_pack(language)
     
     @property
     def all_patterns(self) -> List[ErrorPattern]:
         """Get all patterns from all matchers."""
         if self._all_patterns is None:
-            self._all_patterns = []
+            patterns: List[ErrorPattern] = []
             for matcher in self.matchers:
-                self._all_patterns.extend(matcher.get_patterns())
+                patterns.extend(matcher.get_patterns())
+            self._all_patterns = patterns
         return self._all_patterns
     
     @property
     def language_indicators(self) -> Dict[str, List[Pattern[str]]]:
         """Get language indicators mapped by matcher class name."""
         if self._language_indicators is None:
-            self._language_indicators = {}
+            indicators: Dict[str, List[Pattern[str]]] = {}
             for matcher in self.matchers:
-                name = matcher.__class__.__name__.replace('PatternMatcher', '').lower()
-                self._language_indicators[name] = matcher.get_language_indicators()
+                indicators[self._matcher_language(matcher)] = matcher.get_language_indicators()
+            self._language_indicators = indicators
         return self._language_indicators
     
     def detect_language(self, text: str) -> Optional[str]:
         """Detect the most likely programming language from text."""
+        self._load_packs_for_text(text)
         scores = {}
         
         for lang, indicators in self.language_indicators.items():
@@ -494,20 +558,28 @@ class ErrorPatternMatcher:
         """Find all matching error patterns in the text."""
         matches = []
         
+        # Make sure the pack for the requested (or detected) language is loaded
+        if language:
+            self.load_pack(language)
+        else:
+            self._load_packs_for_text(text)
+        
         # Filter patterns by language if specified
         patterns = self.all_patterns
         if language:
             patterns = [p for p in patterns if language.lower() in [l.lower() for l in p.languages]]
         
+        lowered = text.lower()
         for pattern in patterns:
+            # ⚓ Skip the regex entirely when its required literal isn't present
+            if pattern.literal_anchor and pattern.literal_anchor not in lowered:
+                continue
             for match in pattern.pattern.finditer(text):
                 context = None
                 
                 # Try to get context from the appropriate matcher
                 for matcher in self.matchers:
-                    if any(lang in pattern.languages for lang in [
-                        matcher.__class__.__name__.replace('PatternMatcher', '').lower()
-                    ]):
+                    if self._matcher_language(matcher) in pattern.languages:
                         context = matcher.extract_context(text, match)
                         break
                 
@@ -169,7 +169,8 @@ def get_search_manager() -> SearchManager:
     """
     logger.debug("🔍 Providing medical records search system (SearchManager)")
     database = get_database_manager()  # Get the database first
-    return SearchManager(database)
+    # Saved index segments next to logs.db: restarts load them instead of re-reading every log
+    return SearchManager(database, index_dir="search_index/segments")
 
 
 @lru_cache()
@@ -220,7 +221,8 @@ def get_alert_manager() -> AlertManager:
         AlertManager: The emergency alert system
     """
     logger.debug("🚨 Providing emergency alert system (AlertManager)")
-    return AlertManager(error_monitor)
+    database = get_database_manager()  # Used to count errors for threshold rules
+    return AlertManager(error_monitor, database_manager=database)
 
 
 def get_connection_manager():
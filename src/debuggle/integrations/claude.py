@@ -31,11 +31,18 @@ and Claude's natural language reasoning, combining the best of both approaches.
 
 import os
 import json
+import time
+import random
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Dict, Any, Tuple
+from types import SimpleNamespace
+from typing import Optional, Dict, Any, Tuple, List, Set
 from dataclasses import dataclass
 from datetime import datetime
 
+from .prompt_budget import PromptBudgeter, BudgetedPrompt, estimate_tokens, normalize_line
+
 logger = logging.getLogger(__name__)
 
 # Try to import the Anthropic client, but don't fail if it's not installed
@@ -45,6 +52,19 @@ try:
 except ImportError:
     CLAUDE_AVAILABLE = False
 
+# The async path talks to the messages endpoint directly over httpx, so it
+# works with any Anthropic-compatible server (including local fakes in tests)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# 🌐 MESSAGES ENDPOINT SETTINGS - Where and how the async client calls Claude
+DEFAULT_API_BASE_URL = "https://api.anthropic.com"
+ANTHROPIC_API_VERSION = "2023-06-01"
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
 
 @dataclass
 class ClaudeEnhancedAnalysis:
@@ -79,6 +99,63 @@ class ClaudeEnhancedAnalysis:
             self.analysis_timestamp = datetime.now()
 
 
+class ClaudeAPIError(Exception):
+    """
+    📵 CONSULTATION LINE ERROR - The messages endpoint said no
+
+    Raised by the async client when the messages endpoint returns a non-200
+    response. Carries the status code and any ``retry-after`` hint so the
+    retry loop can decide whether (and how long) to wait before trying again.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code in RETRYABLE_STATUS_CODES
+
+
+class TokenBucketRateLimiter:
+    """
+    🪣 TOKEN BUCKET - Keeps us under the API's requests-per-minute limit
+
+    🏆 HIGH SCHOOL EXPLANATION:
+    Picture a jar that refills with one ticket every few seconds, up to a
+    maximum. Each request takes a ticket; if the jar is empty you wait for
+    the next ticket instead of getting rejected by the API. Short bursts are
+    fine (the jar starts full) but the long-run rate never exceeds the refill.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: Optional[float] = None):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate = rate_per_second
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available, then take them."""
+        while True:
+            self._refill()
+            # No await between the check and the decrement, so concurrent
+            # coroutines on the same loop can't both spend the same token
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
 class ClaudeAnalyzer:
     """
     🧠 CLAUDE AI CONSULTANT - Professional Error Analysis Enhancement
@@ -96,28 +173,77 @@ class ClaudeAnalyzer:
     The key insight: Claude doesn't replace Debuggle's analysis - it enriches it!
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-sonnet-20240229"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "claude-3-sonnet-20240229",
+        base_url: Optional[str] = None,
+        max_concurrency: int = 4,
+        requests_per_minute: float = 50.0,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 20.0,
+        request_timeout_seconds: float = 60.0,
+        max_prompt_tokens: int = 3000
+    ):
         """
         🏗️ SETTING UP THE AI CONSULTATION OFFICE
-        
+
         Initialize the Claude integration with proper error handling and
         graceful degradation. Like setting up a consultation service that
         works even when the specialist isn't available.
-        
+
         Args:
             api_key: Claude API key (will try environment variable if None)
             model: Claude model to use for analysis
+            base_url: Messages API host for the async client (ANTHROPIC_BASE_URL or the public API if None)
+            max_concurrency: Maximum async requests in flight at once
+            requests_per_minute: Token-bucket rate limit for async requests
+            max_retries: Retries for rate-limited / transient async failures
+            backoff_base_seconds: First backoff step (doubles each retry, with full jitter)
+            backoff_max_seconds: Upper bound for a single backoff sleep
+            request_timeout_seconds: Per-request timeout for the async client
+            max_prompt_tokens: Approximate token ceiling for each prompt sent to Claude
         """
         # 🔑 API KEY MANAGEMENT - Secure credential handling
         self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
         self.model = model
-        self.client = None
+        self.client: Any = None  # anthropic.Anthropic once initialized
         self.available = False
-        
+
+        # ⚡ ASYNC CLIENT SETTINGS - Concurrency, pacing and retry policy
+        self.base_url = (base_url or os.getenv('ANTHROPIC_BASE_URL') or DEFAULT_API_BASE_URL).rstrip('/')
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.request_timeout_seconds = request_timeout_seconds
+
+        # ✂️ PROMPT BUDGET - Long traces are compressed to this ceiling
+        self.prompt_budgeter = PromptBudgeter(max_prompt_tokens=max_prompt_tokens)
+
+        # asyncio primitives are bound to the loop that created them, so they
+        # are built lazily by _ensure_async_state() for the running loop
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter: Optional[TokenBucketRateLimiter] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._http_client: Optional["httpx.AsyncClient"] = None
+        self._closing_clients: Set["asyncio.Future[None]"] = set()
+
         # 📊 USAGE TRACKING - Help users understand their AI usage
         self.requests_made = 0
         self.total_tokens_used = 0
-        
+        self.api_calls_made = 0
+        self.coalesced_requests = 0
+        self.retries_made = 0
+        self.prompt_tokens_before_compression = 0
+        self.prompt_tokens_after_compression = 0
+        self.prompts_compressed = 0
+        self.batch_requests = 0
+        self.batch_fallbacks = 0
+
         # 🚀 INITIALIZATION - Set up the AI consultation service
         self._initialize_client()
     
@@ -220,26 +346,314 @@ class ClaudeAnalyzer:
             
             # 📊 PARSE AND INTEGRATE - Combine Claude's insights with our analysis
             if claude_response:
-                enhanced.claude_explanation = claude_response.get('explanation')
-                enhanced.specific_fix_suggestion = claude_response.get('fix_suggestion')
-                enhanced.prevention_advice = claude_response.get('prevention_advice')
-                enhanced.confidence_score = claude_response.get('confidence_score', 0.8)
-                enhanced.similar_patterns = claude_response.get('similar_patterns', [])
-                enhanced.used_claude = True
-                enhanced.claude_model = self.model
-                
-                # 📈 USAGE TRACKING - Help users understand AI usage
-                self.requests_made += 1
-                self.total_tokens_used += claude_response.get('tokens_used', 0)
-                
-                logger.info(f"🤖 Claude analysis completed (confidence: {enhanced.confidence_score:.1%})")
-            
+                self._apply_claude_response(enhanced, claude_response)
+
         except Exception as e:
             logger.warning(f"🤖 Claude analysis failed: {e}")
             # Don't fail the entire analysis - just continue without Claude
-        
+
         return enhanced
-    
+
+    def _apply_claude_response(self, enhanced: ClaudeEnhancedAnalysis,
+                               claude_response: Dict[str, Any],
+                               track_usage: bool = True) -> None:
+        """
+        🧩 MERGE CLAUDE'S INSIGHTS - Copy parsed fields onto the analysis
+
+        Shared by the sync, async and batch enhancement paths so all of them
+        record usage the same way. ``track_usage=False`` is used when the same
+        insight is copied onto duplicate errors within a batch
+        (_share_with_duplicates).
+        """
+        enhanced.claude_explanation = claude_response.get('explanation')
+        enhanced.specific_fix_suggestion = claude_response.get('fix_suggestion')
+        enhanced.prevention_advice = claude_response.get('prevention_advice')
+        enhanced.confidence_score = claude_response.get('confidence_score', 0.8)
+        enhanced.similar_patterns = claude_response.get('similar_patterns', [])
+        enhanced.used_claude = True
+        enhanced.claude_model = self.model
+
+        if not track_usage:
+            return
+
+        # 📈 USAGE TRACKING - Help users understand AI usage
+        self.requests_made += 1
+        self.total_tokens_used += claude_response.get('tokens_used', 0)
+
+        logger.info(f"🤖 Claude analysis completed (confidence: {enhanced.confidence_score:.1%})")
+
+    def is_async_available(self) -> bool:
+        """
+        ✅ ASYNC AVAILABILITY CHECK - Can we call the messages endpoint directly?
+
+        The async path only needs an API key and httpx; it does not depend on
+        the anthropic SDK being installed.
+        """
+        return HTTPX_AVAILABLE and bool(self.api_key)
+
+    async def enhance_analysis_async(
+        self,
+        original_analysis: str,
+        error_message: str,
+        error_type: str,
+        language: str,
+        severity: str,
+        file_path: Optional[str] = None,
+        project_context: Optional[Dict[str, Any]] = None
+    ) -> ClaudeEnhancedAnalysis:
+        """
+        ⚡ NON-BLOCKING ENHANCEMENT - enhance_analysis() for async callers
+
+        Same contract as enhance_analysis(): always returns a
+        ClaudeEnhancedAnalysis and never raises because Claude misbehaved.
+        Many of these can run concurrently; the analyzer's semaphore, rate
+        limiter and request coalescing keep the API traffic under control.
+        """
+        enhanced = ClaudeEnhancedAnalysis(
+            original_analysis=original_analysis,
+            error_type=error_type,
+            language=language,
+            severity=severity
+        )
+
+        if not self.is_async_available():
+            logger.info("🤖 Claude async client not available - returning standard analysis")
+            return enhanced
+
+        try:
+            claude_response = await self._query_claude_async(
+                original_analysis=original_analysis,
+                error_message=error_message,
+                error_type=error_type,
+                language=language,
+                severity=severity,
+                file_path=file_path,
+                project_context=project_context
+            )
+            if claude_response:
+                self._apply_claude_response(enhanced, claude_response)
+        except Exception as e:
+            logger.warning(f"🤖 Claude async analysis failed: {e}")
+
+        return enhanced
+
+    async def enhance_many_async(self, requests: List[Dict[str, Any]]) -> List[ClaudeEnhancedAnalysis]:
+        """
+        🚀 FAN-OUT ENHANCEMENT - Enhance a list of errors concurrently
+
+        Each item holds the keyword arguments for enhance_analysis_async().
+        Results come back in the same order as the input.
+        """
+        return list(await asyncio.gather(
+            *(self.enhance_analysis_async(**request) for request in requests)
+        ))
+
+    async def _query_claude_async(
+        self,
+        original_analysis: str,
+        error_message: str,
+        error_type: str,
+        language: str,
+        severity: str,
+        file_path: Optional[str] = None,
+        project_context: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        💬 ASYNC CONSULTATION - _query_claude() without blocking the event loop
+
+        🤝 REQUEST COALESCING:
+        If an identical prompt is already in flight (the same error reported
+        by several log lines at once), later callers wait on the first call's
+        result instead of sending a duplicate request. Followers get a copy of
+        the result with ``tokens_used`` set to 0 so usage isn't double counted.
+        """
+        prompt = self._build_claude_prompt(
+            original_analysis=original_analysis,
+            error_message=error_message,
+            error_type=error_type,
+            language=language,
+            severity=severity,
+            file_path=file_path,
+            project_context=project_context
+        )
+        return await self._coalesced_request(prompt)
+
+    async def _coalesced_request(self, prompt: str, max_tokens: int = 1000,
+                                 batch_ids: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Send ``prompt`` once no matter how many callers ask for it at the same time."""
+        self._ensure_async_state()
+        key = hashlib.sha256(f"{self.model}\0{max_tokens}\0{prompt}".encode('utf-8')).hexdigest()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced_requests += 1
+            follower = True
+        else:
+            follower = False
+            task = asyncio.ensure_future(self._send_with_retries(prompt, max_tokens, batch_ids))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+
+        try:
+            # shield() so one cancelled caller doesn't cancel the shared request
+            result: Optional[Dict[str, Any]] = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not follower:
+                logger.error(f"🤖 Claude API error: {e}")
+            return None
+
+        if follower and result:
+            return dict(result, tokens_used=0)
+        return result
+
+    async def _send_with_retries(self, prompt: str, max_tokens: int,
+                                 batch_ids: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        🔁 RETRY LOOP - Rate limit, bound concurrency, back off on failures
+
+        Each attempt waits for a rate-limiter token and a concurrency slot.
+        Retryable failures (429, 5xx, 529 overloaded, timeouts, dropped
+        connections) sleep with "full jitter" exponential backoff - a random
+        delay between 0 and base * 2^attempt - so a burst of callers that all
+        got throttled together don't all retry at the same instant. A
+        server-provided retry-after wins when it is longer.
+        """
+        rate_limiter, semaphore = self._rate_limiter, self._semaphore
+        if rate_limiter is None or semaphore is None:
+            raise RuntimeError("async state is not set up - call _ensure_async_state() first")
+        attempt = 0
+        while True:
+            try:
+                await rate_limiter.acquire()
+                async with semaphore:
+                    response = await self._post_messages(prompt, max_tokens)
+                return self._parse_claude_response(response, batch_ids)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = random.uniform(0, min(self.backoff_max_seconds,
+                                              self.backoff_base_seconds * (2 ** attempt)))
+                retry_after = getattr(e, 'retry_after', None)
+                if retry_after:
+                    delay = max(delay, min(retry_after, self.backoff_max_seconds))
+                attempt += 1
+                self.retries_made += 1
+                logger.info(f"🤖 Claude request failed ({e}); retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, ClaudeAPIError):
+            return error.retryable
+        if HTTPX_AVAILABLE and isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+            return True
+        return False
+
+    async def _post_messages(self, prompt: str, max_tokens: int) -> SimpleNamespace:
+        """
+        📞 RAW MESSAGES CALL - POST /v1/messages and adapt the reply
+
+        Returns an object shaped like the SDK's message response
+        (``.content[0].text`` and ``.usage.input_tokens``) so the existing
+        _parse_claude_response() works unchanged.
+        """
+        http_client = self._http_client
+        if http_client is None:
+            raise RuntimeError("async state is not set up - call _ensure_async_state() first")
+        self.api_calls_made += 1
+        http_response = await http_client.post(
+            f"{self.base_url}/v1/messages",
+            headers={
+                "x-api-key": self.api_key or "",
+                "anthropic-version": ANTHROPIC_API_VERSION,
+                "content-type": "application/json",
+            },
+            json={
+                "model": self.model,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        )
+
+        if http_response.status_code != 200:
+            retry_after = None
+            header = http_response.headers.get("retry-after")
+            if header:
+                try:
+                    retry_after = float(header)
+                except ValueError:
+                    retry_after = None
+            raise ClaudeAPIError(
+                f"Claude API returned HTTP {http_response.status_code}: {http_response.text[:200]}",
+                status_code=http_response.status_code,
+                retry_after=retry_after
+            )
+
+        body = http_response.json()
+        usage = body.get("usage") or {}
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=block.get("text", ""))
+                     for block in body.get("content", []) if block.get("type", "text") == "text"],
+            usage=SimpleNamespace(
+                input_tokens=usage.get("input_tokens", 0),
+                output_tokens=usage.get("output_tokens", 0)
+            )
+        )
+
+    def _ensure_async_state(self) -> None:
+        """Build (or rebuild) the loop-bound async machinery for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is loop:
+            return
+        if self._http_client is not None:
+            self._close_stale_client(self._http_client, self._async_loop)
+        self._async_loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_limiter = TokenBucketRateLimiter(
+            rate_per_second=self.requests_per_minute / 60.0,
+            capacity=max(1.0, float(self.max_concurrency))
+        )
+        self._inflight = {}
+        self._http_client = httpx.AsyncClient(timeout=self.request_timeout_seconds)
+
+    def _close_stale_client(self, client: "httpx.AsyncClient",
+                            loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """
+        🧹 HANG UP THE OLD LINE - Close a client left behind by a previous loop
+
+        The client's connections belong to the loop that opened them, so it
+        is closed there while that loop still runs; otherwise the close runs
+        on the current loop. A close that fails only means the old loop
+        already tore its connections down.
+        """
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        closing = asyncio.ensure_future(client.aclose())
+        self._closing_clients.add(closing)
+
+        def finished(task: "asyncio.Future[None]") -> None:
+            self._closing_clients.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.debug(f"🤖 Closing the previous loop's HTTP client failed: {task.exception()}")
+
+        closing.add_done_callback(finished)
+
+    async def aclose(self) -> None:
+        """
+        🧹 HANG UP - Close the async HTTP client
+
+        Call this when the event loop that used enhance_analysis_async() is
+        shutting down.
+        """
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._async_loop = None
+
     def _query_claude(
         self,
         original_analysis: str,
@@ -277,6 +691,7 @@ class ClaudeAnalyzer:
             )
             
             # 📞 MAKE THE API CALL - Request Claude's professional opinion
+            self.api_calls_made += 1
             response = self.client.messages.create(
                 model=self.model,
                 max_tokens=1000,  # Reasonable limit for debugging advice
@@ -327,19 +742,15 @@ class ClaudeAnalyzer:
             prompt_parts.append(f"**File:** {file_path}")
         
         # 🏗️ PROJECT CONTEXT - Additional background information
+        surrounding_code = None
         if project_context:
             if project_context.get('framework'):
                 prompt_parts.append(f"**Framework:** {project_context['framework']}")
             if project_context.get('dependencies'):
                 prompt_parts.append(f"**Key Dependencies:** {', '.join(project_context['dependencies'][:3])}")
-        
-        prompt_parts.extend([
-            "",
-            "**Raw Error:**",
-            error_message,
-            "",
-            "**Local Analysis (already provided to user):**",
-            original_analysis,
+            surrounding_code = project_context.get('surrounding_code')
+
+        instructions = [
             "",
             "**Please provide (in JSON format):**",
             "1. `explanation`: A deeper explanation of why this error occurs",
@@ -350,17 +761,63 @@ class ClaudeAnalyzer:
             "",
             "Focus on actionable advice that complements the local analysis.",
             "Be concise but thorough. Respond only with valid JSON."
+        ]
+
+        # ✂️ SIZE CONTROL - Squeeze the big sections down to the token budget
+        section_labels = ["", "**Raw Error:**", "", "**Local Analysis (already provided to user):**"]
+        if surrounding_code:
+            section_labels.extend(["", "**Surrounding Code:**"])
+        fixed_tokens = estimate_tokens("\n".join(prompt_parts + section_labels + instructions))
+        budgeted = self.prompt_budgeter.budget(
+            error_message=error_message,
+            original_analysis=original_analysis,
+            surrounding_code=surrounding_code,
+            fixed_tokens=fixed_tokens
+        )
+        self._record_prompt_size(budgeted)
+
+        prompt_parts.extend([
+            "",
+            "**Raw Error:**",
+            budgeted.error_message,
         ])
-        
+        if budgeted.surrounding_code:
+            prompt_parts.extend([
+                "",
+                "**Surrounding Code:**",
+                budgeted.surrounding_code,
+            ])
+        prompt_parts.extend([
+            "",
+            "**Local Analysis (already provided to user):**",
+            budgeted.original_analysis,
+        ])
+        prompt_parts.extend(instructions)
+
         return "\n".join(prompt_parts)
-    
-    def _parse_claude_response(self, response) -> Optional[Dict[str, Any]]:
+
+    def _record_prompt_size(self, budgeted: BudgetedPrompt) -> None:
+        """📏 Track prompt sizes before and after compression for get_usage_stats()."""
+        self.prompt_tokens_before_compression += budgeted.tokens_before
+        self.prompt_tokens_after_compression += budgeted.tokens_after
+        if budgeted.compressed:
+            self.prompts_compressed += 1
+
+    def _parse_claude_response(self, response: Any,
+                               batch_ids: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         🔍 RESPONSE INTERPRETER - Extract structured insights from Claude
         
         Parse Claude's response and extract the structured information
         we need for enhanced analysis. Like interpreting a specialist's
         report and extracting the key recommendations.
+
+        📦 BATCH MODE:
+        When ``batch_ids`` is given the response is expected to hold one JSON
+        section per error id. The result is ``{'batch_results': {id: section},
+        'tokens_used': n}`` containing only the well-formed sections; ids that
+        are missing or garbled are simply absent so the caller can fall back
+        to individual requests for them. Unparseable batch JSON returns None.
         """
         try:
             # 📝 EXTRACT THE CORE CONTENT - Get Claude's actual response
@@ -374,15 +831,25 @@ class ClaudeAnalyzer:
             content = content.strip()
             
             # 📊 PARSE STRUCTURED RESPONSE - Convert to usable data
-            parsed = json.loads(content)
+            parsed: Dict[str, Any] = json.loads(content)
+            tokens_used = response.usage.input_tokens + response.usage.output_tokens
+
+            if batch_ids is not None:
+                return {
+                    'batch_results': self._extract_batch_sections(parsed, batch_ids),
+                    'tokens_used': tokens_used
+                }
             
             # 📈 ADD USAGE METADATA - Track token usage for cost awareness
-            parsed['tokens_used'] = response.usage.input_tokens + response.usage.output_tokens
+            parsed['tokens_used'] = tokens_used
             
             return parsed
             
         except json.JSONDecodeError as e:
             logger.warning(f"🤖 Failed to parse Claude response as JSON: {e}")
+            if batch_ids is not None:
+                # No way to tell which prose belongs to which error
+                return None
             # Try to extract useful information anyway
             return {
                 'explanation': response.content[0].text,
@@ -393,7 +860,266 @@ class ClaudeAnalyzer:
         except Exception as e:
             logger.error(f"🤖 Failed to parse Claude response: {e}")
             return None
+
+    @staticmethod
+    def _extract_batch_sections(parsed: Any, batch_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        🗂️ SECTION SORTER - Pull per-error sections out of a batch reply
+
+        Accepts the requested ``{"errors": [{"id": ...}, ...]}`` shape, a bare
+        list of sections, or an object keyed by id. Sections without an
+        explanation or for ids we didn't ask about are dropped.
+        """
+        if isinstance(parsed, dict) and isinstance(parsed.get('errors'), list):
+            sections = parsed['errors']
+        elif isinstance(parsed, list):
+            sections = parsed
+        elif isinstance(parsed, dict):
+            sections = [dict(value, id=key) for key, value in parsed.items() if isinstance(value, dict)]
+        else:
+            sections = []
+
+        wanted = set(batch_ids)
+        results: Dict[str, Dict[str, Any]] = {}
+        for section in sections:
+            if not isinstance(section, dict):
+                continue
+            error_id = str(section.get('id', ''))
+            if error_id in wanted and error_id not in results and section.get('explanation'):
+                results[error_id] = section
+        return results
     
+    # ------------------------------------------------------------------
+    # 📦 BATCH ENHANCEMENT - Several errors, one consultation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def fingerprint_error(error_type: str, error_message: str) -> str:
+        """
+        🧬 ERROR FINGERPRINT - Same bug, same fingerprint
+
+        Hashes the error type plus the message with timestamps, numbers and
+        addresses masked, so the same failure reported at different times
+        (or for different record ids) is only sent to Claude once.
+        """
+        normalized = "\n".join(normalize_line(line) for line in (error_message or "").splitlines())
+        return hashlib.sha1(f"{error_type}\0{normalized}".encode('utf-8')).hexdigest()[:16]
+
+    def enhance_batch(self, errors: List[Dict[str, Any]],
+                      max_batch_size: int = 8) -> List[ClaudeEnhancedAnalysis]:
+        """
+        📦 BATCH ENHANCEMENT - Enhance many errors with a few round trips
+
+        🏆 HIGH SCHOOL EXPLANATION:
+        Instead of raising your hand once per homework question, you hand the
+        teacher one sheet with all your questions numbered. One trip to the
+        desk, every question answered - and if the teacher's answer sheet is
+        smudged for question 3, you go back and ask just that one again.
+
+        Each item holds the keyword arguments for enhance_analysis(). Errors
+        with the same fingerprint are sent once and share the answer. Up to
+        ``max_batch_size`` distinct errors go into each request; any error
+        whose section is missing or malformed in the reply falls back to an
+        individual request. Results come back in input order.
+        """
+        results, groups, chunks = self._plan_batches(errors, max_batch_size)
+        if not self.is_available():
+            logger.info("🤖 Claude not available - returning standard analysis")
+            return results
+
+        for chunk in chunks:
+            pending = chunk
+            if len(chunk) > 1:
+                prompt, batch_ids, max_tokens = self._build_batch_prompt([errors[i] for i in chunk])
+                response = None
+                try:
+                    self.api_calls_made += 1
+                    raw = self.client.messages.create(
+                        model=self.model,
+                        max_tokens=max_tokens,
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                    response = self._parse_claude_response(raw, batch_ids)
+                except Exception as e:
+                    logger.warning(f"🤖 Claude batch request failed: {e}")
+                pending = self._merge_batch_response(results, chunk, batch_ids, response)
+
+            for index in pending:
+                if len(chunk) > 1:
+                    self.batch_fallbacks += 1
+                results[index] = self.enhance_analysis(**errors[index])
+
+        self._share_with_duplicates(results, groups)
+        return results
+
+    async def enhance_batch_async(self, errors: List[Dict[str, Any]],
+                                  max_batch_size: int = 8) -> List[ClaudeEnhancedAnalysis]:
+        """
+        ⚡📦 ASYNC BATCH ENHANCEMENT - enhance_batch() for async callers
+
+        Batches run concurrently under the analyzer's semaphore and rate
+        limiter; fallbacks go through enhance_analysis_async().
+        """
+        results, groups, chunks = self._plan_batches(errors, max_batch_size)
+        if not self.is_async_available():
+            logger.info("🤖 Claude async client not available - returning standard analysis")
+            return results
+
+        async def run_chunk(chunk: List[int]) -> None:
+            pending = chunk
+            if len(chunk) > 1:
+                prompt, batch_ids, max_tokens = self._build_batch_prompt([errors[i] for i in chunk])
+                response = await self._coalesced_request(prompt, max_tokens, batch_ids)
+                pending = self._merge_batch_response(results, chunk, batch_ids, response)
+            for index in pending:
+                if len(chunk) > 1:
+                    self.batch_fallbacks += 1
+                results[index] = await self.enhance_analysis_async(**errors[index])
+
+        await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        self._share_with_duplicates(results, groups)
+        return results
+
+    def _plan_batches(self, errors: List[Dict[str, Any]], max_batch_size: int
+                      ) -> Tuple[List[ClaudeEnhancedAnalysis], Dict[int, List[int]], List[List[int]]]:
+        """
+        🗺️ BATCH PLANNER - Baseline results, duplicate groups and request chunks
+
+        Returns the un-enhanced results (one per input), a map from each
+        representative index to its duplicate indices, and the
+        representatives split into chunks of at most ``max_batch_size``.
+        """
+        results = [
+            ClaudeEnhancedAnalysis(
+                original_analysis=error['original_analysis'],
+                error_type=error['error_type'],
+                language=error['language'],
+                severity=error['severity']
+            )
+            for error in errors
+        ]
+
+        representative_for: Dict[str, int] = {}
+        groups: Dict[int, List[int]] = {}
+        for index, error in enumerate(errors):
+            fingerprint = self.fingerprint_error(error['error_type'], error['error_message'])
+            if fingerprint in representative_for:
+                groups[representative_for[fingerprint]].append(index)
+            else:
+                representative_for[fingerprint] = index
+                groups[index] = []
+
+        representatives = list(groups)
+        size = max(1, max_batch_size)
+        chunks = [representatives[i:i + size] for i in range(0, len(representatives), size)]
+        return results, groups, chunks
+
+    def _build_batch_prompt(self, errors: List[Dict[str, Any]]) -> Tuple[str, List[str], int]:
+        """
+        📝 BATCH REQUEST BUILDER - One structured prompt for several errors
+
+        Every error gets an id (E1, E2, ...) and an equal share of the prompt
+        token budget. Returns the prompt, the ids and a response token limit
+        scaled to the number of errors.
+        """
+        batch_ids = [f"E{i + 1}" for i in range(len(errors))]
+        prompt_parts = [
+            "You are a senior software engineer helping debug several errors from the same application.",
+            "I've already done initial analysis of each error with a local debugging tool.",
+            "Please provide additional insights that would help a developer fix and prevent each error.",
+        ]
+        instructions = [
+            "",
+            "**Respond only with valid JSON of this exact shape:**",
+            '{"errors": [{"id": "E1", "explanation": "...", "fix_suggestion": "...", '
+            '"prevention_advice": "...", "confidence_score": 0.0, "similar_patterns": ["..."]}]}',
+            "",
+            "Include exactly one entry per error id listed above.",
+            "Focus on actionable advice that complements the local analysis. Be concise but thorough."
+        ]
+
+        per_error_budget = max(200, (self.prompt_budgeter.max_prompt_tokens
+                                     - estimate_tokens("\n".join(prompt_parts + instructions))) // len(errors))
+        budgeter = PromptBudgeter(
+            max_prompt_tokens=per_error_budget,
+            head_frames=self.prompt_budgeter.head_frames,
+            tail_frames=self.prompt_budgeter.tail_frames,
+            max_block_size=self.prompt_budgeter.max_block_size
+        )
+
+        for error_id, error in zip(batch_ids, errors):
+            header = [
+                "",
+                f"### Error {error_id}",
+                f"**Error Type:** {error['error_type']}",
+                f"**Language:** {error['language']}",
+                f"**Severity:** {error['severity']}",
+            ]
+            if error.get('file_path'):
+                header.append(f"**File:** {error['file_path']}")
+            labels = ["**Raw Error:**", "**Local Analysis (already provided to user):**"]
+            budgeted = budgeter.budget(
+                error_message=error['error_message'],
+                original_analysis=error['original_analysis'],
+                fixed_tokens=estimate_tokens("\n".join(header + labels))
+            )
+            self._record_prompt_size(budgeted)
+            prompt_parts.extend(header)
+            prompt_parts.extend([
+                "**Raw Error:**",
+                budgeted.error_message,
+                "**Local Analysis (already provided to user):**",
+                budgeted.original_analysis,
+            ])
+
+        prompt_parts.extend(instructions)
+        max_tokens = min(4096, 600 * len(errors))
+        return "\n".join(prompt_parts), batch_ids, max_tokens
+
+    def _merge_batch_response(self, results: List[ClaudeEnhancedAnalysis], chunk: List[int],
+                              batch_ids: List[str], response: Optional[Dict[str, Any]]) -> List[int]:
+        """
+        🧩 BATCH MERGER - Apply each well-formed section, report the rest
+
+        Token usage for the whole request is attributed to the first error
+        that received an answer so totals stay exact. Returns the input
+        indices that still need an individual request.
+        """
+        self.batch_requests += 1
+        sections = (response or {}).get('batch_results') or {}
+        tokens_left = (response or {}).get('tokens_used', 0)
+        missing = []
+        for index, error_id in zip(chunk, batch_ids):
+            section = sections.get(error_id)
+            if not section:
+                missing.append(index)
+                continue
+            self._apply_claude_response(results[index], dict(section, tokens_used=tokens_left))
+            tokens_left = 0
+        # A reply with no usable sections still cost tokens
+        self.total_tokens_used += tokens_left
+        if missing:
+            logger.warning(f"🤖 Claude batch reply missing {len(missing)} of {len(chunk)} sections - "
+                           f"falling back to individual requests")
+        return missing
+
+    def _share_with_duplicates(self, results: List[ClaudeEnhancedAnalysis],
+                               groups: Dict[int, List[int]]) -> None:
+        """Copy each representative's insights onto errors with the same fingerprint (usage counted once)."""
+        for representative, duplicates in groups.items():
+            source = results[representative]
+            if not source.used_claude:
+                continue
+            insights = {
+                'explanation': source.claude_explanation,
+                'fix_suggestion': source.specific_fix_suggestion,
+                'prevention_advice': source.prevention_advice,
+                'confidence_score': source.confidence_score,
+                'similar_patterns': source.similar_patterns,
+            }
+            for index in duplicates:
+                self._apply_claude_response(results[index], insights, track_usage=False)
+
     def format_enhanced_output(self, analysis: ClaudeEnhancedAnalysis) -> str:
         """
         🎨 PROFESSIONAL REPORT FORMATTER - Present analysis in readable format
@@ -475,5 +1201,13 @@ class ClaudeAnalyzer:
             'requests_made': self.requests_made,
             'total_tokens_used': self.total_tokens_used,
             'estimated_cost_usd': self.total_tokens_used * 0.000003,  # Rough estimate
-            'model': self.model
+            'model': self.model,
+            'api_calls_made': self.api_calls_made,
+            'coalesced_requests': self.coalesced_requests,
+            'retries_made': self.retries_made,
+            'prompt_tokens_before_compression': self.prompt_tokens_before_compression,
+            'prompt_tokens_after_compression': self.prompt_tokens_after_compression,
+            'prompts_compressed': self.prompts_compressed,
+            'batch_requests': self.batch_requests,
+            'batch_fallbacks': self.batch_fallbacks
         }
\ No newline at end of file
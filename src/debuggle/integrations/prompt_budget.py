@@ -0,0 +1,353 @@
+"""
+✂️ PROMPT BUDGETER - Fitting the Whole Story Into a Small Envelope! ✂️
+
+Claude is billed (and gets slower) per token, and the raw material we hand it
+can be huge: a 400-frame Java trace, a log that repeats the same line 10,000
+times, a recursion error with the same three frames over and over. This
+module squeezes that material down to a token budget while keeping the parts
+a senior developer would actually read.
+
+🏆 HIGH SCHOOL EXPLANATION:
+Imagine summarizing a 300-page novel for a book report with a 2-page limit:
+- 📖 KEEP: The opening, the ending, and the plot twists (top frames, the
+  innermost frames and the "Caused by" chain)
+- 📍 KEEP: Quotes from the key scene (the surrounding code)
+- ✂️ CUT: Chapters that say the same thing again (repeated frames and lines)
+- 📝 NOTE: "...chapters 4-17 skipped..." so the reader knows something was cut
+
+🎯 WHAT GETS PROTECTED (in priority order):
+1. Exception headers and the exception chain (Caused by / During handling...)
+2. The first and last few frames of every stack trace section
+3. The surrounding code passed in by the caller
+4. Everything else, trimmed from the middle outwards
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+# 🔢 TOKEN ESTIMATION - Roughly how tokenizers split code-ish text
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+
+# 🧬 NORMALIZATION - Things that differ between otherwise identical lines
+_VOLATILE_PARTS = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"  # timestamps
+    r"|0x[0-9a-fA-F]+"                                                            # addresses
+    r"|\d+"                                                                      # numbers
+)
+_ADDRESSES = re.compile(r"0x[0-9a-fA-F]+")
+
+# 🧱 STACK FRAME SHAPES - Python, Java/C#/JavaScript, Go and Rust style frames
+_FRAME_LINE = re.compile(
+    r'^\s*(?:File ".*", line \d+'                     # Python
+    r"|at\s+\S+"                                     # Java / C# / JavaScript
+    r"|\d+:\s+\S+"                                   # Rust backtrace
+    r"|\S+\.go:\d+"                                  # Go
+    r"|#\d+\s+\S+)"                                  # gdb / native
+)
+
+# ⛓️ EXCEPTION CHAIN - Headers and the glue lines between chained exceptions
+_CHAIN_LINE = re.compile(
+    r"^\s*(?:Traceback \(most recent call last\)"
+    r"|Caused by:"
+    r"|During handling of the above exception"
+    r"|The above exception was the direct cause"
+    r"|Exception in thread"
+    r"|panic:"
+    r"|thread '.*' panicked"
+    r"|(?:[\w$]+\.)*[\w$]*(?:Error|Exception|Exit|Interrupt|Warning|Fault)\b\s*(?::|$))"
+)
+
+OMITTED_FRAMES_MARKER = "    ... {count} frames omitted ..."
+REPEATED_LINE_MARKER = "    ... previous line repeated {count} more times ..."
+REPEATED_BLOCK_MARKER = "    ... previous {size} lines repeated {count} more times ..."
+TRUNCATED_MARKER = "... [{count} lines trimmed to fit the prompt budget] ..."
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    🔢 APPROXIMATE TOKEN COUNT - Good enough for budgeting, no tokenizer needed
+
+    Punctuation counts as one token each; words count as one token per ~4
+    characters. This tracks real BPE tokenizers closely on stack traces, which
+    are dense with dots, parentheses and long identifiers.
+    """
+    if not text:
+        return 0
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        tokens += (len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == "_" else 1
+    return tokens
+
+
+def normalize_line(line: str) -> str:
+    # Frames differ by class/file/line number, so only addresses are masked
+    # there; log lines get timestamps, counters and ids masked as well
+    if _FRAME_LINE.match(line):
+        return _ADDRESSES.sub("#", line.strip())
+    return _VOLATILE_PARTS.sub("#", line.strip())
+
+
+def _is_frame(line: str) -> bool:
+    return bool(_FRAME_LINE.match(line))
+
+
+def _is_chain(line: str) -> bool:
+    return bool(_CHAIN_LINE.match(line))
+
+
+@dataclass
+class BudgetedPrompt:
+    """
+    📦 COMPRESSION RESULT - The trimmed sections plus before/after sizes
+    """
+    error_message: str
+    original_analysis: str
+    surrounding_code: Optional[str]
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def compressed(self) -> bool:
+        return self.tokens_after < self.tokens_before
+
+
+class PromptBudgeter:
+    """
+    ✂️ THE EDITOR - Trims prompt sections to a token ceiling
+
+    🏆 HIGH SCHOOL EXPLANATION:
+    Like an editor with a word limit: first delete the repetition (free
+    savings, nothing is lost), then skip the boring middle of long lists,
+    and only as a last resort cut text from the middle of a section.
+
+    Args:
+        max_prompt_tokens: Ceiling for the variable sections of the prompt
+        head_frames: Frames kept from the top of each stack section
+        tail_frames: Frames kept from the bottom of each stack section
+        max_block_size: Longest run of lines detected as a repeating block
+    """
+
+    def __init__(self, max_prompt_tokens: int = 3000, head_frames: int = 6,
+                 tail_frames: int = 4, max_block_size: int = 6):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.head_frames = head_frames
+        self.tail_frames = tail_frames
+        self.max_block_size = max_block_size
+
+    # ------------------------------------------------------------------
+    # 🔁 STEP 1: LOSSLESS-ISH COLLAPSING OF REPETITION
+    # ------------------------------------------------------------------
+
+    def collapse_repeats(self, lines: List[str]) -> List[str]:
+        """
+        🔁 REPETITION SQUASHER - "Same line 500 times" becomes one line + a note
+
+        Log lines are compared after masking timestamps, addresses and
+        numbers, so a retry loop logging "attempt 1", "attempt 2", ...
+        collapses too. Frames must match exactly (apart from addresses).
+        Repeating blocks of up to ``max_block_size`` lines (recursion frames)
+        are collapsed the same way.
+        """
+        lines = self._collapse_runs(lines, 1)
+        for size in range(2, self.max_block_size + 1):
+            lines = self._collapse_runs(lines, size)
+        return lines
+
+    def _collapse_runs(self, lines: List[str], size: int) -> List[str]:
+        keys = [normalize_line(line) for line in lines]
+        result: List[str] = []
+        i = 0
+        while i < len(lines):
+            block = keys[i:i + size]
+            repeats = 0
+            if len(block) == size and any(block):
+                j = i + size
+                while keys[j:j + size] == block:
+                    repeats += 1
+                    j += size
+            if repeats:
+                result.extend(lines[i:i + size])
+                if size == 1:
+                    result.append(REPEATED_LINE_MARKER.format(count=repeats))
+                else:
+                    result.append(REPEATED_BLOCK_MARKER.format(size=size, count=repeats))
+                i += size * (repeats + 1)
+            else:
+                result.append(lines[i])
+                i += 1
+        return result
+
+    # ------------------------------------------------------------------
+    # 🧱 STEP 2: KEEP THE TOP AND BOTTOM OF EACH STACK SECTION
+    # ------------------------------------------------------------------
+
+    def trim_frames(self, lines: List[str]) -> List[str]:
+        """
+        🧱 FRAME TRIMMER - Keep the first and last frames of every stack section
+
+        A Python frame is the ``File "..."`` line plus the indented source
+        line under it, so they are kept or dropped together. Exception
+        headers and chain lines always end a section and are never dropped.
+        """
+        result: List[str] = []
+        section: List[List[str]] = []
+
+        def flush() -> None:
+            keep = self.head_frames + self.tail_frames
+            if len(section) > keep:
+                kept = section[:self.head_frames]
+                omitted = len(section) - keep
+                tail = section[len(section) - self.tail_frames:] if self.tail_frames else []
+                for frame in kept:
+                    result.extend(frame)
+                result.append(OMITTED_FRAMES_MARKER.format(count=omitted))
+                for frame in tail:
+                    result.extend(frame)
+            else:
+                for frame in section:
+                    result.extend(frame)
+            section.clear()
+
+        for line in lines:
+            if _is_frame(line) and not _is_chain(line):
+                section.append([line])
+            elif section and not _is_chain(line) and line.startswith((" ", "\t")) \
+                    and len(section[-1]) == 1 and line.strip() and not line.strip().startswith("..."):
+                # Source line printed under a Python frame
+                section[-1].append(line)
+            else:
+                flush()
+                result.append(line)
+        flush()
+        return result
+
+    # ------------------------------------------------------------------
+    # ✂️ STEP 3: HARD LIMIT
+    # ------------------------------------------------------------------
+
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        """
+        ✂️ LAST RESORT - Cut lines from the middle until the text fits
+
+        Keeps exception/chain lines wherever they are, then fills the rest of
+        the budget alternately from the start and the end of the text.
+        """
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        lines = text.splitlines()
+        costs = [estimate_tokens(line) + 1 for line in lines]
+        keep = [False] * len(lines)
+        used = estimate_tokens(TRUNCATED_MARKER) + 1
+
+        for idx, line in enumerate(lines):
+            if _is_chain(line) and used + costs[idx] <= max_tokens:
+                keep[idx] = True
+                used += costs[idx]
+
+        front, back = 0, len(lines) - 1
+        take_front = True
+        while front <= back:
+            idx = front if take_front else back
+            if not keep[idx]:
+                if used + costs[idx] > max_tokens:
+                    break
+                keep[idx] = True
+                used += costs[idx]
+            if take_front:
+                front += 1
+            else:
+                back -= 1
+            take_front = not take_front
+
+        result: List[str] = []
+        dropped = 0
+        for idx, line in enumerate(lines):
+            if keep[idx]:
+                if dropped:
+                    result.append(TRUNCATED_MARKER.format(count=dropped))
+                    dropped = 0
+                result.append(line)
+            else:
+                dropped += 1
+        if dropped:
+            result.append(TRUNCATED_MARKER.format(count=dropped))
+
+        truncated = "\n".join(result)
+        if estimate_tokens(truncated) > max_tokens:
+            # A single enormous line - fall back to a character cut (~4 chars/token)
+            truncated = truncated[:max(0, max_tokens * 4)]
+        return truncated
+
+    def compress(self, text: str, max_tokens: int) -> str:
+        """
+        🗜️ FULL PIPELINE - Collapse repeats, trim frames, then hard-truncate
+
+        Each step only runs if the previous one didn't already fit.
+        """
+        if not text or estimate_tokens(text) <= max_tokens:
+            return text
+        lines = self.collapse_repeats(text.splitlines())
+        candidate = "\n".join(lines)
+        if estimate_tokens(candidate) <= max_tokens:
+            return candidate
+        candidate = "\n".join(self.trim_frames(lines))
+        return self.truncate_to_tokens(candidate, max_tokens)
+
+    # ------------------------------------------------------------------
+    # 📦 WHOLE-PROMPT BUDGETING
+    # ------------------------------------------------------------------
+
+    def budget(self, error_message: str, original_analysis: str,
+               surrounding_code: Optional[str] = None,
+               fixed_tokens: int = 0) -> BudgetedPrompt:
+        """
+        📦 SPLIT THE BUDGET - Share the ceiling between the prompt sections
+
+        ``fixed_tokens`` is the cost of the instructions and metadata that are
+        always sent. What's left is shared: the error gets the biggest slice,
+        then surrounding code, then the local analysis (which the user has
+        already seen). Any slice a section doesn't need is handed on.
+        """
+        sections = [error_message or "", surrounding_code or "", original_analysis or ""]
+        sizes = [estimate_tokens(s) for s in sections]
+        tokens_before = fixed_tokens + sum(sizes)
+
+        available = max(0, self.max_prompt_tokens - fixed_tokens)
+        shares = self._allocate(sizes, available, weights=(0.6, 0.2, 0.2))
+        compressed = [self.compress(text, share) if size > share else text
+                      for text, size, share in zip(sections, sizes, shares)]
+
+        tokens_after = fixed_tokens + sum(estimate_tokens(s) for s in compressed)
+        return BudgetedPrompt(
+            error_message=compressed[0],
+            surrounding_code=compressed[1] if surrounding_code else surrounding_code,
+            original_analysis=compressed[2],
+            tokens_before=tokens_before,
+            tokens_after=tokens_after,
+        )
+
+    @staticmethod
+    def _allocate(sizes: List[int], available: int,
+                  weights: Tuple[float, ...]) -> List[int]:
+        """Weighted split of ``available`` where unused shares flow to sections that need more."""
+        shares = [0] * len(sizes)
+        remaining = available
+        pending = [i for i, size in enumerate(sizes) if size > 0]
+        while pending and remaining > 0:
+            total_weight = sum(weights[i] for i in pending)
+            satisfied = []
+            for i in pending:
+                offer = int(remaining * weights[i] / total_weight)
+                if sizes[i] - shares[i] <= offer:
+                    satisfied.append(i)
+            if not satisfied:
+                for i in pending:
+                    shares[i] += int(remaining * weights[i] / total_weight)
+                break
+            for i in satisfied:
+                remaining -= sizes[i] - shares[i]
+                shares[i] = sizes[i]
+                pending.remove(i)
+        return shares
@@ -61,6 +61,7 @@ class SearchRequest(BaseModel):
     sort_by: Optional[str] = Field("newest_first", description="Sort order")
     limit: int = Field(100, ge=1, le=1000, description="Maximum results to return")
     offset: int = Field(0, ge=0, description="Results to skip (for pagination)")
+    cursor: Optional[str] = Field(None, description="next_cursor from a previous response; continues after it instead of using offset")
 
 
 class SearchResponse(BaseModel):
@@ -85,6 +86,9 @@ class SearchResponse(BaseModel):
     
     # 🎯 SEARCH QUALITY INFO
     query_info: Optional[str] = Field(None, description="Information about the executed query")
+    
+    # 🔖 PAGINATION - opaque bookmark for the next page (None on the last page)
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page")
 
 
 class LogStorageRequest(BaseModel):
@@ -5,6 +5,7 @@ Test configuration and fixtures.
 import pytest
 import sys
 import os
+from datetime import datetime
 from pathlib import Path
 
 # Set testing environment BEFORE any imports that might cache settings
@@ -49,4 +50,37 @@ def large_log_input():
     lines = []
     for i in range(200):
         lines.append(f"Line {i}: Error occurred in processing step {i}")
-    return "\n".join(lines)
\ No newline at end of file
+    return "\n".join(lines)
+
+
+# Storage helpers shared by the tests/test_storage_*.py modules. The storage
+# package is imported inside them, so collecting the other test modules never
+# depends on it.
+
+def make_log_entry(log_id, timestamp=None, text="RuntimeError: failure", **fields):
+    """A storage LogEntry with test defaults; any other LogEntry field can be overridden."""
+    from src.debuggle.storage.database import LogEntry, LogSeverity
+
+    values = {
+        "log_id": log_id,
+        "timestamp": timestamp or datetime(2024, 5, 1, 12, 0),
+        "original_log": text,
+        "processed_log": text,
+        "summary": None,
+        "tags": ["runtime"],
+        "severity": LogSeverity.ERROR,
+        "language": "python",
+        "metadata": {},
+    }
+    values.update(fields)
+    return LogEntry(**values)
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """An empty DatabaseManager on a temporary file (modules can extend it with their own data)."""
+    from src.debuggle.storage.database import DatabaseManager
+
+    manager = DatabaseManager(database_path=str(tmp_path / "test.db"))
+    yield manager
+    manager.close()
@@ -899,4 +899,29 @@ class TestEdgeCasesAndErrorHandling:
         count = await self.alert_manager._count_recent_matching_errors(rule, log_entry)
         
         # Should return default count when database access fails
-        assert count == 1
\ No newline at end of file
+        assert count == 1
+    
+    @pytest.mark.asyncio
+    async def test_count_recent_matching_errors_uses_database(self):
+        """Test that threshold counting asks the database with the rule's filters"""
+        database = Mock()
+        database.count_logs.return_value = 7
+        alert_manager = AlertManager(self.mock_error_monitor, database_manager=database)
+        rule = AlertRule(
+            rule_id="count-rule",
+            name="Count Rule",
+            description="Count errors",
+            severity_filter=[LogSeverity.ERROR],
+            tag_filter=["database"],
+            error_count_threshold=5,
+            time_window_minutes=10
+        )
+        log_entry = create_test_log_entry(log_id="log-1", content="Test error")
+        
+        count = await alert_manager._count_recent_matching_errors(rule, log_entry)
+        
+        assert count == 7
+        kwargs = database.count_logs.call_args.kwargs
+        assert kwargs["tags"] == ["database"]
+        assert kwargs["severities"] == [LogSeverity.ERROR]
+        assert datetime.now() - kwargs["start_date"] >= timedelta(minutes=10)
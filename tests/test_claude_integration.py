@@ -25,8 +25,10 @@ TESTING PHILOSOPHY:
 """
 
 import pytest
+import asyncio
 import json
 import os
+import re
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 from typing import Dict, Any
@@ -472,6 +474,438 @@ class TestClaudeIntegrationE2E:
         assert "Debuggle works great without AI too!" in result
 
 
+class TestClaudePromptBudget:
+    """
+    ✂️ PROMPT BUDGET TESTING - Long traces shrink, the important parts stay
+
+    These tests make sure huge traces are squeezed under the token ceiling
+    without losing the exception chain or the top/bottom frames, and that
+    the before/after sizes show up in the usage stats.
+    """
+
+    @staticmethod
+    def _recursion_trace(depth: int = 300) -> str:
+        frames = []
+        for _ in range(depth):
+            frames.append('  File "app.py", line 12, in recurse')
+            frames.append('    return recurse(n - 1)')
+        return ("Traceback (most recent call last):\n" + "\n".join(frames) +
+                "\nRecursionError: maximum recursion depth exceeded")
+
+    def test_repeated_frames_are_collapsed(self):
+        """🔁 Test that recursion frames collapse into one block plus a note"""
+        from src.debuggle.integrations.prompt_budget import PromptBudgeter, estimate_tokens
+
+        budgeter = PromptBudgeter(max_prompt_tokens=200)
+        compressed = budgeter.compress(self._recursion_trace(), 200)
+
+        assert estimate_tokens(compressed) <= 200
+        assert compressed.count('File "app.py"') == 1
+        assert "repeated 299 more times" in compressed
+        assert compressed.endswith("RecursionError: maximum recursion depth exceeded")
+
+    def test_exception_chain_and_edge_frames_survive(self):
+        """⛓️ Test that Caused by lines and the first/last frames are kept"""
+        from src.debuggle.integrations.prompt_budget import PromptBudgeter, estimate_tokens
+
+        trace = "\n".join(
+            ["Exception in thread \"main\" java.lang.RuntimeException: wrapper"] +
+            [f"\tat com.example.Service{i}.handle(Service{i}.java:{i + 10})" for i in range(120)] +
+            ["Caused by: java.lang.NullPointerException: user was null"] +
+            [f"\tat com.example.Repo{i}.load(Repo{i}.java:{i + 5})" for i in range(80)]
+        )
+        budgeter = PromptBudgeter(max_prompt_tokens=400)
+        compressed = budgeter.compress(trace, 400)
+
+        assert estimate_tokens(compressed) <= 400
+        assert "Caused by: java.lang.NullPointerException: user was null" in compressed
+        assert "com.example.Service0.handle" in compressed
+        assert "com.example.Repo79.load" in compressed
+        assert "frames omitted" in compressed
+
+    def test_small_prompts_are_untouched(self):
+        """📄 Test that prompts under the ceiling are sent verbatim"""
+        analyzer = ClaudeAnalyzer()
+        prompt = analyzer._build_claude_prompt(
+            original_analysis="Short analysis",
+            error_message="IndexError: list index out of range",
+            error_type="IndexError",
+            language="python",
+            severity="error"
+        )
+
+        assert "IndexError: list index out of range" in prompt
+        stats = analyzer.get_usage_stats()
+        assert stats['prompts_compressed'] == 0
+        assert stats['prompt_tokens_before_compression'] == stats['prompt_tokens_after_compression']
+
+    def test_prompt_respects_ceiling_and_records_sizes(self):
+        """📏 Test the configurable ceiling and the usage stats bookkeeping"""
+        from src.debuggle.integrations.prompt_budget import estimate_tokens
+
+        analyzer = ClaudeAnalyzer(max_prompt_tokens=600)
+        prompt = analyzer._build_claude_prompt(
+            original_analysis="Local analysis line\n" * 400,
+            error_message=self._recursion_trace(),
+            error_type="RecursionError",
+            language="python",
+            severity="error",
+            project_context={'surrounding_code': "def recurse(n):\n    return recurse(n - 1)"}
+        )
+
+        assert estimate_tokens(prompt) <= 600
+        assert "**Surrounding Code:**" in prompt
+        assert "def recurse(n):" in prompt
+        assert "RecursionError: maximum recursion depth exceeded" in prompt
+
+        stats = analyzer.get_usage_stats()
+        assert stats['prompts_compressed'] == 1
+        assert stats['prompt_tokens_before_compression'] > stats['prompt_tokens_after_compression']
+        assert stats['prompt_tokens_after_compression'] <= 600
+
+
+class FakeMessagesServer:
+    """
+    🎭 FAKE MESSAGES ENDPOINT - A local stand-in for api.anthropic.com
+
+    Serves POST /v1/messages with Claude-shaped JSON so the async client can be
+    exercised over real HTTP. ``fail_first`` makes the first N calls return
+    the given status code to exercise the retry path.
+    """
+
+    def __init__(self, delay: float = 0.0, fail_first: int = 0, fail_status: int = 529):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.received = []
+        self._runner = None
+        self.base_url = None
+
+    async def _handle(self, request):
+        from aiohttp import web
+        import asyncio
+
+        self.calls += 1
+        body = await request.json()
+        self.received.append((request.headers.get("x-api-key"), body))
+        if self.calls <= self.fail_first:
+            return web.json_response({"type": "error"}, status=self.fail_status)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        prompt = body["messages"][0]["content"]
+        batch_ids = re.findall(r"^### Error (E\d+)$", prompt, flags=re.MULTILINE)
+        if batch_ids:
+            text = json.dumps({"errors": [
+                {"id": error_id, "explanation": f"Batch answer for {error_id}",
+                 "fix_suggestion": "Check the index", "confidence_score": 0.7}
+                for error_id in batch_ids
+            ]})
+        else:
+            text = json.dumps({
+                "explanation": f"Explained {len(prompt)} chars",
+                "fix_suggestion": "Check the index",
+                "confidence_score": 0.9,
+            })
+        return web.json_response({
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": text}],
+            "usage": {"input_tokens": 40, "output_tokens": 60},
+        })
+
+    async def __aenter__(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post("/v1/messages", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._runner.cleanup()
+
+
+def _async_request(message: str) -> Dict[str, Any]:
+    return {
+        "original_analysis": "Local analysis",
+        "error_message": message,
+        "error_type": "IndexError",
+        "language": "python",
+        "severity": "error",
+    }
+
+
+class TestClaudeAsyncClient:
+    """
+    ⚡ ASYNC CLIENT TESTING - Concurrency, rate limiting, retries, coalescing
+
+    These tests run the async enhancement path against a local fake messages
+    server, so they exercise real HTTP without needing an API key or network.
+    """
+
+    @pytest.mark.asyncio
+    async def test_async_enhancement_against_fake_server(self):
+        """✅ Test a single async enhancement round trip"""
+        async with FakeMessagesServer() as server:
+            analyzer = ClaudeAnalyzer(api_key="test-key", base_url=server.base_url)
+            try:
+                result = await analyzer.enhance_analysis_async(**_async_request("IndexError: boom"))
+            finally:
+                await analyzer.aclose()
+
+        assert result.used_claude
+        assert result.specific_fix_suggestion == "Check the index"
+        assert analyzer.total_tokens_used == 100
+        assert server.received[0][0] == "test-key"
+        assert server.received[0][1]["model"] == analyzer.model
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_by_semaphore(self):
+        """🚦 Test that no more than max_concurrency requests are in flight"""
+        async with FakeMessagesServer(delay=0.05) as server:
+            analyzer = ClaudeAnalyzer(api_key="test-key", base_url=server.base_url,
+                                      max_concurrency=2, requests_per_minute=60000)
+            try:
+                results = await analyzer.enhance_many_async(
+                    [_async_request(f"IndexError: case {i}") for i in range(6)]
+                )
+            finally:
+                await analyzer.aclose()
+
+        assert all(r.used_claude for r in results)
+        assert server.calls == 6
+        assert server.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_are_coalesced(self):
+        """🤝 Test that identical in-flight prompts share one API call"""
+        async with FakeMessagesServer(delay=0.05) as server:
+            analyzer = ClaudeAnalyzer(api_key="test-key", base_url=server.base_url)
+            try:
+                results = await analyzer.enhance_many_async(
+                    [_async_request("IndexError: same")] * 5
+                )
+            finally:
+                await analyzer.aclose()
+
+        assert server.calls == 1
+        assert all(r.used_claude for r in results)
+        assert analyzer.get_usage_stats()['coalesced_requests'] == 4
+        assert analyzer.total_tokens_used == 100  # counted once, not five times
+
+    @pytest.mark.asyncio
+    async def test_retryable_errors_are_retried_with_backoff(self):
+        """🔁 Test that overloaded responses are retried until success"""
+        async with FakeMessagesServer(fail_first=2, fail_status=529) as server:
+            analyzer = ClaudeAnalyzer(api_key="test-key", base_url=server.base_url,
+                                      backoff_base_seconds=0.01)
+            try:
+                result = await analyzer.enhance_analysis_async(**_async_request("IndexError: flaky"))
+            finally:
+                await analyzer.aclose()
+
+        assert result.used_claude
+        assert server.calls == 3
+        assert analyzer.retries_made == 2
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_degrade_gracefully(self):
+        """🛡️ Test that a 400 is not retried and the local analysis survives"""
+        async with FakeMessagesServer(fail_first=10, fail_status=400) as server:
+            analyzer = ClaudeAnalyzer(api_key="test-key", base_url=server.base_url)
+            try:
+                result = await analyzer.enhance_analysis_async(**_async_request("IndexError: bad"))
+            finally:
+                await analyzer.aclose()
+
+        assert not result.used_claude
+        assert result.original_analysis == "Local analysis"
+        assert server.calls == 1
+
+    def test_new_event_loop_closes_the_previous_client(self):
+        """🧹 Test that moving to another event loop closes the old HTTP client"""
+        analyzer = ClaudeAnalyzer(api_key="test-key")
+
+        async def client_for_this_loop():
+            analyzer._ensure_async_state()
+            client = analyzer._http_client
+            await asyncio.sleep(0.01)  # Let a pending close finish on this loop
+            return client
+
+        first = asyncio.run(client_for_this_loop())
+        second = asyncio.run(client_for_this_loop())
+
+        assert first is not second
+        assert first.is_closed
+        assert not second.is_closed
+        asyncio.run(analyzer.aclose())
+        assert second.is_closed
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_paces_requests(self):
+        """🪣 Test that the token bucket delays requests once the burst is spent"""
+        import time
+        from src.debuggle.integrations.claude import TokenBucketRateLimiter
+
+        limiter = TokenBucketRateLimiter(rate_per_second=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        # First token is free, the next three each wait ~1/20s
+        assert time.monotonic() - start >= 0.12
+
+    @pytest.mark.asyncio
+    async def test_async_without_api_key_returns_standard_analysis(self):
+        """🚫 Test async graceful degradation without an API key"""
+        with patch.dict(os.environ, {}, clear=True):
+            analyzer = ClaudeAnalyzer()
+            result = await analyzer.enhance_analysis_async(**_async_request("IndexError: x"))
+
+        assert not result.used_claude
+        assert result.original_analysis == "Local analysis"
+
+
+class TestClaudeBatchEnhancement:
+    """
+    📦 BATCH ENHANCEMENT TESTING - Many errors, few round trips
+
+    These tests check that distinct errors are packed into one request,
+    duplicates are only sent once, and malformed batch replies fall back to
+    individual requests without losing any error.
+    """
+
+    @pytest.fixture
+    def mock_claude_analyzer(self):
+        """🎭 Create a mock Claude analyzer for testing"""
+        with patch('src.debuggle.integrations.claude.CLAUDE_AVAILABLE', True):
+            with patch('src.debuggle.integrations.claude.anthropic.Anthropic') as mock_anthropic:
+                mock_client = Mock()
+                mock_anthropic.return_value = mock_client
+                analyzer = ClaudeAnalyzer(api_key="test-key")
+                return analyzer, mock_client
+
+    @staticmethod
+    def _errors():
+        return [
+            _async_request("IndexError: list index out of range at 2024-01-01 10:00:00"),
+            {**_async_request("KeyError: 'user_id'"), "error_type": "KeyError"},
+            _async_request("IndexError: list index out of range at 2024-01-02 11:30:00"),
+        ]
+
+    @staticmethod
+    def _mock_response(text: str) -> Mock:
+        response = Mock()
+        response.content = [Mock()]
+        response.content[0].text = text
+        response.usage = Mock()
+        response.usage.input_tokens = 300
+        response.usage.output_tokens = 200
+        return response
+
+    def test_fingerprint_ignores_volatile_parts(self):
+        """🧬 Test that timestamps and numbers don't change the fingerprint"""
+        first = ClaudeAnalyzer.fingerprint_error("IndexError", "IndexError: at 2024-01-01 10:00:00 row 17")
+        second = ClaudeAnalyzer.fingerprint_error("IndexError", "IndexError: at 2024-03-09 08:15:42 row 99")
+        other = ClaudeAnalyzer.fingerprint_error("KeyError", "IndexError: at 2024-01-01 10:00:00 row 17")
+
+        assert first == second
+        assert first != other
+
+    def test_batch_uses_one_request_and_shares_duplicates(self, mock_claude_analyzer):
+        """📦 Test that distinct errors share one request and duplicates share answers"""
+        analyzer, mock_client = mock_claude_analyzer
+        mock_client.messages.create.return_value = self._mock_response(json.dumps({"errors": [
+            {"id": "E1", "explanation": "Index explanation", "confidence_score": 0.9},
+            {"id": "E2", "explanation": "Key explanation", "confidence_score": 0.8},
+        ]}))
+
+        results = analyzer.enhance_batch(self._errors())
+
+        assert mock_client.messages.create.call_count == 1
+        prompt = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert "### Error E1" in prompt and "### Error E2" in prompt
+        assert "### Error E3" not in prompt  # duplicate fingerprint not resent
+
+        assert [r.claude_explanation for r in results] == [
+            "Index explanation", "Key explanation", "Index explanation"
+        ]
+        assert all(r.used_claude for r in results)
+        assert analyzer.total_tokens_used == 500
+        assert analyzer.requests_made == 2  # The shared duplicate is not counted again
+        assert analyzer.get_usage_stats()['batch_requests'] == 1
+
+    def test_partial_batch_reply_falls_back_for_missing_sections(self, mock_claude_analyzer):
+        """🔧 Test that a missing section triggers an individual request"""
+        analyzer, mock_client = mock_claude_analyzer
+        mock_client.messages.create.side_effect = [
+            self._mock_response(json.dumps({"errors": [
+                {"id": "E1", "explanation": "Index explanation"},
+                {"id": "E2", "oops": "no explanation here"},
+            ]})),
+            self._mock_response(json.dumps({"explanation": "Individual key explanation"})),
+        ]
+
+        results = analyzer.enhance_batch(self._errors())
+
+        assert mock_client.messages.create.call_count == 2
+        assert results[1].claude_explanation == "Individual key explanation"
+        assert analyzer.get_usage_stats()['batch_fallbacks'] == 1
+
+    def test_malformed_batch_reply_falls_back_to_individual_calls(self, mock_claude_analyzer):
+        """🛡️ Test that non-JSON batch replies are never mis-assigned"""
+        analyzer, mock_client = mock_claude_analyzer
+        mock_client.messages.create.side_effect = [
+            self._mock_response("Sorry, here is some prose instead of JSON"),
+            self._mock_response(json.dumps({"explanation": "Individual index explanation"})),
+            self._mock_response(json.dumps({"explanation": "Individual key explanation"})),
+        ]
+
+        results = analyzer.enhance_batch(self._errors())
+
+        assert mock_client.messages.create.call_count == 3
+        assert results[0].claude_explanation == "Individual index explanation"
+        assert results[1].claude_explanation == "Individual key explanation"
+        assert results[2].claude_explanation == "Individual index explanation"
+
+    def test_batch_without_claude_returns_standard_analysis(self):
+        """🚫 Test batch graceful degradation when Claude is unavailable"""
+        with patch('src.debuggle.integrations.claude.CLAUDE_AVAILABLE', False):
+            analyzer = ClaudeAnalyzer()
+            results = analyzer.enhance_batch(self._errors())
+
+        assert len(results) == 3
+        assert not any(r.used_claude for r in results)
+
+    @pytest.mark.asyncio
+    async def test_async_batch_against_fake_server(self):
+        """⚡ Test async batching over HTTP against the fake messages server"""
+        async with FakeMessagesServer() as server:
+            analyzer = ClaudeAnalyzer(api_key="test-key", base_url=server.base_url)
+            try:
+                results = await analyzer.enhance_batch_async(self._errors())
+            finally:
+                await analyzer.aclose()
+
+        assert server.calls == 1
+        assert [r.claude_explanation for r in results] == [
+            "Batch answer for E1", "Batch answer for E2", "Batch answer for E1"
+        ]
+
+
 # 🎯 INTEGRATION TESTING UTILITIES
 # ================================
 
@@ -325,7 +325,7 @@ class TestDatabaseManager:
             column_names = [col[1] for col in columns]
             
             expected_columns = [
-                'log_id', 'timestamp', 'original_log', 'processed_log',
+                'log_id', 'timestamp', 'original_blob_id', 'processed_blob_id',
                 'summary', 'tags', 'severity', 'language', 'metadata',
                 'project_name', 'file_path', 'source'
             ]
@@ -0,0 +1,215 @@
+"""
+Test the pattern pack loader, the literal-anchor build step and on-demand
+loading of extra languages in ErrorPatternMatcher.
+"""
+
+import json
+import re
+
+import pytest
+
+from src.debuggle.core.pattern_packs import (
+    DEFAULT_PACK_DIR,
+    INDEX_FILENAME,
+    PatternPackError,
+    PatternPackIndex,
+    build_index,
+    build_index_data,
+    extract_literal_anchor,
+    validate_pack,
+)
+from src.debuggle.core.patterns import ErrorPatternMatcher
+
+
+GO_PANIC = """panic: runtime error: invalid memory address or nil pointer dereference
+[signal SIGSEGV: segmentation violation code=0x1 addr=0x0 pc=0x4553a2]
+
+goroutine 1 [running]:
+main.main()
+\t/tmp/sandbox/prog.go:9 +0x12"""
+
+RUST_PANIC = """thread 'main' panicked at src/main.rs:4:37:
+called `Option::unwrap()` on a `None` value
+note: run with `RUST_BACKTRACE=1` environment variable to display a backtrace"""
+
+CSHARP_ERROR = """Unhandled exception. System.NullReferenceException: Object reference not set to an instance of an object.
+   at Shop.Cart.Total() in /src/Shop/Cart.cs:line 42"""
+
+RUBY_ERROR = """app/models/user.rb:12:in `display_name': undefined method `upcase' for nil:NilClass (NoMethodError)
+\tfrom app/main.rb:3:in `<main>'"""
+
+PYTHON_ERROR = """Traceback (most recent call last):
+  File "app.py", line 10, in main
+    print(items[5])
+IndexError: list index out of range"""
+
+
+def _minimal_pack(**overrides):
+    pack = {
+        "language": "elixir",
+        "indicators": [r"\*\* \(\w+Error\)"],
+        "patterns": [{
+            "name": "FunctionClauseError",
+            "pattern": r"no function clause matching in ([\w.]+)",
+            "category": "runtime",
+            "severity": "high",
+            "explanation": "No function head matched the arguments",
+            "what_happened": "A function was called with arguments none of its clauses accept",
+            "quick_fixes": ["Add a catch-all clause"],
+            "prevention_tip": "Cover every expected input shape",
+            "learn_more_url": "https://hexdocs.pm/elixir/FunctionClauseError.html",
+        }],
+    }
+    pack.update(overrides)
+    return pack
+
+
+class TestLiteralAnchors:
+    """Test the literal anchors precomputed by the build step."""
+
+    @pytest.mark.parametrize("regex,expected", [
+        (r"runtime error: index out of range \[(\d+)\]", "runtime error: index out of range ["),
+        (r"KeyError: ['\"]([^'\"]+)['\"]", "keyerror: "),
+        (r"undefined method `(\w+[?!]?)' for nil", "undefined method `"),
+        (r"colou?r not found", "r not found"),
+        (r"fatal error: concurrent map (?:writes|read and map write)", "fatal error: concurrent map "),
+    ])
+    def test_extracts_required_literal(self, regex, expected):
+        assert extract_literal_anchor(regex) == expected
+
+    @pytest.mark.parametrize("regex", [r"foo|bar", r"\d+\.\d+", r"(a|b)c"])
+    def test_no_anchor_when_nothing_is_required(self, regex):
+        assert extract_literal_anchor(regex) is None
+
+    @pytest.mark.parametrize("regex,sample,expected", [
+        (r"foo\x41bar", "fooAbar", "foo"),
+        (r"caf\u00e9 closed", "café closed", " closed"),
+        (r"\N{BULLET} item list", "• item list", " item list"),
+        (r"tab\0111here", "tab\t1here", "1here"),
+        (r"col\101width", "colAwidth", "width"),
+        (r"(a)(b)(c)(d)(e)(f)(g)(h)(i)(j)(k)(l) \12 code", "abcdefghijkl l code", " code"),
+    ])
+    def test_escape_arguments_are_not_literal(self, regex, sample, expected):
+        """The digits of \\x41, \\u00e9, octal and group references never show up in a match."""
+        assert re.search(regex, sample)
+        assert extract_literal_anchor(regex) == expected
+
+    def test_anchor_is_always_contained_in_matches(self):
+        """Every bundled pattern's anchor must appear in any text its regex matches."""
+        samples = [GO_PANIC, RUST_PANIC, CSHARP_ERROR, RUBY_ERROR]
+        packs = build_index_data()["packs"]
+        for entry in packs.values():
+            for spec in entry["patterns"]:
+                regex = re.compile(spec["pattern"], re.IGNORECASE | re.MULTILINE)
+                for sample in samples:
+                    for match in regex.finditer(sample):
+                        assert spec["anchor"] in match.group(0).lower()
+
+
+class TestPackValidation:
+    """Test that broken packs are rejected with every problem listed."""
+
+    def test_valid_pack_produces_index_entry(self):
+        entry = validate_pack(_minimal_pack(), source="elixir.json")
+        assert entry["language"] == "elixir"
+        assert entry["patterns"][0]["languages"] == ["elixir"]
+        assert entry["patterns"][0]["anchor"] == "no function clause matching in "
+
+    def test_invalid_pack_reports_all_problems(self):
+        pack = _minimal_pack()
+        pack["patterns"][0]["severity"] = "apocalyptic"
+        pack["patterns"].append({"name": "Broken", "pattern": "(unclosed"})
+        with pytest.raises(PatternPackError) as excinfo:
+            validate_pack(pack, source="elixir.json")
+        message = str(excinfo.value)
+        assert "unknown severity 'apocalyptic'" in message
+        assert "pattern Broken is missing" in message
+
+    def test_bad_regex_is_rejected(self):
+        pack = _minimal_pack()
+        pack["patterns"][0]["pattern"] = "(unclosed"
+        with pytest.raises(PatternPackError, match="does not compile"):
+            validate_pack(pack)
+
+    def test_duplicate_language_across_packs_is_rejected(self, tmp_path):
+        (tmp_path / "a.json").write_text(json.dumps(_minimal_pack()))
+        (tmp_path / "b.json").write_text(json.dumps(_minimal_pack()))
+        with pytest.raises(PatternPackError, match="already provided by a.json"):
+            build_index_data(tmp_path)
+
+
+class TestPatternPackIndex:
+    """Test building, loading and staleness handling of the serialized index."""
+
+    def test_bundled_index_is_up_to_date(self):
+        """The committed pattern_index.json must match the pack files (run `make patterns`)."""
+        committed = json.loads((DEFAULT_PACK_DIR / INDEX_FILENAME).read_text(encoding="utf-8"))
+        assert committed == build_index_data()
+
+    def test_bundled_packs_cover_new_languages(self):
+        index = PatternPackIndex.load()
+        assert {"go", "rust", "csharp", "ruby"} <= set(index.languages)
+
+    def test_load_uses_prebuilt_index(self, tmp_path):
+        (tmp_path / "elixir.json").write_text(json.dumps(_minimal_pack()))
+        build_index(tmp_path)
+        index = PatternPackIndex.load(tmp_path)
+        assert index.languages == ["elixir"]
+
+    def test_stale_index_is_rebuilt_in_memory(self, tmp_path):
+        (tmp_path / "elixir.json").write_text(json.dumps(_minimal_pack()))
+        build_index(tmp_path)
+        (tmp_path / "ocaml.json").write_text(json.dumps(_minimal_pack(language="ocaml")))
+        index = PatternPackIndex.load(tmp_path)
+        assert index.languages == ["elixir", "ocaml"]
+
+    def test_edited_pack_is_rebuilt_in_memory(self, tmp_path):
+        pack = _minimal_pack()
+        (tmp_path / "elixir.json").write_text(json.dumps(pack))
+        build_index(tmp_path)
+        pack["patterns"][0]["name"] = "CaseClauseError"
+        pack["patterns"][0]["pattern"] = r"no case clause matching: (.+)"
+        (tmp_path / "elixir.json").write_text(json.dumps(pack))
+        patterns = PatternPackIndex.load(tmp_path).get_matcher("elixir").get_patterns()
+        assert [pattern.name for pattern in patterns] == ["CaseClauseError"]
+
+    def test_candidate_languages_use_anchors(self):
+        index = PatternPackIndex.load()
+        assert index.candidate_languages(GO_PANIC.lower()) == ["go"]
+        assert index.candidate_languages("nothing interesting here") == []
+
+
+class TestOnDemandPackLoading:
+    """Test that ErrorPatternMatcher only loads the packs it needs."""
+
+    def test_no_packs_loaded_for_builtin_languages(self):
+        matcher = ErrorPatternMatcher()
+        assert matcher.detect_language(PYTHON_ERROR) == "python"
+        assert matcher.find_matches(PYTHON_ERROR)[0].pattern.name == "IndexError"
+        assert matcher.loaded_packs == []
+
+    @pytest.mark.parametrize("text,language,pattern_name", [
+        (GO_PANIC, "go", "NilPointerDereference"),
+        (RUST_PANIC, "rust", "UnwrapOnNone"),
+        (CSHARP_ERROR, "csharp", "NullReferenceException"),
+        (RUBY_ERROR, "ruby", "NoMethodErrorNil"),
+    ])
+    def test_detected_language_loads_its_pack(self, text, language, pattern_name):
+        matcher = ErrorPatternMatcher()
+        assert matcher.detect_language(text) == language
+        assert matcher.loaded_packs == [language]
+
+        best = matcher.get_best_match(text, language)
+        assert best is not None
+        assert best.pattern.name == pattern_name
+
+    def test_explicit_language_loads_pack(self):
+        matcher = ErrorPatternMatcher()
+        matches = matcher.find_matches("index out of bounds: the len is 3 but the index is 7", "rust")
+        assert [m.pattern.name for m in matches] == ["IndexOutOfBounds"]
+        assert matcher.loaded_packs == ["rust"]
+
+    def test_packs_can_be_disabled(self):
+        matcher = ErrorPatternMatcher(use_packs=False)
+        assert matcher.detect_language(GO_PANIC) is None
+        assert matcher.find_matches(GO_PANIC) == []
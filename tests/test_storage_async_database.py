@@ -0,0 +1,132 @@
+"""
+Tests for the async DatabaseManager facade: calls run off the event loop,
+reads run concurrently, writes are queued in order, and timeouts or
+cancellation skip queued calls and interrupt running SQLite statements.
+"""
+
+import asyncio
+import gc
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.debuggle.storage.async_database import AsyncDatabaseManager
+from src.debuggle.storage.database import DatabaseManager
+from tests.conftest import make_log_entry
+
+ENDLESS_QUERY = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT count(*) FROM n"
+
+
+def _entry(log_id, summary=None, minutes_ago=0):
+    return make_log_entry(log_id, datetime(2024, 5, 1, 12, 0) - timedelta(minutes=minutes_ago),
+                          text=f"ValueError: bad input {log_id}", processed_log="Bad input",
+                          summary=summary, tags=["input"])
+
+
+class TestAsyncDatabaseManager:
+    """Test awaitable reads and writes on the worker pools."""
+
+    @pytest.mark.asyncio
+    async def test_reads_and_writes_round_trip(self, db_manager):
+        adb = AsyncDatabaseManager(db_manager)
+        assert await adb.store_logs([_entry(f"log_{i}", minutes_ago=i) for i in range(5)]) == 5
+        assert (await adb.get_log("log_3")).log_id == "log_3"
+        assert await adb.count_logs() == 5
+        assert [log.log_id async for log in adb.iter_logs(batch_size=2)] == [f"log_{i}" for i in range(5)]
+        await adb.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_applied_in_order(self, db_manager):
+        adb = AsyncDatabaseManager(db_manager)
+        await asyncio.gather(*(adb.store_log(_entry("same", summary=f"version {i}")) for i in range(20)))
+        assert (await adb.get_log("same")).summary == "version 19"
+        await adb.close()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_keeps_running_during_reads(self, db_manager):
+        adb = AsyncDatabaseManager(db_manager, read_workers=2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        started = time.monotonic()
+        await asyncio.gather(adb.read(time.sleep, 0.3), adb.read(time.sleep, 0.3))
+        elapsed = time.monotonic() - started
+        ticking.cancel()
+
+        assert elapsed < 0.55  # The two reads ran side by side
+        assert ticks >= 10
+        await adb.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout_interrupts_running_query(self, db_manager):
+        adb = AsyncDatabaseManager(db_manager, read_workers=1)
+
+        def endless():
+            with db_manager.connection() as conn:
+                return conn.execute(ENDLESS_QUERY).fetchone()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await adb.read(endless, timeout=0.1)
+
+        # The only reader thread is free again, so the interrupt stopped the query
+        assert await adb.read(lambda: "done", timeout=2) == "done"
+        await adb.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_is_skipped_while_queued(self, db_manager):
+        adb = AsyncDatabaseManager(db_manager, read_workers=1)
+        release = threading.Event()
+        ran = []
+
+        blocker = asyncio.create_task(adb.read(release.wait, 5))
+        queued = asyncio.create_task(adb.read(ran.append, "queued"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        release.set()
+        assert await blocker is True
+        await adb.read(lambda: None)
+        assert ran == []
+        await adb.close()
+
+    @pytest.mark.asyncio
+    async def test_default_timeout_applies_to_every_call(self, db_manager):
+        adb = AsyncDatabaseManager(db_manager, default_timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await adb.read(time.sleep, 0.5)
+        assert await adb.count_logs(timeout=None) == 0
+        await adb.close()
+
+    @pytest.mark.asyncio
+    async def test_wrap_shares_one_facade_per_manager(self, db_manager):
+        adb = AsyncDatabaseManager.wrap(db_manager)
+        assert AsyncDatabaseManager.wrap(db_manager) is adb
+        assert AsyncDatabaseManager.wrap(adb) is adb
+
+        await adb.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            await adb.count_logs()
+        assert AsyncDatabaseManager.wrap(db_manager) is not adb
+
+    @pytest.mark.asyncio
+    async def test_wrapped_manager_can_still_be_collected(self, tmp_path):
+        manager = DatabaseManager(database_path=str(tmp_path / "test.db"))
+        adb = AsyncDatabaseManager.wrap(manager)
+        assert await adb.count_logs() == 0
+        manager_ref, adb_ref = weakref.ref(manager), weakref.ref(adb)
+
+        manager.close()
+        del manager, adb
+        gc.collect()
+        assert manager_ref() is None and adb_ref() is None
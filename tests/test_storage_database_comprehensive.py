@@ -19,6 +19,7 @@ import pytest
 import tempfile
 import sqlite3
 import os
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
@@ -26,13 +27,48 @@ import json
 
 from src.debuggle.storage.database import (
     DatabaseManager,
+    _decode_body,
     LogEntry,
+    LogRow,
+    LogWriteBuffer,
+    decode_cursor,
+    fts_match_query,
+    identifier_terms,
     LogStats,
     LogSeverity,
     TierLevel
 )
 
 
+def _create_legacy_database(db_path, rows):
+    """Write a database in the original schema: log text inline, no side tables or triggers"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE logs (
+            log_id TEXT PRIMARY KEY,
+            timestamp DATETIME NOT NULL,
+            original_log TEXT NOT NULL,
+            processed_log TEXT NOT NULL,
+            summary TEXT,
+            tags TEXT,
+            severity TEXT NOT NULL,
+            language TEXT NOT NULL,
+            metadata TEXT,
+            project_name TEXT,
+            file_path TEXT,
+            source TEXT DEFAULT 'api',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO logs (log_id, timestamp, original_log, processed_log, tags, severity, language) "
+        "VALUES (?, ?, ?, ?, ?, 'error', ?)",
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+
 class TestDatabaseManagerInitialization:
     """Test database manager setup and initialization"""
     
@@ -70,6 +106,14 @@ class TestDatabaseManagerInitialization:
             
             conn.close()
     
+    def test_old_sqlite_is_refused_with_a_clear_error(self, monkeypatch):
+        """Test that a SQLite without RETURNING / DROP COLUMN fails up front, not on every write"""
+        monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 31, 1))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(RuntimeError, match=r"SQLite 3\.35\.0 or newer.*3\.31\.1"):
+                DatabaseManager(database_path=str(Path(temp_dir) / "test.db"))
+            assert not (Path(temp_dir) / "test.db").exists()
+    
     def test_database_with_default_path(self):
         """Test database with default path"""
         db_manager = DatabaseManager()
@@ -629,6 +673,935 @@ class TestDatabaseMaintenance:
         assert test_log.log_id == "vacuum_test_0"
 
 
+class TestConnectionPool:
+    """Test the pooled, WAL-tuned connection layer"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            manager = DatabaseManager(database_path=str(db_path))
+            yield manager
+            manager.close()
+    
+    @staticmethod
+    def _entry(log_id):
+        return LogEntry(
+            log_id=log_id,
+            timestamp=datetime.now(),
+            original_log=f"ValueError: bad value in {log_id}",
+            processed_log=f"Bad value in {log_id}",
+            summary=None,
+            tags=["ValueError"],
+            severity=LogSeverity.ERROR,
+            language="python",
+            metadata={}
+        )
+    
+    def test_wal_and_pragmas_are_applied(self, db_manager):
+        """Test that connections run in WAL mode with the tuned pragmas"""
+        assert db_manager.journal_mode == "wal"
+        conn = db_manager.get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    
+    def test_pragma_overrides(self):
+        """Test that callers can override individual pragmas"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            manager = DatabaseManager(database_path=str(db_path), pragmas={"cache_size": -2000})
+            conn = manager.get_connection()
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2000
+            assert manager.journal_mode == "wal"
+            manager.close()
+    
+    def test_connection_is_reused_within_a_thread(self, db_manager):
+        """Test that repeated calls share one connection per thread"""
+        db_manager.store_log(self._entry("reuse_1"))
+        first = db_manager.get_connection()
+        db_manager.get_log("reuse_1")
+        assert db_manager.get_connection() is first
+    
+    def test_each_thread_gets_its_own_connection(self, db_manager):
+        """Test that worker threads get separate connections and see committed data"""
+        db_manager.store_log(self._entry("threaded_1"))
+        main_conn = db_manager.get_connection()
+        seen = {}
+        
+        def worker():
+            seen["conn"] = db_manager.get_connection()
+            seen["log"] = db_manager.get_log("threaded_1")
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        
+        assert seen["conn"] is not main_conn
+        assert seen["log"] is not None
+    
+    def test_readers_are_not_blocked_by_open_write(self, db_manager):
+        """Test that a reader can query while another connection holds a write transaction"""
+        db_manager.store_log(self._entry("committed"))
+        
+        other_manager = DatabaseManager(database_path=str(db_manager.database_path))
+        writer = other_manager.get_connection()
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("DELETE FROM logs")
+        try:
+            # The uncommitted delete is invisible and does not block the read
+            assert db_manager.get_log("committed") is not None
+        finally:
+            writer.rollback()
+            other_manager.close()
+    
+    def test_failed_unit_of_work_is_rolled_back(self, db_manager):
+        """Test that connection() rolls back when the block raises"""
+        db_manager.store_log(self._entry("survivor"))
+        with pytest.raises(RuntimeError):
+            with db_manager.connection() as conn:
+                conn.execute("DELETE FROM logs")
+                raise RuntimeError("boom")
+        assert db_manager.get_log("survivor") is not None
+    
+    def test_close_releases_and_reopens(self, db_manager):
+        """Test that close() drops pooled connections and later calls reconnect"""
+        db_manager.store_log(self._entry("before_close"))
+        old_conn = db_manager.get_connection()
+        db_manager.close()
+        
+        with pytest.raises(sqlite3.ProgrammingError):
+            old_conn.execute("SELECT 1")
+        assert db_manager.get_log("before_close") is not None
+        assert db_manager.get_connection() is not old_conn
+
+
+class TestBulkStorage:
+    """Test batched store_logs and the write-behind buffer"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            manager = DatabaseManager(database_path=str(db_path))
+            yield manager
+            manager.close()
+    
+    @staticmethod
+    def _entries(count, prefix="bulk"):
+        now = datetime.now()
+        return [
+            LogEntry(
+                log_id=f"{prefix}_{i}",
+                timestamp=now - timedelta(seconds=i),
+                original_log=f"KeyError: 'field_{i}'",
+                processed_log=f"Missing key field_{i}",
+                summary=None,
+                tags=["KeyError"],
+                severity=LogSeverity.ERROR,
+                language="python",
+                metadata={"index": i}
+            )
+            for i in range(count)
+        ]
+    
+    def _count(self, db_manager):
+        with db_manager.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+    
+    def test_store_logs_in_batches(self, db_manager):
+        """Test that store_logs writes every entry and reports the count"""
+        stored = db_manager.store_logs(self._entries(25), batch_size=10)
+        
+        assert stored == 25
+        assert self._count(db_manager) == 25
+        assert db_manager.get_log("bulk_7").metadata == {"index": 7}
+    
+    def test_store_logs_accepts_generators(self, db_manager):
+        """Test that store_logs streams from any iterable"""
+        stored = db_manager.store_logs(entry for entry in self._entries(3))
+        assert stored == 3
+    
+    def test_failed_batch_is_rolled_back(self, db_manager):
+        """Test that a bad batch is rolled back as a whole and stops the write"""
+        entries = self._entries(6)
+        entries[4].original_log = None  # Violates NOT NULL
+        
+        stored = db_manager.store_logs(entries, batch_size=3)
+        
+        assert stored == 3
+        assert self._count(db_manager) == 3
+        assert db_manager.get_log("bulk_3") is None
+    
+    def test_invalid_batch_size(self, db_manager):
+        with pytest.raises(ValueError):
+            db_manager.store_logs(self._entries(1), batch_size=0)
+    
+    def test_buffer_flushes_when_full(self, db_manager):
+        """Test that filling the buffer writes a batch immediately"""
+        with db_manager.create_write_buffer(max_size=5, max_delay_seconds=60) as buffer:
+            buffer.add_many(self._entries(7))
+            
+            assert self._count(db_manager) == 5
+            assert buffer.pending == 2
+            assert buffer.flush_count == 1
+        
+        # Closing flushes the remainder
+        assert self._count(db_manager) == 7
+        assert buffer.entries_written == 7
+    
+    def test_buffer_flushes_after_delay(self, db_manager):
+        """Test that the background helper flushes a partly filled buffer"""
+        buffer = LogWriteBuffer(db_manager, max_size=100, max_delay_seconds=0.05)
+        try:
+            buffer.add_many(self._entries(3))
+            deadline = datetime.now() + timedelta(seconds=5)
+            while buffer.flush_count == 0 and datetime.now() < deadline:
+                threading.Event().wait(0.01)
+            
+            assert buffer.pending == 0
+            assert buffer.entries_written == 3
+            assert self._count(db_manager) == 3
+        finally:
+            buffer.close()
+    
+    def test_closed_buffer_rejects_entries(self, db_manager):
+        buffer = db_manager.create_write_buffer()
+        buffer.close()
+        with pytest.raises(RuntimeError):
+            buffer.add(self._entries(1)[0])
+
+
+class TestStatisticsRollups:
+    """Test the rollup tables behind get_statistics, kept current on every write"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            manager = DatabaseManager(database_path=str(db_path))
+            yield manager
+            manager.close()
+    
+    @staticmethod
+    def _entry(log_id, timestamp, severity=LogSeverity.ERROR, tags=("TypeError",),
+               language="python", project_name=None):
+        return LogEntry(
+            log_id=log_id,
+            timestamp=timestamp,
+            original_log="TypeError: unsupported operand",
+            processed_log="Type mismatch",
+            summary=None,
+            tags=list(tags),
+            severity=severity,
+            language=language,
+            metadata={},
+            project_name=project_name
+        )
+    
+    def _rollup(self, db_manager, dimension):
+        with db_manager.connection() as conn:
+            return dict(conn.execute(
+                "SELECT value, SUM(count) FROM log_rollup_daily WHERE dimension = ? GROUP BY value",
+                (dimension,)
+            ).fetchall())
+    
+    def test_rollups_follow_inserts_replaces_and_deletes(self, db_manager):
+        """Test that counters stay exact when rows are replaced or deleted"""
+        now = datetime.now()
+        db_manager.store_log(self._entry("a", now, tags=["TypeError", "TypeError", "math"]))
+        db_manager.store_log(self._entry("b", now, severity=LogSeverity.WARNING))
+        assert self._rollup(db_manager, "tag") == {"TypeError": 2, "math": 1}
+        
+        # Replacing a row moves its counts instead of double counting
+        db_manager.store_log(self._entry("a", now, severity=LogSeverity.WARNING, tags=["math"]))
+        assert self._rollup(db_manager, "severity") == {"warning": 2}
+        assert self._rollup(db_manager, "tag") == {"TypeError": 1, "math": 1}
+        
+        with db_manager.connection() as conn:
+            conn.execute("DELETE FROM logs")
+            assert conn.execute("SELECT COUNT(*) FROM log_rollup_hourly").fetchone()[0] == 0
+    
+    def test_bulk_writes_count_each_stored_row_once(self, db_manager):
+        """Test that a batch repeating an id is counted as the one row it leaves behind"""
+        now = datetime.now()
+        db_manager.store_log(self._entry("a", now - timedelta(days=2), tags=["old"]))
+        db_manager.store_logs([
+            self._entry("a", now, severity=LogSeverity.WARNING, tags=["first"]),
+            self._entry("b", now, project_name="web"),
+            self._entry("a", now, severity=LogSeverity.CRITICAL, tags=["last", "last"]),
+        ])
+        assert db_manager.count_logs() == 2
+        assert self._rollup(db_manager, "total") == {"": 2}
+        assert self._rollup(db_manager, "severity") == {"critical": 1, "error": 1}
+        assert self._rollup(db_manager, "tag") == {"last": 1, "TypeError": 1}
+        
+        with db_manager.connection() as conn:
+            counted = {table: sorted(conn.execute(f"SELECT * FROM {table}").fetchall())
+                       for table in ("log_rollup_hourly", "log_rollup_daily")}
+        db_manager.rebuild_rollups()
+        with db_manager.connection() as conn:
+            for table, rows in counted.items():
+                assert sorted(conn.execute(f"SELECT * FROM {table}").fetchall()) == rows
+    
+    def test_reopening_drops_the_per_row_insert_trigger(self, db_manager):
+        """Test that databases from before batched rollups don't count inserts twice"""
+        with db_manager.connection() as conn:
+            conn.execute("CREATE TRIGGER logs_rollup_insert AFTER INSERT ON logs BEGIN "
+                         "INSERT INTO log_rollup_daily VALUES (strftime('%Y-%m-%d', NEW.timestamp), 'total', '', 1) "
+                         "ON CONFLICT DO UPDATE SET count = count + 1; END")
+        reopened = DatabaseManager(database_path=str(db_manager.database_path))
+        reopened.store_logs([self._entry(f"log_{i}", datetime.now()) for i in range(3)])
+        assert self._rollup(reopened, "total") == {"": 3}
+        reopened.close()
+    
+    def test_statistics_match_direct_counts(self, db_manager):
+        """Test that rollup-based statistics equal counting the logs table"""
+        now = datetime.now()
+        severities = list(LogSeverity)
+        entries = [
+            self._entry(
+                f"stat_{i}",
+                now - timedelta(hours=i * 7, minutes=13),
+                severity=severities[i % len(severities)],
+                tags=[f"tag{i % 4}", "shared"],
+                language=["python", "java", "go"][i % 3],
+                project_name="web" if i % 2 else None
+            )
+            for i in range(120)
+        ]
+        db_manager.store_logs(entries)
+        
+        stats = db_manager.get_statistics()
+        
+        assert stats.total_logs == 120
+        week_ago = now - timedelta(days=7)
+        assert stats.logs_this_week == sum(1 for e in entries if e.timestamp >= week_ago)
+        month_ago = now - timedelta(days=30)
+        assert stats.logs_this_month == sum(1 for e in entries if e.timestamp >= month_ago)
+        assert stats.logs_today == sum(1 for e in entries if e.timestamp.date() == now.date())
+        assert stats.top_error_types["shared"] == 120
+        assert sum(stats.top_languages.values()) == 120
+        assert sum(stats.busiest_hours.values()) == 120
+        assert sum(stats.busiest_days.values()) == 120
+        
+        for i, count in enumerate(stats.errors_per_day_last_week):
+            day = now.date() - timedelta(days=6 - i)
+            assert count == sum(1 for e in entries if e.timestamp.date() == day)
+        
+        error_trend = stats.severity_trends["error"]
+        assert sum(error_trend) == sum(
+            1 for e in entries
+            if e.severity == LogSeverity.ERROR and (now.date() - e.timestamp.date()).days < 7
+        )
+    
+    def test_existing_database_is_backfilled(self):
+        """Test that opening a pre-rollup database builds the rollups once"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "legacy.db"
+            _create_legacy_database(db_path, [("old", datetime.now(), "x", "y", '["legacy"]', "python")])
+            
+            manager = DatabaseManager(database_path=str(db_path))
+            stats = manager.get_statistics()
+            manager.close()
+            
+            assert stats.total_logs == 1
+            assert stats.top_error_types == {"legacy": 1}
+
+
+class TestTagTable:
+    """Test the normalized log_tags table behind tag filtering"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            manager = DatabaseManager(database_path=str(db_path))
+            yield manager
+            manager.close()
+    
+    @staticmethod
+    def _entry(log_id, tags, severity=LogSeverity.ERROR):
+        return LogEntry(
+            log_id=log_id,
+            timestamp=datetime.now(),
+            original_log="Something failed",
+            processed_log="Something failed",
+            summary=None,
+            tags=tags,
+            severity=severity,
+            language="python",
+            metadata={}
+        )
+    
+    def _tag_rows(self, db_manager):
+        with db_manager.connection() as conn:
+            return sorted(conn.execute("SELECT tag, log_id FROM log_tags").fetchall())
+    
+    def test_tag_filter_is_exact(self, db_manager):
+        """Test that 'Error' no longer matches 'TypeError'"""
+        db_manager.store_log(self._entry("type", ["TypeError"]))
+        db_manager.store_log(self._entry("plain", ["Error"]))
+        
+        results = db_manager.search_logs(tags=["Error"])
+        assert [log.log_id for log in results] == ["plain"]
+    
+    def test_tag_filter_is_case_insensitive_and_matches_any(self, db_manager):
+        db_manager.store_log(self._entry("a", ["Database"]))
+        db_manager.store_log(self._entry("b", ["network"]))
+        db_manager.store_log(self._entry("c", ["ui"]))
+        
+        results = db_manager.search_logs(tags=["database", "NETWORK"])
+        assert sorted(log.log_id for log in results) == ["a", "b"]
+    
+    def test_tag_rows_follow_replace_and_delete(self, db_manager):
+        db_manager.store_log(self._entry("a", ["x", "y", "x"]))
+        assert self._tag_rows(db_manager) == [("x", "a"), ("y", "a")]
+        
+        db_manager.store_log(self._entry("a", ["z"]))
+        assert self._tag_rows(db_manager) == [("z", "a")]
+        
+        with db_manager.connection() as conn:
+            conn.execute("DELETE FROM logs WHERE log_id = 'a'")
+        assert self._tag_rows(db_manager) == []
+    
+    def test_tag_lookup_is_answered_from_the_index(self, db_manager):
+        with db_manager.connection() as conn:
+            plan = " ".join(
+                row[-1] for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT log_id FROM log_tags WHERE tag IN ('a', 'b')"
+                )
+            )
+        assert "USING PRIMARY KEY" in plan or "COVERING INDEX" in plan
+    
+    def test_count_logs_with_filters(self, db_manager):
+        db_manager.store_log(self._entry("a", ["db"], severity=LogSeverity.ERROR))
+        db_manager.store_log(self._entry("b", ["db"], severity=LogSeverity.WARNING))
+        db_manager.store_log(self._entry("c", ["dbx"], severity=LogSeverity.ERROR))
+        
+        assert db_manager.count_logs(tags=["db"]) == 2
+        assert db_manager.count_logs(tags=["db"], severities=[LogSeverity.ERROR]) == 1
+        assert db_manager.count_logs(start_date=datetime.now() + timedelta(hours=1)) == 0
+    
+    def test_existing_database_is_migrated(self):
+        """Test that databases created before log_tags get it filled on open"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "legacy.db"
+            manager = DatabaseManager(database_path=str(db_path))
+            manager.store_log(self._entry("old", ["LegacyTag"]))
+            manager.close()
+            
+            conn = sqlite3.connect(db_path)
+            for trigger in ("logs_tags_insert", "logs_tags_delete", "logs_tags_update"):
+                conn.execute(f"DROP TRIGGER {trigger}")
+            conn.execute("DROP TABLE log_tags")
+            conn.commit()
+            conn.close()
+            
+            manager = DatabaseManager(database_path=str(db_path))
+            assert [log.log_id for log in manager.search_logs(tags=["legacytag"])] == ["old"]
+            manager.close()
+
+
+class TestFullTextSearch:
+    """Test the FTS5 index behind text_search and search_text"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            manager = DatabaseManager(database_path=str(db_path))
+            for log_id, original, summary in [
+                ("npe", "java.lang.NullPointerException at com.shop.Cart.total(Cart.java:42)", "Null reference in cart"),
+                ("snake", "KeyError: 'user_profile_id' in load_user_profile", None),
+                ("conn", "ConnectionError: failed connecting to database after 3 retries", "Database unreachable"),
+                ("db_summary", "Timeout waiting for pool", "database database database"),
+            ]:
+                manager.store_log(LogEntry(
+                    log_id=log_id,
+                    timestamp=datetime.now(),
+                    original_log=original,
+                    processed_log=f"Processed: {original}",
+                    summary=summary,
+                    tags=[],
+                    severity=LogSeverity.ERROR,
+                    language="python",
+                    metadata={}
+                ))
+            yield manager
+            manager.close()
+    
+    def _ids(self, results):
+        return sorted(log.log_id for log in results)
+    
+    def test_identifier_terms_split_camel_case(self):
+        assert identifier_terms("NullPointerException in HTTPServer") == "null pointer exception http server"
+        assert identifier_terms("plain words only") == ""
+    
+    def test_match_query_quotes_user_input(self):
+        assert fts_match_query('snake_case NullPoint') == '"snake_case"* "NullPoint"*'
+        assert fts_match_query('AND OR "NEAR(') == '"AND"* "OR"* "NEAR"*'
+        assert fts_match_query("!!! ???") is None
+    
+    def test_index_is_used(self, db_manager):
+        assert db_manager.fts_enabled
+    
+    def test_camel_case_parts_and_prefixes_match(self, db_manager):
+        assert self._ids(db_manager.search_logs(text_search="NullPointerException")) == ["npe"]
+        assert self._ids(db_manager.search_logs(text_search="Pointer")) == ["npe"]
+        assert self._ids(db_manager.search_logs(text_search="NullPoint")) == ["npe"]
+        assert "conn" in self._ids(db_manager.search_logs(text_search="Error"))
+    
+    def test_snake_case_and_stemming_match(self, db_manager):
+        assert self._ids(db_manager.search_logs(text_search="user_profile_id")) == ["snake"]
+        assert self._ids(db_manager.search_logs(text_search="profile")) == ["snake"]
+        assert self._ids(db_manager.search_logs(text_search="connection")) == ["conn"]
+    
+    def test_punctuation_only_text_matches_nothing(self, db_manager):
+        assert db_manager.search_logs(text_search="%%%") == []
+    
+    def test_search_text_ranks_and_highlights(self, db_manager):
+        hits = db_manager.search_text("database")
+        
+        assert [hit.log.log_id for hit in hits] == ["db_summary", "conn"]
+        assert hits[0].score > hits[1].score > 0
+        assert "<mark>database</mark>" in hits[1].snippet.lower()
+    
+    def test_search_text_applies_filters(self, db_manager):
+        assert db_manager.search_text("database", severity=LogSeverity.WARNING) == []
+    
+    def test_index_follows_replace_and_delete(self, db_manager):
+        entry = db_manager.get_log("conn")
+        entry.original_log = "Socket closed unexpectedly"
+        entry.processed_log = "Socket closed"
+        entry.summary = None
+        db_manager.store_log(entry)
+        
+        assert db_manager.search_logs(text_search="ConnectionError") == []
+        assert self._ids(db_manager.search_logs(text_search="socket")) == ["conn"]
+        
+        db_manager.delete_logs_older_than(-1)  # Everything is older than tomorrow
+        assert db_manager.search_logs(text_search="socket") == []
+        with db_manager.connection() as conn:
+            conn.execute("INSERT INTO logs_fts (logs_fts) VALUES ('integrity-check')")
+    
+    def test_existing_database_is_indexed(self):
+        """Test that databases created before the FTS index get it built on open"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "legacy.db"
+            _create_legacy_database(db_path, [
+                ("old", datetime.now(), "IllegalStateException: closed", "closed", "[]", "java")
+            ])
+            
+            manager = DatabaseManager(database_path=str(db_path))
+            assert self._ids(manager.search_logs(text_search="IllegalState")) == ["old"]
+            assert self._ids(manager.search_logs(text_search="state")) == ["old"]
+            manager.close()
+
+
+class TestCursorPagination:
+    """Test keyset pagination on (timestamp, log_id)"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            manager = DatabaseManager(database_path=str(db_path))
+            base = datetime(2024, 5, 1, 12, 0, 0)
+            entries = []
+            for i in range(23):
+                # Groups of three logs share a timestamp to exercise the log_id tiebreak
+                entries.append(LogEntry(
+                    log_id=f"page_{i:02d}",
+                    timestamp=base + timedelta(minutes=i // 3),
+                    original_log=f"RuntimeError: failure {i}",
+                    processed_log=f"Failure {i}",
+                    summary=None,
+                    tags=["even"] if i % 2 == 0 else ["odd"],
+                    severity=LogSeverity.ERROR,
+                    language="python",
+                    metadata={}
+                ))
+            manager.store_logs(entries)
+            yield manager
+            manager.close()
+    
+    def test_pages_cover_everything_once_in_order(self, db_manager):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            page = db_manager.search_logs_page(limit=5, cursor=cursor)
+            seen.extend(log.log_id for log in page.logs)
+            pages += 1
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        
+        assert pages == 5
+        assert seen == [log.log_id for log in db_manager.search_logs(limit=100)]
+        assert seen == sorted(seen, key=lambda log_id: (int(log_id[5:]) // 3, log_id), reverse=True)
+        assert len(set(seen)) == 23
+    
+    def test_last_full_page_has_no_cursor(self, db_manager):
+        page = db_manager.search_logs_page(limit=23)
+        assert len(page.logs) == 23
+        assert page.next_cursor is None
+    
+    def test_cursor_pages_respect_filters(self, db_manager):
+        first = db_manager.search_logs_page(tags=["even"], limit=10)
+        second = db_manager.search_logs_page(tags=["even"], limit=10, cursor=first.next_cursor)
+        
+        ids = [log.log_id for log in first.logs + second.logs]
+        assert len(ids) == 12
+        assert all(int(log_id[5:]) % 2 == 0 for log_id in ids)
+        assert second.next_cursor is None
+    
+    def test_new_logs_do_not_shift_pages(self, db_manager):
+        first = db_manager.search_logs_page(limit=5)
+        newer = db_manager.get_log("page_22")
+        newer.log_id = "page_new"
+        newer.timestamp = datetime(2030, 1, 1)
+        db_manager.store_log(newer)
+        
+        second = db_manager.search_logs_page(limit=5, cursor=first.next_cursor)
+        assert second.logs[0].log_id == "page_17"
+    
+    def test_cursor_is_opaque_and_validated(self, db_manager):
+        page = db_manager.search_logs_page(limit=1)
+        assert decode_cursor(page.next_cursor)[1] == page.logs[0].log_id
+        with pytest.raises(ValueError):
+            db_manager.search_logs_page(cursor="not-a-cursor")
+    
+    def test_iter_logs_walks_whole_table(self, db_manager):
+        assert len(list(db_manager.iter_logs(batch_size=4))) == 23
+        assert len(list(db_manager.iter_logs(batch_size=4, tags=["odd"]))) == 11
+    
+    def test_cursor_query_seeks_the_index(self, db_manager):
+        with db_manager.connection() as conn:
+            plan = " ".join(row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT log_id FROM logs WHERE (timestamp, log_id) < (?, ?) "
+                "ORDER BY timestamp DESC, log_id DESC LIMIT 5",
+                ("2024-05-01 12:03:00", "page_10")
+            ))
+        assert "idx_timestamp_log_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestBlobStore:
+    """Test the deduplicated, compressed log body store"""
+    
+    TRACE = "Traceback (most recent call last):\n" + "".join(
+        f'  File "/srv/app/handlers_{i}.py", line {i * 10}, in handle\n    process(request)\n'
+        for i in range(40)
+    ) + "ValueError: invalid literal for int() with base 10: 'ü✓'"
+    
+    @pytest.fixture
+    def temp_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+    
+    @pytest.fixture
+    def db_manager(self, temp_dir):
+        manager = DatabaseManager(database_path=str(temp_dir / "test.db"))
+        yield manager
+        manager.close()
+    
+    def _entry(self, log_id, original, processed="Invalid integer", days_ago=0):
+        return LogEntry(
+            log_id=log_id,
+            timestamp=datetime.now() - timedelta(days=days_ago),
+            original_log=original,
+            processed_log=processed,
+            summary=None,
+            tags=[],
+            severity=LogSeverity.ERROR,
+            language="python",
+            metadata={}
+        )
+    
+    def _blob_rows(self, manager):
+        with manager.connection() as conn:
+            return conn.execute("SELECT codec, size, refcount FROM log_blobs ORDER BY size").fetchall()
+    
+    def test_identical_bodies_share_one_blob(self, db_manager):
+        db_manager.store_logs(self._entry(f"dup_{i}", self.TRACE) for i in range(50))
+        
+        stats = db_manager.get_storage_statistics()
+        assert stats["blobs"] == 2
+        assert stats["references"] == 100
+        assert [refcount for _, _, refcount in self._blob_rows(db_manager)] == [50, 50]
+    
+    def test_bodies_round_trip_exactly(self, db_manager):
+        db_manager.store_log(self._entry("big", self.TRACE, processed="short ✓"))
+        
+        log = db_manager.get_log("big")
+        assert log.original_log == self.TRACE
+        assert log.processed_log == "short ✓"
+    
+    def test_large_bodies_are_compressed_and_short_ones_are_not(self, db_manager):
+        db_manager.store_log(self._entry("big", self.TRACE))
+        
+        (short_codec, _, _), (long_codec, _, _) = self._blob_rows(db_manager)
+        assert short_codec == "raw"
+        assert long_codec == "zlib"
+        stats = db_manager.get_storage_statistics()
+        assert stats["stored_bytes"] * 4 < stats["original_bytes"]
+    
+    def test_deleting_logs_releases_blobs(self, db_manager):
+        db_manager.store_logs([
+            self._entry("old_shared", self.TRACE, days_ago=10),
+            self._entry("new_shared", self.TRACE),
+            self._entry("old_unique", "OSError: disk full", processed="Disk full", days_ago=10),
+        ])
+        
+        assert db_manager.delete_logs_older_than(5) == 2
+        stats = db_manager.get_storage_statistics()
+        assert (stats["blobs"], stats["references"]) == (2, 2)
+        assert stats["original_bytes"] == len(self.TRACE.encode()) + len("Invalid integer")
+        assert db_manager.get_log("new_shared").original_log == self.TRACE
+    
+    def test_replacing_a_log_moves_its_references(self, db_manager):
+        db_manager.store_log(self._entry("same_id", "first body"))
+        db_manager.store_log(self._entry("same_id", "second body"))
+        
+        assert db_manager.get_storage_statistics()["references"] == 2
+        assert db_manager.purge_orphaned_blobs() == 1
+        assert db_manager.get_log("same_id").original_log == "second body"
+        assert db_manager.search_logs(text_search="first") == []
+        assert [log.log_id for log in db_manager.search_logs(text_search="second")] == ["same_id"]
+    
+    def test_bodies_are_only_decoded_for_returned_rows(self, temp_dir):
+        manager = DatabaseManager(database_path=str(temp_dir / "test.db"), blob_cache_size=0)
+        manager.store_logs(self._entry(f"log_{i}", f"RuntimeError: case {i}", processed=f"Case {i}")
+                           for i in range(20))
+        
+        with patch("src.debuggle.storage.database._decode_body", wraps=_decode_body) as decode:
+            logs = manager.search_logs(severity=LogSeverity.ERROR, limit=2)
+            assert manager.count_logs(severities=[LogSeverity.ERROR]) == 20
+        manager.close()
+        
+        assert len(logs) == 2
+        assert decode.call_count == 4  # original + processed, for the two returned rows only
+    
+    def test_repeated_bodies_are_decoded_once(self, temp_dir):
+        db_path = str(temp_dir / "test.db")
+        writer = DatabaseManager(database_path=db_path)
+        writer.store_logs(self._entry(f"dup_{i}", self.TRACE) for i in range(10))
+        writer.close()
+        
+        reader = DatabaseManager(database_path=db_path)
+        with patch("src.debuggle.storage.database._decode_body", wraps=_decode_body) as decode:
+            assert len(reader.search_logs(limit=10)) == 10
+        reader.close()
+        
+        assert decode.call_count == 2
+    
+    def test_legacy_database_is_migrated(self, temp_dir):
+        db_path = temp_dir / "legacy.db"
+        now = datetime.now()
+        _create_legacy_database(db_path, [
+            (f"old_{i}", now - timedelta(minutes=i), self.TRACE, "Invalid integer", "[]", "python")
+            for i in range(30)
+        ] + [("odd_one", now, "SegmentationFault in NativeBridge", "Crash", "[]", "cpp")])
+        
+        manager = DatabaseManager(database_path=str(db_path))
+        with manager.connection() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(logs)")}
+            conn.execute("INSERT INTO logs_fts (logs_fts) VALUES ('integrity-check')")
+        stats = manager.get_storage_statistics()
+        
+        assert "original_log" not in columns and "processed_log" not in columns
+        assert stats["blobs"] == 4
+        assert stats["references"] == 62
+        assert manager.get_log("old_7").original_log == self.TRACE
+        assert [log.log_id for log in manager.search_logs(text_search="NativeBridge")] == ["odd_one"]
+        assert [log.log_id for log in manager.search_logs(text_search="native")] == ["odd_one"]
+        manager.close()
+
+
+class TestColumnProjection:
+    """Test column projection and lazily parsed LogRow results"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = DatabaseManager(database_path=str(Path(temp_dir) / "test.db"))
+            base = datetime(2024, 5, 1, 12, 0, 0)
+            manager.store_logs(LogEntry(
+                log_id=f"proj_{i}",
+                timestamp=base + timedelta(minutes=i),
+                original_log=f"KeyError: 'field_{i}'",
+                processed_log=f"Missing key field_{i}",
+                summary="Missing dictionary key",
+                tags=["KeyError", "even" if i % 2 == 0 else "odd"],
+                severity=LogSeverity.WARNING if i % 3 == 0 else LogSeverity.ERROR,
+                language="python",
+                metadata={"line": i},
+                project_name="api"
+            ) for i in range(7))
+            yield manager
+            manager.close()
+    
+    def test_projection_returns_log_rows(self, db_manager):
+        rows = db_manager.search_logs(columns=["severity", "tags"])
+        
+        assert all(isinstance(row, LogRow) for row in rows)
+        assert rows[0].columns == ("log_id", "timestamp", "severity", "tags")
+        assert [row.log_id for row in rows] == [f"proj_{i}" for i in range(6, -1, -1)]
+        assert rows[0].timestamp == datetime(2024, 5, 1, 12, 6, 0)
+        assert rows[0].severity == LogSeverity.WARNING
+        assert rows[0].tags == ["KeyError", "even"]
+    
+    def test_unselected_columns_are_not_available(self, db_manager):
+        row = db_manager.search_logs(columns=["severity"], limit=1)[0]
+        with pytest.raises(AttributeError, match="original_log"):
+            row.original_log
+    
+    def test_json_fields_are_parsed_once_on_first_access(self, db_manager):
+        row = db_manager.search_logs(columns=["tags", "metadata"], limit=1)[0]
+        
+        with patch("src.debuggle.storage.database.json.loads", wraps=json.loads) as loads:
+            assert row.metadata == {"line": 6}
+            assert row.metadata is row.metadata
+            assert loads.call_count == 1
+    
+    def test_full_projection_converts_to_entry(self, db_manager):
+        columns = ["original_log", "processed_log", "summary", "tags", "severity",
+                   "language", "metadata", "project_name", "file_path", "source"]
+        row = db_manager.search_logs(columns=columns, limit=1)[0]
+        assert row.to_entry() == db_manager.get_log("proj_6")
+    
+    def test_projection_works_with_filters_and_cursors(self, db_manager):
+        first = db_manager.search_logs_page(tags=["even"], limit=2, columns=["severity"])
+        second = db_manager.search_logs_page(tags=["even"], limit=2, columns=["severity"],
+                                             cursor=first.next_cursor)
+        
+        assert [row.log_id for row in first.logs + second.logs] == ["proj_6", "proj_4", "proj_2", "proj_0"]
+        assert second.next_cursor is None
+        assert [row.log_id for row in db_manager.iter_logs(batch_size=3, columns=())] == [
+            f"proj_{i}" for i in range(6, -1, -1)
+        ]
+    
+    def test_projection_skips_body_decoding(self, db_manager):
+        # A fresh manager has an empty body cache, so every body read decodes
+        reader = DatabaseManager(database_path=str(db_manager.database_path))
+        with patch("src.debuggle.storage.database._decode_body", wraps=_decode_body) as decode:
+            assert len(reader.search_logs(columns=["severity", "tags"])) == 7
+            assert decode.call_count == 0
+            
+            reader.search_logs(columns=["original_log"])
+            assert decode.call_count == 7
+        reader.close()
+    
+    def test_unknown_column_is_rejected(self, db_manager):
+        with pytest.raises(ValueError, match="Unknown log columns: stack"):
+            db_manager.search_logs(columns=["stack"])
+
+
+class TestChangeFeed:
+    """Test change listeners hearing about every committed write"""
+    
+    @pytest.fixture
+    def db_manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = DatabaseManager(database_path=str(Path(temp_dir) / "test.db"))
+            yield manager
+            manager.close()
+    
+    @staticmethod
+    def _entry(log_id, days_ago=0):
+        return LogEntry(
+            log_id=log_id,
+            timestamp=datetime.now() - timedelta(days=days_ago),
+            original_log=f"OSError: disk full {log_id}",
+            processed_log="Disk full",
+            summary=None,
+            tags=["disk"],
+            severity=LogSeverity.ERROR,
+            language="python",
+            metadata={}
+        )
+    
+    def test_writes_are_reported_in_order(self, db_manager):
+        changes = []
+        db_manager.add_change_listener(changes.append)
+        
+        db_manager.store_log(self._entry("one", days_ago=10))
+        db_manager.store_logs([self._entry("two"), self._entry("three")])
+        db_manager.delete_log("two")
+        db_manager.delete_log("missing")  # Nothing deleted, nothing reported
+        db_manager.delete_logs_older_than(5)
+        
+        assert [change.generation for change in changes] == [1, 2, 3, 4]
+        assert db_manager.generation == 4
+        assert [entry.log_id for entry in changes[1].stored] == ["two", "three"]
+        assert list(changes[2].deleted_ids) == ["two"]
+        assert list(changes[3].deleted_ids) == ["one"]
+    
+    def test_failing_listener_does_not_fail_the_write(self, db_manager):
+        def broken(change):
+            raise RuntimeError("listener bug")
+        
+        db_manager.add_change_listener(broken)
+        assert db_manager.store_log(self._entry("kept")) is True
+        assert db_manager.get_log("kept") is not None
+    
+    def test_listeners_can_be_removed(self, db_manager):
+        changes = []
+        db_manager.add_change_listener(changes.append)
+        db_manager.remove_change_listener(changes.append)
+        db_manager.store_log(self._entry("unheard"))
+        assert changes == []
+        assert db_manager.generation == 1
+    
+    def test_bound_methods_are_held_weakly(self, db_manager):
+        class Subscriber:
+            def __init__(self):
+                self.changes = []
+            
+            def on_change(self, change):
+                self.changes.append(change)
+        
+        subscriber = Subscriber()
+        db_manager.add_change_listener(subscriber.on_change)
+        db_manager.store_log(self._entry("first"))
+        assert len(subscriber.changes) == 1
+        
+        del subscriber
+        db_manager.store_log(self._entry("second"))
+        assert db_manager._change_listeners == []
+
+    def test_generation_survives_reopening(self, db_manager):
+        db_manager.store_log(self._entry("one"))
+        db_manager.store_log(self._entry("two"))
+
+        reopened = DatabaseManager(str(db_manager.database_path))
+        assert reopened.generation == 2
+        assert reopened.database_id == db_manager.database_id
+
+        # A write through the other manager is a skipped generation here
+        changes = []
+        db_manager.add_change_listener(changes.append)
+        reopened.store_log(self._entry("three"))
+        db_manager.store_log(self._entry("four"))
+        assert [change.generation for change in changes] == [4]
+        reopened.close()
+
+    def test_logs_changed_since_a_generation(self, db_manager):
+        db_manager.store_logs([self._entry("one"), self._entry("two")])
+        db_manager.store_log(self._entry("three"))
+        db_manager.store_log(self._entry("one"))  # Replaced: moves to the new generation
+
+        changed = db_manager.iter_logs_changed_since(1, batch_size=1)
+        assert sorted(log.log_id for log in changed) == ["one", "three"]
+        assert list(db_manager.iter_logs_changed_since(db_manager.generation)) == []
+
+        rows = list(db_manager.iter_logs_changed_since(0, columns=["severity"]))
+        assert {row.log_id for row in rows} == {"one", "two", "three"}
+        assert rows[0].severity == LogSeverity.ERROR
+
+
 class TestDatabaseErrorHandling:
     """Test database error handling and edge cases"""
     
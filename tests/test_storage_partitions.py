@@ -0,0 +1,256 @@
+"""
+Tests for time-partitioned storage: routing writes to day/week partition
+files, fanning reads out newest first, merged statistics and retention by
+dropping whole partition files.
+"""
+
+import tempfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.debuggle.storage.database import DatabaseManager, LogSeverity
+from src.debuggle.storage.partitions import PartitionedDatabaseManager
+from src.debuggle.storage.search import SearchManager, SearchQuery, SortOrder
+from tests.conftest import make_log_entry
+
+
+def _entry(log_id, timestamp, severity=LogSeverity.ERROR, tags=None, text="RuntimeError: failure"):
+    return make_log_entry(log_id, timestamp, text=f"{text} {log_id}", severity=severity,
+                          tags=tags if tags is not None else ["runtime"])
+
+
+@pytest.fixture
+def partition_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.fixture
+def recent_logs():
+    """Four logs on each of the last six days (oldest first)."""
+    today = datetime.combine(date.today(), time.min)
+    entries = []
+    for days_ago in range(5, -1, -1):
+        for hour in (1, 7, 13, 19):
+            timestamp = today - timedelta(days=days_ago) + timedelta(hours=hour)
+            entries.append(_entry(f"log_{days_ago}_{hour:02d}", timestamp,
+                                  severity=LogSeverity.CRITICAL if hour == 13 else LogSeverity.ERROR,
+                                  tags=["db"] if hour == 7 else ["runtime"]))
+    return entries
+
+
+@pytest.fixture
+def daily(partition_dir, recent_logs):
+    manager = PartitionedDatabaseManager(str(partition_dir), period="day")
+    assert manager.store_logs(recent_logs, batch_size=5) == len(recent_logs)
+    yield manager
+    manager.close()
+
+
+def _newest_first_ids(entries):
+    return [entry.log_id for entry in sorted(entries, key=lambda e: e.timestamp, reverse=True)]
+
+
+class TestPartitionRouting:
+    """Test that writes land in the partition for their timestamp."""
+
+    def test_one_file_per_day(self, daily, partition_dir):
+        today = date.today()
+        expected = {f"logs-{(today - timedelta(days=n)).isoformat()}.db" for n in range(6)}
+        assert {path.name for path in partition_dir.glob("logs-*.db")} == expected
+        for manager in daily.partitions():
+            assert manager.count_logs() == 4
+
+    def test_weeks_start_on_monday(self, partition_dir):
+        manager = PartitionedDatabaseManager(str(partition_dir), period="week")
+        # 2024-05-01 is a Wednesday, 2024-05-06 the following Monday
+        manager.store_log(_entry("wed", datetime(2024, 5, 1, 9)))
+        manager.store_log(_entry("sun", datetime(2024, 5, 5, 23)))
+        manager.store_log(_entry("mon", datetime(2024, 5, 6, 0, 30)))
+        manager.close()
+
+        assert sorted(path.name for path in partition_dir.glob("logs-*.db")) == [
+            "logs-2024-04-29.db", "logs-2024-05-06.db"
+        ]
+        assert DatabaseManager(str(partition_dir / "logs-2024-04-29.db")).count_logs() == 2
+
+    def test_invalid_period_is_rejected(self, partition_dir):
+        with pytest.raises(ValueError, match="period"):
+            PartitionedDatabaseManager(str(partition_dir), period="month")
+
+    def test_existing_partitions_are_discovered_lazily(self, daily, partition_dir, recent_logs):
+        daily.close()
+        reopened = PartitionedDatabaseManager(str(partition_dir), period="day")
+        assert len(reopened._partitions) == 6
+        assert all(manager is None for manager in reopened._partitions.values())
+
+        assert reopened.get_log("log_0_19").log_id == "log_0_19"
+        assert reopened.count_logs() == len(recent_logs)
+        reopened.close()
+
+
+class TestPartitionedReads:
+    """Test reads that fan out to several partitions."""
+
+    def test_search_logs_is_newest_first_across_partitions(self, daily, recent_logs):
+        expected = _newest_first_ids(recent_logs)
+        assert [log.log_id for log in daily.search_logs(limit=100)] == expected
+        assert [log.log_id for log in daily.search_logs(limit=6, offset=3)] == expected[3:9]
+
+    def test_recent_page_does_not_open_old_partitions(self, daily, partition_dir):
+        daily.close()
+        reopened = PartitionedDatabaseManager(str(partition_dir), period="day")
+        reopened.search_logs(limit=3)
+        opened = [start for start, manager in reopened._partitions.items() if manager is not None]
+        assert opened == [date.today()]
+        reopened.close()
+
+    def test_cursor_pages_cover_everything_once(self, daily, recent_logs):
+        seen = []
+        cursor = None
+        while True:
+            # Pages of four end exactly on partition boundaries
+            page = daily.search_logs_page(limit=4, cursor=cursor)
+            seen.extend(log.log_id for log in page.logs)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert seen == _newest_first_ids(recent_logs)
+
+    def test_cursor_pages_span_partitions_with_filters(self, daily):
+        first = daily.search_logs_page(tags=["db"], limit=4)
+        second = daily.search_logs_page(tags=["db"], limit=4, cursor=first.next_cursor)
+
+        ids = [log.log_id for log in first.logs + second.logs]
+        assert ids == [f"log_{n}_07" for n in range(6)]
+        assert second.next_cursor is None
+
+    def test_projected_pages_span_partitions(self, daily, recent_logs):
+        first = daily.search_logs_page(limit=6, columns=["severity"])
+        second = daily.search_logs_page(limit=6, columns=["severity"], cursor=first.next_cursor)
+
+        assert [row.log_id for row in first.logs + second.logs] == _newest_first_ids(recent_logs)[:12]
+        assert first.logs[1].severity == LogSeverity.CRITICAL
+
+    def test_date_range_only_reads_matching_partitions(self, daily):
+        today = datetime.combine(date.today(), time.min)
+        logs = daily.search_logs(start_date=today - timedelta(days=2), end_date=today - timedelta(days=1))
+        assert [log.log_id for log in logs] == ["log_2_19", "log_2_13", "log_2_07", "log_2_01"]
+
+    def test_counts_and_statistics_are_merged(self, daily, recent_logs):
+        assert daily.count_logs() == len(recent_logs)
+        assert daily.count_logs(severities=[LogSeverity.CRITICAL]) == 6
+        assert daily.count_logs(tags=["db"]) == 6
+
+        stats = daily.get_statistics()
+        assert stats.total_logs == len(recent_logs)
+        assert stats.logs_today == 4
+        assert stats.top_error_types == {"runtime": 18, "db": 6}
+        assert stats.top_severity_levels == {"error": 18, "critical": 6}
+        assert stats.oldest_log_date == recent_logs[0].timestamp
+        assert stats.newest_log_date == recent_logs[-1].timestamp
+
+    def test_search_text_merges_hits(self, daily, partition_dir):
+        daily.store_log(_entry("deadlock_new", datetime.now() - timedelta(minutes=1),
+                               text="Deadlock detected while waiting"))
+        daily.store_log(_entry("deadlock_old", datetime.now() - timedelta(days=4),
+                               text="Deadlock detected while waiting"))
+
+        hits = daily.search_text("deadlock")
+        assert [hit.log.log_id for hit in hits] == ["deadlock_new", "deadlock_old"]
+
+    def test_delete_log_finds_its_partition(self, daily):
+        assert daily.delete_log("log_3_07") is True
+        assert daily.get_log("log_3_07") is None
+        assert daily.delete_log("log_3_07") is False
+
+
+class TestPartitionRetention:
+    """Test retention that drops whole partition files."""
+
+    def test_expired_partitions_are_deleted_as_files(self, daily, partition_dir, recent_logs):
+        cutoff = datetime.now() - timedelta(days=2)
+        expected = sum(1 for entry in recent_logs if entry.timestamp < cutoff)
+
+        assert daily.delete_logs_older_than(2) == expected
+
+        remaining = sorted(path.name for path in partition_dir.glob("logs-*.db"))
+        oldest_kept = (date.today() - timedelta(days=2)).isoformat()
+        assert remaining[0] == f"logs-{oldest_kept}.db"
+        assert len(remaining) == 3
+        assert not list(partition_dir.glob(f"logs-{(date.today() - timedelta(days=3)).isoformat()}.db*"))
+        assert daily.count_logs() == len(recent_logs) - expected
+        assert all(log.timestamp >= cutoff for log in daily.search_logs(limit=100))
+
+    def test_change_feed_spans_partitions_and_drops(self, daily, recent_logs):
+        changes = []
+        daily.add_change_listener(changes.append)
+        daily.store_log(_entry("fresh", datetime.now()))
+        daily.delete_logs_older_than(2)
+
+        first = changes[0].generation
+        assert [change.generation for change in changes] == list(range(first, first + len(changes)))
+        assert [entry.log_id for entry in changes[0].stored] == ["fresh"]
+        cutoff = datetime.now() - timedelta(days=2)
+        deleted = {log_id for change in changes[1:] for log_id in change.deleted_ids}
+        assert deleted == {entry.log_id for entry in recent_logs if entry.timestamp < cutoff}
+
+    def test_nothing_expired_keeps_every_partition(self, daily, recent_logs):
+        assert daily.delete_logs_older_than(30) == 0
+        assert len(list(daily.partitions())) == 6
+        assert daily.count_logs() == len(recent_logs)
+
+
+class TestSearchManagerOnPartitions:
+    """Test that SearchManager works unchanged on partitioned storage."""
+
+    @pytest.mark.asyncio
+    async def test_severity_sort_spans_partitions(self, daily):
+        search = SearchManager(daily)
+        result = await search.search(SearchQuery(sort_by=SortOrder.SEVERITY_HIGH, limit=8))
+
+        assert [log.severity for log in result.logs[:6]] == [LogSeverity.CRITICAL] * 6
+        assert result.logs[0].log_id == "log_0_13"
+        assert result.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_index_follows_partition_drops(self, daily, recent_logs):
+        search = SearchManager(daily)
+        daily.delete_logs_older_than(2)
+        cutoff = datetime.now() - timedelta(days=2)
+
+        result = await search.search(SearchQuery(tags=["db"], limit=10))
+        assert result.query_plan.index_used
+        assert [log.log_id for log in result.logs] == [
+            log_id for log_id in _newest_first_ids(recent_logs)
+            if log_id.endswith("_07") and daily.get_log(log_id) is not None
+        ]
+        assert all(log.timestamp >= cutoff for log in result.logs)
+        assert len(result.query_plan.candidate_ids) == len(result.logs)
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_span_partitions(self, daily, recent_logs):
+        search = SearchManager(daily)
+        seen = []
+        cursor = None
+        while True:
+            result = await search.search(SearchQuery(limit=5, cursor=cursor))
+            seen.extend(log.log_id for log in result.logs)
+            if result.next_cursor is None:
+                break
+            cursor = result.next_cursor
+
+        assert seen == _newest_first_ids(recent_logs)
+
+    @pytest.mark.asyncio
+    async def test_relevance_order_spans_partitions(self, daily):
+        search = SearchManager(daily)
+        daily.store_log(_entry("once_new", datetime.now() - timedelta(minutes=1), text="Deadlock detected"))
+        daily.store_log(_entry("twice_old", datetime.now() - timedelta(days=4), text="Deadlock deadlock detected"))
+
+        result = await search.search(SearchQuery(text="deadlock", sort_by=SortOrder.MOST_RELEVANT))
+        assert [log.log_id for log in result.logs] == ["twice_old", "once_new"]
+        assert result.match_quality_scores[0] == 1.0
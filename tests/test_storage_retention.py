@@ -0,0 +1,139 @@
+"""
+Tests for RetentionManager's set-based execution: rule filters run as
+SQL, deletes and marks happen in bounded chunks that yield to the event
+loop, and rules that need each log's contents keep the per-log path.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.debuggle.storage.database import LogSeverity
+from src.debuggle.storage.retention import RetentionAction, RetentionManager, RetentionRule
+from tests.conftest import make_log_entry
+
+
+def _entry(log_id, days_ago, severity=LogSeverity.WARNING, tags=("db",), source="api"):
+    return make_log_entry(log_id, datetime.now() - timedelta(days=days_ago, minutes=1),
+                          text=f"Slow query {log_id}", processed_log="Slow query",
+                          tags=list(tags), severity=severity, source=source)
+
+
+@pytest.fixture
+def db_manager(db_manager):
+    db_manager.store_logs(
+        [_entry(f"old_warning_{i}", 40 + i) for i in range(10)]
+        + [_entry(f"new_warning_{i}", 1) for i in range(3)]
+        + [_entry(f"old_error_{i}", 40, severity=LogSeverity.ERROR, tags=["ui"], source="upload")
+           for i in range(4)]
+    )
+    return db_manager
+
+
+@pytest.fixture
+def retention(db_manager):
+    manager = RetentionManager(db_manager)
+    manager.rules = []
+    manager.config["chunk_size"] = 3
+    return manager
+
+
+def _ids(db_manager):
+    return {log.log_id for log in db_manager.search_logs(limit=100)}
+
+
+class TestSetBasedRetention:
+    """Test rules executed as chunked SQL statements."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_run_in_chunks_and_yield(self, retention, db_manager, monkeypatch):
+        changes = []
+        db_manager.add_change_listener(changes.append)
+        sleeps = []
+        real_sleep = asyncio.sleep
+        monkeypatch.setattr(asyncio, "sleep", lambda delay: sleeps.append(delay) or real_sleep(delay))
+        retention.add_rule(RetentionRule("Old warnings", "", 30, RetentionAction.DELETE,
+                                         severity_filter=[LogSeverity.WARNING]))
+
+        report = await retention.execute_retention_policies()
+
+        assert report.actions_taken[RetentionAction.DELETE] == 10
+        assert report.total_logs_processed == 10 and report.errors == []
+        assert [len(change.deleted_ids) for change in changes] == [3, 3, 3, 1]
+        assert sleeps == [0, 0, 0]
+        assert _ids(db_manager) == {f"new_warning_{i}" for i in range(3)} | {f"old_error_{i}" for i in range(4)}
+        assert retention.get_rule("Old warnings").total_processed == 10
+
+    @pytest.mark.asyncio
+    async def test_every_filter_is_applied_in_sql(self, retention, db_manager):
+        retention.add_rule(RetentionRule("Uploaded UI errors", "", 30, RetentionAction.ARCHIVE,
+                                         severity_filter=[LogSeverity.ERROR, LogSeverity.CRITICAL],
+                                         language_filter=["python"], tag_filter=["ui", "mobile"],
+                                         source_filter=["upload"]))
+        retention.add_rule(RetentionRule("Other project", "", 30, RetentionAction.DELETE,
+                                         project_filter=["billing"]))
+
+        report = await retention.execute_retention_policies()
+
+        assert report.actions_taken[RetentionAction.ARCHIVE] == 4
+        assert report.actions_taken[RetentionAction.DELETE] == 0
+        assert len(_ids(db_manager)) == 13
+        assert not any(log_id.startswith("old_error") for log_id in _ids(db_manager))
+
+    @pytest.mark.asyncio
+    async def test_marking_persists_a_tag_once(self, retention, db_manager):
+        retention.add_rule(RetentionRule("Mark old", "", 30, RetentionAction.MARK_ARCHIVED,
+                                         tag_filter=["db"]))
+
+        first = await retention.execute_retention_policies()
+        second = await retention.execute_retention_policies()
+
+        assert first.actions_taken[RetentionAction.MARK_ARCHIVED] == 10
+        assert second.actions_taken[RetentionAction.MARK_ARCHIVED] == 0
+        assert db_manager.get_log("old_warning_0").tags == ["db", "archived"]
+        assert db_manager.get_log("new_warning_0").tags == ["db"]
+        assert db_manager.count_logs(tags=["archived"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_max_execution_time_stops_between_chunks(self, retention, db_manager):
+        retention.config["max_execution_time"] = -1
+        retention.add_rule(RetentionRule("Everything old", "", 30, RetentionAction.DELETE))
+
+        report = await retention.execute_retention_policies()
+
+        assert report.total_logs_processed == 3
+        assert len(report.errors) == 1 and "max_execution_time" in report.errors[0]
+        assert len(_ids(db_manager)) == 14
+
+    @pytest.mark.asyncio
+    async def test_a_failing_chunk_is_reported(self, retention, db_manager):
+        with db_manager.connection() as conn:
+            conn.execute("CREATE TRIGGER hold BEFORE DELETE ON logs WHEN OLD.log_id = 'old_warning_5' "
+                         "BEGIN SELECT RAISE(ABORT, 'legal hold'); END")
+        retention.add_rule(RetentionRule("Old warnings", "", 30, RetentionAction.DELETE,
+                                         severity_filter=[LogSeverity.WARNING]))
+
+        report = await retention.execute_retention_policies()
+
+        assert report.actions_taken[RetentionAction.DELETE] == 3  # The oldest chunk, before the hold
+        assert len(report.errors) == 1
+        assert "Old warnings" in report.errors[0] and "legal hold" in report.errors[0]
+        assert db_manager.get_log("old_warning_5") is not None
+        assert db_manager.get_log("old_warning_9") is None
+
+    @pytest.mark.asyncio
+    async def test_callbacks_keep_the_per_log_path(self, retention, db_manager):
+        seen = []
+
+        async def callback(log_entry, action):
+            seen.append(log_entry.log_id)
+
+        retention.add_rule(RetentionRule("Old errors", "", 30, RetentionAction.DELETE,
+                                         severity_filter=[LogSeverity.ERROR], callback=callback))
+
+        report = await retention.execute_retention_policies()
+
+        assert sorted(seen) == [f"old_error_{i}" for i in range(4)]
+        assert report.actions_taken[RetentionAction.DELETE] == 4
+        assert len(_ids(db_manager)) == 13
@@ -0,0 +1,143 @@
+"""
+Tests for DebuggleSearchEngine's SQLite FTS backend: batched,
+transactional add_logs, the background write queue, the FTS5
+merge/optimize schedule, and filtered, bm25-ranked searches.
+"""
+
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.debuggle.storage import search_engine
+from src.debuggle.storage.search_engine import DebuggleSearchEngine
+
+
+def _log(n, content="Connection refused by database server"):
+    return {
+        "id": f"log_{n}",
+        "title": f"Error {n}",
+        "content": content,
+        "severity": "error",
+        "language": "python",
+        "timestamp": datetime(2024, 5, 1) + timedelta(seconds=n),
+        "tags": ["db"],
+    }
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(search_engine, "WHOOSH_AVAILABLE", False)
+    with tempfile.TemporaryDirectory() as index_dir:
+        engine = DebuggleSearchEngine(index_dir=index_dir)
+        yield engine
+        engine.close()
+
+
+def _counts(engine):
+    with sqlite3.connect(engine.db_path) as conn:
+        return (conn.execute("SELECT COUNT(*) FROM search_fts").fetchone()[0],
+                conn.execute("SELECT COUNT(*) FROM search_metadata").fetchone()[0])
+
+
+class TestAddLogs:
+    """Test batched writes to the FTS and metadata tables."""
+
+    def test_batches_write_both_tables(self, engine):
+        engine.write_batch_size = 7
+        assert engine.add_logs(_log(n) for n in range(50)) == 50
+        assert _counts(engine) == (50, 50)
+        results, _ = engine.search("refused", limit=100)
+        assert len(results) == 50
+
+    def test_adding_a_log_again_replaces_it(self, engine):
+        engine.add_logs([_log(1), _log(2)])
+        assert engine.add_log(_log(1, content="Deadlock detected"))
+        assert _counts(engine) == (2, 2)
+        assert [result.log_id for result in engine.search("deadlock")[0]] == ["log_1"]
+        assert [result.log_id for result in engine.search("refused")[0]] == ["log_2"]
+
+    def test_a_failing_log_rolls_back_the_whole_call(self, engine):
+        broken = _log(3)
+        broken["timestamp"] = "not a datetime"
+        engine.write_batch_size = 2
+        assert engine.add_logs([_log(1), _log(2), broken]) == 0
+        assert _counts(engine) == (0, 0)
+
+    def test_merge_and_optimize_run_on_schedule(self, engine):
+        engine.write_batch_size, engine.merge_every_docs, engine.optimize_every_docs = 5, 10, 30
+        for start in range(0, 25, 5):
+            engine.add_logs(_log(n) for n in range(start, start + 5))
+        assert (engine._docs_since_merge, engine._docs_since_optimize) == (5, 25)  # Merged at 10 and 20
+        engine.add_logs(_log(n) for n in range(25, 30))
+        assert (engine._docs_since_merge, engine._docs_since_optimize) == (0, 0)
+        assert len(engine.search("refused", limit=100)[0]) == 30
+
+
+class TestWriteQueue:
+    """Test logs handed to the background writer."""
+
+    def test_queued_logs_are_written_in_batches(self, engine, monkeypatch):
+        batches = []
+        add_logs = engine.add_logs
+        monkeypatch.setattr(engine, "add_logs", lambda logs: batches.append(len(logs)) or add_logs(logs))
+        engine.write_batch_size = 100
+        engine.queue_logs(_log(n) for n in range(250))
+        engine.queue_log(_log(250))
+        assert engine.flush_queue(timeout=10)
+        assert _counts(engine) == (251, 251)
+        assert sum(batches) == 251 and max(batches) <= 100
+        assert engine.get_stats()["queued_writes"] == 0
+
+    def test_close_writes_what_is_queued(self, engine):
+        engine.queue_logs(_log(n) for n in range(20))
+        engine.close(timeout=10)
+        assert _counts(engine) == (20, 20)
+
+
+class TestSearch:
+    """Test filters pushed into SQL, bm25 scores and snippets."""
+
+    @pytest.fixture
+    def filled(self, engine):
+        logs = [_log(n) for n in range(20)]
+        for n, log in enumerate(logs):
+            log["severity"] = "critical" if n % 5 == 0 else "error"
+            log["language"] = "javascript" if n % 2 else "python"
+            log["tags"] = ["db", "network"] if n % 4 == 0 else ["db"]
+        logs[7]["content"] = "Connection refused refused refused"
+        engine.add_logs(logs)
+        return engine
+
+    def test_filters_apply_before_the_limit(self, filled):
+        results, _ = filled.search("refused", limit=2, filters={"severity": "critical", "language": ["python"]})
+        assert sorted(result.log_id for result in results) == ["log_0", "log_10"]
+
+        results, _ = filled.search("refused", limit=20, filters={
+            "tags": ["network"], "date_range": (datetime(2024, 5, 1, 0, 0, 4), None)})
+        assert sorted(result.log_id for result in results) == ["log_12", "log_16", "log_4", "log_8"]
+
+        results, _ = filled.search("refused", limit=20, filters={"end_date": "2024-05-01T00:00:01"})
+        assert sorted(result.log_id for result in results) == ["log_0", "log_1"]
+
+    def test_results_carry_bm25_scores_and_snippets(self, filled):
+        results, _ = filled.search("refused", limit=5)
+        assert results[0].log_id == "log_7"  # The word three times over
+        scores = [result.relevance_score for result in results]
+        assert scores == sorted(scores, reverse=True) and scores[-1] > 0
+        assert "<mark>refused</mark>" in results[0].snippet
+
+    def test_indexes_written_before_rowids_matched_are_migrated(self, engine):
+        with sqlite3.connect(engine.db_path) as conn:
+            for n in (1, 2, 1):
+                conn.execute("INSERT INTO search_fts (log_id, title, content) VALUES (?, ?, ?)",
+                             (f"log_{n}", "Error", f"Refused attempt {n}"))
+            conn.execute("INSERT INTO search_metadata (log_id, severity, tags) VALUES ('log_2', 'error', 'db')")
+            conn.execute("INSERT INTO search_metadata (log_id, severity, tags) VALUES ('log_1', 'error', 'db,ui')")
+            conn.execute("PRAGMA user_version = 0")
+
+        migrated = DebuggleSearchEngine(index_dir=str(engine.index_dir))
+        assert _counts(migrated) == (2, 2)
+        results, _ = migrated.search("refused", filters={"tags": "ui"})
+        assert [result.log_id for result in results] == ["log_1"]
@@ -0,0 +1,566 @@
+"""
+Tests for the SearchManager query planner and its indexes: word and tag
+predicates are answered from the in-memory posting lists, the database only
+sees the candidate ids, whatever the indexes can't decide exactly is still
+checked by SQL, and the indexes follow every write without full rebuilds.
+"""
+
+import random
+import tempfile
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.debuggle.storage.database import DatabaseManager, LogSeverity
+from src.debuggle.storage.segments import IndexSegment, edit_distance
+from src.debuggle.storage.search import (
+    SearchManager, SearchQuery, SortOrder, _SearchIndex, _difference, _intersect_pair, _union
+)
+from tests.conftest import make_log_entry
+
+MESSAGES = {
+    "index_error": ("IndexError: list index out of range", ["python", "Bounds"]),
+    "key_error": ("KeyError: 'user_id' missing from payload", ["python"]),
+    "key_error_2": ("KeyError: 'userXid' missing from cache", ["cache"]),
+    "timeout": ("Connection timeout while reading from the database", ["db", "network"]),
+    "refused": ("Connection refused by database server", ["db"]),
+    "null": ("NullPointerException at service layer", ["java"]),
+}
+
+
+def _entry(log_id, minutes_ago):
+    text, tags = MESSAGES[log_id]
+    return make_log_entry(log_id, datetime(2024, 5, 1, 12, 0) - timedelta(minutes=minutes_ago),
+                          text=text, tags=tags)
+
+
+@pytest.fixture
+def db_manager(db_manager):
+    db_manager.store_logs([_entry(log_id, n) for n, log_id in enumerate(MESSAGES)])
+    return db_manager
+
+
+@pytest.fixture
+def search(db_manager):
+    return SearchManager(db_manager)
+
+
+def _ids(result):
+    return [log.log_id for log in result.logs]
+
+
+def _log(log_id, text, hour=13):
+    return make_log_entry(log_id, datetime(2024, 5, 1, hour, 0), text=text, tags=[])
+
+
+class TestQueryPlanner:
+    """Test which predicates the indexes answer and which SQL still checks."""
+
+    @pytest.mark.asyncio
+    async def test_single_word_is_answered_by_the_index(self, search):
+        result = await search.search(SearchQuery(text="connection"))
+
+        assert _ids(result) == ["timeout", "refused"]
+        assert result.query_plan.index_used
+        assert result.query_plan.candidate_ids == {"timeout", "refused"}
+        assert result.query_plan.sql_predicates == set()
+
+    def test_lookups_are_intersected_smallest_first(self, search):
+        plan = search._plan_query(SearchQuery(all_words=["connection", "database"], tags=["db"]))
+
+        assert plan.candidate_ids == {"timeout", "refused"}
+        sizes = [size for _, size in plan.steps]
+        assert sizes == sorted(sizes)
+
+    @pytest.mark.asyncio
+    async def test_no_candidates_skips_the_database(self, search, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("the database should not be queried")
+
+        monkeypatch.setattr(search, "_execute_on_partitions", fail)
+        result = await search.search(SearchQuery(all_words=["connection", "nullpointerexception"]))
+
+        assert result.logs == []
+        assert result.query_plan.candidate_ids == set()
+
+    @pytest.mark.asyncio
+    async def test_phrases_and_fragments_keep_a_sql_check(self, search):
+        # "index out" narrows to logs with both words; SQL confirms they are adjacent
+        result = await search.search(SearchQuery(text="list index out"))
+        assert _ids(result) == ["index_error"]
+        assert "text" in result.query_plan.sql_predicates
+
+        assert _ids(await search.search(SearchQuery(text="index range"))) == []
+
+        # Word fragments match every indexed word containing them
+        result = await search.search(SearchQuery(text="rror"))
+        assert _ids(result) == ["index_error", "key_error", "key_error_2"]
+
+    @pytest.mark.asyncio
+    async def test_word_lists(self, search):
+        assert _ids(await search.search(SearchQuery(any_words=["refused", "nullpointerexception"]))) == [
+            "refused", "null"
+        ]
+        assert _ids(await search.search(SearchQuery(all_words=["keyerror", "payload"]))) == ["key_error"]
+        assert _ids(await search.search(SearchQuery(text="connection", exclude_words=["timeout"]))) == ["refused"]
+        assert _ids(await search.search(SearchQuery(exclude_words=["keyerror", "connection"]))) == [
+            "index_error", "null"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tags_match_case_insensitively(self, search):
+        result = await search.search(SearchQuery(tags=["DB", "bounds"]))
+        assert _ids(result) == ["index_error", "timeout", "refused"]
+        assert result.query_plan.sql_predicates == set()
+
+    @pytest.mark.asyncio
+    async def test_like_wildcards_are_matched_literally(self, search):
+        # Unescaped, "_" would match the "X" in "userXid"
+        assert _ids(await search.search(SearchQuery(text="user_id'"))) == ["key_error"]
+        assert _ids(await search.search(SearchQuery(text="100%"))) == []
+
+    def test_planned_results_match_sql_only_results(self, search):
+        queries = [
+            SearchQuery(text="error"),
+            SearchQuery(text="KeyError: 'user"),
+            SearchQuery(exact_phrase="from the database"),
+            SearchQuery(any_words=["cache", "the"], tags=["python", "cache"]),
+            SearchQuery(all_words=["missing"], exclude_words=["cach"]),
+        ]
+        for query in queries:
+            plan, _, rows = search._plan_and_fetch(query)
+            sql, params = search._build_sql_query(query)
+            expected = search._execute_on_partitions(query, sql, params)
+            assert [row[0] for row in rows] == [row[0] for row in expected], query
+
+
+class TestIncrementalIndex:
+    """Test that writes reach the indexes without rebuilding them."""
+
+    @pytest.mark.asyncio
+    async def test_stores_replaces_and_deletes_are_indexed(self, search, db_manager):
+        db_manager.store_log(_log("late", "Connection reset by peer"))
+        db_manager.store_log(_log("refused", "Socket closed by database server", hour=11))
+        db_manager.delete_log("timeout")
+
+        result = await search.search(SearchQuery(text="connection"))
+        assert _ids(result) == ["late"]
+        assert result.query_plan.index_used
+        assert result.query_plan.generation == db_manager.generation
+        assert _ids(await search.search(SearchQuery(text="socket"))) == ["refused"]
+
+    @pytest.mark.asyncio
+    async def test_retention_deletes_are_indexed(self, search, db_manager):
+        db_manager.delete_logs_older_than(0)
+        result = await search.search(SearchQuery(text="connection"))
+        assert result.logs == []
+        assert result.query_plan.candidate_ids == set()
+
+    def test_compaction_sweeps_retired_doc_ids(self, search, db_manager):
+        db_manager.delete_log("null")
+        db_manager.store_log(_log("refused", "Socket closed by database server"))
+        assert len(search._index.dead) == 2
+
+        search.compact_indexes()
+        index = search._index
+        assert index.dead == set()
+        assert "nullpointerexception" not in index.text
+        assert "refused" not in index.text
+        live_docs = set(index.memory.log_ids)
+        for postings in (index.text, index.tags, index.bigrams):
+            assert all(set(ids) <= live_docs for ids in postings.values())
+
+    def test_compaction_runs_in_the_background(self, search, db_manager):
+        search.config["index_compaction_threshold"] = 3
+        for log_id in ("null", "refused", "timeout"):
+            db_manager.delete_log(log_id)
+
+        search._maintenance.join(timeout=5)
+        assert search._index.dead == set()
+
+    @pytest.mark.asyncio
+    async def test_failed_update_falls_back_to_sql_and_is_rebuilt(self, search, db_manager, monkeypatch):
+        def broken(change):
+            raise RuntimeError("indexing bug")
+
+        monkeypatch.setattr(search._index, "apply", broken)
+        db_manager.store_log(_log("late", "Connection reset by peer"))
+        search._maintenance.join(timeout=5)
+
+        result = await search.search(SearchQuery(text="connection"))
+        assert _ids(result) == ["late", "timeout", "refused"]
+        assert result.query_plan.index_used
+
+    @pytest.mark.asyncio
+    async def test_stale_index_falls_back_to_sql(self, search, db_manager):
+        # A write the indexes never heard about (another manager on the same file)
+        DatabaseManager(str(db_manager.database_path)).store_log(_log("late", "Connection reset by peer"))
+        db_manager.generation += 1
+
+        result = await search.search(SearchQuery(text="connection"))
+        assert _ids(result) == ["late", "timeout", "refused"]
+        assert not result.query_plan.index_used
+        assert result.query_plan.candidate_ids is None
+
+
+class TestPostingLists:
+    """Test the sorted array("I") posting lists and the set operations on them."""
+
+    @pytest.mark.parametrize("small, large", [
+        (range(0, 40, 4), range(0, 40, 3)),        # Similar sizes: filtered through a set
+        (range(0, 4000, 500), range(0, 4000, 3)),  # Lopsided: galloped with binary search
+        ((), range(10)),
+    ])
+    def test_intersect_and_difference_match_sets(self, small, large):
+        a, b = array("I", small), array("I", large)
+        assert list(_intersect_pair(a, b)) == sorted(set(small) & set(large))
+        assert list(_difference(b, a)) == sorted(set(large) - set(small))
+        assert list(_difference(a, b)) == sorted(set(small) - set(large))
+
+    def test_difference_returns_the_same_list_when_nothing_is_removed(self):
+        ids = array("I", range(0, 100, 2))
+        assert _difference(ids, array("I", [1, 3, 99])) is ids
+
+    def test_union_is_sorted_and_deduplicated(self):
+        assert list(_union([array("I", [1, 5, 9]), array("I"), array("I", [2, 5, 10])])) == [1, 2, 5, 9, 10]
+        single = array("I", [3, 4])
+        assert _union([array("I"), single]) is single
+
+    def test_postings_are_sorted_compact_arrays(self, search, db_manager):
+        db_manager.store_log(_log("refused", "Connection refused refused by database server"))
+        for postings in (search._index.text, search._index.tags, search._index.bigrams):
+            for ids in postings.values():
+                assert isinstance(ids, array) and ids.typecode == "I"
+                assert list(ids) == sorted(set(ids))
+
+
+class TestRelevanceRanking:
+    """Test BM25F ranking from the indexed word counts and field lengths."""
+
+    @staticmethod
+    def _summarized(log_id, text, summary, tags=()):
+        entry = _log(log_id, text)
+        entry.processed_log, entry.summary, entry.tags = "Worker stalled", summary, list(tags)
+        return entry
+
+    @pytest.fixture
+    def ranked(self, search, db_manager):
+        db_manager.store_logs([
+            self._summarized("in_summary", "Replica lag detected on node seven", "Deadlock in the scheduler"),
+            self._summarized("in_body", "Deadlock detected on node seven", "Replica lag"),
+            self._summarized("repeated", "Deadlock deadlock deadlock on node seven", "Replica lag"),
+            self._summarized("long_body", "Deadlock detected after a very long wait on the shared "
+                                          "queue worker pool of node seven", "Replica lag"),
+            self._summarized("tagged", "Deadlock detected on node seven", "Replica lag", tags=["deadlock"]),
+        ])
+        return search
+
+    @pytest.mark.asyncio
+    async def test_most_relevant_ranks_by_field_weighted_counts(self, ranked):
+        result = await ranked.search(SearchQuery(text="deadlock", sort_by=SortOrder.MOST_RELEVANT))
+
+        # Repeats and tags add up, a summary mention beats a body one, long bodies dilute
+        assert _ids(result) == ["repeated", "tagged", "in_summary", "in_body", "long_body"]
+        scores = result.query_plan.scores
+        assert [scores[log_id] for log_id in _ids(result)] == sorted(scores.values(), reverse=True)
+        assert result.match_quality_scores[0] == 1.0
+        assert result.match_quality_scores == sorted(result.match_quality_scores, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_rarer_words_weigh_more(self, ranked):
+        result = await ranked.search(SearchQuery(any_words=["deadlock", "scheduler"],
+                                                 sort_by=SortOrder.MOST_RELEVANT, limit=2, offset=1))
+        assert _ids(result) == ["repeated", "tagged"]
+        # Only the best offset + limit candidates are ranked for SQL
+        assert set(result.query_plan.scores) == {"in_summary", "repeated", "tagged"}
+        assert result.query_plan.ranked_out == 2
+
+        everything = await ranked.search(SearchQuery(any_words=["deadlock", "scheduler"],
+                                                     sort_by=SortOrder.MOST_RELEVANT))
+        assert everything.query_plan.scores["in_summary"] > 2 * everything.query_plan.scores["in_body"]
+
+    @pytest.mark.asyncio
+    async def test_filters_rejecting_the_top_ranked_widen_the_ranking(self, ranked, db_manager):
+        for log_id in ("in_body", "long_body"):
+            warning = db_manager.get_log(log_id)
+            warning.severity = LogSeverity.WARNING
+            db_manager.store_log(warning)
+        result = await ranked.search(SearchQuery(text="deadlock", severities=[LogSeverity.WARNING],
+                                                 sort_by=SortOrder.MOST_RELEVANT, limit=1))
+        assert _ids(result) == ["in_body"]
+        assert len(result.query_plan.scores) == 4
+
+    def test_pruned_ranking_matches_scoring_everything(self):
+        rng = random.Random(7)
+        words = ["deadlock", "timeout", "replica", "queue", "worker", "stalled", "node", "lag"]
+        index = _SearchIndex()
+        for n in range(300):
+            entry = _log(f"log_{n}", " ".join(rng.choices(words, weights=range(8, 0, -1), k=rng.randint(3, 12))))
+            entry.tags = rng.sample(words, rng.randint(0, 2))
+            index.add(entry)
+        docs = list(index.live(index.all_docs()))
+        terms = ["deadlock", "queue", "lag"]
+        weights = {"summary": 2.0, "tags": 1.5, "body": 1.0}
+        everything = index.score(docs, terms, weights, 1.2, 0.75)
+        for depth in (1, 10, 50):
+            top = index.top_scores(docs, terms, depth, weights, 1.2, 0.75)
+            cut = sorted(everything.values(), reverse=True)[depth - 1]
+            assert top == pytest.approx({doc: score for doc, score in everything.items() if score >= cut})
+
+    @pytest.mark.asyncio
+    async def test_other_orders_score_only_the_returned_page(self, ranked):
+        result = await ranked.search(SearchQuery(text="deadlock", limit=2))
+        assert result.query_plan.scores is None
+        assert _ids(result) == ["tagged", "repeated"]  # Newest first: equal timestamps, log_id descending
+        assert result.match_quality_scores == [pytest.approx(0.97, abs=0.01), 1.0]
+
+    @pytest.mark.asyncio
+    async def test_stale_indexes_fall_back_to_newest_first(self, ranked, db_manager):
+        db_manager.generation += 1
+        result = await ranked.search(SearchQuery(text="deadlock", sort_by=SortOrder.MOST_RELEVANT))
+        assert result.query_plan.scores is None
+        assert _ids(result) == ["tagged", "repeated", "long_body", "in_summary", "in_body"]
+        assert result.match_quality_scores is None
+
+
+class TestFacets:
+    """Test filter suggestions and related tags counted from the indexes."""
+
+    @pytest.mark.asyncio
+    async def test_suggestions_count_every_match_not_just_the_page(self, search, db_manager):
+        late = _log("late", "Connection reset by peer")
+        late.severity, late.project_name, late.tags = LogSeverity.WARNING, "gateway", ["network"]
+        db_manager.store_log(late)
+
+        result = await search.search(SearchQuery(text="connection", limit=1))
+        assert _ids(result) == ["late"]
+        assert result.query_plan.facets["tags"] == {"db": 2, "network": 2}
+        assert set(result.related_tags) == {"db", "network"}
+        assert result.suggested_filters == {"severities": ["error", "warning"]}
+
+    @pytest.mark.asyncio
+    async def test_without_index_lookups_the_page_is_counted(self, search):
+        result = await search.search(SearchQuery(limit=2))
+        assert result.query_plan.facets is None
+        assert result.related_tags == ["python", "Bounds"]
+
+    def test_saved_segments_keep_facet_values(self, db_manager):
+        with tempfile.TemporaryDirectory() as index_dir:
+            search = SearchManager(db_manager, index_dir=index_dir)
+            in_memory = search._index.facet_counts(search._index.live(search._index.all_docs()))
+            assert search.flush_index()
+            assert isinstance(search._index.segments[0], IndexSegment)
+            saved = search._index.facet_counts(search._index.live(search._index.all_docs()))
+        assert saved == in_memory
+        assert saved["tags"]["db"] == 2 and saved["language"] == {"python": 6}
+
+
+class TestFuzzySearch:
+    """Test words no log contains matching indexed words spelled like them."""
+
+    @pytest.mark.asyncio
+    async def test_misspelled_word_matches_its_closest_spellings(self, search):
+        result = await search.search(SearchQuery(text="NullPointerExeption"))
+        assert _ids(result) == ["null"]
+        assert result.query_plan.fuzzy_expansions == {"nullpointerexeption": ["nullpointerexception"]}
+        assert "text" not in result.query_plan.sql_predicates
+        assert "nullpointerexception" in result.highlighted_snippets[0].lower()
+
+    @pytest.mark.asyncio
+    async def test_each_word_is_matched_exactly_partially_or_fuzzily(self, search, db_manager):
+        db_manager.store_log(_log("refused_error", "ConnectionRefusedError: [Errno 111]"))
+        result = await search.search(SearchQuery(all_words=["Connection timout"]))
+        assert _ids(result) == ["timeout"]
+        assert result.query_plan.fuzzy_expansions == {"timout": ["timeout"]}
+
+        result = await search.search(SearchQuery(any_words=["ConnectionRefus Errmo", "Segfault"]))
+        assert _ids(result) == ["refused_error"]  # A fragment of a word, and "errno"
+        assert result.query_plan.fuzzy_expansions == {"errmo": ["errno"]}
+
+    @pytest.mark.asyncio
+    async def test_words_that_are_all_there_are_not_guessed_at(self, search, db_manager):
+        db_manager.store_log(_log("greek", "alpha beta gamma delta"))
+        result = await search.search(SearchQuery(text="beta delta gamma alpha"))
+        assert _ids(result) == []  # Every word is indexed; only the phrase is missing
+        assert result.query_plan.fuzzy_expansions == {}
+        assert _ids(await search.search(SearchQuery(text="beta gamma"))) == ["greek"]
+
+    @pytest.mark.asyncio
+    async def test_words_not_guessed_at_are_still_checked_by_sql(self, search, db_manager):
+        db_manager.store_logs([_log("apart", "NullPointerException: foo then bar"),
+                               _log("joined", "NullPointerException in foo-bar")])
+        result = await search.search(SearchQuery(all_words=["NullPointerExeption", "foo-bar"]))
+        assert _ids(result) == ["joined"]
+        assert result.query_plan.fuzzy_expansions == {"nullpointerexeption": ["nullpointerexception"]}
+
+        result = await search.search(SearchQuery(any_words=["Segfault", "foo-bar"]))
+        assert _ids(result) == ["joined"]
+        result = await search.search(SearchQuery(any_words=["NullPointerExeption at service", "foo-bar"]))
+        assert sorted(_ids(result)) == ["joined", "null"]  # Not "apart": "at service" is checked as written
+
+    @pytest.mark.asyncio
+    async def test_words_matched_by_nothing_still_find_nothing(self, search):
+        search.config["enable_fuzzy_search"] = False
+        assert _ids(await search.search(SearchQuery(text="NullPointerExeption"))) == []
+        search.config["enable_fuzzy_search"] = True
+        assert _ids(await search.search(SearchQuery(text="Segfault"))) == []
+        assert _ids(await search.search(SearchQuery(text="Exy"))) == []  # Too short to guess at
+
+    def test_expansion_stops_when_its_time_is_up(self, search):
+        search.config["max_search_time_ms"] = 0
+        plan = search._plan_query(SearchQuery(text="NullPointerExeption"))
+        assert plan.fuzzy_expansions == {} and plan.candidate_ids == set()
+
+    def test_saved_segments_find_spelled_alike_words(self, db_manager):
+        with tempfile.TemporaryDirectory() as index_dir:
+            search = SearchManager(db_manager, index_dir=index_dir)
+            assert search.flush_index()
+            plan = search._plan_query(SearchQuery(text="Conection"))
+            assert plan.fuzzy_expansions == {"conection": ["connection"]}
+            assert plan.candidate_ids == {"timeout", "refused"}
+
+    def test_swapped_letters_mid_word_are_matched(self, search):
+        for word, expected in (("refsued", "refused"), ("refuesd", "refused"), ("tiemout", "timeout")):
+            plan = search._plan_query(SearchQuery(text=word))
+            assert plan.fuzzy_expansions == {word: [expected]}
+            assert plan.candidate_ids == {expected}
+
+    def test_edit_distance_counts_swapped_letters_once(self):
+        assert edit_distance("recieve", "receive", 2) == 1
+        assert edit_distance("timout", "timeout", 2) == 1
+        assert edit_distance("database", "adtabsae", 2) == 2
+        assert edit_distance("deadlock", "livelock", 2) == 3  # Stops counting past the limit
+
+
+class TestResultCache:
+    """Test search results served again until the next write."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_answered_from_the_cache(self, search):
+        first = await search.search(SearchQuery(text="connection", tags=["db", "network"]))
+        again = await search.search(SearchQuery(text="connection", tags=["network", "db", "db"]))
+        assert _ids(again) == _ids(first) == ["timeout", "refused"]
+        assert again.query_plan is first.query_plan  # Same normalized query, nothing re-planned
+        stats = search.get_search_analytics()["result_cache"]
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_cached_results(self, search, db_manager):
+        await search.search(SearchQuery(text="connection"))
+        db_manager.store_log(_log("late", "Connection reset by peer"))
+        result = await search.search(SearchQuery(text="connection"))
+        assert _ids(result) == ["late", "timeout", "refused"]
+        assert search.get_search_analytics()["result_cache"]["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_config_changes_miss_the_cache(self, search):
+        await search.search(SearchQuery(text="NullPointerExeption"))
+        search.config["enable_fuzzy_search"] = False
+        assert _ids(await search.search(SearchQuery(text="NullPointerExeption"))) == []
+        assert search.get_search_analytics()["result_cache"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_clock_relative_and_stale_index_results_are_not_cached(self, search, db_manager):
+        await search.search(SearchQuery(text="connection", last_n_days=7))
+        db_manager.generation += 1  # A write the indexes haven't seen yet
+        await search.search(SearchQuery(text="connection"))
+        assert search.get_search_analytics()["result_cache"]["entries"] == 0
+
+
+class TestSavedSegments:
+    """Test indexes saved to disk as segments, reloaded, caught up and merged."""
+
+    @pytest.fixture
+    def index_dir(self, db_manager):
+        return db_manager.database_path.parent / "segments"
+
+    @pytest.fixture
+    def saved(self, db_manager, index_dir):
+        search = SearchManager(db_manager, index_dir=str(index_dir))
+        assert search.flush_index()
+        return search
+
+    @pytest.mark.asyncio
+    async def test_restart_loads_segments_and_catches_up(self, saved, db_manager, index_dir, monkeypatch):
+        db_manager.store_log(_log("late", "Connection reset by peer"))
+        db_manager.delete_log("timeout")
+        saved.compact_indexes()  # Records the delete in the manifest
+        db_manager.remove_change_listener(saved._on_log_change)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("a restart should not re-read every log")
+
+        monkeypatch.setattr(db_manager, "iter_logs", fail)
+        search = SearchManager(db_manager, index_dir=str(index_dir))
+        assert len(search._index.segments) == 1
+        assert set(search._index.memory.log_ids.values()) == {"late"}
+
+        result = await search.search(SearchQuery(text="connection"))
+        assert _ids(result) == ["late", "refused"]
+        assert result.query_plan.index_used
+
+    @pytest.mark.asyncio
+    async def test_deletes_missing_from_the_manifest_are_reconciled(self, saved, db_manager, index_dir):
+        db_manager.remove_change_listener(saved._on_log_change)
+        db_manager.delete_log("refused")
+
+        search = SearchManager(db_manager, index_dir=str(index_dir))
+        result = await search.search(SearchQuery(text="connection"))
+        assert _ids(result) == ["timeout"]
+        assert result.query_plan.candidate_ids == {"timeout"}
+
+    def test_segments_of_another_database_are_rebuilt(self, saved, index_dir):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            other = DatabaseManager(str(Path(temp_dir) / "other.db"))
+            other.store_log(_log("only", "Segmentation fault"))
+            search = SearchManager(other, index_dir=str(index_dir))
+            assert search._index.segments == []
+            assert search._index.live_count() == 1
+            other.close()
+
+    @pytest.mark.asyncio
+    async def test_segments_are_merged_and_expunged(self, saved, db_manager):
+        saved.config["index_max_segments"] = 2
+        for n in range(3):
+            db_manager.store_log(_log(f"extra_{n}", f"Connection dropped {n}"))
+            assert saved.flush_index()
+        assert len(saved._index.segments) == 4
+
+        assert saved.merge_index_segments() >= 1
+        assert len(saved._index.segments) <= 2
+
+        for log_id in ("timeout", "refused", "extra_0"):
+            db_manager.delete_log(log_id)
+        saved.merge_index_segments()
+        assert saved._index.dead == set()
+
+        result = await saved.search(SearchQuery(text="connection"))
+        assert _ids(result) == ["extra_2", "extra_1"]
+        assert result.query_plan.index_used
+
+    def test_ranking_is_the_same_from_segments(self, db_manager, index_dir):
+        db_manager.store_log(_log("late", "Connection reset by peer while reading from the database"))
+        search = SearchManager(db_manager, index_dir=str(index_dir))
+        query = SearchQuery(text="database connection", sort_by=SortOrder.MOST_RELEVANT)
+        in_memory = search._plan_query(query).scores
+
+        db_manager.delete_log("refused")
+        assert search.flush_index()
+        db_manager.store_log(_log("refused", "Connection refused by database server"))
+        assert search._plan_query(query).scores == pytest.approx(in_memory)
+
+    def test_segment_postings_match_memory_postings(self, saved, db_manager):
+        segment = saved._index.segments[0]
+        rebuilt = SearchManager(db_manager)._index.memory
+        for field, postings in rebuilt.fields().items():
+            for term, ids in postings.items():
+                assert list(segment.postings(field, term)) == list(ids), (field, term)
+        assert segment.words_containing("text", "rror") == rebuilt.words_containing("text", "rror")
+
+        ids, frequencies = segment.postings_with_frequencies("text", "database")
+        assert (ids, frequencies) == rebuilt.postings_with_frequencies("text", "database")
+        for doc in rebuilt.log_ids:
+            assert segment.lengths_of(doc) == rebuilt.lengths_of(doc)
+        assert saved._index.total_lengths == SearchManager(db_manager)._index.total_lengths